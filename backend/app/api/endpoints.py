@@ -5,11 +5,14 @@ Clean architecture: endpoints only handle HTTP concerns,
 business logic is delegated to service layer.
 """
 
+import asyncio
 import logging
 import re
+from dataclasses import asdict
+from typing import TYPE_CHECKING
 
 from config import settings
-from dependencies import get_job_service
+from dependencies import get_exporter, get_job_service, get_stage_scheduler
 from fastapi import (
     APIRouter,
     BackgroundTasks,
@@ -21,19 +24,31 @@ from fastapi import (
 )
 from fastapi.responses import FileResponse
 from pipeline.export import PlotterExporter
+from pipeline.params import ProcessingParams
 from services.job_service import JobService
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from api.models import (
+    BatchItemError,
+    BatchProcessRequest,
+    BatchProcessResponse,
+    BatchStatusRequest,
+    BatchStatusResponse,
+    BatchUploadResponse,
     JobStats,
     JobStatusResponse,
     ProcessingStatus,
     ProcessRequest,
     ProcessResponse,
+    StageMetricsResponse,
     UploadResponse,
 )
 
+if TYPE_CHECKING:
+    # Loads OpenCV; only job-running processes create a scheduler
+    from pipeline.scheduler import StageScheduler
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
@@ -61,6 +76,25 @@ def validate_job_id(job_id: str) -> None:
         raise HTTPException(status_code=400, detail="Invalid job ID format")
 
 
+def validate_batch_job_ids(job_ids: list[str]) -> None:
+    """
+    Validate the job IDs of a batch request.
+
+    Args:
+        job_ids: Job identifiers to validate
+
+    Raises:
+        HTTPException: If the batch is too large or an ID is not a valid UUID
+    """
+    if len(job_ids) > settings.max_batch_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many jobs in batch (max: {settings.max_batch_size})",
+        )
+    for job_id in job_ids:
+        validate_job_id(job_id)
+
+
 @router.post("/upload", response_model=UploadResponse)
 @limiter.limit(settings.rate_limit_uploads)
 async def upload_image(
@@ -95,9 +129,53 @@ async def upload_image(
     )
 
 
+@router.post("/batch/upload", response_model=BatchUploadResponse)
+@limiter.limit(settings.rate_limit_uploads)
+async def upload_batch(
+    request: Request,
+    files: list[UploadFile] = File(...),
+    job_service: JobService = Depends(get_job_service),
+) -> BatchUploadResponse:
+    """
+    Upload many images at once, creating one job per image.
+
+    Accepts any mix of image files and ZIP archives of images. Invalid
+    files are reported in ``errors`` without failing the rest of the batch.
+
+    Args:
+        request: FastAPI request (for rate limiting)
+        files: Uploaded image files and/or ZIP archives
+        job_service: Injected job service
+
+    Returns:
+        BatchUploadResponse with the created jobs and rejected files
+
+    Raises:
+        HTTPException: If the batch is empty, too large, or upload fails
+    """
+    entries = await job_service.read_batch_files(files)
+    created, rejected = await job_service.create_jobs_from_batch(entries)
+
+    return BatchUploadResponse(
+        jobs=[
+            UploadResponse(
+                job_id=job_id,
+                filename=filename,
+                image_url=f"/api/uploads/{job_id}{file_path.suffix}",
+            )
+            for job_id, filename, file_path in created
+        ],
+        errors=[
+            BatchItemError(item=filename or "<unnamed>", error=error)
+            for filename, error in rejected
+        ],
+    )
+
+
 async def process_job_background(
     job_id: str,
-    body: ProcessRequest,
+    params: ProcessingParams,
+    preview: bool,
     job_service: JobService,
 ) -> None:
     """
@@ -105,38 +183,12 @@ async def process_job_background(
 
     Args:
         job_id: Job identifier
-        body: Processing request with parameters
+        params: Resolved processing parameters
+        preview: Whether to stream a fast preview first
         job_service: Job service instance
     """
-    # Extract params from body
-    from pipeline.processor import ProcessingParams
-
-    if body.params:
-        params = ProcessingParams(
-            canvas_width_mm=body.params.canvas_width_mm,
-            canvas_height_mm=body.params.canvas_height_mm,
-            line_width_mm=body.params.line_width_mm,
-            isolate_subject=body.params.isolate_subject,
-            use_ml=body.params.use_ml,
-            edge_threshold=body.params.edge_threshold,
-            line_threshold=body.params.line_threshold,
-            merge_tolerance=body.params.merge_tolerance,
-            simplify_tolerance=body.params.simplify_tolerance,
-            hatching_enabled=body.params.hatching_enabled,
-            hatch_density=body.params.hatch_density,
-            hatch_angle=body.params.hatch_angle,
-            darkness_threshold=body.params.darkness_threshold,
-        )
-    else:
-        # Default parameters
-        params = ProcessingParams(
-            canvas_width_mm=300.0,
-            canvas_height_mm=200.0,
-            line_width_mm=0.3,
-        )
-
     try:
-        await job_service.process_job(job_id, params)
+        await job_service.process_job(job_id, params, preview=preview)
     except HTTPException:
         # Already handled by service layer
         pass
@@ -144,6 +196,59 @@ async def process_job_background(
         logger.exception(f"Background processing failed for job {job_id}")
 
 
+async def process_jobs_background(
+    job_ids: list[str],
+    params: ProcessingParams,
+    preview: bool,
+    job_service: JobService,
+) -> None:
+    """
+    Background task processing several jobs concurrently.
+
+    Starlette runs a response's background tasks one after another, so a
+    batch is a single task that awaits all its jobs together and lets the
+    stage scheduler overlap them.
+
+    Args:
+        job_ids: Job identifiers
+        params: Resolved processing parameters
+        preview: Whether to stream a fast preview first
+        job_service: Job service instance
+    """
+    await asyncio.gather(
+        *(
+            process_job_background(job_id, params, preview, job_service)
+            for job_id in job_ids
+        )
+    )
+
+
+async def start_jobs(
+    job_ids: list[str],
+    params: ProcessingParams,
+    preview: bool,
+    background_tasks: BackgroundTasks,
+    job_service: JobService,
+) -> None:
+    """
+    Start jobs in this process, or queue them when the process is API-only.
+
+    Args:
+        job_ids: Job identifiers
+        params: Resolved processing parameters
+        preview: Whether to stream a fast preview first
+        background_tasks: FastAPI background tasks
+        job_service: Job service instance
+    """
+    if settings.process_role == "api":
+        for job_id in job_ids:
+            await job_service.enqueue_job(job_id, params, preview=preview)
+    elif job_ids:
+        background_tasks.add_task(
+            process_jobs_background, job_ids, params, preview, job_service
+        )
+
+
 @router.post("/process", response_model=ProcessResponse)
 @limiter.limit(settings.rate_limit_processing)
 async def process_image(
@@ -155,8 +260,8 @@ async def process_image(
     """
     Start processing an uploaded image.
 
-    Initiates background processing and returns immediately.
-    Use /status endpoint to check progress.
+    Initiates background processing (or queues the job for a worker
+    process) and returns immediately. Use /status endpoint to check progress.
 
     Args:
         request: FastAPI request (for rate limiting)
@@ -173,7 +278,7 @@ async def process_image(
     validate_job_id(body.job_id)
 
     # Verify job exists and is in correct state
-    job = job_service.get_job(body.job_id)
+    job = await job_service.get_job(body.job_id)
 
     if job["status"] != ProcessingStatus.PENDING.value:
         raise HTTPException(
@@ -181,8 +286,9 @@ async def process_image(
             detail=f"Job already {job['status']}",
         )
 
-    # Add background task
-    background_tasks.add_task(process_job_background, body.job_id, body, job_service)
+    params = job_service.resolve_params(body.mode, body.preset, body.params)
+
+    await start_jobs([body.job_id], params, body.preview, background_tasks, job_service)
 
     return ProcessResponse(
         job_id=body.job_id,
@@ -191,28 +297,63 @@ async def process_image(
     )
 
 
-@router.get("/status/{job_id}", response_model=JobStatusResponse)
-async def get_job_status(
-    job_id: str,
+@router.post("/batch/process", response_model=BatchProcessResponse)
+@limiter.limit(settings.rate_limit_processing)
+async def process_batch(
+    request: Request,
+    body: BatchProcessRequest,
+    background_tasks: BackgroundTasks,
     job_service: JobService = Depends(get_job_service),
-) -> JobStatusResponse:
+) -> BatchProcessResponse:
     """
-    Get processing status for a job.
+    Start processing several uploaded images with the same parameters.
+
+    Job states are checked with a single storage round trip. Jobs that do
+    not exist or are not pending are reported in ``errors``; the others
+    start as with /process.
 
     Args:
-        job_id: Job identifier
+        request: FastAPI request (for rate limiting)
+        body: Batch request with job IDs and parameters
+        background_tasks: FastAPI background tasks
         job_service: Injected job service
 
     Returns:
-        JobStatusResponse with current status and results
+        BatchProcessResponse with started and rejected jobs
 
     Raises:
-        HTTPException: If job not found
+        HTTPException: If the batch is too large or a job ID is malformed
     """
-    validate_job_id(job_id)
+    validate_batch_job_ids(body.job_ids)
+
+    params = job_service.resolve_params(body.mode, body.preset, body.params)
+    pending, rejected = await job_service.get_pending_jobs(body.job_ids)
+
+    await start_jobs(pending, params, body.preview, background_tasks, job_service)
+
+    return BatchProcessResponse(
+        jobs=[
+            ProcessResponse(
+                job_id=job_id,
+                status=ProcessingStatus.PROCESSING,
+                message="Processing started",
+            )
+            for job_id in pending
+        ],
+        errors=[BatchItemError(item=job_id, error=error) for job_id, error in rejected],
+    )
+
 
-    status_data = job_service.get_job_status(job_id)
+def _status_response(status_data: dict) -> JobStatusResponse:
+    """
+    Convert a status dictionary from the job service to a response model.
+
+    Args:
+        status_data: Status dictionary from JobService
 
+    Returns:
+        JobStatusResponse for the job
+    """
     # Convert stats to JobStats model if present
     stats = None
     if status_data.get("stats"):
@@ -221,12 +362,16 @@ async def get_job_status(
             total_length_mm=status_data["stats"]["total_length_mm"],
             width_mm=status_data["stats"].get("width_mm"),
             height_mm=status_data["stats"].get("height_mm"),
+            edge_threshold=status_data["stats"].get("edge_threshold"),
+            stages=status_data["stats"].get("stages"),
         )
 
     return JobStatusResponse(
         job_id=status_data["job_id"],
         status=status_data["status"],
         progress=status_data["progress"],
+        stage=status_data["stage"],
+        progress_updated_at=status_data["progress_updated_at"],
         result_url=status_data["result_url"],
         stats=stats,
         error=status_data["error"],
@@ -234,11 +379,87 @@ async def get_job_status(
     )
 
 
+@router.get("/status/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(
+    job_id: str,
+    job_service: JobService = Depends(get_job_service),
+) -> JobStatusResponse:
+    """
+    Get processing status for a job.
+
+    Args:
+        job_id: Job identifier
+        job_service: Injected job service
+
+    Returns:
+        JobStatusResponse with current status and results
+
+    Raises:
+        HTTPException: If job not found
+    """
+    validate_job_id(job_id)
+
+    return _status_response(await job_service.get_job_status(job_id))
+
+
+@router.post("/batch/status", response_model=BatchStatusResponse)
+async def get_batch_status(
+    body: BatchStatusRequest,
+    job_service: JobService = Depends(get_job_service),
+) -> BatchStatusResponse:
+    """
+    Get processing status for many jobs with one storage round trip.
+
+    Args:
+        body: Job IDs to look up
+        job_service: Injected job service
+
+    Returns:
+        BatchStatusResponse with the status of each job found, in request
+        order, and the IDs that do not exist
+
+    Raises:
+        HTTPException: If the batch is too large or a job ID is malformed
+    """
+    validate_batch_job_ids(body.job_ids)
+
+    statuses = await job_service.get_jobs_status(body.job_ids)
+
+    return BatchStatusResponse(
+        jobs=[_status_response(status) for status in statuses if status],
+        not_found=[
+            job_id
+            for job_id, status in zip(body.job_ids, statuses, strict=True)
+            if status is None
+        ],
+    )
+
+
+@router.get("/pipeline/stages", response_model=dict[str, StageMetricsResponse])
+async def get_stage_metrics(
+    scheduler: "StageScheduler" = Depends(get_stage_scheduler),
+) -> dict[str, StageMetricsResponse]:
+    """
+    Get per-stage queue depth and throughput counters.
+
+    Args:
+        scheduler: Injected stage scheduler
+
+    Returns:
+        Stage metrics keyed by stage name, in pipeline order
+    """
+    return {
+        stage: StageMetricsResponse(**asdict(metrics))
+        for stage, metrics in scheduler.metrics().items()
+    }
+
+
 @router.get("/download/{job_id}")
 async def download_result(
     job_id: str,
     export_format: str = "svg",
     job_service: JobService = Depends(get_job_service),
+    exporter: PlotterExporter = Depends(get_exporter),
 ) -> FileResponse:
     """
     Download processed result in specified format.
@@ -247,6 +468,7 @@ async def download_result(
         job_id: Job identifier
         export_format: Export format (svg, hpgl, gcode)
         job_service: Injected job service
+        exporter: Injected shared plotter exporter
 
     Returns:
         File in requested format
@@ -256,8 +478,8 @@ async def download_result(
     """
     validate_job_id(job_id)
 
-    job = job_service.get_job(job_id)
-    output_path = job_service.get_result_path(job_id)
+    job = await job_service.get_job(job_id)
+    output_path = await job_service.get_result_path(job_id)
 
     format_lower = export_format.lower()
 
@@ -270,7 +492,6 @@ async def download_result(
         )
 
     # For other formats, convert on-the-fly
-    exporter = PlotterExporter()
     svg_content = output_path.read_text()
 
     # Create export file path
@@ -0,0 +1,203 @@
+"""
+Job event fan-out between API replicas.
+
+ConnectionManager publishes every WebSocket message to an event bus and
+sends whatever the bus hands back to its local sockets. The in-memory bus
+loops messages straight back within one process; the Redis bus publishes to
+a channel every replica subscribes to once, so a client connected to any
+replica hears about jobs running on any other.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+import redis
+import redis.asyncio as aioredis
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from storage import JobStorage
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "ws:job-events"
+
+# How long the listener waits for a message per poll, and how long it backs
+# off after a Redis error
+SUBSCRIBER_POLL_SECONDS = 1.0
+SUBSCRIBER_RETRY_SECONDS = 1.0
+
+
+class EventBus(ABC):
+    """
+    Transport for WebSocket job events.
+
+    Messages are JSON strings that always carry the ``job_id`` they belong
+    to. The handler passed to ``start`` receives ``(job_id, message)`` for
+    every event published by any replica sharing the bus.
+    """
+
+    @abstractmethod
+    async def start(self, handler: Callable[[str, str], Awaitable[None]]) -> None:
+        """
+        Begin delivering events to ``handler``.
+
+        Args:
+            handler: Coroutine function called with (job_id, message)
+        """
+
+    @abstractmethod
+    async def publish(self, job_id: str, message: str) -> None:
+        """
+        Publish an event to every subscriber.
+
+        Args:
+            job_id: Job the event belongs to
+            message: JSON-encoded WebSocket message
+        """
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Stop delivering events and release resources."""
+
+
+class InMemoryEventBus(EventBus):
+    """Delivers events within the current process only."""
+
+    def __init__(self) -> None:
+        """Initialize bus without a subscriber."""
+        self._handler: Callable[[str, str], Awaitable[None]] | None = None
+
+    async def start(self, handler: Callable[[str, str], Awaitable[None]]) -> None:
+        """Register the local handler."""
+        self._handler = handler
+
+    async def publish(self, job_id: str, message: str) -> None:
+        """Hand the event straight to the local handler."""
+        if self._handler is not None:
+            await self._handler(job_id, message)
+
+    async def stop(self) -> None:
+        """Unregister the local handler."""
+        self._handler = None
+
+
+class RedisEventBus(EventBus):
+    """
+    Fans events out to every replica through Redis pub/sub.
+
+    Uses the async client (and therefore the connection pool) of
+    ``JobStorage``. One listener task per replica reads ``EVENTS_CHANNEL``
+    and awaits the handler for each event.
+    """
+
+    def __init__(self, client: aioredis.Redis, channel: str = EVENTS_CHANNEL):
+        """
+        Initialize bus on an existing Redis client.
+
+        Args:
+            client: Async Redis client with ``decode_responses=True``
+            channel: Pub/sub channel shared by all replicas
+        """
+        self._client = client
+        self._channel = channel
+        self._pubsub: aioredis.client.PubSub | None = None
+        self._handler: Callable[[str, str], Awaitable[None]] | None = None
+        self._listener: asyncio.Task[None] | None = None
+
+    async def start(self, handler: Callable[[str, str], Awaitable[None]]) -> None:
+        """Subscribe to the channel and start the listener task."""
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self._channel)
+        self._handler = handler
+        self._pubsub = pubsub
+
+        self._listener = asyncio.create_task(
+            self._listen(pubsub, handler), name="ws-event-subscriber"
+        )
+        logger.info(f"Subscribed to WebSocket events on Redis channel {self._channel}")
+
+    async def publish(self, job_id: str, message: str) -> None:
+        """
+        Publish the event to Redis.
+
+        Falls back to local delivery if Redis is unreachable, so clients on
+        this replica still receive it.
+        """
+        try:
+            await self._client.publish(self._channel, message)
+        except (redis.RedisError, OSError) as e:
+            logger.warning(f"Failed to publish event for job {job_id}: {e}")
+            if self._handler is not None:
+                await self._handler(job_id, message)
+
+    async def stop(self) -> None:
+        """Stop the listener task and close the subscription."""
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+
+    async def _listen(
+        self,
+        pubsub: aioredis.client.PubSub,
+        handler: Callable[[str, str], Awaitable[None]],
+    ) -> None:
+        """
+        Forward channel messages to the handler until cancelled.
+
+        Args:
+            pubsub: Subscription opened by ``start``
+            handler: Local delivery callback
+        """
+        while True:
+            try:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=SUBSCRIBER_POLL_SECONDS
+                )
+            except (redis.RedisError, OSError) as e:
+                logger.warning(f"Redis event subscription error: {e}")
+                await asyncio.sleep(SUBSCRIBER_RETRY_SECONDS)
+                continue
+
+            if message is None or message["type"] != "message":
+                continue
+
+            data = message["data"]
+            try:
+                job_id = json.loads(data)["job_id"]
+            except (ValueError, KeyError, TypeError):
+                logger.warning("Ignoring malformed WebSocket event from Redis")
+                continue
+
+            try:
+                await handler(job_id, data)
+            except Exception:
+                logger.exception(f"Failed to deliver event for job {job_id}")
+
+
+def create_event_bus(storage: JobStorage) -> EventBus:
+    """
+    Create the event bus matching the job storage backend.
+
+    Args:
+        storage: Initialized job storage
+
+    Returns:
+        RedisEventBus sharing the storage's Redis client, or an
+        InMemoryEventBus when storage is in-memory
+    """
+    if storage.use_redis and storage.redis_client is not None:
+        return RedisEventBus(storage.redis_client)
+    return InMemoryEventBus()
@@ -0,0 +1,99 @@
+"""
+Prometheus metrics exposition.
+
+Stage metrics are recorded in the process that runs the stages. The API
+serves them on ``/metrics``; worker processes, which serve no HTTP API,
+expose the same text on their own port so split deployments
+(``PROCESS_ROLE=api``) can scrape every worker.
+"""
+
+import asyncio
+import contextlib
+import logging
+
+from dependencies import get_scheduler
+from utils.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+METRICS_PATH = "/metrics"
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Bounds how long a scrape connection may take to send its request
+REQUEST_TIMEOUT_SECONDS = 5.0
+
+
+def render_metrics() -> str:
+    """
+    Render the process's metrics in Prometheus text format.
+
+    Includes the stage scheduler's queue depths when this process has
+    created a scheduler.
+
+    Returns:
+        Prometheus text exposition
+    """
+    if get_scheduler.cache_info().currsize:
+        queue_depth = metrics_registry.gauge(
+            "pipeline_stage_queue_depth", "Jobs waiting for a stage worker", ("stage",)
+        )
+        active = metrics_registry.gauge(
+            "pipeline_stage_active_jobs", "Jobs executing in a stage", ("stage",)
+        )
+        for stage, stage_metrics in get_scheduler().metrics().items():
+            queue_depth.set(stage_metrics.queue_depth, stage=stage)
+            active.set(stage_metrics.active, stage=stage)
+
+    return metrics_registry.render()
+
+
+async def _handle_scrape(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    """Answer one HTTP request: the metrics for ``GET /metrics``, else 404."""
+    try:
+        async with asyncio.timeout(REQUEST_TIMEOUT_SECONDS):
+            request_line = await reader.readline()
+            # Headers are not needed; read up to the blank line ending them
+            while (await reader.readline()).strip():
+                pass
+        method, _, target = request_line.decode("latin-1").partition(" ")
+        path = target.split(" ", 1)[0].split("?", 1)[0]
+        if method == "GET" and path == METRICS_PATH:
+            status, body = "200 OK", render_metrics().encode()
+        else:
+            status, body = "404 Not Found", b"Not Found\n"
+        writer.write(
+            (
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {METRICS_CONTENT_TYPE}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode()
+            + body
+        )
+        await writer.drain()
+    except (TimeoutError, ConnectionError) as e:
+        logger.debug(f"Metrics scrape aborted: {e!r}")
+    finally:
+        writer.close()
+        with contextlib.suppress(ConnectionError):
+            await writer.wait_closed()
+
+
+async def serve_metrics(host: str, port: int) -> asyncio.Server:
+    """
+    Serve ``GET /metrics`` on a plain HTTP port.
+
+    Used by worker processes, which run no web framework.
+
+    Args:
+        host: Interface to bind
+        port: TCP port to bind (0 picks a free port)
+
+    Returns:
+        The listening server; close it on shutdown
+    """
+    server = await asyncio.start_server(_handle_scrape, host, port)
+    logger.info(f"Serving metrics on {host}:{port}{METRICS_PATH}")
+    return server
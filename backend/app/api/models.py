@@ -10,6 +10,7 @@ from __future__ import annotations
 from enum import StrEnum
 from typing import Annotated
 
+from models.smoothing_method import SmoothingMethod
 from pydantic import BaseModel, Field, field_validator
 
 
@@ -64,6 +65,20 @@ class ProcessParams(BaseModel):
         bool,
         Field(default=False, description="Whether to isolate subject from background"),
     ]
+    refine_mask: Annotated[
+        bool,
+        Field(
+            default=False,
+            description="Whether to refine the subject mask along image edges",
+        ),
+    ]
+    mask_cascade: Annotated[
+        bool,
+        Field(
+            default=False,
+            description="Whether to segment coarse-to-fine instead of in one pass",
+        ),
+    ]
     use_ml: Annotated[
         bool,
         Field(default=False, description="Whether to use ML-based line extraction"),
@@ -73,6 +88,22 @@ class ProcessParams(BaseModel):
         tuple[int, int],
         Field(default=(50, 150), description="Canny edge thresholds (low, high)"),
     ]
+    smoothing: Annotated[
+        SmoothingMethod,
+        Field(
+            default=SmoothingMethod.BILATERAL,
+            description="Edge-preserving smoother before Canny (faster alternatives "
+            "to bilateral: bilateral_downsampled, guided, domain_transform)",
+        ),
+    ]
+    auto_threshold: Annotated[
+        bool,
+        Field(
+            default=False,
+            description="Derive Canny thresholds from the image instead of "
+            "edge_threshold; the chosen values are reported in the job stats",
+        ),
+    ]
     line_threshold: Annotated[
         int, Field(default=16, description="Vectorization line threshold", ge=1, le=255)
     ]
@@ -125,10 +156,24 @@ class ProcessRequest(BaseModel):
         ProcessingMode,
         Field(default=ProcessingMode.AUTO, description="Processing mode"),
     ]
+    preset: Annotated[
+        str | None,
+        Field(
+            default=None,
+            description="Named preset (overrides mode); explicitly set params win",
+        ),
+    ]
     params: Annotated[
         ProcessParams | None,
         Field(default=None, description="Custom processing parameters"),
     ]
+    preview: Annotated[
+        bool,
+        Field(
+            default=False,
+            description="Stream a fast low-resolution preview before the full result",
+        ),
+    ]
 
 
 class ProcessResponse(BaseModel):
@@ -143,6 +188,37 @@ class ProcessResponse(BaseModel):
     ]
 
 
+class StageTiming(BaseModel):
+    """Timing and resource usage of one extension call within a job."""
+
+    model_config = {"frozen": True}
+
+    stage: Annotated[str, Field(description="Extension name")]
+    provider: Annotated[str, Field(description="Provider that handled the call")]
+    wall_seconds: Annotated[float, Field(description="Wall-clock time", ge=0)]
+    cpu_seconds: Annotated[
+        float, Field(description="CPU time of the worker thread", ge=0)
+    ]
+    process_peak_rss_bytes: Annotated[
+        int,
+        Field(
+            description=(
+                "Peak RSS of the whole process when the call finished; "
+                "includes concurrently running jobs"
+            ),
+            ge=0,
+        ),
+    ]
+    input: Annotated[
+        dict[str, int],
+        Field(default_factory=dict, description="Input sizes (pixels, bytes, paths)"),
+    ]
+    output: Annotated[
+        dict[str, int],
+        Field(default_factory=dict, description="Output sizes (pixels, bytes, paths)"),
+    ]
+
+
 class JobStats(BaseModel):
     """Statistics about processed SVG."""
 
@@ -158,6 +234,14 @@ class JobStats(BaseModel):
     height_mm: Annotated[
         float | None, Field(default=None, description="SVG height in mm")
     ]
+    edge_threshold: Annotated[
+        tuple[int, int] | None,
+        Field(default=None, description="Canny thresholds the job ran with"),
+    ]
+    stages: Annotated[
+        list[StageTiming] | None,
+        Field(default=None, description="Per-stage timing and resource usage"),
+    ]
 
 
 class JobStatusResponse(BaseModel):
@@ -170,6 +254,14 @@ class JobStatusResponse(BaseModel):
     progress: Annotated[
         int, Field(default=0, description="Progress percentage (0-100)", ge=0, le=100)
     ]
+    stage: Annotated[
+        str | None,
+        Field(default=None, description="Pipeline stage currently executing"),
+    ]
+    progress_updated_at: Annotated[
+        float | None,
+        Field(default=None, description="Unix time of the last progress update"),
+    ]
     result_url: Annotated[
         str | None, Field(default=None, description="URL to result SVG if complete")
     ]
@@ -185,6 +277,120 @@ class JobStatusResponse(BaseModel):
     ]
 
 
+class BatchItemError(BaseModel):
+    """A file or job rejected from a batch request."""
+
+    model_config = {"frozen": True}
+
+    item: Annotated[str, Field(description="Filename or job ID that was rejected")]
+    error: Annotated[str, Field(description="Reason for rejection")]
+
+
+class BatchUploadResponse(BaseModel):
+    """Response from batch upload."""
+
+    model_config = {"frozen": True}
+
+    jobs: Annotated[
+        list[UploadResponse], Field(description="Jobs created, in upload order")
+    ]
+    errors: Annotated[
+        list[BatchItemError],
+        Field(default_factory=list, description="Files that were not accepted"),
+    ]
+
+
+class BatchProcessRequest(BaseModel):
+    """Request to process several uploaded images with the same parameters."""
+
+    model_config = {"extra": "forbid"}
+
+    job_ids: Annotated[
+        list[str], Field(description="Job IDs from upload", min_length=1)
+    ]
+    mode: Annotated[
+        ProcessingMode,
+        Field(default=ProcessingMode.AUTO, description="Processing mode"),
+    ]
+    preset: Annotated[
+        str | None,
+        Field(
+            default=None,
+            description="Named preset (overrides mode); explicitly set params win",
+        ),
+    ]
+    params: Annotated[
+        ProcessParams | None,
+        Field(default=None, description="Custom processing parameters"),
+    ]
+    preview: Annotated[
+        bool,
+        Field(
+            default=False,
+            description="Stream a fast low-resolution preview before the full result",
+        ),
+    ]
+
+
+class BatchProcessResponse(BaseModel):
+    """Response from batch process initiation."""
+
+    model_config = {"frozen": True}
+
+    jobs: Annotated[
+        list[ProcessResponse], Field(description="Jobs that started processing")
+    ]
+    errors: Annotated[
+        list[BatchItemError],
+        Field(default_factory=list, description="Jobs that were not started"),
+    ]
+
+
+class BatchStatusRequest(BaseModel):
+    """Request for the status of several jobs."""
+
+    model_config = {"extra": "forbid"}
+
+    job_ids: Annotated[
+        list[str], Field(description="Job identifiers to look up", min_length=1)
+    ]
+
+
+class BatchStatusResponse(BaseModel):
+    """Response from bulk status query."""
+
+    model_config = {"extra": "forbid"}
+
+    jobs: Annotated[
+        list[JobStatusResponse], Field(description="Status of each job found")
+    ]
+    not_found: Annotated[
+        list[str],
+        Field(default_factory=list, description="Requested job IDs that do not exist"),
+    ]
+
+
+class StageMetricsResponse(BaseModel):
+    """Queue depth and throughput counters for one pipeline stage."""
+
+    model_config = {"frozen": True}
+
+    workers: Annotated[int, Field(description="Worker threads for the stage", ge=1)]
+    queue_capacity: Annotated[
+        int, Field(description="Maximum jobs waiting for the stage", ge=1)
+    ]
+    queue_depth: Annotated[int, Field(description="Jobs waiting for a worker", ge=0)]
+    active: Annotated[int, Field(description="Jobs currently executing", ge=0)]
+    completed: Annotated[int, Field(description="Jobs finished successfully", ge=0)]
+    failed: Annotated[int, Field(description="Jobs that failed in this stage", ge=0)]
+    wait_seconds_total: Annotated[
+        float, Field(description="Cumulative queue wait time in seconds", ge=0)
+    ]
+    run_seconds_total: Annotated[
+        float, Field(description="Cumulative execution time in seconds", ge=0)
+    ]
+
+
 class WebSocketMessage(BaseModel):
     """WebSocket progress message."""
 
@@ -193,8 +399,8 @@ class WebSocketMessage(BaseModel):
     type: Annotated[
         str,
         Field(
-            description="Message type: progress, complete, error",
-            pattern="^(progress|complete|error)$",
+            description="Message type: progress, preview, complete, error",
+            pattern="^(progress|preview|complete|error)$",
         ),
     ]
     job_id: Annotated[str, Field(description="Job identifier")]
@@ -208,3 +414,6 @@ class WebSocketMessage(BaseModel):
     result_url: Annotated[
         str | None, Field(default=None, description="Result URL if complete")
     ]
+    svg: Annotated[
+        str | None, Field(default=None, description="Inline SVG for preview messages")
+    ]
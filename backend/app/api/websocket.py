@@ -6,46 +6,185 @@ updates during image processing.
 """
 
 import asyncio
+import contextlib
 import json
 import logging
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any
 
 from fastapi import WebSocket, WebSocketDisconnect
 
+from api.events import EventBus, InMemoryEventBus
+
 logger = logging.getLogger(__name__)
 
+# Messages buffered per client before progress frames are dropped
+OUTBOUND_QUEUE_SIZE = 32
+
+# A client that cannot take one message within this time is evicted
+SEND_TIMEOUT_SECONDS = 5.0
+
+# Close code sent to evicted clients ("try again later")
+WS_CLOSE_TRY_AGAIN_LATER = 1013
+
+# Only progress frames are superseded by later ones and may be dropped
+DROPPABLE_MESSAGE_TYPES = frozenset({"progress"})
+
+
+class _ClientConnection:
+    """
+    Outbound queue and writer task for one WebSocket client.
+
+    Broadcasts only append to the queue, so a slow client delays nothing
+    but its own messages. When the queue is full the oldest progress frame
+    is dropped; if none can be dropped the client is evicted.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        job_id: str,
+        evict: Callable[["_ClientConnection", str], Awaitable[None]],
+    ):
+        self.websocket = websocket
+        self.job_id = job_id
+        self._evict = evict
+        self._pending: deque[tuple[str, bool]] = deque()
+        self._wakeup = asyncio.Event()
+        self._writer: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start the writer task on the running loop."""
+        self._writer = asyncio.create_task(
+            self._write_loop(), name=f"ws-writer-{self.job_id}"
+        )
+
+    def offer(self, message: str, droppable: bool) -> bool:
+        """
+        Queue a message without waiting for the client.
+
+        Args:
+            message: Encoded WebSocket message
+            droppable: Whether a later message supersedes this one
+
+        Returns:
+            False if the queue is full of messages that cannot be dropped
+        """
+        if len(self._pending) >= OUTBOUND_QUEUE_SIZE:
+            oldest_droppable = next(
+                (i for i, (_, drop) in enumerate(self._pending) if drop), None
+            )
+            if oldest_droppable is None:
+                return False
+            del self._pending[oldest_droppable]
+
+        self._pending.append((message, droppable))
+        self._wakeup.set()
+        return True
+
+    async def aclose(self) -> None:
+        """Stop the writer task, discarding unsent messages."""
+        self._pending.clear()
+        writer = self._writer
+        if writer is None or writer is asyncio.current_task():
+            return
+        writer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await writer
+
+    async def _write_loop(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._pending:
+                message, _ = self._pending.popleft()
+                try:
+                    await asyncio.wait_for(
+                        self.websocket.send_text(message), SEND_TIMEOUT_SECONDS
+                    )
+                except Exception as e:
+                    await self._evict(self, f"send failed: {e!r}")
+                    return
+
 
 class ConnectionManager:
     """
     Manages WebSocket connections for real-time progress updates.
 
     Allows multiple clients to subscribe to progress updates for specific jobs.
-    Supports broadcasting progress to all connected clients for a job.
+    Broadcasts go through an EventBus so that, with the Redis bus, every API
+    replica forwards them to the clients connected to it.
     """
 
-    def __init__(self):
-        """Initialize connection manager with empty connection registry."""
-        # Map job_id -> list of WebSocket connections
-        self.active_connections: dict[str, list[WebSocket]] = {}
+    def __init__(self, bus: EventBus | None = None):
+        """
+        Initialize connection manager with empty connection registry.
+
+        Args:
+            bus: Event transport; defaults to single-process in-memory delivery
+        """
+        # Map job_id -> WebSocket -> its outbound queue and writer
+        self.active_connections: dict[str, dict[WebSocket, _ClientConnection]] = {}
+        # Guards the registry only; never held while sending
         self._lock = asyncio.Lock()
+        self._bus: EventBus = bus or InMemoryEventBus()
+        self._bus_started = False
+
+    async def start(self, bus: EventBus | None = None) -> None:
+        """
+        Subscribe to job events, optionally switching to another bus.
+
+        Args:
+            bus: Event transport to use from now on
+        """
+        if bus is not None:
+            await self.stop()
+            self._bus = bus
+
+        if not self._bus_started:
+            await self._bus.start(self._deliver)
+            self._bus_started = True
 
-    async def connect(self, websocket: WebSocket, job_id: str) -> None:
+    async def stop(self) -> None:
+        """Unsubscribe from job events and stop all client writers."""
+        if self._bus_started:
+            await self._bus.stop()
+            self._bus_started = False
+
+        async with self._lock:
+            connections = [
+                connection
+                for clients in self.active_connections.values()
+                for connection in clients.values()
+            ]
+            self.active_connections.clear()
+        await asyncio.gather(*(connection.aclose() for connection in connections))
+
+    async def connect(self, websocket: WebSocket, job_id: str) -> _ClientConnection:
         """
         Accept WebSocket connection and register for job updates.
 
         Args:
             websocket: WebSocket connection to accept
             job_id: Job ID to subscribe to
+
+        Returns:
+            The client's outbound connection
         """
         await websocket.accept()
 
+        connection = _ClientConnection(websocket, job_id, self._evict)
         async with self._lock:
             if job_id not in self.active_connections:
-                self.active_connections[job_id] = []
-            self.active_connections[job_id].append(websocket)
+                self.active_connections[job_id] = {}
+            self.active_connections[job_id][websocket] = connection
+        connection.start()
 
         logger.info(
             f"WebSocket connected for job {job_id}. Total: {len(self.active_connections[job_id])}"
         )
+        return connection
 
     async def disconnect(self, websocket: WebSocket, job_id: str) -> None:
         """
@@ -55,14 +194,9 @@ class ConnectionManager:
             websocket: WebSocket connection to remove
             job_id: Job ID to unsubscribe from
         """
-        async with self._lock:
-            if job_id in self.active_connections:
-                if websocket in self.active_connections[job_id]:
-                    self.active_connections[job_id].remove(websocket)
-
-                # Clean up empty job lists
-                if not self.active_connections[job_id]:
-                    del self.active_connections[job_id]
+        connection = await self._unregister(job_id, websocket)
+        if connection is not None:
+            await connection.aclose()
 
         logger.info(f"WebSocket disconnected for job {job_id}")
 
@@ -94,28 +228,35 @@ class ConnectionManager:
         if message:
             data["message"] = message
 
-        message_json = json.dumps(data)
+        await self._publish(job_id, data)
 
-        async with self._lock:
-            if job_id not in self.active_connections:
-                return
+    async def broadcast_preview(
+        self,
+        job_id: str,
+        svg: str,
+        stats: dict | None = None,
+    ) -> None:
+        """
+        Broadcast a low-resolution preview result to all clients.
 
-            # Send to all connections for this job
-            disconnected = []
-            for connection in self.active_connections[job_id]:
-                try:
-                    await connection.send_text(message_json)
-                except Exception as e:
-                    logger.warning(f"Failed to send to WebSocket: {e}")
-                    disconnected.append(connection)
+        Sent before the full-quality result so clients can show something
+        while the job is still queued or processing.
 
-            # Clean up failed connections
-            for connection in disconnected:
-                if connection in self.active_connections[job_id]:
-                    self.active_connections[job_id].remove(connection)
+        Args:
+            job_id: Job ID to broadcast to
+            svg: Preview SVG content
+            stats: Optional preview statistics
+        """
+        data: dict[str, Any] = {
+            "type": "preview",
+            "job_id": job_id,
+            "svg": svg,
+        }
 
-            if not self.active_connections[job_id]:
-                del self.active_connections[job_id]
+        if stats:
+            data["stats"] = stats
+
+        await self._publish(job_id, data)
 
     async def broadcast_complete(
         self,
@@ -141,17 +282,7 @@ class ConnectionManager:
         if stats:
             data["stats"] = stats
 
-        message_json = json.dumps(data)
-
-        async with self._lock:
-            if job_id not in self.active_connections:
-                return
-
-            for connection in list(self.active_connections[job_id]):
-                try:
-                    await connection.send_text(message_json)
-                except Exception as e:
-                    logger.warning(f"Failed to send completion: {e}")
+        await self._publish(job_id, data)
 
     async def broadcast_error(
         self,
@@ -171,17 +302,91 @@ class ConnectionManager:
             "error": error,
         }
 
-        message_json = json.dumps(data)
+        await self._publish(job_id, data)
+
+    async def reply(self, connection: _ClientConnection, message: str) -> bool:
+        """
+        Queue a control message for one client behind its pending events.
+
+        Args:
+            connection: Client to reply to
+            message: Encoded WebSocket message
+
+        Returns:
+            False if the client was evicted because its queue is full
+        """
+        if connection.offer(message, droppable=False):
+            return True
+        await self._evict(connection, "outbound queue full")
+        return False
+
+    async def _publish(self, job_id: str, data: dict) -> None:
+        """Encode a message and hand it to the event bus."""
+        if not self._bus_started:
+            await self.start()
+        await self._bus.publish(job_id, json.dumps(data))
+
+    async def _deliver(self, job_id: str, message_json: str) -> None:
+        """
+        Queue an event from the bus for this process's clients of the job.
+
+        Only the registry lookup happens under the lock; each client's
+        writer task sends concurrently with all others.
 
+        Args:
+            job_id: Job ID the event belongs to
+            message_json: Encoded WebSocket message
+        """
         async with self._lock:
-            if job_id not in self.active_connections:
-                return
+            connections = list(self.active_connections.get(job_id, {}).values())
+        if not connections:
+            return
+
+        droppable = json.loads(message_json).get("type") in DROPPABLE_MESSAGE_TYPES
+        overflowing = [
+            connection
+            for connection in connections
+            if not connection.offer(message_json, droppable)
+        ]
+        await asyncio.gather(
+            *(
+                self._evict(connection, "outbound queue full")
+                for connection in overflowing
+            )
+        )
 
-            for connection in list(self.active_connections[job_id]):
-                try:
-                    await connection.send_text(message_json)
-                except Exception as e:
-                    logger.warning(f"Failed to send error: {e}")
+    async def _unregister(
+        self, job_id: str, websocket: WebSocket
+    ) -> _ClientConnection | None:
+        """Remove a client from the registry, returning its connection."""
+        async with self._lock:
+            clients = self.active_connections.get(job_id)
+            if clients is None:
+                return None
+            connection = clients.pop(websocket, None)
+
+            # Clean up empty job lists
+            if not clients:
+                del self.active_connections[job_id]
+            return connection
+
+    async def _evict(self, connection: _ClientConnection, reason: str) -> None:
+        """
+        Drop a client that cannot keep up and close its socket.
+
+        Args:
+            connection: Client to evict
+            reason: Why the client is evicted, for the log
+        """
+        if await self._unregister(connection.job_id, connection.websocket) is None:
+            return
+
+        logger.warning(
+            f"Evicting slow WebSocket client for job {connection.job_id}: {reason}"
+        )
+        await connection.aclose()
+        with contextlib.suppress(Exception):
+            await connection.websocket.close(code=WS_CLOSE_TRY_AGAIN_LATER)
 
 
 # Global connection manager instance
@@ -197,13 +402,14 @@ async def websocket_endpoint(websocket: WebSocket, job_id: str) -> None:
 
     Message format:
     {
-        "type": "progress" | "complete" | "error",
+        "type": "progress" | "preview" | "complete" | "error",
         "job_id": str,
         "progress": int,  // 0-100
         "stage": str,     // optional: current processing stage
         "message": str,   // optional: status message
+        "svg": str,         // only for "preview" type
         "result_url": str,  // only for "complete" type
-        "stats": {...},     // only for "complete" type
+        "stats": {...},     // for "preview" and "complete" types
         "error": str,     // only for "error" type
     }
 
@@ -211,7 +417,7 @@ async def websocket_endpoint(websocket: WebSocket, job_id: str) -> None:
         websocket: WebSocket connection
         job_id: Job ID to subscribe to
     """
-    await ws_manager.connect(websocket, job_id)
+    connection = await ws_manager.connect(websocket, job_id)
 
     try:
         # Keep connection alive and handle ping/pong
@@ -220,16 +426,16 @@ async def websocket_endpoint(websocket: WebSocket, job_id: str) -> None:
             try:
                 data = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
 
-                # Handle ping
-                if data == "ping":
-                    await websocket.send_text("pong")
+                # Handle ping; replies go through the writer so they never
+                # race a broadcast on the socket
+                if data == "ping" and not await ws_manager.reply(connection, "pong"):
+                    break
 
             except TimeoutError:
                 # Send keepalive ping from server
-                try:
-                    await websocket.send_text(json.dumps({"type": "keepalive"}))
-                except Exception:
-                    # Connection dead
+                keepalive = json.dumps({"type": "keepalive"})
+                if not await ws_manager.reply(connection, keepalive):
+                    # Connection evicted
                     break
 
     except WebSocketDisconnect:
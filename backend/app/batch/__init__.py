@@ -0,0 +1,32 @@
+"""
+Offline batch conversion of image directories.
+
+Run from ``backend/app`` with ``python -m batch``; see
+``docs/batch.md`` for options and the report format.
+"""
+
+from batch.runner import (
+    OUTPUT_SUFFIXES,
+    BatchReport,
+    BatchTask,
+    ImageRecord,
+    discover_inputs,
+    is_up_to_date,
+    params_digest,
+    plan_tasks,
+    previous_params_digest,
+    run_batch,
+)
+
+__all__ = [
+    "OUTPUT_SUFFIXES",
+    "BatchReport",
+    "BatchTask",
+    "ImageRecord",
+    "discover_inputs",
+    "is_up_to_date",
+    "params_digest",
+    "plan_tasks",
+    "previous_params_digest",
+    "run_batch",
+]
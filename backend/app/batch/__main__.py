@@ -0,0 +1,203 @@
+"""
+Command-line entry point for offline batch conversion.
+
+Usage (from backend/app):
+    python -m batch ../catalog --output-dir ../out --preset portrait
+    python -m batch "../catalog/**/*.jpg" --output-dir ../out \
+        --params params.json --format svg --format gcode --workers 8
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+from api.models import ProcessParams
+from config import settings
+from pipeline.presets import load_presets, preset_params
+from pipeline.processor import ProcessingParams
+from pydantic import ValidationError
+from utils.mask_cache import open_mask_cache
+
+from batch.runner import (
+    OUTPUT_SUFFIXES,
+    discover_inputs,
+    params_digest,
+    plan_tasks,
+    previous_params_digest,
+    run_batch,
+)
+
+logger = logging.getLogger("batch")
+
+DEFAULT_CANVAS_WIDTH_MM = 300.0
+DEFAULT_CANVAS_HEIGHT_MM = 200.0
+DEFAULT_LINE_WIDTH_MM = 0.3
+REPORT_FILENAME = "report.json"
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m batch",
+        description="Convert a directory of photos to plotter files.",
+    )
+    parser.add_argument("source", help="Input directory or glob pattern")
+    parser.add_argument(
+        "--output-dir", type=Path, required=True, help="Directory for outputs"
+    )
+    params_group = parser.add_mutually_exclusive_group(required=True)
+    params_group.add_argument(
+        "--preset",
+        help="Preset name (built-in or from PRESETS_FILE)",
+    )
+    params_group.add_argument(
+        "--params", type=Path, help="JSON file with processing parameters"
+    )
+    parser.add_argument(
+        "--canvas-width",
+        type=float,
+        default=DEFAULT_CANVAS_WIDTH_MM,
+        help="Canvas width in mm for --preset (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--canvas-height",
+        type=float,
+        default=DEFAULT_CANVAS_HEIGHT_MM,
+        help="Canvas height in mm for --preset (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--line-width",
+        type=float,
+        default=DEFAULT_LINE_WIDTH_MM,
+        help="Line width in mm for --preset (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--format",
+        action="append",
+        dest="formats",
+        choices=sorted(OUTPUT_SUFFIXES),
+        help="Output format (repeatable; default: svg)",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--recursive", action="store_true", help="Descend into subdirectories"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reprocess images whose outputs are already up to date",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        help=f"JSON stats report path (default: OUTPUT_DIR/{REPORT_FILENAME})",
+    )
+    return parser.parse_args(argv)
+
+
+def load_params(path: Path) -> ProcessingParams:
+    """
+    Read processing parameters from a JSON file.
+
+    The file uses the same fields as the ``params`` object of /api/process.
+
+    Raises:
+        ValueError: If the file is not valid JSON or a parameter is invalid
+    """
+    try:
+        validated = ProcessParams.model_validate(json.loads(path.read_text()))
+    except (json.JSONDecodeError, ValidationError) as e:
+        msg = f"Invalid params file {path}: {e}"
+        raise ValueError(msg) from e
+    return ProcessingParams(**validated.model_dump())
+
+
+def resolve_params(
+    args: argparse.Namespace, presets: dict[str, dict]
+) -> tuple[ProcessingParams, float]:
+    """
+    Build processing parameters from ``--preset`` or ``--params``.
+
+    Returns:
+        Tuple of (parameters, modification time of the params file or, for
+        a preset, of PRESETS_FILE; 0.0 for a built-in preset)
+
+    Raises:
+        OSError: If the params file cannot be read
+        ValueError: If the parameters or the preset are invalid
+    """
+    if args.params:
+        return load_params(args.params), args.params.stat().st_mtime
+    params = preset_params(
+        args.preset,
+        canvas_width_mm=args.canvas_width,
+        canvas_height_mm=args.canvas_height,
+        line_width_mm=args.line_width,
+        presets=presets,
+    )
+    presets_file = settings.presets_file
+    return params, presets_file.stat().st_mtime if presets_file else 0.0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Convert every image found under the source.
+
+    Returns:
+        Exit code: 0 on success, 1 if any image failed, 2 on bad input
+    """
+    args = parse_args(argv)
+    # Provider logging would drown out the per-image progress lines
+    logging.basicConfig(level=logging.WARNING, format="%(message)s", force=True)
+    logging.getLogger("batch").setLevel(logging.INFO)
+
+    try:
+        presets = load_presets(settings.presets_file)
+        params, newer_than = resolve_params(args, presets)
+    except (OSError, TypeError, ValueError) as e:
+        logger.error(str(e))
+        return 2
+
+    images, root = discover_inputs(args.source, recursive=args.recursive)
+    if not images:
+        logger.error(f"No images found in {args.source}")
+        return 2
+
+    report_path = args.report or args.output_dir / REPORT_FILENAME
+    resume = not args.force
+    # Output mtimes cannot show a change of --canvas-*/--line-width or of a
+    # preset, so compare the resolved parameters with the last run's
+    previous = previous_params_digest(report_path)
+    if resume and previous not in (None, params_digest(params)):
+        logger.info(f"Parameters changed since {report_path}; reprocessing all")
+        resume = False
+
+    tasks = plan_tasks(images, root, args.output_dir, args.formats or ["svg"])
+    report = run_batch(
+        tasks,
+        params,
+        workers=args.workers,
+        u2net_model_path=settings.u2net_model_path
+        if settings.u2net_model_path.exists()
+        else None,
+        presets=presets,
+        mask_cache=open_mask_cache(settings.mask_cache_dir, settings.mask_cache_max_mb),
+        resume=resume,
+        newer_than=newer_than,
+    )
+
+    report.save(report_path)
+    summary = report.to_dict()["summary"]
+    logger.info(
+        f"Report written to {report_path}: "
+        + ", ".join(f"{count} {status}" for status, count in sorted(summary.items()))
+    )
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,375 @@
+"""
+Offline batch processing across a process pool.
+
+Each worker process builds one ``PhotoToLineProcessor`` (and with it the
+extension registry and any models) in its initializer and reuses it for
+every image it is handed, so model loading is paid once per worker rather
+than once per image.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pipeline.preprocess import ImagePreprocessor
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from pipeline.export import PlotterExporter
+    from pipeline.processor import PhotoToLineProcessor, ProcessingParams
+    from utils.mask_cache import MaskCache
+
+logger = logging.getLogger(__name__)
+
+REPORT_VERSION = 1
+
+# Output file suffix for each supported export format
+OUTPUT_SUFFIXES: dict[str, str] = {
+    "svg": ".svg",
+    "gcode": ".gcode",
+    "hpgl": ".hpgl",
+}
+
+GLOB_CHARS = "*?["
+
+# Per-process state, set by _init_worker
+_processor: PhotoToLineProcessor | None = None
+_exporter: PlotterExporter | None = None
+
+
+@dataclass(frozen=True)
+class BatchTask:
+    """One input image and the files it should produce."""
+
+    input_path: Path
+    outputs: dict[str, Path]
+
+
+@dataclass
+class ImageRecord:
+    """Outcome of one image in a batch run."""
+
+    input: str
+    status: str
+    outputs: dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+    device: str | None = None
+    stats: dict[str, Any] | None = None
+    error: str | None = None
+
+
+@dataclass
+class BatchReport:
+    """A full batch run."""
+
+    metadata: dict[str, Any]
+    images: list[ImageRecord]
+
+    @property
+    def failed(self) -> list[ImageRecord]:
+        """Images that could not be processed."""
+        return [record for record in self.images if record.status == "failed"]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize to a JSON-compatible dictionary."""
+        counts: dict[str, int] = {}
+        for record in self.images:
+            counts[record.status] = counts.get(record.status, 0) + 1
+        return {
+            "version": REPORT_VERSION,
+            "metadata": self.metadata,
+            "summary": counts,
+            "images": [asdict(record) for record in self.images],
+        }
+
+    def save(self, path: Path) -> None:
+        """Write the report as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2) + "\n")
+
+
+def discover_inputs(source: str, recursive: bool = False) -> tuple[list[Path], Path]:
+    """
+    Find the images to process.
+
+    Args:
+        source: Directory or glob pattern (e.g. ``"photos/**/*.jpg"``)
+        recursive: Descend into subdirectories when ``source`` is a directory
+
+    Returns:
+        Tuple of (sorted image paths, root the output layout is relative to)
+    """
+    parts = Path(source).parts
+    glob_at = next(
+        (i for i, part in enumerate(parts) if any(c in part for c in GLOB_CHARS)),
+        None,
+    )
+    if glob_at is None:
+        root = Path(source)
+        candidates = root.rglob("*") if recursive else root.glob("*")
+    else:
+        root = Path(*parts[:glob_at]) if glob_at else Path()
+        candidates = root.glob(str(Path(*parts[glob_at:])))
+
+    images = sorted(
+        path
+        for path in candidates
+        if path.is_file()
+        and path.suffix.lower() in ImagePreprocessor.SUPPORTED_FORMATS
+        and not path.name.startswith(".")
+    )
+    return images, root
+
+
+def plan_tasks(
+    images: Iterable[Path],
+    root: Path,
+    output_dir: Path,
+    formats: Iterable[str],
+) -> list[BatchTask]:
+    """
+    Map each image to its output files, mirroring the input layout.
+
+    Args:
+        images: Input image paths
+        root: Directory the images are taken relative to
+        output_dir: Directory receiving the outputs
+        formats: Export formats from ``OUTPUT_SUFFIXES``
+
+    Returns:
+        One BatchTask per image
+    """
+    formats = list(formats)
+    tasks = []
+    for image in images:
+        stem = output_dir / image.relative_to(root).with_suffix("")
+        tasks.append(
+            BatchTask(
+                input_path=image,
+                outputs={
+                    fmt: stem.with_name(stem.name + OUTPUT_SUFFIXES[fmt])
+                    for fmt in formats
+                },
+            )
+        )
+    return tasks
+
+
+def is_up_to_date(task: BatchTask, newer_than: float = 0.0) -> bool:
+    """
+    Check whether every output of a task exists and is newer than its inputs.
+
+    Args:
+        task: Task to check
+        newer_than: Modification time of other inputs (e.g. the params file)
+
+    Returns:
+        True if the task can be skipped
+    """
+    source_mtime = max(task.input_path.stat().st_mtime, newer_than)
+    return all(
+        path.exists() and path.stat().st_mtime >= source_mtime
+        for path in task.outputs.values()
+    )
+
+
+def params_digest(params: ProcessingParams) -> str:
+    """
+    Digest of the resolved processing parameters.
+
+    Stored in the report so a later run can tell whether outputs were made
+    with different parameters, however those parameters were specified.
+    """
+    encoded = json.dumps(asdict(params), sort_keys=True).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def previous_params_digest(report_path: Path) -> str | None:
+    """
+    Read the parameter digest recorded by an earlier run.
+
+    Args:
+        report_path: Report written by the earlier run
+
+    Returns:
+        The digest, or None if there is no readable report or it predates
+        digests
+    """
+    try:
+        report = json.loads(report_path.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(report, dict):
+        return None
+    digest = report.get("metadata", {}).get("params_digest")
+    return digest if isinstance(digest, str) else None
+
+
+def _init_worker(
+    u2net_model_path: Path | None,
+    presets: dict[str, dict[str, Any]] | None,
+    workers: int,
+    mask_cache: MaskCache | None,
+) -> None:
+    """
+    Load the processor and compile its plans once per worker process.
+
+    Each worker's torch and OpenCV thread pools get 1/``workers`` of the
+    CPUs, so the pool does not start ``workers`` x CPUs threads.
+    """
+    global _processor, _exporter
+    from pipeline.export import PlotterExporter
+    from pipeline.processor import PhotoToLineProcessor
+
+    _processor = PhotoToLineProcessor(
+        u2net_model_path=u2net_model_path,
+        presets=presets,
+        thread_concurrency=workers,
+        mask_cache=mask_cache,
+    )
+    _exporter = PlotterExporter()
+
+
+def _process_task(task: BatchTask, params: ProcessingParams) -> ImageRecord:
+    """
+    Run the pipeline on one image inside a worker process.
+
+    Raises:
+        RuntimeError: If the process was not initialized by ``_init_worker``
+    """
+    if _processor is None or _exporter is None:
+        msg = "Batch worker is not initialized; run tasks through run_batch"
+        raise RuntimeError(msg)
+
+    start = time.perf_counter()
+    try:
+        result = _processor.process(task.input_path, params)
+        for fmt, path in task.outputs.items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write next to the target and rename so an interrupted run
+            # never leaves a truncated file that looks up to date
+            partial = path.with_name(f".{path.stem}.partial{path.suffix}")
+            if fmt == "svg":
+                partial.write_text(result.svg_content)
+            else:
+                _exporter.export_to_format(
+                    result.svg_content, partial, export_format=fmt
+                )
+            partial.replace(path)
+    except Exception as e:
+        return ImageRecord(
+            input=str(task.input_path),
+            status="failed",
+            seconds=time.perf_counter() - start,
+            error=f"{type(e).__name__}: {e}",
+        )
+
+    return ImageRecord(
+        input=str(task.input_path),
+        status="completed",
+        outputs={fmt: str(path) for fmt, path in task.outputs.items()},
+        seconds=time.perf_counter() - start,
+        device=result.device_used,
+        stats=dict(result.stats),
+    )
+
+
+def run_batch(
+    tasks: list[BatchTask],
+    params: ProcessingParams,
+    *,
+    workers: int | None = None,
+    u2net_model_path: Path | None = None,
+    presets: dict[str, dict[str, Any]] | None = None,
+    mask_cache: MaskCache | None = None,
+    resume: bool = True,
+    newer_than: float = 0.0,
+) -> BatchReport:
+    """
+    Process tasks across a pool of worker processes.
+
+    Args:
+        tasks: Images and their output files
+        params: Processing parameters shared by every image
+        workers: Worker processes (default: CPU count)
+        u2net_model_path: Optional path to U²-Net weights
+        presets: Preset table for the workers' processors
+        mask_cache: Persisted U²-Net masks shared by the workers
+        resume: Skip tasks whose outputs are already up to date
+        newer_than: Modification time of other inputs, for ``resume``
+
+    Returns:
+        BatchReport with one record per task, in task order
+    """
+    workers = workers or os.cpu_count() or 1
+    records: list[ImageRecord | None] = [None] * len(tasks)
+    pending: list[int] = []
+    for index, task in enumerate(tasks):
+        if resume and is_up_to_date(task, newer_than):
+            records[index] = ImageRecord(
+                input=str(task.input_path),
+                status="skipped",
+                outputs={fmt: str(path) for fmt, path in task.outputs.items()},
+            )
+        else:
+            pending.append(index)
+
+    logger.info(
+        f"Processing {len(pending)} image(s) with {workers} worker(s), "
+        f"{len(tasks) - len(pending)} already up to date"
+    )
+
+    start = time.perf_counter()
+    if pending:
+        pool_size = min(workers, len(pending))
+        # spawn: forking a parent that has imported torch/OpenCV thread pools
+        # can deadlock the children
+        with ProcessPoolExecutor(
+            max_workers=pool_size,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(u2net_model_path, presets, pool_size, mask_cache),
+        ) as executor:
+            futures = {
+                executor.submit(_process_task, tasks[index], params): index
+                for index in pending
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                task = tasks[futures[future]]
+                try:
+                    record = future.result()
+                except Exception as e:
+                    # The worker itself died (e.g. out of memory)
+                    record = ImageRecord(
+                        input=str(task.input_path),
+                        status="failed",
+                        error=f"{type(e).__name__}: {e}",
+                    )
+                records[futures[future]] = record
+                logger.info(
+                    f"[{done}/{len(pending)}] {record.status} {task.input_path} "
+                    f"({record.seconds:.1f}s)"
+                    + (f": {record.error}" if record.error else "")
+                )
+
+    return BatchReport(
+        metadata={
+            "timestamp": datetime.now(UTC).isoformat(),
+            "workers": workers,
+            "wall_seconds": round(time.perf_counter() - start, 3),
+            "params": asdict(params),
+            "params_digest": params_digest(params),
+        },
+        images=[record for record in records if record is not None],
+    )
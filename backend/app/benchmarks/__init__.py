@@ -0,0 +1,33 @@
+"""
+Performance benchmarks for pipeline providers and the full processor.
+
+Run from ``backend/app`` with ``python -m benchmarks``; see
+``docs/benchmarks.md`` for options and baseline comparison.
+"""
+
+from benchmarks.cases import CASES, BenchmarkCase, BenchmarkInput, select_cases
+from benchmarks.runner import (
+    BenchmarkReport,
+    CaseResult,
+    Regression,
+    compare,
+    measure,
+    run_benchmarks,
+)
+from benchmarks.synthetic import CONTENT_TYPES, DEFAULT_SIZES, generate_image
+
+__all__ = [
+    "CASES",
+    "CONTENT_TYPES",
+    "DEFAULT_SIZES",
+    "BenchmarkCase",
+    "BenchmarkInput",
+    "BenchmarkReport",
+    "CaseResult",
+    "Regression",
+    "compare",
+    "generate_image",
+    "measure",
+    "run_benchmarks",
+    "select_cases",
+]
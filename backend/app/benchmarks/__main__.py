@@ -0,0 +1,115 @@
+"""
+Command-line entry point for the benchmark suite.
+
+Usage (from backend/app):
+    python -m benchmarks --output results.json
+    python -m benchmarks --case "vectorize.*" --size 512 --baseline baseline.json
+"""
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Benchmarks are CPU-only so runs are comparable across machines
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+
+from benchmarks.cases import select_cases
+from benchmarks.runner import (
+    DEFAULT_REGRESSION_THRESHOLD,
+    BenchmarkReport,
+    compare,
+    run_benchmarks,
+)
+from benchmarks.synthetic import CONTENT_TYPES, DEFAULT_SIZES
+
+logger = logging.getLogger("benchmarks")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark pipeline providers on synthetic images.",
+    )
+    parser.add_argument(
+        "--case",
+        action="append",
+        dest="cases",
+        help="Case name pattern, e.g. 'vectorize.*' (repeatable; default: all)",
+    )
+    parser.add_argument(
+        "--content",
+        action="append",
+        dest="contents",
+        choices=CONTENT_TYPES,
+        help="Synthetic content type (repeatable; default: all)",
+    )
+    parser.add_argument(
+        "--size",
+        action="append",
+        dest="sizes",
+        type=int,
+        help=f"Longer image edge in pixels (repeatable; default: {DEFAULT_SIZES})",
+    )
+    parser.add_argument("--iterations", type=int, default=5, help="Timed runs per case")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs per case")
+    parser.add_argument("--seed", type=int, default=0, help="Image generation seed")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument(
+        "--baseline", type=Path, help="Baseline report to compare against"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD,
+        help="Allowed relative slowdown before failing (default: %(default)s)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the benchmarks and optionally compare with a baseline.
+
+    Returns:
+        Exit code: 0 on success, 1 if any metric regressed
+    """
+    args = parse_args(argv)
+    # Provider logging would drown out the per-case summary lines
+    logging.basicConfig(level=logging.WARNING, format="%(message)s", force=True)
+    logging.getLogger("benchmarks").setLevel(logging.INFO)
+
+    report = run_benchmarks(
+        select_cases(args.cases),
+        contents=args.contents or CONTENT_TYPES,
+        sizes=args.sizes or DEFAULT_SIZES,
+        iterations=args.iterations,
+        warmup=args.warmup,
+        seed=args.seed,
+    )
+
+    if args.output:
+        report.save(args.output)
+        logger.info(f"Report written to {args.output}")
+
+    if not args.baseline:
+        return 0
+
+    regressions = compare(report, BenchmarkReport.load(args.baseline), args.threshold)
+    for regression in regressions:
+        logger.error(
+            f"REGRESSION {regression.key} {regression.metric}: "
+            f"{regression.baseline:.1f} -> {regression.current:.1f} "
+            f"(x{regression.ratio:.2f})"
+        )
+    if regressions:
+        return 1
+
+    logger.info(f"No regressions beyond {args.threshold:.0%} of baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+"""
+Benchmark case definitions.
+
+Each case times one provider (or the full processor) on a prepared
+BenchmarkInput. Inputs for later stages are derived from earlier ones
+outside the timed region so every case measures only its own work.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import cv2
+from extensions.export.PRV_Vpype import PRV_Vpype as ExportVpype
+from extensions.line_extraction.PRV_BilateralCanny import PRV_BilateralCanny
+from extensions.optimize.PRV_Vpype import PRV_Vpype as OptimizeVpype
+from extensions.vectorize.PRV_ImageTracer import PRV_ImageTracer
+from extensions.vectorize.PRV_Potrace import PRV_Potrace
+from models.smoothing_method import SmoothingMethod
+from models.u2net import U2NetPredictor
+from PIL import Image
+from pipeline.hatching import HatchGenerator
+from pipeline.processor import PhotoToLineProcessor, ProcessingParams
+
+from benchmarks.quality import edge_f_score, mask_iou
+from benchmarks.synthetic import edges_to_svg, generate_image
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    import numpy as np
+    from numpy.typing import NDArray
+
+CANVAS_WIDTH_MM = 300.0
+CANVAS_HEIGHT_MM = 200.0
+LINE_WIDTH_MM = 0.3
+U2NET_MODEL_PATH = Path("models/u2net/u2net.pth")
+
+
+@dataclass(frozen=True)
+class BenchmarkInput:
+    """
+    Prepared inputs for one content type and size.
+
+    Attributes:
+        content: Synthetic content type
+        size: Longer image edge in pixels
+        image: RGB image
+        gray: Grayscale version of ``image``
+        edges: Bilateral Canny edge map of ``image`` (255 = line), the
+            reference for the smoothing variants
+        svg: SVG traced from ``edges``
+        image_path: ``image`` saved as PNG for file-based stages
+        work_dir: Scratch directory for case outputs
+    """
+
+    content: str
+    size: int
+    image: NDArray[np.uint8]
+    gray: NDArray[np.uint8]
+    edges: NDArray[np.uint8]
+    svg: str
+    image_path: Path
+    work_dir: Path
+
+    @property
+    def pixels(self) -> int:
+        """Number of pixels in the input image."""
+        return int(self.image.shape[0] * self.image.shape[1])
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """
+    A single timed operation.
+
+    Attributes:
+        name: Case identifier, ``<stage>.<provider>[.<variant>]``
+        is_available: Whether the case can run in this environment
+        run: Operation to time
+        quality: Optional scorer comparing the output of ``run`` with a
+            reference, returning named scores
+    """
+
+    name: str
+    is_available: Callable[[], bool]
+    run: Callable[[BenchmarkInput], Any]
+    quality: Callable[[BenchmarkInput, Any], dict[str, float]] | None = None
+
+
+def build_input(
+    content: str, size: int, work_dir: Path, seed: int = 0
+) -> BenchmarkInput:
+    """
+    Generate a synthetic image and derive inputs for every stage.
+
+    Args:
+        content: Synthetic content type
+        size: Longer image edge in pixels
+        work_dir: Existing scratch directory
+        seed: Random seed for image generation
+
+    Returns:
+        Prepared benchmark input
+    """
+    image = generate_image(content, size, seed)
+    edges = PRV_BilateralCanny.execute(image)
+    image_path = work_dir / f"{content}_{size}.png"
+    Image.fromarray(image).save(image_path)
+    gray: NDArray[np.uint8] = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)  # type: ignore[assignment]
+
+    return BenchmarkInput(
+        content=content,
+        size=size,
+        image=image,
+        gray=gray,
+        edges=edges,
+        svg=edges_to_svg(edges),
+        image_path=image_path,
+        work_dir=work_dir,
+    )
+
+
+@cache
+def _processor() -> PhotoToLineProcessor:
+    return PhotoToLineProcessor(u2net_model_path=None)
+
+
+@cache
+def _u2net() -> U2NetPredictor:
+    return U2NetPredictor(U2NET_MODEL_PATH)
+
+
+def _mask_quality(data: BenchmarkInput, mask: NDArray[np.uint8]) -> dict[str, float]:
+    """Score a mask against the single-pass prediction."""
+    return mask_iou(mask, _u2net().predict(data.image))
+
+
+def _lines_on_white(edges: NDArray[np.uint8]) -> NDArray[np.uint8]:
+    """Invert an edge map into the black-on-white input the vectorizers take."""
+    inverted: NDArray[np.uint8] = cv2.bitwise_not(edges)  # type: ignore[assignment]
+    return inverted
+
+
+def _has_vectorizer() -> bool:
+    return PRV_ImageTracer.is_available() or PRV_Potrace.is_available()
+
+
+def _run_pipeline(data: BenchmarkInput) -> Any:
+    params = ProcessingParams(
+        canvas_width_mm=CANVAS_WIDTH_MM,
+        canvas_height_mm=CANVAS_HEIGHT_MM,
+        line_width_mm=LINE_WIDTH_MM,
+    )
+    return _processor().process(data.image_path, params)
+
+
+def _run_hatching(data: BenchmarkInput) -> Any:
+    generator = HatchGenerator(line_width_mm=LINE_WIDTH_MM)
+    return generator.add_hatching_to_edges(
+        data.edges, data.gray, CANVAS_WIDTH_MM, CANVAS_HEIGHT_MM
+    )
+
+
+def _smoothing(method: SmoothingMethod) -> BenchmarkCase:
+    return BenchmarkCase(
+        f"line_extraction.bilateral_canny.{method}",
+        PRV_BilateralCanny.is_available,
+        lambda data: PRV_BilateralCanny.execute(data.image, smoothing=method),
+        quality=lambda data, edges: edge_f_score(edges, data.edges),
+    )
+
+
+def _export(export_format: str) -> Callable[[BenchmarkInput], Any]:
+    def run(data: BenchmarkInput) -> Any:
+        output_path = data.work_dir / f"export.{export_format}"
+        return ExportVpype.execute(data.svg, output_path, export_format=export_format)
+
+    return run
+
+
+CASES: tuple[BenchmarkCase, ...] = (
+    BenchmarkCase(
+        "line_extraction.bilateral_canny",
+        PRV_BilateralCanny.is_available,
+        lambda data: PRV_BilateralCanny.execute(data.image),
+    ),
+    *(
+        _smoothing(method)
+        for method in SmoothingMethod
+        if method != SmoothingMethod.BILATERAL
+    ),
+    BenchmarkCase(
+        "segment.u2net",
+        U2NET_MODEL_PATH.exists,
+        lambda data: _u2net().predict(data.image),
+    ),
+    BenchmarkCase(
+        "segment.u2net.cascade",
+        U2NET_MODEL_PATH.exists,
+        lambda data: _u2net().predict_cascade(data.image),
+        quality=_mask_quality,
+    ),
+    BenchmarkCase(
+        "vectorize.imagetracer",
+        PRV_ImageTracer.is_available,
+        lambda data: PRV_ImageTracer.execute(
+            _lines_on_white(data.edges), line_threshold=16, qtres=1.0, pathomit=8
+        ),
+    ),
+    BenchmarkCase(
+        "vectorize.potrace",
+        PRV_Potrace.is_available,
+        lambda data: PRV_Potrace.execute(_lines_on_white(data.edges)),
+    ),
+    BenchmarkCase(
+        "optimize.vpype",
+        OptimizeVpype.is_available,
+        lambda data: OptimizeVpype.execute(
+            data.svg,
+            canvas_width_mm=CANVAS_WIDTH_MM,
+            canvas_height_mm=CANVAS_HEIGHT_MM,
+        ),
+    ),
+    BenchmarkCase("export.vpype.svg", ExportVpype.is_available, _export("svg")),
+    BenchmarkCase("export.vpype.hpgl", ExportVpype.is_available, _export("hpgl")),
+    BenchmarkCase("export.vpype.gcode", ExportVpype.is_available, _export("gcode")),
+    BenchmarkCase("hatching.hatch_generator", lambda: True, _run_hatching),
+    BenchmarkCase("pipeline.process", _has_vectorizer, _run_pipeline),
+)
+
+
+def select_cases(patterns: Sequence[str] | None = None) -> list[BenchmarkCase]:
+    """
+    Filter cases by shell-style name patterns.
+
+    Args:
+        patterns: Patterns such as ``"vectorize.*"``; all cases when empty
+
+    Returns:
+        Matching cases in definition order
+
+    Raises:
+        ValueError: If a pattern matches no case
+    """
+    if not patterns:
+        return list(CASES)
+
+    for pattern in patterns:
+        if not any(fnmatch.fnmatchcase(case.name, pattern) for case in CASES):
+            msg = f"No benchmark case matches '{pattern}'"
+            raise ValueError(msg)
+
+    return [
+        case
+        for case in CASES
+        if any(fnmatch.fnmatchcase(case.name, pattern) for pattern in patterns)
+    ]
@@ -0,0 +1,253 @@
+"""
+Import-time report for process startup.
+
+Imports a module in a fresh interpreter with ``python -X importtime``
+and checks the cumulative time and the set of loaded modules against a
+budget. Cold starts of autoscaled API replicas are dominated by imports,
+so the API entry point must not load the ML stack.
+
+Usage (from backend/app):
+    python -m benchmarks.imports
+    python -m benchmarks.imports --module worker --budget-ms 5000 --no-forbid
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger("benchmarks")
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_MODULE = "main"
+# About twice the measured cold import of ``main`` on a laptop CPU
+DEFAULT_BUDGET_MS = 2000.0
+DEFAULT_REPEAT = 3
+DEFAULT_TOP = 15
+US_PER_MS = 1000.0
+# Packages an API process must not import at startup; the processor,
+# models, export and authentication load them on first use
+API_FORBIDDEN_MODULES = (
+    "cv2",
+    "torch",
+    "vpype",
+    "scipy",
+    "fastapi_users",
+    "sqlalchemy",
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+_INDENT = 2
+
+
+@dataclass(frozen=True)
+class ModuleImport:
+    """
+    One line of ``-X importtime`` output.
+
+    Attributes:
+        name: Module name
+        self_ms: Time spent executing the module itself
+        cumulative_ms: Time including the modules it imported first
+        depth: Nesting level (0 = imported directly by the top-level code)
+    """
+
+    name: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+@dataclass(frozen=True)
+class ImportReport:
+    """
+    Import cost of one module in a fresh interpreter.
+
+    Attributes:
+        module: Module that was imported
+        total_ms: Cumulative import time of ``module``
+        imports: Every module loaded, in completion order
+    """
+
+    module: str
+    total_ms: float
+    imports: tuple[ModuleImport, ...]
+
+    @property
+    def loaded(self) -> set[str]:
+        """Names of all modules loaded by the import."""
+        return {entry.name for entry in self.imports}
+
+    def slowest(self, count: int = DEFAULT_TOP) -> list[ModuleImport]:
+        """Modules with the highest self time."""
+        return sorted(self.imports, key=lambda entry: -entry.self_ms)[:count]
+
+
+def parse_importtime(output: str) -> list[ModuleImport]:
+    """
+    Parse ``-X importtime`` output, skipping the header and other lines.
+
+    Args:
+        output: Standard error of the interpreter
+
+    Returns:
+        Parsed lines in the order they were printed
+    """
+    entries = []
+    for line in output.splitlines():
+        if match := _LINE.match(line):
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append(
+                ModuleImport(
+                    name=name,
+                    self_ms=int(self_us) / US_PER_MS,
+                    cumulative_ms=int(cumulative_us) / US_PER_MS,
+                    depth=(len(indent) - 1) // _INDENT,
+                )
+            )
+    return entries
+
+
+def measure_imports(
+    module: str = DEFAULT_MODULE,
+    repeat: int = DEFAULT_REPEAT,
+    env: dict[str, str] | None = None,
+) -> ImportReport:
+    """
+    Import ``module`` in fresh interpreters and keep the fastest run.
+
+    The first run also writes bytecode caches, so the fastest of several
+    runs is the cold start a deployed replica sees.
+
+    Args:
+        module: Module to import, relative to ``backend/app``
+        repeat: Interpreter runs
+        env: Extra environment variables for the interpreter
+
+    Returns:
+        ImportReport of the fastest run
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    best: ImportReport | None = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=APP_DIR,
+            env={**os.environ, **(env or {})},
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if result.returncode:
+            msg = f"Importing {module} failed:\n{result.stderr[-2000:]}"
+            raise RuntimeError(msg)
+
+        imports = parse_importtime(result.stderr)
+        total = next(
+            entry.cumulative_ms
+            for entry in imports
+            if entry.name == module and entry.depth == 0
+        )
+        if best is None or total < best.total_ms:
+            best = ImportReport(module=module, total_ms=total, imports=tuple(imports))
+
+    assert best is not None
+    return best
+
+
+def check_budget(
+    report: ImportReport,
+    budget_ms: float = DEFAULT_BUDGET_MS,
+    forbidden: tuple[str, ...] = API_FORBIDDEN_MODULES,
+) -> list[str]:
+    """
+    List the ways an import report exceeds its budget.
+
+    Args:
+        report: Report to check
+        budget_ms: Allowed cumulative import time
+        forbidden: Top-level packages that must not be loaded
+
+    Returns:
+        Human-readable violations; empty when within budget
+    """
+    violations = [
+        f"{package} is imported at startup"
+        for package in forbidden
+        if package in report.loaded
+    ]
+    if report.total_ms > budget_ms:
+        violations.append(
+            f"import {report.module} took {report.total_ms:.0f} ms "
+            f"(budget {budget_ms:.0f} ms)"
+        )
+    return violations
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.imports",
+        description="Report startup import time and check it against a budget.",
+    )
+    parser.add_argument(
+        "--module", default=DEFAULT_MODULE, help="Module to import (default: main)"
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help="Allowed cumulative import time (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-forbid",
+        action="store_true",
+        help=f"Allow {', '.join(API_FORBIDDEN_MODULES)} to be imported",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT, help="Interpreter runs"
+    )
+    parser.add_argument(
+        "--top", type=int, default=DEFAULT_TOP, help="Slowest modules to list"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Print the import report and check the budget.
+
+    Returns:
+        Exit code: 0 within budget, 1 otherwise
+    """
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+
+    report = measure_imports(args.module, repeat=args.repeat)
+    logger.info(f"import {report.module}: {report.total_ms:.0f} ms")
+    for entry in report.slowest(args.top):
+        logger.info(
+            f"{entry.self_ms:9.1f} ms self {entry.cumulative_ms:9.1f} ms total  "
+            f"{entry.name}"
+        )
+
+    violations = check_budget(
+        report,
+        budget_ms=args.budget_ms,
+        forbidden=() if args.no_forbid else API_FORBIDDEN_MODULES,
+    )
+    for violation in violations:
+        logger.error(f"OVER BUDGET: {violation}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Output quality metrics for benchmark cases.
+
+Used to check that a faster variant of a stage still produces what the
+reference implementation does, alongside its timing.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import cv2
+import numpy as np
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+# Edge pixels this close to a reference edge count as matched, which
+# tolerates the one-pixel shifts smoothing differences cause in Canny
+DEFAULT_TOLERANCE_PX = 1
+
+
+def edge_f_score(
+    edges: NDArray[np.uint8],
+    reference: NDArray[np.uint8],
+    tolerance_px: int = DEFAULT_TOLERANCE_PX,
+) -> dict[str, float]:
+    """
+    Compare an edge map with a reference edge map.
+
+    Precision is the share of edge pixels within ``tolerance_px`` of a
+    reference edge, recall the share of reference edge pixels within
+    ``tolerance_px`` of an edge. An empty map has nothing to miss, so its
+    precision (or recall against an empty reference) is 1.
+
+    Args:
+        edges: Binary edge map to score (nonzero = edge)
+        reference: Binary reference edge map of the same shape
+        tolerance_px: Matching distance in pixels
+
+    Returns:
+        ``precision``, ``recall`` and their harmonic mean ``f_score``
+
+    Raises:
+        ValueError: If the maps have different shapes
+    """
+    if edges.shape != reference.shape:
+        msg = f"Edge map shape {edges.shape} does not match {reference.shape}"
+        raise ValueError(msg)
+
+    kernel = np.ones((2 * tolerance_px + 1, 2 * tolerance_px + 1), dtype=np.uint8)
+    found = edges > 0
+    expected = reference > 0
+    near_expected = cv2.dilate(expected.astype(np.uint8), kernel) > 0
+    near_found = cv2.dilate(found.astype(np.uint8), kernel) > 0
+
+    found_count = int(found.sum())
+    expected_count = int(expected.sum())
+    precision = (
+        float((found & near_expected).sum()) / found_count if found_count else 1.0
+    )
+    recall = (
+        float((expected & near_found).sum()) / expected_count if expected_count else 1.0
+    )
+    total = precision + recall
+    return {
+        "precision": precision,
+        "recall": recall,
+        "f_score": 2 * precision * recall / total if total else 0.0,
+    }
+
+
+def mask_iou(
+    mask: NDArray[np.uint8], reference: NDArray[np.uint8], threshold: int = 128
+) -> dict[str, float]:
+    """
+    Compare a segmentation mask with a reference mask.
+
+    Args:
+        mask: Mask to score, 0-255
+        reference: Reference mask of the same shape, 0-255
+        threshold: Values above this count as foreground in both masks
+
+    Returns:
+        ``iou`` of the foregrounds (1 when both are empty) and
+        ``changed``, the share of pixels whose class differs
+
+    Raises:
+        ValueError: If the masks have different shapes
+    """
+    if mask.shape != reference.shape:
+        msg = f"Mask shape {mask.shape} does not match {reference.shape}"
+        raise ValueError(msg)
+
+    found = mask > threshold
+    expected = reference > threshold
+    union = int((found | expected).sum())
+    return {
+        "iou": float((found & expected).sum()) / union if union else 1.0,
+        "changed": float((found ^ expected).mean()),
+    }
@@ -0,0 +1,351 @@
+"""
+Benchmark execution, reporting and baseline comparison.
+
+Times each case over synthetic inputs, summarizes latency percentiles,
+throughput and peak memory, and compares a run against a stored baseline
+report to flag regressions.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import cv2
+import numpy as np
+import vpype
+
+from benchmarks.cases import BenchmarkCase, BenchmarkInput, build_input
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 99)
+DEFAULT_REGRESSION_THRESHOLD = 0.2
+REPORT_VERSION = 1
+
+# ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+RSS_UNIT_BYTES = 1 if sys.platform == "darwin" else 1024
+MS_PER_SECOND = 1000.0
+PIXELS_PER_MEGAPIXEL = 1_000_000
+
+# Metrics compared against the baseline; higher is worse for both
+COMPARED_METRICS = ("latency_p50_ms", "peak_memory_bytes")
+
+
+@dataclass
+class CaseResult:
+    """
+    Measurements for one case on one input.
+
+    Attributes:
+        case: Case name
+        content: Synthetic content type
+        size: Longer image edge in pixels
+        pixels: Input image pixel count
+        iterations: Number of timed iterations
+        latency_ms: Latency summary (p50, p90, p99, mean, min, max)
+        throughput_per_s: Completed operations per second
+        megapixels_per_s: Input megapixels processed per second
+        peak_memory_bytes: Peak traced Python/NumPy allocation during one run
+        quality: Scores of the case's quality check, if it has one
+        skipped: Reason the case was not run, if any
+    """
+
+    case: str
+    content: str
+    size: int
+    pixels: int = 0
+    iterations: int = 0
+    latency_ms: dict[str, float] = field(default_factory=dict)
+    throughput_per_s: float = 0.0
+    megapixels_per_s: float = 0.0
+    peak_memory_bytes: int = 0
+    quality: dict[str, float] = field(default_factory=dict)
+    skipped: str | None = None
+
+    @property
+    def key(self) -> str:
+        """Identifier used to match results across reports."""
+        return f"{self.case}[{self.content}@{self.size}]"
+
+    def metric(self, name: str) -> float:
+        """Return a compared metric by name."""
+        if name == "latency_p50_ms":
+            return self.latency_ms["p50"]
+        return float(getattr(self, name))
+
+
+@dataclass
+class BenchmarkReport:
+    """A full benchmark run."""
+
+    metadata: dict[str, Any]
+    results: list[CaseResult]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize to a JSON-compatible dictionary."""
+        return {
+            "version": REPORT_VERSION,
+            "metadata": self.metadata,
+            "results": [asdict(result) for result in self.results],
+        }
+
+    def save(self, path: Path) -> None:
+        """Write the report as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2) + "\n")
+
+    @classmethod
+    def load(cls, path: Path) -> BenchmarkReport:
+        """
+        Read a report written by ``save``.
+
+        Raises:
+            ValueError: If the report version is not supported
+        """
+        data = json.loads(path.read_text())
+        if data.get("version") != REPORT_VERSION:
+            msg = (
+                f"Unsupported benchmark report version in {path}: {data.get('version')}"
+            )
+            raise ValueError(msg)
+        return cls(
+            metadata=data["metadata"],
+            results=[CaseResult(**result) for result in data["results"]],
+        )
+
+
+@dataclass(frozen=True)
+class Regression:
+    """A metric that got worse than the baseline by more than the threshold."""
+
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        """Current value relative to the baseline."""
+        return self.current / self.baseline
+
+
+def environment_metadata() -> dict[str, Any]:
+    """Describe the machine and library versions a run was made with."""
+    return {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": cv2.getNumberOfCPUs(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "vpype": vpype.__version__,
+    }
+
+
+def _summarize(samples_s: Sequence[float]) -> dict[str, float]:
+    samples_ms = np.asarray(samples_s) * MS_PER_SECOND
+    summary = {
+        f"p{p}": float(value)
+        for p, value in zip(
+            PERCENTILES, np.percentile(samples_ms, PERCENTILES), strict=True
+        )
+    }
+    summary.update(
+        mean=float(samples_ms.mean()),
+        min=float(samples_ms.min()),
+        max=float(samples_ms.max()),
+    )
+    return summary
+
+
+def _peak_traced_bytes(case: BenchmarkCase, data: BenchmarkInput) -> int:
+    """Run the case once under tracemalloc and return the allocation peak."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        case.run(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure(
+    case: BenchmarkCase,
+    data: BenchmarkInput,
+    iterations: int,
+    warmup: int = 1,
+) -> CaseResult:
+    """
+    Time one case on one input.
+
+    Warmup runs are discarded. Memory is measured in a separate run so
+    tracing overhead does not inflate the latency samples. Cases with a
+    quality check are scored on the output of the last timed run.
+
+    Args:
+        case: Case to run
+        data: Prepared input
+        iterations: Number of timed runs
+        warmup: Number of untimed runs before timing
+
+    Returns:
+        Case measurements
+
+    Raises:
+        ValueError: If iterations is below one
+    """
+    if iterations < 1:
+        msg = f"Benchmark needs at least one iteration, got {iterations}"
+        raise ValueError(msg)
+
+    for _ in range(warmup):
+        case.run(data)
+
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        output = case.run(data)
+        samples.append(time.perf_counter() - started)
+
+    total = sum(samples)
+    return CaseResult(
+        case=case.name,
+        content=data.content,
+        size=data.size,
+        pixels=data.pixels,
+        iterations=iterations,
+        latency_ms=_summarize(samples),
+        throughput_per_s=iterations / total if total else 0.0,
+        megapixels_per_s=(
+            data.pixels * iterations / PIXELS_PER_MEGAPIXEL / total if total else 0.0
+        ),
+        peak_memory_bytes=_peak_traced_bytes(case, data),
+        quality=case.quality(data, output) if case.quality else {},
+    )
+
+
+def run_benchmarks(
+    cases: Sequence[BenchmarkCase],
+    contents: Sequence[str],
+    sizes: Sequence[int],
+    iterations: int,
+    warmup: int = 1,
+    seed: int = 0,
+) -> BenchmarkReport:
+    """
+    Run every case on every content type and size.
+
+    Cases whose provider is unavailable, or that raise, are recorded as
+    skipped rather than aborting the run.
+
+    Args:
+        cases: Cases to run
+        contents: Synthetic content types
+        sizes: Longer image edge lengths in pixels
+        iterations: Timed runs per case and input
+        warmup: Untimed runs per case and input
+        seed: Random seed for image generation
+
+    Returns:
+        Report with one result per case, content and size
+    """
+    available = {case.name: case.is_available() for case in cases}
+    results: list[CaseResult] = []
+
+    with tempfile.TemporaryDirectory(prefix="benchmarks-") as tmp:
+        work_dir = Path(tmp)
+        for content in contents:
+            for size in sizes:
+                data = build_input(content, size, work_dir, seed)
+                for case in cases:
+                    if not available[case.name]:
+                        results.append(
+                            CaseResult(
+                                case.name, content, size, skipped="provider unavailable"
+                            )
+                        )
+                        continue
+                    try:
+                        result = measure(case, data, iterations, warmup)
+                    except Exception as e:
+                        reason = str(e).splitlines()[0] if str(e) else type(e).__name__
+                        logger.warning(
+                            f"Benchmark {case.name} failed on {content}@{size}: {reason}"
+                        )
+                        result = CaseResult(
+                            case.name, content, size, skipped=f"error: {reason}"
+                        )
+                    results.append(result)
+                    logger.info(
+                        f"{result.key}: "
+                        + (
+                            f"skipped ({result.skipped})"
+                            if result.skipped
+                            else f"p50={result.latency_ms['p50']:.1f}ms"
+                            + "".join(
+                                f" {name}={score:.3f}"
+                                for name, score in result.quality.items()
+                            )
+                        )
+                    )
+
+    metadata = environment_metadata()
+    metadata.update(
+        iterations=iterations,
+        warmup=warmup,
+        seed=seed,
+        max_rss_bytes=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        * RSS_UNIT_BYTES,
+    )
+    return BenchmarkReport(metadata=metadata, results=results)
+
+
+def compare(
+    report: BenchmarkReport,
+    baseline: BenchmarkReport,
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+) -> list[Regression]:
+    """
+    Find metrics that regressed relative to a baseline.
+
+    Only results present and measured in both reports are compared.
+
+    Args:
+        report: Current run
+        baseline: Reference run
+        threshold: Allowed relative increase, e.g. 0.2 for 20%
+
+    Returns:
+        Regressions, ordered as in the current report
+    """
+    reference = {
+        result.key: result for result in baseline.results if not result.skipped
+    }
+    regressions = []
+
+    for result in report.results:
+        base = reference.get(result.key)
+        if result.skipped or base is None:
+            continue
+        for metric in COMPARED_METRICS:
+            current, previous = result.metric(metric), base.metric(metric)
+            if previous > 0 and current > previous * (1 + threshold):
+                regressions.append(Regression(result.key, metric, previous, current))
+
+    return regressions
@@ -0,0 +1,152 @@
+"""
+Deterministic synthetic inputs for benchmarks.
+
+Generates RGB test images whose content stresses different parts of the
+pipeline, plus an SVG traced directly from an edge map so path-level
+stages can be measured without an external vectorizer.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import cv2
+import numpy as np
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+CONTENT_TYPES = ("gradient", "shapes", "texture", "portrait")
+DEFAULT_SIZES = (256, 512, 1024)
+
+# Output images are landscape 4:3, sized by their longer edge
+ASPECT_RATIO = 0.75
+SHAPE_COUNT = 24
+RECTANGLE_PROBABILITY = 0.5
+MIN_PATH_POINTS = 2
+TEXTURE_BLUR_KERNEL = (5, 5)
+
+
+def generate_image(content: str, size: int, seed: int = 0) -> NDArray[np.uint8]:
+    """
+    Generate a synthetic RGB image.
+
+    Content types:
+        gradient: smooth diagonal ramp with almost no edges (best case)
+        shapes: filled rectangles and circles with hard edges
+        texture: blurred noise producing dense, fragmented edges (worst case)
+        portrait: soft-shaded ellipses approximating a head and shoulders
+
+    Args:
+        content: One of ``CONTENT_TYPES``
+        size: Length of the longer image edge in pixels
+        seed: Random seed; the same arguments always give the same image
+
+    Returns:
+        RGB image (H, W, 3)
+
+    Raises:
+        ValueError: If content type is unknown or size is not positive
+    """
+    if content not in CONTENT_TYPES:
+        msg = f"Unknown content type '{content}', expected one of {CONTENT_TYPES}"
+        raise ValueError(msg)
+    if size <= 0:
+        msg = f"Image size must be positive, got {size}"
+        raise ValueError(msg)
+
+    width = size
+    height = max(1, int(size * ASPECT_RATIO))
+    rng = np.random.default_rng(seed)
+
+    if content == "gradient":
+        ramp = np.add.outer(np.arange(height), np.arange(width)).astype(np.float32)
+        gray = (ramp * (255.0 / max(1, height + width - 2))).astype(np.uint8)
+        return np.dstack([gray, gray[:, ::-1], np.full_like(gray, 128)])
+
+    if content == "texture":
+        noise = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+        texture: NDArray[np.uint8] = cv2.GaussianBlur(noise, TEXTURE_BLUR_KERNEL, 0)  # type: ignore[assignment]
+        return texture
+
+    image = np.full((height, width, 3), 235, dtype=np.uint8)
+
+    if content == "shapes":
+        for _ in range(SHAPE_COUNT):
+            color = tuple(int(c) for c in rng.integers(0, 200, size=3))
+            x, y = int(rng.integers(0, width)), int(rng.integers(0, height))
+            extent = int(rng.integers(size // 20 + 1, size // 5 + 2))
+            if rng.random() < RECTANGLE_PROBABILITY:
+                cv2.rectangle(image, (x, y), (x + extent, y + extent), color, -1)
+            else:
+                cv2.circle(image, (x, y), extent // 2, color, -1)
+        return image
+
+    # portrait: shoulders, head and facial features with soft shading
+    center_x = width // 2
+    cv2.ellipse(
+        image,
+        (center_x, height),
+        (width // 3, height // 3),
+        0,
+        180,
+        360,
+        (70, 80, 110),
+        -1,
+    )
+    cv2.ellipse(
+        image,
+        (center_x, height // 2),
+        (width // 7, height // 4),
+        0,
+        0,
+        360,
+        (190, 160, 140),
+        -1,
+    )
+    for offset in (-1, 1):
+        eye = (center_x + offset * width // 18, height // 2 - height // 16)
+        cv2.circle(image, eye, max(1, size // 80), (40, 30, 30), -1)
+    cv2.ellipse(
+        image,
+        (center_x, height // 2 + height // 8),
+        (width // 24, height // 48 + 1),
+        0,
+        0,
+        180,
+        (90, 40, 40),
+        max(1, size // 256),
+    )
+    kernel = max(3, (size // 64) | 1)
+    blurred: NDArray[np.uint8] = cv2.GaussianBlur(image, (kernel, kernel), 0)  # type: ignore[assignment]
+    return blurred
+
+
+def edges_to_svg(edges: NDArray[np.uint8]) -> str:
+    """
+    Trace an edge map into an SVG of polyline paths.
+
+    Uses OpenCV contour following, so it needs no external tracer. The
+    result is only meant as realistic input for optimize/export benchmarks.
+
+    Args:
+        edges: Binary edge image (255 = line)
+
+    Returns:
+        SVG string sized to the edge map in pixels
+    """
+    height, width = edges.shape[:2]
+    contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+
+    paths = []
+    for contour in contours:
+        points = contour.reshape(-1, 2)
+        if len(points) < MIN_PATH_POINTS:
+            continue
+        commands = " L ".join(f"{x} {y}" for x, y in points)
+        paths.append(f'<path d="M {commands}" fill="none" stroke="black"/>')
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}">{"".join(paths)}</svg>'
+    )
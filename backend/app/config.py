@@ -8,7 +8,7 @@ and Pydantic v2's strict type validation.
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Literal
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -40,6 +40,31 @@ class Settings(BaseSettings):
         Field(description="Comma-separated list of allowed CORS origins"),
     ] = "http://localhost:5173,http://localhost:3000"
 
+    # Process Role
+    process_role: Annotated[
+        Literal["all", "api"],
+        Field(
+            description=(
+                "all: run jobs in the API process; api: queue jobs for worker "
+                "processes (python -m worker)"
+            )
+        ),
+    ] = "all"
+    worker_max_jobs: Annotated[
+        int, Field(ge=1, le=256, description="Jobs a worker process runs at once")
+    ] = 4
+    worker_metrics_port: Annotated[
+        int | None,
+        Field(
+            ge=1,
+            le=65535,
+            description=(
+                "Port on which worker processes serve /metrics (unset: workers "
+                "expose no metrics)"
+            ),
+        ),
+    ] = None
+
     # File Storage
     upload_dir: Annotated[Path, Field(description="Upload directory path")] = Path(
         "./temp/uploads"
@@ -50,6 +75,9 @@ class Settings(BaseSettings):
     max_upload_size_mb: Annotated[
         int, Field(ge=1, le=500, description="Max upload size in MB")
     ] = 50
+    max_batch_size: Annotated[
+        int, Field(ge=1, le=10000, description="Max jobs per batch request")
+    ] = 200
 
     # Model Paths
     u2net_model_path: Annotated[
@@ -62,11 +90,81 @@ class Settings(BaseSettings):
         Field(description="Path to Informative Drawings model"),
     ] = Path("../models/informative-drawings/checkpoints/netG_A_sketch.pth")
 
+    # Presets
+    presets_file: Annotated[
+        Path | None,
+        Field(description="JSON file with presets added to or replacing built-ins"),
+    ] = None
+
+    # Edge-density guardrail
+    max_edge_components: Annotated[
+        int,
+        Field(
+            ge=1, description="Edge fragments above which a job fails before tracing"
+        ),
+    ] = 25_000
+    max_edge_density: Annotated[
+        float,
+        Field(gt=0, le=1, description="Edge pixel share above which a job fails"),
+    ] = 0.2
+
+    # Pipeline Scheduling
+    stage_workers: Annotated[
+        dict[str, int],
+        Field(description="Worker threads per pipeline stage (JSON object)"),
+    ] = {"preprocess": 2, "line_extraction": 2, "vectorize": 2, "optimize": 2}
+    stage_queue_size: Annotated[
+        int, Field(ge=1, le=1000, description="Max jobs queued in front of each stage")
+    ] = 8
+    thread_concurrency: Annotated[
+        int | None,
+        Field(
+            ge=1,
+            le=256,
+            description=(
+                "CPU-bound tasks sharing this machine's CPUs; torch and OpenCV "
+                "threads are split between them (default: total stage workers)"
+            ),
+        ),
+    ] = None
+
+    # Segmentation Mask Cache
+    mask_cache_dir: Annotated[
+        Path | None,
+        Field(
+            description=(
+                "Directory of persisted U²-Net masks reused by later jobs on "
+                "the same image (unset to disable)"
+            )
+        ),
+    ] = Path("./temp/masks")
+    mask_cache_max_mb: Annotated[
+        int, Field(ge=1, le=100_000, description="Max size of the mask cache in MB")
+    ] = 256
+
+    # Fast Preview
+    preview_max_dimension: Annotated[
+        int, Field(ge=64, le=2048, description="Longest edge of preview renders (px)")
+    ] = 512
+    preview_latency_budget_ms: Annotated[
+        int,
+        Field(ge=50, le=60000, description="Preview is dropped if slower than this"),
+    ] = 1500
+
+    # Progress Reporting
+    progress_min_interval_ms: Annotated[
+        int,
+        Field(ge=10, le=10000, description="Minimum time between progress messages"),
+    ] = 250
+
     # Redis Configuration
     redis_url: Annotated[
         str | None,
         Field(description="Redis URL for job storage (None for in-memory)"),
     ] = None
+    redis_max_connections: Annotated[
+        int, Field(ge=1, le=10000, description="Redis connection pool size")
+    ] = 50
 
     # Rate Limiting
     rate_limit_enabled: Annotated[bool, Field(description="Enable rate limiting")] = (
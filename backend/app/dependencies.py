@@ -3,17 +3,30 @@ Dependency injection for FastAPI.
 
 Provides factory functions for services and other dependencies.
 Enables clean architecture with proper dependency inversion.
+
+The processor and scheduler are only created (and their modules only
+imported) by processes that run jobs; an API-only process
+(``process_role = "api"``) resolves presets and queues jobs without
+loading OpenCV or any model.
 """
 
+from __future__ import annotations
+
 import logging
 from functools import lru_cache
+from typing import TYPE_CHECKING
 
 from config import settings
-from fastapi import Depends
-from pipeline.processor import PhotoToLineProcessor
+from fastapi import Depends, HTTPException
+from pipeline.export import PlotterExporter
+from pipeline.presets import PresetRegistry, load_presets
 from services.job_service import JobService
 from storage import JobStorage, get_job_storage
 
+if TYPE_CHECKING:
+    from pipeline.processor import PhotoToLineProcessor
+    from pipeline.scheduler import StageScheduler
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,29 +41,108 @@ def get_processor() -> PhotoToLineProcessor:
     Returns:
         PhotoToLineProcessor instance
     """
+    # Imported here so API-only processes never load OpenCV or the models
+    from pipeline.guardrail import EdgeBudget
+    from pipeline.processor import PhotoToLineProcessor
+    from utils.mask_cache import open_mask_cache
+
     logger.info("Initializing PhotoToLineProcessor")
 
     return PhotoToLineProcessor(
         u2net_model_path=settings.u2net_model_path
         if settings.u2net_model_path.exists()
         else None,
+        presets=load_presets(settings.presets_file),
+        edge_budget=EdgeBudget(
+            max_components=settings.max_edge_components,
+            max_density=settings.max_edge_density,
+        ),
+        # Every stage worker may run CPU-bound work at the same time
+        thread_concurrency=settings.thread_concurrency
+        or sum(settings.stage_workers.values()),
+        mask_cache=open_mask_cache(settings.mask_cache_dir, settings.mask_cache_max_mb),
+    )
+
+
+@lru_cache
+def get_presets() -> PresetRegistry:
+    """
+    Get the preset registry used to resolve process requests.
+
+    Plans are not compiled: compiling selects providers, which the
+    processor does for the jobs it runs.
+
+    Returns:
+        PresetRegistry with the built-in and configured presets
+    """
+    return PresetRegistry(load_presets(settings.presets_file), compile_plans=False)
+
+
+@lru_cache
+def get_scheduler() -> StageScheduler:
+    """
+    Get or create the global stage scheduler.
+
+    One scheduler per application so every job shares the same bounded
+    per-stage worker pools.
+
+    Returns:
+        StageScheduler instance driving the global processor
+    """
+    from pipeline.scheduler import StageScheduler
+
+    return StageScheduler(
+        get_processor(),
+        stage_workers=settings.stage_workers,
+        queue_size=settings.stage_queue_size,
     )
 
 
-def get_job_service(
-    storage: JobStorage = Depends(get_job_storage),
-    processor: PhotoToLineProcessor = Depends(get_processor),
-) -> JobService:
+def get_stage_scheduler() -> StageScheduler:
+    """
+    Get the scheduler of this process for API endpoints.
+
+    Returns:
+        The global StageScheduler
+
+    Raises:
+        HTTPException: If this process only serves the API
+    """
+    if settings.process_role == "api":
+        raise HTTPException(
+            status_code=503, detail="Stages run in worker processes, not the API"
+        )
+    return get_scheduler()
+
+
+@lru_cache
+def get_exporter() -> PlotterExporter:
+    """
+    Get or create the shared plotter exporter.
+
+    The exporter is stateless, so one instance serves every download.
+
+    Returns:
+        PlotterExporter instance
+    """
+    return PlotterExporter()
+
+
+def get_job_service(storage: JobStorage = Depends(get_job_storage)) -> JobService:
     """
     Get job service with injected dependencies.
 
-    FastAPI will automatically inject storage and processor when needed.
+    API-only processes get a service that queues jobs for workers; other
+    processes get one that runs jobs on the shared processor and scheduler.
 
     Args:
         storage: Injected job storage
-        processor: Injected processor
 
     Returns:
         JobService instance with dependencies
     """
-    return JobService(storage=storage, processor=processor)
+    if settings.process_role == "api":
+        return JobService(storage=storage, presets=get_presets())
+    return JobService(
+        storage=storage, processor=get_processor(), scheduler=get_scheduler()
+    )
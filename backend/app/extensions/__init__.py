@@ -5,7 +5,12 @@ Provides abstract base classes and infrastructure for building
 extensible processing pipelines with hook support and provider rotation.
 """
 
-from extensions.base import AbstractProvider, AbstractStaticExtension, HookContext
+from extensions.base import (
+    AbstractProvider,
+    AbstractStaticExtension,
+    HookContext,
+    RunContext,
+)
 from extensions.hooks import HookTiming, hook
 from extensions.registry import ExtensionRegistry
 
@@ -15,5 +20,6 @@ __all__ = [
     "ExtensionRegistry",
     "HookContext",
     "HookTiming",
+    "RunContext",
     "hook",
 ]
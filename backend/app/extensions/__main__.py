@@ -0,0 +1,30 @@
+"""
+Regenerate the extension manifest.
+
+Usage (from backend/app):
+    python -m extensions
+"""
+
+import logging
+import sys
+
+from extensions.manifest import MANIFEST_PATH, render_manifest, scan_extensions
+
+logger = logging.getLogger("extensions")
+
+
+def main() -> int:
+    """Scan the extensions package and write the manifest."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    entries = scan_extensions()
+    MANIFEST_PATH.write_text(render_manifest(entries))
+    logger.info(
+        f"Wrote {len(entries)} extensions with "
+        f"{sum(len(entry.providers) for entry in entries)} providers "
+        f"to {MANIFEST_PATH}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Extension manifest generated by ``python -m extensions``.
+
+Do not edit by hand; regenerate after adding or changing an EXT_*.py or
+PRV_*.py file.
+"""
+
+EXTENSIONS = [
+    {
+        "name": "export",
+        "module": "extensions.export.EXT_Export",
+        "class_name": "EXT_Export",
+        "version": "1.0.0",
+        "providers": (
+            {
+                "name": "vpype",
+                "module": "extensions.export.PRV_Vpype",
+                "class_name": "PRV_Vpype",
+                "version": "1.0.0",
+                "description": "vpype-based export to SVG/HPGL/G-code",
+                "capabilities": (),
+            },
+        ),
+    },
+    {
+        "name": "line_extraction",
+        "module": "extensions.line_extraction.EXT_LineExtraction",
+        "class_name": "EXT_LineExtraction",
+        "version": "1.0.0",
+        "providers": (
+            {
+                "name": "auto_canny",
+                "module": "extensions.line_extraction.PRV_AutoCanny",
+                "class_name": "PRV_AutoCanny",
+                "version": "1.0.0",
+                "description": "Canny edge detection with automatic thresholds",
+                "capabilities": ("preview",),
+            },
+            {
+                "name": "bilateral_canny",
+                "module": "extensions.line_extraction.PRV_BilateralCanny",
+                "class_name": "PRV_BilateralCanny",
+                "version": "1.0.0",
+                "description": "Bilateral filtering + Canny edge detection",
+                "capabilities": (),
+            },
+        ),
+    },
+    {
+        "name": "optimize",
+        "module": "extensions.optimize.EXT_Optimize",
+        "class_name": "EXT_Optimize",
+        "version": "1.0.0",
+        "providers": (
+            {
+                "name": "vpype",
+                "module": "extensions.optimize.PRV_Vpype",
+                "class_name": "PRV_Vpype",
+                "version": "1.0.0",
+                "description": "vpype SVG optimization",
+                "capabilities": (),
+            },
+        ),
+    },
+    {
+        "name": "preprocess",
+        "module": "extensions.preprocess.EXT_Preprocess",
+        "class_name": "EXT_Preprocess",
+        "version": "1.0.0",
+        "providers": (
+            {
+                "name": "classical_cv",
+                "module": "extensions.preprocess.PRV_ClassicalCV",
+                "class_name": "PRV_ClassicalCV",
+                "version": "1.0.0",
+                "description": "Classical CV-based preprocessing",
+                "capabilities": (),
+            },
+            {
+                "name": "u2net",
+                "module": "extensions.preprocess.PRV_U2Net",
+                "class_name": "PRV_U2Net",
+                "version": "1.0.0",
+                "description": "U²-Net ML-based preprocessing",
+                "capabilities": ("ml", "subject_isolation"),
+            },
+        ),
+    },
+    {
+        "name": "vectorize",
+        "module": "extensions.vectorize.EXT_Vectorize",
+        "class_name": "EXT_Vectorize",
+        "version": "1.0.0",
+        "providers": (
+            {
+                "name": "imagetracer",
+                "module": "extensions.vectorize.PRV_ImageTracer",
+                "class_name": "PRV_ImageTracer",
+                "version": "1.0.0",
+                "description": "ImageTracerJS vectorization (public domain)",
+                "capabilities": ("external_tool",),
+            },
+            {
+                "name": "potrace",
+                "module": "extensions.vectorize.PRV_Potrace",
+                "class_name": "PRV_Potrace",
+                "version": "1.0.0",
+                "description": "Potrace line art vectorization",
+                "capabilities": ("external_tool",),
+            },
+        ),
+    },
+]
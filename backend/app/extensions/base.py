@@ -5,6 +5,7 @@ Defines the core interfaces for the extension system:
 - AbstractStaticExtension: Base class for all extensions
 - AbstractProvider: Base class for all providers
 - HookContext: Context passed to hook handlers
+- RunContext: Per-job state shared by hooks across all stages of a run
 """
 
 from __future__ import annotations
@@ -17,6 +18,34 @@ if TYPE_CHECKING:
     from collections.abc import Callable
 
 
+@dataclass
+class RunContext:
+    """
+    Per-job state shared by hooks across every stage of one pipeline run.
+
+    Passed explicitly to each extension call so hooks can attribute their
+    work to a job without relying on thread-local state.
+    """
+
+    job_id: str | None = None
+    stage_records: list[dict[str, Any]] = field(default_factory=list)
+    progress: Callable[[str, float, str | None], None] | None = None
+
+    def report_progress(
+        self, stage: str, fraction: float, message: str | None = None
+    ) -> None:
+        """
+        Forward progress within a stage to the run's progress callback.
+
+        Args:
+            stage: Hook stage name (e.g. "vectorize")
+            fraction: Completed share of the stage (0.0-1.0)
+            message: Optional human-readable status
+        """
+        if self.progress is not None:
+            self.progress(stage, fraction, message)
+
+
 @dataclass
 class HookContext:
     """
@@ -34,48 +63,46 @@ class HookContext:
     output_data: Any = None
     params: dict[str, Any] = field(default_factory=dict)
     metadata: dict[str, Any] = field(default_factory=dict)
+    provider: str | None = None
+    run: RunContext | None = None
 
     def set_output(self, data: Any) -> None:
         """Set output data (for after hooks to modify results)."""
         self.output_data = data
 
+    def report_progress(self, fraction: float, message: str | None = None) -> None:
+        """Report progress within this stage to the run, if there is one."""
+        if self.run is not None:
+            self.run.report_progress(self.stage, fraction, message)
+
 
 class AbstractStaticExtension(ABC):
     """
     Base class for all extensions.
 
     Extensions are static classes that coordinate providers and hooks
-    for a specific pipeline stage. They use auto-discovery to find
-    their providers and manage hook execution.
+    for a specific pipeline stage. They look their providers up in the
+    extension registry and manage hook execution.
     """
 
     name: ClassVar[str]
     version: ClassVar[str] = "1.0.0"
     description: ClassVar[str] = ""
 
-    # Auto-discovered providers (populated by registry)
-    _providers: ClassVar[list[type[AbstractProvider]]] = []
-
     # Registered hooks (populated by hook decorator)
     _hooks: ClassVar[dict[tuple[str, str], list[tuple[int, Callable]]]] = {}
 
     @classmethod
     def get_providers(cls) -> list[type[AbstractProvider]]:
         """
-        Return all discovered providers for this extension.
+        Return all registered providers for this extension.
 
-        Providers are auto-discovered from PRV_*.py files in the
-        extension's directory. This method queries the registry to
-        ensure up-to-date provider lists.
+        Imports every provider module of the extension; selection with
+        ``select_provider`` only imports the providers it tries.
         """
         # Import here to avoid circular dependency
         from extensions.registry import ExtensionRegistry
 
-        # Ensure discovery has run
-        if not ExtensionRegistry._discovered:
-            ExtensionRegistry.discover()
-
-        # Query registry for providers
         return ExtensionRegistry.get_providers(cls.name)
 
     @classmethod
@@ -85,6 +112,9 @@ class AbstractStaticExtension(ABC):
         """
         Select best available provider based on preferences.
 
+        Providers are tried in preference order, then in registry order,
+        and each provider module is imported when it is first tried.
+
         Args:
             preferences: Ordered list of preferred provider names
 
@@ -94,16 +124,9 @@ class AbstractStaticExtension(ABC):
         Raises:
             RuntimeError: If no available providers found
         """
-        providers = cls.get_providers()
-
-        if preferences:
-            for pref in preferences:
-                provider = next((p for p in providers if p.name == pref), None)
-                if provider and provider.is_available():
-                    return provider
+        from extensions.registry import ExtensionRegistry
 
-        # Fallback to first available provider
-        for provider in providers:
+        for provider in ExtensionRegistry.iter_providers(cls.name, preferences):
             if provider.is_available():
                 return provider
 
@@ -144,7 +167,10 @@ class AbstractProvider(ABC):
 
     name: ClassVar[str]
     extension: ClassVar[str]  # Parent extension name
+    version: ClassVar[str] = "1.0.0"
     description: ClassVar[str] = ""
+    # Feature tags recorded in the extension manifest (e.g. "ml", "preview")
+    capabilities: ClassVar[frozenset[str]] = frozenset()
 
     @classmethod
     @abstractmethod
@@ -9,7 +9,7 @@ import logging
 from pathlib import Path
 from typing import Any, ClassVar
 
-from extensions.base import AbstractStaticExtension, HookContext
+from extensions.base import AbstractStaticExtension, HookContext, RunContext
 from extensions.hooks import HookTiming
 
 logger = logging.getLogger(__name__)
@@ -34,6 +34,7 @@ class EXT_Export(AbstractStaticExtension):
         output_path: Path,
         export_format: str = "svg",
         provider_preferences: list[str] | None = None,
+        run: RunContext | None = None,
         **params: Any,
     ) -> None:
         """
@@ -44,6 +45,7 @@ class EXT_Export(AbstractStaticExtension):
             output_path: Output file path
             export_format: Export format (svg, hpgl, gcode)
             provider_preferences: Ordered list of preferred providers
+            run: Per-job run context shared with hooks
             **params: Format-specific parameters
 
         Raises:
@@ -61,10 +63,12 @@ class EXT_Export(AbstractStaticExtension):
                 "export_format": export_format,
                 **params,
             },
+            run=run,
         )
         cls.execute_hooks("export", HookTiming.BEFORE.value, context)
 
         provider = cls.select_provider(provider_preferences)
+        context.provider = provider.name
         logger.info("Using export provider: %s", provider.name)
 
         provider.execute(
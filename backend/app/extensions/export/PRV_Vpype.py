@@ -5,11 +5,11 @@ Provides export to SVG, HPGL, and G-code formats using vpype.
 """
 
 import logging
-import tempfile
 from pathlib import Path
 from typing import Any, ClassVar
 
 import vpype as vp
+from utils.svg import read_svg_string
 
 from extensions.base import AbstractProvider
 
@@ -82,24 +82,15 @@ class PRV_Vpype(AbstractProvider):
             layer_mode: Color mode (layer, device, or default)
             **params: Additional parameters
         """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".svg", delete=False) as tmp:
-            tmp_path = Path(tmp.name)
-            tmp.write(svg_string)
+        lc, page_w, page_h = read_svg_string(svg_string)
 
-        try:
-            result = vp.read_svg(str(tmp_path), quantization=0.1)
-            lc, page_w, page_h = result
-
-            doc = vp.Document()
-            doc.add(lc, 1)
-            doc.page_size = (page_w, page_h)
-
-            with output_path.open("w") as f:
-                vp.write_svg(f, doc, color_mode=layer_mode)
-            logger.info("Exported SVG to %s", output_path)
+        doc = vp.Document()
+        doc.add(lc, 1)
+        doc.page_size = (page_w, page_h)
 
-        finally:
-            tmp_path.unlink(missing_ok=True)
+        with output_path.open("w") as f:
+            vp.write_svg(f, doc, color_mode=layer_mode)
+        logger.info("Exported SVG to %s", output_path)
 
     @classmethod
     def export_hpgl(
@@ -125,13 +116,8 @@ class PRV_Vpype(AbstractProvider):
         Raises:
             RuntimeError: If HPGL export fails
         """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".svg", delete=False) as tmp:
-            tmp_path = Path(tmp.name)
-            tmp.write(svg_string)
-
         try:
-            result = vp.read_svg(str(tmp_path), quantization=0.1)
-            lc, _, _ = result
+            lc, _, _ = read_svg_string(svg_string)
 
             hpgl_content = []
 
@@ -165,8 +151,6 @@ class PRV_Vpype(AbstractProvider):
         except Exception as e:
             msg = f"HPGL export failed: {e}"
             raise RuntimeError(msg) from e
-        finally:
-            tmp_path.unlink(missing_ok=True)
 
     @classmethod
     def export_gcode(
@@ -194,13 +178,8 @@ class PRV_Vpype(AbstractProvider):
         Raises:
             RuntimeError: If G-code export fails
         """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".svg", delete=False) as tmp:
-            tmp_path = Path(tmp.name)
-            tmp.write(svg_string)
-
         try:
-            result = vp.read_svg(str(tmp_path), quantization=0.1)
-            lc, _, _ = result
+            lc, _, _ = read_svg_string(svg_string)
 
             gcode_lines = []
 
@@ -243,5 +222,3 @@ class PRV_Vpype(AbstractProvider):
         except Exception as e:
             msg = f"G-code export failed: {e}"
             raise RuntimeError(msg) from e
-        finally:
-            tmp_path.unlink(missing_ok=True)
@@ -59,8 +59,8 @@ def hook(
     def decorator(func: Callable[[HookContext], Any]) -> Callable:
         hook_key = (stage, timing.value)
 
-        # Initialize hooks dict if needed
-        if not hasattr(extension_class, "_hooks"):
+        # Each extension gets its own registry rather than sharing the base class dict
+        if "_hooks" not in vars(extension_class):
             extension_class._hooks = {}
 
         if hook_key not in extension_class._hooks:
@@ -0,0 +1,216 @@
+"""
+Per-stage timing and resource instrumentation.
+
+Registers before/after hooks on every pipeline extension that record wall
+time, CPU time and payload sizes for each provider call. Samples feed
+process-wide histograms (exported on ``/metrics``) and, when the call
+carries a RunContext, the per-job stage records stored with the job's
+stats.
+
+Memory is not attributed to stages: ``ru_maxrss`` is a high-water mark for
+the whole process, and with the stage scheduler running several jobs at
+once its growth during a call mostly reflects other jobs. It is reported
+as a process-level gauge instead.
+"""
+
+from __future__ import annotations
+
+import logging
+import resource
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from utils.metrics import metrics_registry
+
+from extensions.export.EXT_Export import EXT_Export
+from extensions.hooks import HookTiming, hook
+from extensions.line_extraction.EXT_LineExtraction import EXT_LineExtraction
+from extensions.optimize.EXT_Optimize import EXT_Optimize
+from extensions.preprocess.EXT_Preprocess import EXT_Preprocess
+from extensions.vectorize.EXT_Vectorize import EXT_Vectorize
+
+if TYPE_CHECKING:
+    from extensions.base import AbstractStaticExtension, HookContext
+
+logger = logging.getLogger(__name__)
+
+# Metrics hooks sit in the 51-80 band so validation and transform hooks
+# (1-50) have already shaped the input before timing starts and the output
+# before sizes are measured.
+METRICS_HOOK_PRIORITY = 60
+
+# Extension class and the hook stage name it fires
+INSTRUMENTED_STAGES: tuple[tuple[type[AbstractStaticExtension], str], ...] = (
+    (EXT_Preprocess, "preprocess"),
+    (EXT_LineExtraction, "extract"),
+    (EXT_Vectorize, "vectorize"),
+    (EXT_Optimize, "optimize"),
+    (EXT_Export, "export"),
+)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = tuple(10.0**exponent for exponent in range(9))
+
+# ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+RSS_UNIT_BYTES = 1 if sys.platform == "darwin" else 1024
+
+GRAYSCALE_NDIM = 2
+
+SVG_PATH_TAGS = ("<path", "<polyline", "<polygon", "<line ")
+
+_START_KEY = "instrumentation.start"
+_LABELS = ("stage", "provider")
+
+_install_lock = threading.Lock()
+_installed = False
+
+_wall_seconds = metrics_registry.histogram(
+    "pipeline_stage_wall_seconds",
+    "Wall-clock time spent in a pipeline stage provider call",
+    DURATION_BUCKETS,
+    _LABELS,
+)
+_cpu_seconds = metrics_registry.histogram(
+    "pipeline_stage_cpu_seconds",
+    "CPU time of the calling thread during a pipeline stage provider call",
+    DURATION_BUCKETS,
+    _LABELS,
+)
+_process_peak_rss_bytes = metrics_registry.gauge(
+    "process_peak_rss_bytes",
+    "Peak resident set size of the whole process (all concurrent jobs)",
+)
+_payload_sizes = metrics_registry.histogram(
+    "pipeline_stage_payload_size",
+    "Size of stage inputs and outputs (pixels, edge pixels, paths, bytes)",
+    SIZE_BUCKETS,
+    (*_LABELS, "measure"),
+)
+
+
+@dataclass(frozen=True)
+class _StartSample:
+    """Counters captured by the before hook."""
+
+    wall: float
+    cpu: float
+
+
+def _peak_rss_bytes() -> int:
+    """Return the process peak resident set size in bytes."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT_BYTES
+
+
+def describe_payload(data: Any) -> dict[str, int]:
+    """
+    Summarize the size of a stage input or output.
+
+    Args:
+        data: Image array, SVG string or file path passed between stages
+
+    Returns:
+        Mapping of measure name to value; empty for unrecognized payloads
+    """
+    if isinstance(data, np.ndarray) and data.ndim >= GRAYSCALE_NDIM:
+        sizes = {"pixels": int(data.shape[0] * data.shape[1])}
+        if data.ndim == GRAYSCALE_NDIM:
+            sizes["edge_pixels"] = int(np.count_nonzero(data))
+        return sizes
+
+    if isinstance(data, str):
+        return {
+            "svg_bytes": len(data.encode()),
+            "paths": sum(data.count(tag) for tag in SVG_PATH_TAGS),
+        }
+
+    if isinstance(data, Path) and data.is_file():
+        return {"file_bytes": data.stat().st_size}
+
+    return {}
+
+
+def _record_start(context: HookContext) -> None:
+    context.metadata[_START_KEY] = _StartSample(
+        wall=time.perf_counter(),
+        cpu=time.thread_time(),
+    )
+
+
+def _record_finish(context: HookContext) -> None:
+    start: _StartSample | None = context.metadata.pop(_START_KEY, None)
+    if start is None:
+        return
+
+    wall = time.perf_counter() - start.wall
+    cpu = time.thread_time() - start.cpu
+    peak_rss = _peak_rss_bytes()
+
+    labels = {"stage": context.extension, "provider": context.provider or "unknown"}
+    input_sizes = describe_payload(context.input_data)
+    output_sizes = describe_payload(context.output_data)
+
+    _wall_seconds.observe(wall, **labels)
+    _cpu_seconds.observe(cpu, **labels)
+    _process_peak_rss_bytes.set(peak_rss)
+    for direction, sizes in (("input", input_sizes), ("output", output_sizes)):
+        for measure, value in sizes.items():
+            _payload_sizes.observe(value, measure=f"{direction}_{measure}", **labels)
+
+    if context.run is not None:
+        context.run.stage_records.append(
+            {
+                **labels,
+                "wall_seconds": wall,
+                "cpu_seconds": cpu,
+                "process_peak_rss_bytes": peak_rss,
+                "input": input_sizes,
+                "output": output_sizes,
+            }
+        )
+
+    logger.debug(
+        "Stage %s (%s): wall=%.3fs cpu=%.3fs process_rss_peak=%d in=%s out=%s",
+        labels["stage"],
+        labels["provider"],
+        wall,
+        cpu,
+        peak_rss,
+        input_sizes,
+        output_sizes,
+    )
+
+
+def install_instrumentation() -> None:
+    """
+    Register the timing hooks on every pipeline extension.
+
+    Safe to call repeatedly; hooks are only registered once per process.
+    """
+    global _installed
+
+    with _install_lock:
+        if _installed:
+            return
+        for extension_class, stage in INSTRUMENTED_STAGES:
+            hook(
+                extension_class,
+                stage,
+                HookTiming.BEFORE,
+                priority=METRICS_HOOK_PRIORITY,
+            )(_record_start)
+            hook(
+                extension_class,
+                stage,
+                HookTiming.AFTER,
+                priority=METRICS_HOOK_PRIORITY,
+            )(_record_finish)
+        _installed = True
+
+    logger.info(
+        "Stage instrumentation installed on %d extensions", len(INSTRUMENTED_STAGES)
+    )
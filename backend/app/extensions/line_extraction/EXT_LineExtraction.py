@@ -11,7 +11,7 @@ from typing import Any, ClassVar
 import numpy as np
 from numpy.typing import NDArray
 
-from extensions.base import AbstractStaticExtension, HookContext
+from extensions.base import AbstractStaticExtension, HookContext, RunContext
 from extensions.hooks import HookTiming
 
 logger = logging.getLogger(__name__)
@@ -34,6 +34,7 @@ class EXT_LineExtraction(AbstractStaticExtension):
         cls,
         image: NDArray[np.uint8],
         provider_preferences: list[str] | None = None,
+        run: RunContext | None = None,
         **params: Any,
     ) -> NDArray[np.uint8]:
         """
@@ -42,6 +43,7 @@ class EXT_LineExtraction(AbstractStaticExtension):
         Args:
             image: Input RGB or grayscale image
             provider_preferences: Ordered list of preferred providers
+            run: Per-job run context shared with hooks
             **params: Provider-specific parameters
 
         Returns:
@@ -57,10 +59,12 @@ class EXT_LineExtraction(AbstractStaticExtension):
             timing=HookTiming.BEFORE.value,
             input_data=image,
             params=params,
+            run=run,
         )
         cls.execute_hooks("extract", HookTiming.BEFORE.value, context)
 
         provider = cls.select_provider(provider_preferences)
+        context.provider = provider.name
         logger.info("Using line extraction provider: %s", provider.name)
 
         result = provider.execute(image, **params)
@@ -0,0 +1,68 @@
+"""
+Automatic-threshold Canny edge detection provider.
+
+Provides fast line extraction with thresholds derived from the image
+median and no smoothing filter. Used for low-latency previews.
+"""
+
+import logging
+from typing import Any, ClassVar
+
+import cv2
+import numpy as np
+from models.classical_cv import auto_canny
+from numpy.typing import NDArray
+
+from extensions.base import AbstractProvider
+
+logger = logging.getLogger(__name__)
+
+RGB_CHANNELS = 3
+
+
+class PRV_AutoCanny(AbstractProvider):
+    """Median-threshold Canny edge detection provider."""
+
+    name: ClassVar[str] = "auto_canny"
+    extension: ClassVar[str] = "line_extraction"
+    description: ClassVar[str] = "Canny edge detection with automatic thresholds"
+    capabilities: ClassVar[frozenset[str]] = frozenset({"preview"})
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Check if required libraries are available."""
+        return True
+
+    @classmethod
+    def execute(
+        cls,
+        input_data: NDArray[np.uint8],
+        sigma: float = 0.33,
+        use_ml: bool = False,
+        **params: Any,
+    ) -> NDArray[np.uint8]:
+        """
+        Extract lines using Canny with median-based thresholds.
+
+        Args:
+            input_data: Input RGB or grayscale image
+            sigma: Spread of the thresholds around the image median
+            use_ml: Whether to use ML (not supported by this provider)
+            **params: Additional parameters (edge_threshold and smoothing are
+                ignored)
+
+        Returns:
+            Binary line art image (255 = line, 0 = background)
+
+        Raises:
+            RuntimeError: If use_ml is requested (not supported)
+        """
+        if use_ml:
+            msg = "ML extraction not supported by auto_canny provider"
+            raise RuntimeError(msg)
+
+        gray = input_data
+        if len(input_data.shape) == RGB_CHANNELS:
+            gray = cv2.cvtColor(input_data, cv2.COLOR_RGB2GRAY)  # type: ignore[assignment]
+
+        return auto_canny(gray, sigma)
@@ -10,7 +10,9 @@ from typing import Any, ClassVar
 
 import numpy as np
 from models.classical_cv import BilateralCannyDetector
+from models.smoothing_method import SmoothingMethod
 from numpy.typing import NDArray
+from utils.cache import stage_objects
 
 from extensions.base import AbstractProvider
 
@@ -38,6 +40,7 @@ class PRV_BilateralCanny(AbstractProvider):
         input_data: NDArray[np.uint8],
         edge_threshold: tuple[int, int] = (50, 150),
         use_ml: bool = False,
+        smoothing: str = SmoothingMethod.BILATERAL,
         **params: Any,
     ) -> NDArray[np.uint8]:
         """
@@ -47,6 +50,8 @@ class PRV_BilateralCanny(AbstractProvider):
             input_data: Input RGB or grayscale image
             edge_threshold: Tuple of (low, high) Canny thresholds
             use_ml: Whether to use ML (not supported by this provider)
+            smoothing: Edge-preserving smoother (bilateral,
+                bilateral_downsampled, guided or domain_transform)
             **params: Additional parameters
 
         Returns:
@@ -54,11 +59,15 @@ class PRV_BilateralCanny(AbstractProvider):
 
         Raises:
             RuntimeError: If use_ml is requested (not supported)
+            ValueError: If the smoothing method is unknown
         """
         if use_ml:
             msg = "ML extraction not supported by bilateral_canny provider"
             raise RuntimeError(msg)
 
         low, high = edge_threshold
-        detector = BilateralCannyDetector(low, high)
+        detector = stage_objects.get(
+            ("bilateral_canny", low, high, smoothing),
+            lambda: BilateralCannyDetector(low, high, smoothing=smoothing),
+        )
         return detector.extract_lines(input_data)
@@ -0,0 +1,219 @@
+"""
+Extension manifest: where every extension and provider lives.
+
+The registry reads the generated ``extensions/_manifest.py`` with a normal
+import and only imports a provider module when the provider is selected.
+Scanning the package for ``EXT_*.py`` and ``PRV_*.py`` files is the
+fallback for development trees without a manifest, and is how the
+manifest is built.
+
+Regenerate after adding or changing an extension or provider (from
+backend/app):
+    python -m extensions
+"""
+
+from __future__ import annotations
+
+import importlib
+import inspect
+import logging
+import pprint
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+from extensions.base import AbstractProvider, AbstractStaticExtension
+
+logger = logging.getLogger(__name__)
+
+PACKAGE = "extensions"
+EXTENSIONS_DIR = Path(__file__).resolve().parent
+MANIFEST_MODULE = f"{PACKAGE}._manifest"
+MANIFEST_PATH = EXTENSIONS_DIR / "_manifest.py"
+
+_T = TypeVar("_T")
+
+_HEADER = '''"""
+Extension manifest generated by ``python -m extensions``.
+
+Do not edit by hand; regenerate after adding or changing an EXT_*.py or
+PRV_*.py file.
+"""
+
+'''
+
+
+@dataclass(frozen=True)
+class ProviderEntry:
+    """
+    Manifest record of one provider.
+
+    Attributes:
+        name: Provider name used in preferences
+        module: Dotted module path of the PRV_*.py file
+        class_name: Provider class in that module
+        version: Provider version
+        description: Human-readable description
+        capabilities: Feature tags such as "ml" or "preview"
+    """
+
+    name: str
+    module: str
+    class_name: str
+    version: str = "1.0.0"
+    description: str = ""
+    capabilities: tuple[str, ...] = ()
+
+    def load(self) -> type[AbstractProvider]:
+        """Import the provider module and return the provider class."""
+        return getattr(importlib.import_module(self.module), self.class_name)
+
+
+@dataclass(frozen=True)
+class ExtensionEntry:
+    """
+    Manifest record of one extension and its providers.
+
+    Attributes:
+        name: Extension name
+        module: Dotted module path of the EXT_*.py file
+        class_name: Extension class in that module
+        version: Extension version
+        providers: Providers in file name order, the fallback order
+    """
+
+    name: str
+    module: str
+    class_name: str
+    version: str = "1.0.0"
+    providers: tuple[ProviderEntry, ...] = ()
+
+    def load(self) -> type[AbstractStaticExtension]:
+        """Import the extension module and return the extension class."""
+        return getattr(importlib.import_module(self.module), self.class_name)
+
+
+def _classes(module: Any, base: type[_T]) -> list[type[_T]]:
+    """Subclasses of ``base`` defined in ``module``."""
+    return [
+        obj
+        for _, obj in inspect.getmembers(module, inspect.isclass)
+        if issubclass(obj, base)
+        and obj is not base
+        and obj.__module__ == module.__name__
+    ]
+
+
+def scan_extensions(extensions_dir: Path = EXTENSIONS_DIR) -> list[ExtensionEntry]:
+    """
+    Build manifest entries by importing every EXT_*.py and PRV_*.py file.
+
+    Modules are imported under their package path (``extensions.<dir>.<file>``)
+    so they share ``sys.modules`` with the rest of the application. Files
+    that fail to import are logged and skipped.
+
+    Args:
+        extensions_dir: Root of the extensions package
+
+    Returns:
+        Extension entries sorted by directory name
+    """
+    entries: list[ExtensionEntry] = []
+    for ext_dir in sorted(extensions_dir.iterdir()):
+        if not ext_dir.is_dir() or ext_dir.name.startswith("_"):
+            continue
+
+        ext_files = sorted(ext_dir.glob("EXT_*.py"))
+        if not ext_files:
+            continue
+        package = f"{extensions_dir.name}.{ext_dir.name}"
+        module = _import(f"{package}.{ext_files[0].stem}")
+        if module is None:
+            continue
+
+        entries.extend(
+            ExtensionEntry(
+                name=extension.name,
+                module=extension.__module__,
+                class_name=extension.__name__,
+                version=extension.version,
+                providers=_scan_providers(ext_dir, package, extension.name),
+            )
+            for extension in _classes(module, AbstractStaticExtension)
+        )
+    return entries
+
+
+def _scan_providers(
+    ext_dir: Path, package: str, extension_name: str
+) -> tuple[ProviderEntry, ...]:
+    """Build entries for the providers of one extension directory."""
+    providers: list[ProviderEntry] = []
+    for prv_file in sorted(ext_dir.glob("PRV_*.py")):
+        module = _import(f"{package}.{prv_file.stem}")
+        if module is None:
+            continue
+        providers.extend(
+            ProviderEntry(
+                name=provider.name,
+                module=provider.__module__,
+                class_name=provider.__name__,
+                version=provider.version,
+                description=provider.description,
+                capabilities=tuple(sorted(provider.capabilities)),
+            )
+            for provider in _classes(module, AbstractProvider)  # type: ignore[type-abstract]
+            if provider.extension == extension_name
+        )
+    return tuple(providers)
+
+
+def _import(module_name: str) -> Any:
+    """Import a module, logging and returning None on failure."""
+    try:
+        return importlib.import_module(module_name)
+    except Exception:
+        logger.exception(f"Failed to load module: {module_name}")
+        return None
+
+
+def load_manifest() -> list[ExtensionEntry] | None:
+    """
+    Read the generated manifest.
+
+    Returns:
+        Extension entries, or None when no manifest has been generated
+    """
+    try:
+        manifest = importlib.import_module(MANIFEST_MODULE)
+    except ModuleNotFoundError:
+        return None
+
+    return [
+        ExtensionEntry(
+            **{
+                **extension,
+                "providers": tuple(
+                    ProviderEntry(
+                        **{**provider, "capabilities": tuple(provider["capabilities"])}
+                    )
+                    for provider in extension["providers"]
+                ),
+            }
+        )
+        for extension in manifest.EXTENSIONS
+    ]
+
+
+def render_manifest(entries: list[ExtensionEntry]) -> str:
+    """
+    Render entries as the source of ``extensions/_manifest.py``.
+
+    Args:
+        entries: Entries from ``scan_extensions``
+
+    Returns:
+        Python module source defining ``EXTENSIONS``
+    """
+    data = [asdict(entry) for entry in entries]
+    return f"{_HEADER}EXTENSIONS = {pprint.pformat(data, sort_dicts=False)}\n"
@@ -8,7 +8,7 @@ through multiple provider implementations.
 import logging
 from typing import Any, ClassVar
 
-from extensions.base import AbstractStaticExtension, HookContext
+from extensions.base import AbstractStaticExtension, HookContext, RunContext
 from extensions.hooks import HookTiming
 
 logger = logging.getLogger(__name__)
@@ -33,6 +33,7 @@ class EXT_Optimize(AbstractStaticExtension):
         canvas_width_mm: float,
         canvas_height_mm: float,
         provider_preferences: list[str] | None = None,
+        run: RunContext | None = None,
         **params: Any,
     ) -> str:
         """
@@ -43,6 +44,7 @@ class EXT_Optimize(AbstractStaticExtension):
             canvas_width_mm: Target canvas width in mm
             canvas_height_mm: Target canvas height in mm
             provider_preferences: Ordered list of preferred providers
+            run: Per-job run context shared with hooks
             **params: Provider-specific parameters
 
         Returns:
@@ -62,16 +64,19 @@ class EXT_Optimize(AbstractStaticExtension):
                 "canvas_height_mm": canvas_height_mm,
                 **params,
             },
+            run=run,
         )
         cls.execute_hooks("optimize", HookTiming.BEFORE.value, context)
 
         provider = cls.select_provider(provider_preferences)
+        context.provider = provider.name
         logger.info("Using optimization provider: %s", provider.name)
 
         result = provider.execute(
             svg_string,
             canvas_width_mm=canvas_width_mm,
             canvas_height_mm=canvas_height_mm,
+            progress_callback=context.report_progress,
             **params,
         )
 
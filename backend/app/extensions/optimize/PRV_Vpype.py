@@ -6,16 +6,22 @@ using the vpype library.
 """
 
 import logging
-import tempfile
-from pathlib import Path
+from collections.abc import Callable
 from typing import Any, ClassVar
 
 import vpype as vp
+from utils.svg import read_svg_string, write_svg_string
 
 from extensions.base import AbstractProvider
 
 logger = logging.getLogger(__name__)
 
+# Share of the optimize stage completed after each step
+LOADED_FRACTION = 0.2
+MERGED_FRACTION = 0.6
+RELOOPED_FRACTION = 0.7
+SCALED_FRACTION = 0.8
+
 
 class PRV_Vpype(AbstractProvider):
     """vpype-based SVG optimization provider."""
@@ -41,6 +47,8 @@ class PRV_Vpype(AbstractProvider):
         merge_tolerance: float = 0.5,
         simplify_tolerance: float = 0.2,
         dedupe_tolerance: float = 0.1,
+        *,
+        progress_callback: Callable[..., None] | None = None,
         **params: Any,
     ) -> str:
         """
@@ -53,61 +61,52 @@ class PRV_Vpype(AbstractProvider):
             merge_tolerance: Line merge tolerance in mm
             simplify_tolerance: Simplification tolerance in mm
             dedupe_tolerance: Deduplication tolerance in mm
+            progress_callback: Called with (fraction, message) after each step
             **params: Additional provider-specific parameters
 
         Returns:
             Optimized SVG string
         """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".svg", delete=False) as tmp:
-            tmp_path = Path(tmp.name)
-            tmp.write(input_data)
 
-        output_path = None
-        try:
-            result = vp.read_svg(str(tmp_path), quantization=0.1)
-            lc, _page_w, _page_h = result
-
-            logger.debug("Initial path count: %d", len(lc))
-
-            lc.merge(tolerance=merge_tolerance)
-            logger.debug("After merge: %d", len(lc))
-            lc.reloop(tolerance=dedupe_tolerance)
-            logger.debug("Reloop complete")
-
-            bounds = lc.bounds()
-            if bounds:
-                current_width = bounds[2] - bounds[0]
-                current_height = bounds[3] - bounds[1]
-                logger.debug("Current bounds: %fx%f", current_width, current_height)
-
-                scale_x = canvas_width_mm / current_width if current_width > 0 else 1.0
-                scale_y = (
-                    canvas_height_mm / current_height if current_height > 0 else 1.0
-                )
-                scale_factor = min(scale_x, scale_y)
-                lc.scale(scale_factor, scale_factor)
-
-            logger.info("Final path count: %d", len(lc))
-
-            doc = vp.Document()
-            doc.add(lc, 1)
-            doc.page_size = (canvas_width_mm, canvas_height_mm)
-
-            output_path = tmp_path.with_suffix(".optimized.svg")
-            with output_path.open("w") as f:
-                vp.write_svg(
-                    f,
-                    doc,
-                    page_size=(canvas_width_mm, canvas_height_mm),
-                    color_mode="layer",
-                )
-
-            return output_path.read_text()
-
-        finally:
-            tmp_path.unlink(missing_ok=True)
-            if output_path is not None:
-                output_path.unlink(missing_ok=True)
+        def report(fraction: float, message: str) -> None:
+            if progress_callback is not None:
+                progress_callback(fraction, message)
+
+        lc, _page_w, _page_h = read_svg_string(input_data)
+
+        logger.debug("Initial path count: %d", len(lc))
+        report(LOADED_FRACTION, f"Merging {len(lc)} paths")
+
+        lc.merge(tolerance=merge_tolerance)
+        logger.debug("After merge: %d", len(lc))
+        report(MERGED_FRACTION, f"Relooping {len(lc)} paths")
+        lc.reloop(tolerance=dedupe_tolerance)
+        logger.debug("Reloop complete")
+        report(RELOOPED_FRACTION, "Scaling to canvas")
+
+        bounds = lc.bounds()
+        if bounds:
+            current_width = bounds[2] - bounds[0]
+            current_height = bounds[3] - bounds[1]
+            logger.debug("Current bounds: %fx%f", current_width, current_height)
+
+            scale_x = canvas_width_mm / current_width if current_width > 0 else 1.0
+            scale_y = canvas_height_mm / current_height if current_height > 0 else 1.0
+            scale_factor = min(scale_x, scale_y)
+            lc.scale(scale_factor, scale_factor)
+
+        logger.info("Final path count: %d", len(lc))
+        report(SCALED_FRACTION, "Writing SVG")
+
+        doc = vp.Document()
+        doc.add(lc, 1)
+        doc.page_size = (canvas_width_mm, canvas_height_mm)
+
+        return write_svg_string(
+            doc,
+            page_size=(canvas_width_mm, canvas_height_mm),
+            color_mode="layer",
+        )
 
     @classmethod
     def get_stats(
@@ -122,32 +121,23 @@ class PRV_Vpype(AbstractProvider):
         Returns:
             Dictionary with path statistics
         """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".svg", delete=False) as tmp:
-            tmp_path = Path(tmp.name)
-            tmp.write(svg_string)
-
-        try:
-            result = vp.read_svg(str(tmp_path), quantization=0.1)
-            lc, _, _ = result
+        lc, _, _ = read_svg_string(svg_string)
 
-            path_count = len(lc)
-            total_length = lc.length()
-            bounds = lc.bounds()
+        path_count = len(lc)
+        total_length = lc.length()
+        bounds = lc.bounds()
 
-            stats: dict[str, float | int | tuple[float, float, float, float] | None] = {
-                "path_count": path_count,
-                "total_length_mm": total_length,
-                "bounds": bounds,
-            }
+        stats: dict[str, float | int | tuple[float, float, float, float] | None] = {
+            "path_count": path_count,
+            "total_length_mm": total_length,
+            "bounds": bounds,
+        }
 
-            if bounds:
-                stats["width_mm"] = bounds[2] - bounds[0]
-                stats["height_mm"] = bounds[3] - bounds[1]
+        if bounds:
+            stats["width_mm"] = bounds[2] - bounds[0]
+            stats["height_mm"] = bounds[3] - bounds[1]
 
-            return stats
-
-        finally:
-            tmp_path.unlink(missing_ok=True)
+        return stats
 
     @classmethod
     def scale_to_canvas(
@@ -171,43 +161,24 @@ class PRV_Vpype(AbstractProvider):
         Returns:
             Scaled SVG string
         """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".svg", delete=False) as tmp:
-            tmp_path = Path(tmp.name)
-            tmp.write(svg_string)
-
-        output_path = None
-        try:
-            result = vp.read_svg(str(tmp_path), quantization=0.1)
-            lc, _, _ = result
-
-            bounds = lc.bounds()
-            if bounds:
-                current_width = bounds[2] - bounds[0]
-                current_height = bounds[3] - bounds[1]
-
-                scale_x = canvas_width_mm / current_width if current_width > 0 else 1.0
-                scale_y = (
-                    canvas_height_mm / current_height if current_height > 0 else 1.0
-                )
-                scale_factor = min(scale_x, scale_y)
-                lc.scale(scale_factor, scale_factor)
-
-            doc = vp.Document()
-            doc.add(lc, 1)
-            doc.page_size = (canvas_width_mm, canvas_height_mm)
-
-            output_path = tmp_path.with_suffix(".scaled.svg")
-            with output_path.open("w") as f:
-                vp.write_svg(
-                    f,
-                    doc,
-                    page_size=(canvas_width_mm, canvas_height_mm),
-                    color_mode="layer",
-                )
-
-            return output_path.read_text()
-
-        finally:
-            tmp_path.unlink(missing_ok=True)
-            if output_path is not None and output_path.exists():
-                output_path.unlink()
+        lc, _, _ = read_svg_string(svg_string)
+
+        bounds = lc.bounds()
+        if bounds:
+            current_width = bounds[2] - bounds[0]
+            current_height = bounds[3] - bounds[1]
+
+            scale_x = canvas_width_mm / current_width if current_width > 0 else 1.0
+            scale_y = canvas_height_mm / current_height if current_height > 0 else 1.0
+            scale_factor = min(scale_x, scale_y)
+            lc.scale(scale_factor, scale_factor)
+
+        doc = vp.Document()
+        doc.add(lc, 1)
+        doc.page_size = (canvas_width_mm, canvas_height_mm)
+
+        return write_svg_string(
+            doc,
+            page_size=(canvas_width_mm, canvas_height_mm),
+            color_mode="layer",
+        )
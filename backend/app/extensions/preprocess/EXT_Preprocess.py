@@ -12,7 +12,7 @@ from typing import Any, ClassVar
 import numpy as np
 from numpy.typing import NDArray
 
-from extensions.base import AbstractStaticExtension, HookContext
+from extensions.base import AbstractStaticExtension, HookContext, RunContext
 from extensions.hooks import HookTiming
 
 logger = logging.getLogger(__name__)
@@ -35,6 +35,7 @@ class EXT_Preprocess(AbstractStaticExtension):
         cls,
         image_path: Path,
         provider_preferences: list[str] | None = None,
+        run: RunContext | None = None,
         **params: Any,
     ) -> NDArray[np.uint8]:
         """
@@ -43,6 +44,7 @@ class EXT_Preprocess(AbstractStaticExtension):
         Args:
             image_path: Path to input image
             provider_preferences: Ordered list of preferred providers
+            run: Per-job run context shared with hooks
             **params: Provider-specific parameters (isolate_subject, max_dimension, etc.)
 
         Returns:
@@ -58,10 +60,12 @@ class EXT_Preprocess(AbstractStaticExtension):
             timing=HookTiming.BEFORE.value,
             input_data=image_path,
             params=params,
+            run=run,
         )
         cls.execute_hooks("preprocess", HookTiming.BEFORE.value, context)
 
         provider = cls.select_provider(provider_preferences)
+        context.provider = provider.name
         logger.info("Using preprocessing provider: %s", provider.name)
 
         result = provider.execute(image_path, **params)
@@ -14,6 +14,7 @@ import numpy as np
 import pillow_heif
 from numpy.typing import NDArray
 from PIL import Image
+from utils.cache import get_clahe
 
 from extensions.base import AbstractProvider
 
@@ -174,12 +175,12 @@ class PRV_ClassicalCV(AbstractProvider):
         if len(image.shape) == RGB_CHANNELS:
             lab = cv2.cvtColor(image, cv2.COLOR_RGB2LAB)
             lightness, a_channel, b_channel = cv2.split(lab)
-            clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(8, 8))
+            clahe = get_clahe(clip_limit)
             lightness = clahe.apply(lightness)
             enhanced_lab = cv2.merge([lightness, a_channel, b_channel])
             enhanced: NDArray[np.uint8] = cv2.cvtColor(enhanced_lab, cv2.COLOR_LAB2RGB)
         else:
-            clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(8, 8))
+            clahe = get_clahe(clip_limit)
             enhanced = clahe.apply(image)
 
         logger.debug("Contrast normalization applied")
@@ -14,6 +14,9 @@ import numpy as np
 import pillow_heif
 from numpy.typing import NDArray
 from PIL import Image
+from utils import compositing
+from utils.cache import get_clahe
+from utils.mask_cache import get_mask_cache
 
 from extensions.base import AbstractProvider
 
@@ -22,7 +25,6 @@ logger = logging.getLogger(__name__)
 pillow_heif.register_heif_opener()
 
 RGB_CHANNELS = 3
-ALPHA_MAX = 255.0
 
 
 class PRV_U2Net(AbstractProvider):
@@ -31,6 +33,7 @@ class PRV_U2Net(AbstractProvider):
     name: ClassVar[str] = "u2net"
     extension: ClassVar[str] = "preprocess"
     description: ClassVar[str] = "U²-Net ML-based preprocessing"
+    capabilities: ClassVar[frozenset[str]] = frozenset({"ml", "subject_isolation"})
 
     SUPPORTED_FORMATS: ClassVar[set[str]] = {
         ".jpg",
@@ -70,6 +73,10 @@ class PRV_U2Net(AbstractProvider):
         enhance_contrast: bool = False,
         threshold: int = 128,
         background_color: tuple[int, int, int] = (255, 255, 255),
+        *,
+        refine_mask: bool = False,
+        mask_cascade: bool = False,
+        keep_alpha: bool = False,
         **params: Any,
     ) -> NDArray[np.uint8]:
         """
@@ -82,10 +89,15 @@ class PRV_U2Net(AbstractProvider):
             enhance_contrast: Whether to apply contrast enhancement
             threshold: Mask threshold for segmentation
             background_color: Color for removed background
+            refine_mask: Refine the subject mask with a guided filter
+            mask_cascade: Segment coarse-to-fine instead of in one pass
+            keep_alpha: Append the subject mask as a fourth (alpha) channel
+                when isolating
             **params: Additional parameters
 
         Returns:
-            Preprocessed RGB image
+            Preprocessed RGB image, or RGBA with ``keep_alpha`` and
+            ``isolate_subject``
         """
         image = cls.load_image(input_data)
         image = cls.resize_if_needed(image, max_dimension)
@@ -94,7 +106,14 @@ class PRV_U2Net(AbstractProvider):
             image = cls.normalize_contrast(image)
 
         if isolate_subject:
-            image = cls.isolate_subject(image, threshold, background_color)
+            image = cls.isolate_subject(
+                image,
+                threshold,
+                background_color,
+                refine=refine_mask,
+                cascade=mask_cascade,
+                keep_alpha=keep_alpha,
+            )
 
         return image
 
@@ -168,6 +187,10 @@ class PRV_U2Net(AbstractProvider):
         image: NDArray[np.uint8],
         threshold: int = 128,
         background_color: tuple[int, int, int] = (255, 255, 255),
+        refine: bool = False,
+        cascade: bool = False,
+        *,
+        keep_alpha: bool = False,
     ) -> NDArray[np.uint8]:
         """
         Isolate subject from background using U²-Net.
@@ -176,9 +199,13 @@ class PRV_U2Net(AbstractProvider):
             image: Input RGB image
             threshold: Mask threshold for segmentation
             background_color: Color for removed background
+            refine: Soften the mask along image edges with a guided filter
+            cascade: Segment with the coarse-to-fine mask cascade
+            keep_alpha: Return the mask the image was composited with as an
+                alpha channel
 
         Returns:
-            RGB image with background replaced
+            RGB image with background replaced, or RGBA with ``keep_alpha``
 
         Raises:
             RuntimeError: If U²-Net predictor not available
@@ -187,15 +214,16 @@ class PRV_U2Net(AbstractProvider):
             msg = "U²-Net predictor not initialized"
             raise RuntimeError(msg)
 
-        rgba = cls._u2net_predictor.isolate_subject(image, threshold)
-
-        rgb_with_bg = np.full_like(image, background_color, dtype=np.uint8)
-        alpha = rgba[:, :, 3:4] / ALPHA_MAX
-        rgb_with_bg = (rgba[:, :, :3] * alpha + rgb_with_bg * (1 - alpha)).astype(
-            np.uint8
+        mask = cls._u2net_predictor.predict_mask(
+            image, threshold, cascade=cascade, cache=get_mask_cache()
         )
+        if refine:
+            mask = compositing.refine_mask(image, mask)
+        rgb_with_bg = compositing.composite(image, mask, background_color)
 
         logger.info("Subject isolation complete")
+        if keep_alpha:
+            return np.dstack((rgb_with_bg, mask))
         return rgb_with_bg
 
     @classmethod
@@ -215,12 +243,12 @@ class PRV_U2Net(AbstractProvider):
         if len(image.shape) == RGB_CHANNELS:
             lab = cv2.cvtColor(image, cv2.COLOR_RGB2LAB)
             lightness, a_channel, b_channel = cv2.split(lab)
-            clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(8, 8))
+            clahe = get_clahe(clip_limit)
             lightness = clahe.apply(lightness)
             enhanced_lab = cv2.merge([lightness, a_channel, b_channel])
             enhanced: NDArray[np.uint8] = cv2.cvtColor(enhanced_lab, cv2.COLOR_LAB2RGB)
         else:
-            clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(8, 8))
+            clahe = get_clahe(clip_limit)
             enhanced = clahe.apply(image)
 
         logger.debug("Contrast normalization applied")
@@ -0,0 +1,68 @@
+"""
+Stage boundary progress hooks.
+
+Registers before/after hooks on every pipeline extension that report the
+start and end of each stage to the run's progress callback. Providers of
+long stages report finer-grained progress in between through the
+``progress_callback`` parameter their extension passes them.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+from extensions.hooks import HookTiming, hook
+from extensions.instrumentation import INSTRUMENTED_STAGES
+
+if TYPE_CHECKING:
+    from extensions.base import HookContext
+
+logger = logging.getLogger(__name__)
+
+# Progress brackets the metrics hooks (60): the start is reported before the
+# stage timer starts and the finish after it stops, so stage timing excludes
+# progress I/O
+PROGRESS_START_PRIORITY = 55
+PROGRESS_FINISH_PRIORITY = 70
+
+_install_lock = threading.Lock()
+_installed = False
+
+
+def _report_start(context: HookContext) -> None:
+    context.report_progress(0.0)
+
+
+def _report_finish(context: HookContext) -> None:
+    context.report_progress(1.0)
+
+
+def install_progress_hooks() -> None:
+    """
+    Register the stage start/finish progress hooks on every extension.
+
+    Safe to call repeatedly; hooks are only registered once per process.
+    """
+    global _installed
+
+    with _install_lock:
+        if _installed:
+            return
+        for extension_class, stage in INSTRUMENTED_STAGES:
+            hook(
+                extension_class,
+                stage,
+                HookTiming.BEFORE,
+                priority=PROGRESS_START_PRIORITY,
+            )(_report_start)
+            hook(
+                extension_class,
+                stage,
+                HookTiming.AFTER,
+                priority=PROGRESS_FINISH_PRIORITY,
+            )(_report_finish)
+        _installed = True
+
+    logger.info("Progress hooks installed on %d extensions", len(INSTRUMENTED_STAGES))
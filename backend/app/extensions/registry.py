@@ -1,19 +1,31 @@
 """
-Extension and provider registry with auto-discovery.
-
-Scans the extensions directory and automatically discovers all
-extensions (EXT_*.py) and their providers (PRV_*.py).
+Extension and provider registry.
+
+Extensions and providers are listed in the generated extension manifest
+(see ``extensions.manifest``), which is read with a normal import. A
+provider module is imported the first time the provider is tried, so a
+process only loads the providers its jobs actually select. Without a
+manifest the registry scans the extensions directory for EXT_*.py and
+PRV_*.py files instead.
 """
 
 from __future__ import annotations
 
-import importlib.util
-import inspect
 import logging
-from pathlib import Path
-from typing import TYPE_CHECKING, Any, ClassVar
+from typing import TYPE_CHECKING, ClassVar
+
+from extensions.manifest import (
+    EXTENSIONS_DIR,
+    ExtensionEntry,
+    ProviderEntry,
+    load_manifest,
+    scan_extensions,
+)
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
     from extensions.base import AbstractProvider, AbstractStaticExtension
 
 logger = logging.getLogger(__name__)
@@ -21,141 +33,98 @@ logger = logging.getLogger(__name__)
 
 class ExtensionRegistry:
     """
-    Registry for auto-discovering and managing extensions and providers.
+    Registry of extensions and their providers.
 
-    Scans the extensions directory for:
-    - EXT_*.py files containing AbstractStaticExtension subclasses
-    - PRV_*.py files containing AbstractProvider subclasses
+    Holds the manifest entries and the provider classes imported so far.
     """
 
-    _extensions: ClassVar[dict[str, type[AbstractStaticExtension]]] = {}
-    _providers: ClassVar[dict[str, list[type[AbstractProvider]]]] = {}
+    _extensions: ClassVar[dict[str, ExtensionEntry]] = {}
+    _loaded: ClassVar[dict[tuple[str, str], type[AbstractProvider] | None]] = {}
     _discovered: ClassVar[bool] = False
 
     @classmethod
     def discover(cls, extensions_dir: Path | None = None) -> None:
         """
-        Discover all extensions and providers.
+        Load the extension manifest, or scan for extensions without one.
 
         Args:
-            extensions_dir: Root extensions directory (defaults to app/extensions)
+            extensions_dir: Extensions directory to scan instead of reading
+                the manifest (defaults to the manifest, or app/extensions
+                when no manifest has been generated)
         """
         if cls._discovered:
             return
 
-        if extensions_dir is None:
-            # Default to app/extensions directory
-            extensions_dir = Path(__file__).parent
-
-        logger.info(f"Discovering extensions in {extensions_dir}")
-
-        # Scan for extension directories
-        for ext_dir in extensions_dir.iterdir():
-            if not ext_dir.is_dir() or ext_dir.name.startswith("_"):
-                continue
-
-            # Look for EXT_*.py file
-            ext_files = list(ext_dir.glob("EXT_*.py"))
-            if ext_files:
-                cls._discover_extension(ext_files[0], ext_dir)
+        entries = load_manifest() if extensions_dir is None else None
+        if entries is None:
+            extensions_dir = extensions_dir or EXTENSIONS_DIR
+            logger.info(f"No extension manifest, scanning {extensions_dir}")
+            entries = scan_extensions(extensions_dir)
 
+        cls._extensions = {entry.name: entry for entry in entries}
         cls._discovered = True
         logger.info(
-            f"Discovered {len(cls._extensions)} extensions "
-            f"with {sum(len(p) for p in cls._providers.values())} total providers"
+            f"Registered {len(cls._extensions)} extensions "
+            f"with {sum(len(e.providers) for e in entries)} total providers"
         )
 
     @classmethod
-    def _discover_extension(cls, ext_file: Path, ext_dir: Path) -> None:
+    def _load_provider(cls, entry: ProviderEntry) -> type[AbstractProvider] | None:
         """
-        Discover an extension and its providers.
+        Import a provider class once, remembering failures.
 
         Args:
-            ext_file: Path to EXT_*.py file
-            ext_dir: Extension directory
-        """
-        from extensions.base import AbstractStaticExtension
+            entry: Manifest entry of the provider
 
-        # Load extension module
-        module = cls._load_module(ext_file)
-        if module is None:
-            return
-
-        # Find AbstractStaticExtension subclasses
-        for _name, obj in inspect.getmembers(module, inspect.isclass):
-            if (
-                issubclass(obj, AbstractStaticExtension)
-                and obj is not AbstractStaticExtension
-            ):
-                cls._extensions[obj.name] = obj
-                logger.debug("Discovered extension: %s", obj.name)
-
-                # Discover providers for this extension
-                providers = cls._discover_providers(ext_dir, obj.name)
-                if providers:
-                    cls._providers[obj.name] = providers
-                    obj._providers = providers  # Intentionally setting class attribute
-                    logger.debug(
-                        "  Found %d providers for %s", len(providers), obj.name
-                    )
+        Returns:
+            Provider class, or None if its module fails to import
+        """
+        key = (entry.module, entry.class_name)
+        if key not in cls._loaded:
+            try:
+                cls._loaded[key] = entry.load()
+            except Exception:
+                logger.exception(f"Failed to load provider: {entry.module}")
+                cls._loaded[key] = None
+        return cls._loaded[key]
 
     @classmethod
-    def _discover_providers(
-        cls, ext_dir: Path, ext_name: str
-    ) -> list[type[AbstractProvider]]:
+    def get_provider_entries(cls, extension_name: str) -> tuple[ProviderEntry, ...]:
         """
-        Discover all providers in an extension directory.
+        Get the manifest entries of an extension's providers.
 
         Args:
-            ext_dir: Extension directory
-            ext_name: Extension name
+            extension_name: Extension name
 
         Returns:
-            List of discovered provider classes
+            Provider entries in registry order (no provider is imported)
         """
-        from extensions.base import AbstractProvider
-
-        providers: list[type[AbstractProvider]] = []
-
-        for prv_file in ext_dir.glob("PRV_*.py"):
-            module = cls._load_module(prv_file)
-            if module is None:
-                continue
-
-            for name, obj in inspect.getmembers(module, inspect.isclass):
-                if (
-                    issubclass(obj, AbstractProvider)
-                    and obj is not AbstractProvider
-                    and obj.extension == ext_name
-                ):
-                    providers.append(obj)
-                    logger.debug(f"    Provider: {obj.name}")
-
-        return providers
+        cls.discover()
+        entry = cls._extensions.get(extension_name)
+        return entry.providers if entry else ()
 
     @classmethod
-    def _load_module(cls, file_path: Path) -> Any:
+    def iter_providers(
+        cls, extension_name: str, preferences: list[str] | None = None
+    ) -> Iterator[type[AbstractProvider]]:
         """
-        Load a Python module from file path.
+        Yield an extension's providers, importing each when reached.
 
         Args:
-            file_path: Path to .py file
+            extension_name: Extension name
+            preferences: Provider names to yield first, in this order
 
-        Returns:
-            Loaded module or None if loading fails
+        Yields:
+            Provider classes: preferred ones first, then the rest in
+            registry order; providers that fail to import are skipped
         """
-        try:
-            spec = importlib.util.spec_from_file_location(file_path.stem, file_path)
-            if spec is None or spec.loader is None:
-                return None
-
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            return module
-
-        except Exception:
-            logger.exception(f"Failed to load module: {file_path}")
-            return None
+        entries = cls.get_provider_entries(extension_name)
+        by_name = {entry.name: entry for entry in entries}
+        ordered = [by_name[name] for name in preferences or () if name in by_name]
+        for entry in dict.fromkeys([*ordered, *entries]):
+            provider = cls._load_provider(entry)
+            if provider is not None:
+                yield provider
 
     @classmethod
     def get_extension(cls, name: str) -> type[AbstractStaticExtension] | None:
@@ -168,14 +137,14 @@ class ExtensionRegistry:
         Returns:
             Extension class or None if not found
         """
-        if not cls._discovered:
-            cls.discover()
-        return cls._extensions.get(name)
+        cls.discover()
+        entry = cls._extensions.get(name)
+        return entry.load() if entry else None
 
     @classmethod
     def get_providers(cls, extension_name: str) -> list[type[AbstractProvider]]:
         """
-        Get all providers for an extension.
+        Get all providers for an extension, importing them.
 
         Args:
             extension_name: Extension name
@@ -183,18 +152,15 @@ class ExtensionRegistry:
         Returns:
             List of provider classes
         """
-        if not cls._discovered:
-            cls.discover()
-        return cls._providers.get(extension_name, [])
+        return list(cls.iter_providers(extension_name))
 
     @classmethod
     def list_extensions(cls) -> list[str]:
         """
-        List all discovered extension names.
+        List all registered extension names.
 
         Returns:
             List of extension names
         """
-        if not cls._discovered:
-            cls.discover()
+        cls.discover()
         return list(cls._extensions.keys())
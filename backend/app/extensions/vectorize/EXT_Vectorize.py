@@ -16,6 +16,8 @@ if TYPE_CHECKING:
     import numpy as np
     from numpy.typing import NDArray
 
+    from extensions.base import RunContext
+
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +41,7 @@ class EXT_Vectorize(AbstractStaticExtension):
         cls,
         image: NDArray[np.uint8],
         provider_preferences: list[str] | None = None,
+        run: RunContext | None = None,
         **params,
     ) -> str:
         """
@@ -47,6 +50,7 @@ class EXT_Vectorize(AbstractStaticExtension):
         Args:
             image: Input grayscale or RGB image
             provider_preferences: Ordered list of preferred providers
+            run: Per-job run context shared with hooks
             **params: Provider-specific parameters
 
         Returns:
@@ -66,15 +70,19 @@ class EXT_Vectorize(AbstractStaticExtension):
             timing=HookTiming.BEFORE.value,
             input_data=image,
             params=params,
+            run=run,
         )
         cls.execute_hooks("vectorize", HookTiming.BEFORE.value, context)
 
         # Select provider
         provider = cls.select_provider(provider_preferences)
+        context.provider = provider.name
         logger.info("Using provider: %s", provider.name)
 
         # Execute vectorization
-        svg_content = provider.execute(image, **params)
+        svg_content = provider.execute(
+            image, progress_callback=context.report_progress, **params
+        )
 
         # Execute after hooks
         context.output_data = svg_content
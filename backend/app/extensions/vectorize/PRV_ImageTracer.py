@@ -11,7 +11,6 @@ import json
 import logging
 import os
 import subprocess
-import tempfile
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar
 
@@ -29,6 +28,9 @@ PROJECT_ROOT_LEVELS_UP = 3
 NODE_MODULES_DIRNAME = "node_modules"
 NODE_PATH_ENV_VAR = "NODE_PATH"
 
+# Share of the stage done once tracing starts
+TRACE_STARTED_FRACTION = 0.1
+
 
 class PRV_ImageTracer(AbstractProvider):
     """ImageTracerJS vectorization provider."""
@@ -36,6 +38,7 @@ class PRV_ImageTracer(AbstractProvider):
     name: ClassVar[str] = "imagetracer"
     extension: ClassVar[str] = "vectorize"
     description: ClassVar[str] = "ImageTracerJS vectorization (public domain)"
+    capabilities: ClassVar[frozenset[str]] = frozenset({"external_tool"})
 
     @classmethod
     def is_available(cls) -> bool:
@@ -69,6 +72,8 @@ class PRV_ImageTracer(AbstractProvider):
                 - qtres: Quality resolution (lower = more detail), default 1.0
                 - pathomit: Minimum path length in pixels, default 8
                 - scale: Output scaling factor, default 1.0
+                - progress_callback: Called with (fraction, message) as
+                  tracing advances
 
         Returns:
             SVG string
@@ -80,27 +85,24 @@ class PRV_ImageTracer(AbstractProvider):
         qtres = params.get("qtres", 1.0)
         pathomit = params.get("pathomit", 8)
         scale = params.get("scale", 1.0)
+        progress_callback = params.get("progress_callback")
 
-        # Write image to temp file
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_input:
-            input_path = Path(tmp_input.name)
-            cv2.imwrite(str(input_path), input_data)
+        # The Node tracer reports nothing until it exits
+        if progress_callback is not None:
+            progress_callback(TRACE_STARTED_FRACTION, "Tracing with ImageTracerJS")
 
-        try:
-            return cls._run_imagetracer(
-                input_path,
-                line_threshold,
-                qtres,
-                pathomit,
-                scale,
-            )
-        finally:
-            input_path.unlink(missing_ok=True)
+        return cls._run_imagetracer(
+            input_data,
+            line_threshold,
+            qtres,
+            pathomit,
+            scale,
+        )
 
     @classmethod
     def _run_imagetracer(
         cls,
-        image_path: Path,
+        image: NDArray[np.uint8],
         threshold: int,
         qtres: float,
         pathomit: int,
@@ -110,7 +112,7 @@ class PRV_ImageTracer(AbstractProvider):
         Run ImageTracerJS via Node.js subprocess.
 
         Args:
-            image_path: Path to input image
+            image: Grayscale or RGB image to trace
             threshold: Line threshold
             qtres: Quality resolution
             pathomit: Path omit threshold
@@ -122,8 +124,13 @@ class PRV_ImageTracer(AbstractProvider):
         Raises:
             RuntimeError: If subprocess fails
         """
+        # ImageTracer works on ImageData, which is RGBA
+        rgba = cv2.cvtColor(
+            image, cv2.COLOR_GRAY2RGBA if image.ndim == 2 else cv2.COLOR_RGB2RGBA
+        )
         config = {
-            "imagePath": str(image_path),
+            "width": int(rgba.shape[1]),
+            "height": int(rgba.shape[0]),
             "threshold": threshold,
             "qtres": qtres,
             "pathomit": pathomit,
@@ -144,17 +151,19 @@ class PRV_ImageTracer(AbstractProvider):
             pal: [{{r:0, g:0, b:0, a:255}}, {{r:255, g:255, b:255, a:255}}]
         }};
 
-        ImageTracer.imageToSVG(config.imagePath, (svgstr) => {{
-            console.log(svgstr);
-        }}, options);
+        // RGBA pixels arrive on stdin as one ImageData buffer
+        const chunks = [];
+        process.stdin.on('data', (chunk) => chunks.push(chunk));
+        process.stdin.on('end', () => {{
+            const imgd = {{
+                width: config.width,
+                height: config.height,
+                data: new Uint8ClampedArray(Buffer.concat(chunks)),
+            }};
+            process.stdout.write(ImageTracer.imagedataToSVG(imgd, options));
+        }});
         """
 
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".js", delete=False
-        ) as tmp_script:
-            script_path = Path(tmp_script.name)
-            tmp_script.write(tracer_script)
-
         # Set up Node.js environment
         project_root = Path(__file__).resolve().parents[PROJECT_ROOT_LEVELS_UP]
         node_modules_dir = project_root / NODE_MODULES_DIRNAME
@@ -163,22 +172,19 @@ class PRV_ImageTracer(AbstractProvider):
 
         try:
             result = subprocess.run(
-                ["node", str(script_path)],
+                ["node", "--eval", tracer_script],
+                input=rgba.tobytes(),
                 check=False,
                 capture_output=True,
-                text=True,
                 timeout=60,
                 env=env,
             )
-
-            if result.returncode == 0:
-                return result.stdout
-
-            msg = f"ImageTracerJS failed: {result.stderr}"
-            raise RuntimeError(msg)
-
         except subprocess.TimeoutExpired as err:
             msg = "ImageTracerJS timeout"
             raise RuntimeError(msg) from err
-        finally:
-            script_path.unlink(missing_ok=True)
+
+        if result.returncode == 0:
+            return result.stdout.decode()
+
+        msg = f"ImageTracerJS failed: {result.stderr.decode(errors='replace')}"
+        raise RuntimeError(msg)
@@ -7,18 +7,21 @@ which works well for line art and silhouettes.
 
 import logging
 import subprocess
-import tempfile
-from pathlib import Path
+from collections.abc import Callable
 from typing import Any, ClassVar
 
 import cv2
 import numpy as np
 from numpy.typing import NDArray
+from utils.potrace import trace_svg
 
 from extensions.base import AbstractProvider
 
 logger = logging.getLogger(__name__)
 
+# Share of the stage done once the bitmap is encoded and tracing starts
+TRACE_STARTED_FRACTION = 0.1
+
 
 class PRV_Potrace(AbstractProvider):
     """Potrace-based vectorization provider."""
@@ -26,6 +29,7 @@ class PRV_Potrace(AbstractProvider):
     name: ClassVar[str] = "potrace"
     extension: ClassVar[str] = "vectorize"
     description: ClassVar[str] = "Potrace line art vectorization"
+    capabilities: ClassVar[frozenset[str]] = frozenset({"external_tool"})
 
     @classmethod
     def is_available(cls) -> bool:
@@ -33,7 +37,8 @@ class PRV_Potrace(AbstractProvider):
         try:
             result = subprocess.run(
                 ["potrace", "--version"],
-                check=False, capture_output=True,
+                check=False,
+                capture_output=True,
                 text=True,
                 timeout=5,
             )
@@ -49,6 +54,9 @@ class PRV_Potrace(AbstractProvider):
         turdsize: int = 2,
         alphamax: float = 1.0,
         opttolerance: float = 0.2,
+        *,
+        backend: str = "svg",
+        progress_callback: Callable[..., None] | None = None,
         **params: Any,
     ) -> str:
         """
@@ -60,12 +68,16 @@ class PRV_Potrace(AbstractProvider):
             turdsize: Suppress speckles of up to this size
             alphamax: Corner threshold parameter (0-1.3, higher = smoother)
             opttolerance: Curve optimization tolerance
+            backend: "svg" keeps potrace's Bézier output; "geojson" traces
+                straight to polylines
+            progress_callback: Called with (fraction, message) as tracing advances
             **params: Additional parameters
 
         Returns:
             SVG string
 
         Raises:
+            ValueError: If the backend is unknown
             RuntimeError: If potrace execution fails
         """
         # Ensure binary image
@@ -76,54 +88,18 @@ class PRV_Potrace(AbstractProvider):
 
         _, binary = cv2.threshold(gray, line_threshold, 255, cv2.THRESH_BINARY)
 
-        # Create temporary files
-        with tempfile.NamedTemporaryFile(suffix=".pbm", delete=False) as tmp_input:
-            tmp_input_path = Path(tmp_input.name)
-
-        with tempfile.NamedTemporaryFile(suffix=".svg", delete=False) as tmp_output:
-            tmp_output_path = Path(tmp_output.name)
+        if progress_callback is not None:
+            progress_callback(TRACE_STARTED_FRACTION, "Tracing with Potrace")
 
-        try:
-            # Write PBM format (Portable Bitmap)
-            height, width = binary.shape
-            with tmp_input_path.open("wb") as f:
-                # PBM header
-                f.write(b"P4\n")
-                f.write(f"{width} {height}\n".encode())
-                # PBM data (packed bits)
-                for row in binary:
-                    # Pack 8 pixels per byte
-                    packed_row = np.packbits(row > 0)
-                    f.write(packed_row.tobytes())
-
-            # Run potrace
-            cmd = [
-                "potrace",
-                "-s",  # SVG output
+        # Trace the dark lines, not the white background around them
+        svg_content = trace_svg(
+            binary == 0,
+            [
                 f"--turdsize={turdsize}",
                 f"--alphamax={alphamax}",
                 f"--opttolerance={opttolerance}",
-                "-o",
-                str(tmp_output_path),
-                str(tmp_input_path),
-            ]
-
-            result = subprocess.run(
-                cmd,
-                check=False, capture_output=True,
-                text=True,
-                timeout=30,
-            )
-
-            if result.returncode != 0:
-                msg = f"Potrace failed: {result.stderr}"
-                raise RuntimeError(msg)
-
-            # Read and return SVG
-            svg_content = tmp_output_path.read_text()
-            logger.info("Potrace vectorization complete")
-            return svg_content
-
-        finally:
-            tmp_input_path.unlink(missing_ok=True)
-            tmp_output_path.unlink(missing_ok=True)
+            ],
+            backend=backend,
+        )
+        logger.info("Potrace vectorization complete")
+        return svg_content
@@ -10,12 +10,14 @@ from contextlib import asynccontextmanager
 from typing import Any
 
 from api.endpoints import router as api_router
-from api.websocket import websocket_endpoint
-from auth import create_db_and_tables
-from auth.routes import router as auth_router
+from api.events import create_event_bus
+from api.metrics import METRICS_CONTENT_TYPE, METRICS_PATH, render_metrics
+from api.websocket import websocket_endpoint, ws_manager
 from config import settings
+from dependencies import get_processor, get_scheduler
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
@@ -47,13 +49,34 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     settings.ensure_directories()
 
     # Initialize job storage (Redis or in-memory)
-    job_storage = init_job_storage(redis_url=settings.redis_url)
+    job_storage = init_job_storage(
+        redis_url=settings.redis_url,
+        max_connections=settings.redis_max_connections,
+    )
+    await job_storage.connect()
     logger.info(
         f"Job storage initialized: {'Redis' if job_storage.use_redis else 'In-memory'}"
     )
 
+    # Worker processes pick jobs up from the queue in Redis
+    if settings.process_role == "api" and not job_storage.use_redis:
+        msg = "process_role 'api' needs Redis so worker processes can run jobs"
+        raise RuntimeError(msg)
+
+    # Fan WebSocket events out across replicas through the storage backend
+    await ws_manager.start(create_event_bus(job_storage))
+
+    if settings.process_role == "api":
+        logger.info("API-only process: jobs are queued for worker processes")
+    else:
+        # Load models and compile preset plans before the first job arrives
+        processor = get_processor()
+        logger.info(f"Presets available: {', '.join(processor.presets.names())}")
+
     # Initialize authentication database
     if settings.auth_enabled:
+        from auth import create_db_and_tables
+
         await create_db_and_tables()
         logger.info("Authentication database initialized")
 
@@ -61,6 +84,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     logger.info("Shutting down photo-to-line-vectorizer backend")
 
+    await ws_manager.stop()
+    await job_storage.close()
+
+    if get_scheduler.cache_info().currsize:
+        get_scheduler().shutdown(wait=False)
+
 
 app = FastAPI(
     title="Photo to Line Vectorizer API",
@@ -86,12 +115,17 @@ app.add_middleware(
 
 app.include_router(api_router, prefix="/api", tags=["api"])
 
-# Include auth routes if authentication is enabled
+# Include auth routes if authentication is enabled; fastapi-users and
+# SQLAlchemy are only imported then
 if settings.auth_enabled:
+    from auth.routes import router as auth_router
+
     app.include_router(auth_router)
 
 # Mount static files for uploaded images
-app.mount("/api/uploads", StaticFiles(directory=str(settings.upload_dir)), name="uploads")
+app.mount(
+    "/api/uploads", StaticFiles(directory=str(settings.upload_dir)), name="uploads"
+)
 
 
 @app.websocket("/ws/status/{job_id}")
@@ -116,6 +150,12 @@ async def root() -> dict[str, Any]:
             "process": "/api/process",
             "status": "/api/status/{job_id}",
             "download": "/api/download/{job_id}",
+            "batch_upload": "/api/batch/upload",
+            "batch_process": "/api/batch/process",
+            "batch_status": "/api/batch/status",
+            "stages": "/api/pipeline/stages",
+            "metrics": "/metrics",
+            "diagnostics": "/diagnostics",
         },
     }
 
@@ -126,6 +166,31 @@ async def health() -> dict[str, str]:
     return {"status": "healthy"}
 
 
+@app.get("/diagnostics")
+async def diagnostics() -> dict[str, Any]:
+    """
+    Process role, compute device and thread pool sizes in effect.
+
+    Device and thread details are only reported once the processor has
+    been loaded, which never happens in API-only processes.
+    """
+    info: dict[str, Any] = {"process_role": settings.process_role}
+    if get_processor.cache_info().currsize:
+        info.update(get_processor().device_manager.diagnostics())
+    return info
+
+
+@app.get(METRICS_PATH, response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """
+    Prometheus scrape endpoint.
+
+    Exposes per-stage timing, CPU, memory and payload-size histograms plus
+    the stage scheduler's queue depths.
+    """
+    return PlainTextResponse(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
 
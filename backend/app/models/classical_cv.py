@@ -11,9 +11,15 @@ import cv2
 import numpy as np
 from numpy.typing import NDArray
 
+from models.smoothing import smooth
+from models.smoothing_method import SmoothingMethod
+
 logger = logging.getLogger(__name__)
 
 RGB_CHANNELS = 3
+MAX_INTENSITY = 255
+# Thresholds only need the intensity distribution, not full resolution
+AUTO_THRESHOLD_MAX_DIMENSION = 256
 
 
 class CannyEdgeDetector:
@@ -94,6 +100,8 @@ class BilateralCannyDetector:
         bilateral_d: int = 9,
         bilateral_sigma_color: float = 75.0,
         bilateral_sigma_space: float = 75.0,
+        *,
+        smoothing: SmoothingMethod | str = SmoothingMethod.BILATERAL,
     ):
         """
         Initialize bilateral Canny detector.
@@ -104,12 +112,18 @@ class BilateralCannyDetector:
             bilateral_d: Diameter of bilateral filter
             bilateral_sigma_color: Filter sigma in color space
             bilateral_sigma_space: Filter sigma in coordinate space
+            smoothing: Edge-preserving smoother run before Canny; the
+                alternatives to the bilateral filter use the same settings
+
+        Raises:
+            ValueError: If the smoothing method is unknown
         """
         self.low_threshold = low_threshold
         self.high_threshold = high_threshold
         self.bilateral_d = bilateral_d
         self.bilateral_sigma_color = bilateral_sigma_color
         self.bilateral_sigma_space = bilateral_sigma_space
+        self.smoothing = SmoothingMethod(smoothing)
 
     def extract_lines(self, image: NDArray[np.uint8]) -> NDArray[np.uint8]:
         """
@@ -121,13 +135,15 @@ class BilateralCannyDetector:
         Returns:
             Binary edge map
         """
+        gray: NDArray[np.uint8]
         if len(image.shape) == RGB_CHANNELS:
-            gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+            gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)  # type: ignore[assignment]
         else:
             gray = image.copy()
 
-        filtered = cv2.bilateralFilter(
+        filtered = smooth(
             gray,
+            self.smoothing,
             self.bilateral_d,
             self.bilateral_sigma_color,
             self.bilateral_sigma_space,
@@ -137,7 +153,9 @@ class BilateralCannyDetector:
             filtered, self.low_threshold, self.high_threshold
         )  # type: ignore[assignment]
 
-        logger.debug(f"Bilateral Canny: {np.sum(edges > 0)} edge pixels")
+        logger.debug(
+            f"Bilateral Canny ({self.smoothing}): {np.sum(edges > 0)} edge pixels"
+        )
         return edges
 
 
@@ -207,6 +225,44 @@ class XDoGExtractor:
         return xdog_result
 
 
+def canny_thresholds(
+    image: NDArray[np.uint8],
+    sigma: float = 0.33,
+    max_dimension: int = AUTO_THRESHOLD_MAX_DIMENSION,
+) -> tuple[int, int]:
+    """
+    Derive Canny thresholds from the median intensity of an image.
+
+    The median is read off a histogram of a copy downsampled to
+    ``max_dimension``, so the cost is one resize and one pass over at
+    most ``max_dimension**2`` pixels whatever the input size.
+
+    Args:
+        image: Input RGB or grayscale image
+        sigma: Spread of the thresholds around the median
+        max_dimension: Longest side of the copy the histogram is built from
+
+    Returns:
+        Tuple of (low, high) thresholds
+    """
+    if len(image.shape) == RGB_CHANNELS:
+        gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    else:
+        gray = image
+
+    h, w = gray.shape[:2]
+    if max(h, w) > max_dimension:
+        scale = max_dimension / max(h, w)
+        size = (max(1, round(w * scale)), max(1, round(h * scale)))
+        gray = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+    cumulative = np.cumsum(np.bincount(gray.ravel(), minlength=MAX_INTENSITY + 1))
+    median = int(np.searchsorted(cumulative, (gray.size + 1) // 2))
+    lower = int(max(0, (1.0 - sigma) * median))
+    upper = int(min(MAX_INTENSITY, (1.0 + sigma) * median))
+    return lower, upper
+
+
 def auto_canny(image: NDArray[np.uint8], sigma: float = 0.33) -> NDArray[np.uint8]:
     """
     Automatic Canny edge detection with adaptive thresholds.
@@ -221,10 +277,7 @@ def auto_canny(image: NDArray[np.uint8], sigma: float = 0.33) -> NDArray[np.uint
     Returns:
         Binary edge map
     """
-    max_intensity = 255
-    v = np.median(image)
-    lower = int(max(0, (1.0 - sigma) * v))
-    upper = int(min(max_intensity, (1.0 + sigma) * v))
+    lower, upper = canny_thresholds(image, sigma)
 
     edges: NDArray[np.uint8] = cv2.Canny(image, lower, upper)  # type: ignore[assignment]
 
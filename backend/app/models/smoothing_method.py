@@ -0,0 +1,17 @@
+"""
+Names of the edge-preserving smoothers.
+
+Kept apart from ``models.smoothing`` so request validation can use them
+without importing OpenCV.
+"""
+
+from enum import StrEnum
+
+
+class SmoothingMethod(StrEnum):
+    """Edge-preserving smoothers available before Canny."""
+
+    BILATERAL = "bilateral"
+    BILATERAL_DOWNSAMPLED = "bilateral_downsampled"
+    GUIDED = "guided"
+    DOMAIN_TRANSFORM = "domain_transform"
@@ -5,8 +5,10 @@ Implements U²-Net for subject isolation and background removal.
 Uses pre-trained weights from the official repository.
 """
 
+import hashlib
 import logging
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import cv2
 import numpy as np
@@ -16,9 +18,30 @@ from numpy.typing import NDArray
 from torch import nn
 from utils.device import device_manager
 
+if TYPE_CHECKING:
+    from utils.mask_cache import MaskCache
+
 logger = logging.getLogger(__name__)
 
 RGB_CHANNELS = 3
+MASK_MAX = 255
+
+# Side length images are resized to for a single-pass prediction
+INPUT_SIZE = 512
+# Mask cascade: a coarse pass over the whole image, then a second pass
+# over grid tiles whose coarse mask is uncertain (within the margin of
+# the threshold). Tiles are 1/CASCADE_GRID of the longer image side and
+# are predicted with CASCADE_CONTEXT of their side as context around them.
+CASCADE_COARSE_SIZE = 320
+CASCADE_TILE_SIZE = 320
+CASCADE_GRID = 4
+CASCADE_CONTEXT = 0.25
+CASCADE_UNCERTAIN_MARGIN = 64
+# Tiles with fewer uncertain pixels than this share keep the coarse mask
+CASCADE_MIN_UNCERTAIN = 0.002
+CASCADE_BATCH_SIZE = 4
+# Hex digits of the weights hash used as the model version
+MODEL_VERSION_LENGTH = 12
 
 
 class REBNCONV(nn.Module):
@@ -341,44 +364,135 @@ class U2NetPredictor:
 
         state_dict = torch.load(self.model_path, map_location="cpu", weights_only=True)
         self.model.load_state_dict(state_dict)
+        self.version = hashlib.sha256(self.model_path.read_bytes()).hexdigest()[
+            :MODEL_VERSION_LENGTH
+        ]
 
     @torch.no_grad()
-    def predict(self, image: NDArray[np.uint8]) -> NDArray[np.uint8]:
+    def _infer(self, batch: torch.Tensor) -> NDArray[np.uint8]:
+        """
+        Run the model on preprocessed images.
+
+        Args:
+            batch: Tensor (N, 3, S, S) from ``_preprocess``
+
+        Returns:
+            Masks (N, S, S), range [0, 255]
+        """
+        batch_device: torch.Tensor = device_manager.to_device(batch)  # type: ignore[assignment]
+        d0, *_ = self.model(batch_device)
+        masks: NDArray[np.float32] = d0[:, 0].cpu().numpy()
+        return (masks * MASK_MAX).astype(np.uint8)
+
+    def predict(
+        self, image: NDArray[np.uint8], size: int = INPUT_SIZE
+    ) -> NDArray[np.uint8]:
         """
         Generate segmentation mask for input image.
 
         Args:
             image: Input RGB image as numpy array (H, W, 3), range [0, 255]
+            size: Side length the image is resized to for inference
 
         Returns:
             Binary mask as numpy array (H, W), range [0, 255]
         """
         original_size = image.shape[:2]
-        image_tensor = self._preprocess(image)
-        image_tensor_device: torch.Tensor = device_manager.to_device(image_tensor)  # type: ignore[assignment]
-
-        d0, *_ = self.model(image_tensor_device)
-
-        mask_np: NDArray[np.float32] = d0[0, 0].cpu().numpy()
-        mask = (mask_np * 255).astype(np.uint8)
+        [mask] = self._infer(self._preprocess(image, size))
         mask_resized: NDArray[np.uint8] = cv2.resize(  # type: ignore[assignment]
             mask, (original_size[1], original_size[0]), interpolation=cv2.INTER_LINEAR
         )
 
         return mask_resized
 
-    def _preprocess(self, image: NDArray[np.uint8]) -> torch.Tensor:
+    def predict_cascade(
+        self, image: NDArray[np.uint8], threshold: int = 128
+    ) -> NDArray[np.uint8]:
+        """
+        Generate a segmentation mask with the coarse-to-fine cascade.
+
+        The whole image is predicted at ``CASCADE_COARSE_SIZE``; only grid
+        tiles where enough of that mask lies within
+        ``CASCADE_UNCERTAIN_MARGIN`` of ``threshold`` are predicted again
+        at ``CASCADE_TILE_SIZE``, and only their uncertain pixels take the
+        tile prediction.
+
+        Args:
+            image: Input RGB image (H, W, 3)
+            threshold: Mask threshold the result will be binarized at
+
+        Returns:
+            Mask (H, W), range [0, 255]
+        """
+        height, width = image.shape[:2]
+        mask = self.predict(image, CASCADE_COARSE_SIZE)
+        uncertain = cv2.inRange(
+            mask,
+            max(threshold - CASCADE_UNCERTAIN_MARGIN, 0),
+            min(threshold + CASCADE_UNCERTAIN_MARGIN, MASK_MAX),
+        )
+
+        tile = -(-max(height, width) // CASCADE_GRID)
+        context = round(tile * CASCADE_CONTEXT)
+        regions = []
+        for y in range(0, height, tile):
+            for x in range(0, width, tile):
+                bottom, right = min(y + tile, height), min(x + tile, width)
+                count = cv2.countNonZero(uncertain[y:bottom, x:right])
+                if count < CASCADE_MIN_UNCERTAIN * (bottom - y) * (right - x):
+                    continue
+                regions.append(
+                    (
+                        (x, y, right, bottom),
+                        (
+                            max(x - context, 0),
+                            max(y - context, 0),
+                            min(right + context, width),
+                            min(bottom + context, height),
+                        ),
+                    )
+                )
+
+        for start in range(0, len(regions), CASCADE_BATCH_SIZE):
+            chunk = regions[start : start + CASCADE_BATCH_SIZE]
+            batch = torch.cat(
+                [
+                    self._preprocess(image[top:bottom, left:right], CASCADE_TILE_SIZE)
+                    for _, (left, top, right, bottom) in chunk
+                ]
+            )
+            for ((x0, y0, x1, y1), (left, top, right, bottom)), tile_mask in zip(
+                chunk, self._infer(batch), strict=True
+            ):
+                refined = cv2.resize(
+                    tile_mask,
+                    (right - left, bottom - top),
+                    interpolation=cv2.INTER_LINEAR,
+                )
+                np.copyto(
+                    mask[y0:y1, x0:x1],
+                    refined[y0 - top : y1 - top, x0 - left : x1 - left],
+                    where=uncertain[y0:y1, x0:x1] > 0,
+                )
+
+        logger.debug(f"Mask cascade refined {len(regions)} of {CASCADE_GRID**2} tiles")
+        return mask
+
+    def _preprocess(
+        self, image: NDArray[np.uint8], size: int = INPUT_SIZE
+    ) -> torch.Tensor:
         """
         Preprocess image for model input.
 
         Args:
             image: RGB numpy array (H, W, 3)
+            size: Side length of the model input
 
         Returns:
-            Preprocessed tensor (1, 3, 512, 512)
+            Preprocessed tensor (1, 3, size, size)
         """
         resized: NDArray[np.uint8] = cv2.resize(
-            image, (512, 512), interpolation=cv2.INTER_LINEAR
+            image, (size, size), interpolation=cv2.INTER_LINEAR
         )  # type: ignore[assignment]
         normalized: NDArray[np.float32] = resized.astype(np.float32) / 255.0
         standardized: NDArray[np.float32] = (
@@ -387,6 +501,53 @@ class U2NetPredictor:
         transposed = standardized.transpose(2, 0, 1)
         return torch.from_numpy(transposed).unsqueeze(0).float()
 
+    def predict_mask(
+        self,
+        image: NDArray[np.uint8],
+        threshold: int = 128,
+        cascade: bool = False,
+        cache: "MaskCache | None" = None,
+    ) -> NDArray[np.uint8]:
+        """
+        Generate a binary subject mask.
+
+        Args:
+            image: Input RGB image (H, W, 3)
+            threshold: Mask threshold for binary segmentation
+            cascade: Use ``predict_cascade`` instead of a single pass
+            cache: Persisted masks to reuse, keyed by image, weights and
+                inference mode
+
+        Returns:
+            Mask (H, W): 255 where the prediction exceeds ``threshold``, else 0
+        """
+        cached = None
+        if cache is not None:
+            # The cascade's refined tiles depend on the threshold
+            mode = (
+                f"cascade{CASCADE_COARSE_SIZE}-t{threshold}"
+                if cascade
+                else str(INPUT_SIZE)
+            )
+            key = cache.key(image, self.version, mode)
+            cached = cache.get(key)
+
+        if cached is not None:
+            logger.info("Reusing cached subject mask")
+            mask = cached
+        else:
+            mask = (
+                self.predict_cascade(image, threshold)
+                if cascade
+                else self.predict(image)
+            )
+            if cache is not None:
+                cache.put(key, mask)
+
+        mask_binary: NDArray[np.uint8]
+        _, mask_binary = cv2.threshold(mask, threshold, MASK_MAX, cv2.THRESH_BINARY)  # type: ignore[assignment]
+        return mask_binary
+
     def isolate_subject(
         self, image: NDArray[np.uint8], threshold: int = 128
     ) -> NDArray[np.uint8]:
@@ -400,14 +561,15 @@ class U2NetPredictor:
         Returns:
             RGBA image with background removed (H, W, 4)
         """
-        mask = self.predict(image)
-        mask_binary: NDArray[np.uint8] = (mask > threshold).astype(np.uint8) * 255
+        mask_binary = self.predict_mask(image, threshold)
 
         if image.shape[2] == RGB_CHANNELS:
-            alpha = mask_binary
-            result: NDArray[np.uint8] = np.dstack((image, alpha)).astype(np.uint8)
+            result: NDArray[np.uint8] = np.empty(
+                (*image.shape[:2], RGB_CHANNELS + 1), dtype=np.uint8
+            )
+            result[:, :, :RGB_CHANNELS] = image
         else:
             result = image.copy()
-            result[:, :, 3] = mask_binary
+        result[:, :, RGB_CHANNELS] = mask_binary
 
         return result
@@ -1,15 +1,13 @@
 """
 Export module for various plotter formats.
 
-Supports SVG, HPGL, and G-code export using vpype.
+Supports SVG, HPGL, and G-code export using vpype. vpype is imported on
+first export so processes that never convert a file do not load it.
 """
 
 import logging
-import tempfile
 from pathlib import Path
 
-import vpype as vp
-
 logger = logging.getLogger(__name__)
 
 
@@ -35,26 +33,19 @@ class PlotterExporter:
             output_path: Output file path
             layer_mode: Color mode (layer, device, or default)
         """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".svg", delete=False) as tmp:
-            tmp_path = Path(tmp.name)
-            tmp.write(svg_string)
-
-        try:
-            result = vp.read_svg(str(tmp_path), quantization=0.1)
-            # read_svg returns (LineCollection, width, height)
-            lc, page_w, page_h = result
+        import vpype as vp
+        from utils.svg import read_svg_string
 
-            # Create Document for writing
-            doc = vp.Document()
-            doc.add(lc, 1)  # Add to layer 1
-            doc.page_size = (page_w, page_h)
+        lc, page_w, page_h = read_svg_string(svg_string)
 
-            with output_path.open("w") as f:
-                vp.write_svg(f, doc, color_mode=layer_mode)
-            logger.info(f"Exported SVG to {output_path}")
+        # Create Document for writing
+        doc = vp.Document()
+        doc.add(lc, 1)  # Add to layer 1
+        doc.page_size = (page_w, page_h)
 
-        finally:
-            tmp_path.unlink(missing_ok=True)
+        with output_path.open("w") as f:
+            vp.write_svg(f, doc, color_mode=layer_mode)
+        logger.info(f"Exported SVG to {output_path}")
 
     def export_hpgl(
         self,
@@ -77,14 +68,10 @@ class PlotterExporter:
         Raises:
             RuntimeError: If HPGL export fails
         """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".svg", delete=False) as tmp:
-            tmp_path = Path(tmp.name)
-            tmp.write(svg_string)
-
         try:
-            result = vp.read_svg(str(tmp_path), quantization=0.1)
-            # read_svg returns (LineCollection, width, height)
-            lc, _, _ = result
+            from utils.svg import read_svg_string
+
+            lc, _, _ = read_svg_string(svg_string)
 
             # Build HPGL command
             hpgl_content = []
@@ -125,8 +112,6 @@ class PlotterExporter:
         except Exception as e:
             error_msg = f"HPGL export failed: {e}"
             raise RuntimeError(error_msg) from e
-        finally:
-            tmp_path.unlink(missing_ok=True)
 
     def export_gcode(
         self,
@@ -151,19 +136,14 @@ class PlotterExporter:
         Raises:
             RuntimeError: If G-code export fails
         """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".svg", delete=False) as tmp:
-            tmp_path = Path(tmp.name)
-            tmp.write(svg_string)
-
         try:
             # Use vpype-gcode plugin
+            from utils.svg import read_svg_string
             from vpype_gcode import (
                 gwrite,  # type: ignore[import-untyped]
             )
 
-            result = vp.read_svg(str(tmp_path), quantization=0.1)
-            # read_svg returns (LineCollection, width, height)
-            lc, _, _ = result
+            lc, _, _ = read_svg_string(svg_string)
 
             # Generate G-code
             gcode_lines = []
@@ -216,8 +196,6 @@ class PlotterExporter:
         except Exception as e:
             error_msg = f"G-code export failed: {e}"
             raise RuntimeError(error_msg) from e
-        finally:
-            tmp_path.unlink(missing_ok=True)
 
     def export_to_format(
         self,
@@ -10,6 +10,7 @@ import logging
 import cv2
 import numpy as np
 from numpy.typing import NDArray
+from utils.cache import hatch_patterns
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,49 @@ ANGLE_0 = 0
 ANGLE_90 = 90
 
 
+def _draw_pattern(
+    height: int, width: int, spacing_px: int, angle: int
+) -> NDArray[np.uint8]:
+    """Rasterize parallel hatch lines covering a height x width frame."""
+    mask = np.zeros((height, width), dtype=np.uint8)
+    for i in range(0, max(height, width) * 2, spacing_px):
+        if angle == ANGLE_45:
+            cv2.line(mask, (-width, i), (i, -height), 255, 1)
+        elif angle == ANGLE_NEG_45:
+            cv2.line(mask, (width * 2, i), (i, height * 2), 255, 1)
+        elif angle == ANGLE_0:
+            if i < height:
+                cv2.line(mask, (0, i), (width, i), 255, 1)
+        elif angle == ANGLE_90 and i < width:
+            cv2.line(mask, (i, 0), (i, height), 255, 1)
+    mask.flags.writeable = False
+    return mask
+
+
+def hatch_pattern(
+    height: int, width: int, spacing_px: int, angle: int
+) -> NDArray[np.uint8]:
+    """
+    Get the hatch line pattern for a frame size, spacing and angle.
+
+    Patterns only depend on these four values, so they are drawn once and
+    shared between jobs. The returned array is read-only.
+
+    Args:
+        height: Frame height in pixels
+        width: Frame width in pixels
+        spacing_px: Distance between hatch lines in pixels
+        angle: Hatch angle in degrees (45, -45, 0 or 90)
+
+    Returns:
+        Binary pattern (255 = hatch line)
+    """
+    return hatch_patterns.get(
+        (height, width, spacing_px, angle),
+        lambda: _draw_pattern(height, width, spacing_px, angle),
+    )
+
+
 class HatchGenerator:
     """
     Generates hatching lines for dark regions in images.
@@ -78,31 +122,14 @@ class HatchGenerator:
         spacing_px = int(self.line_width_mm * self.density_factor * pixels_per_mm)
         spacing_px = max(spacing_px, 2)
 
-        hatch_mask = np.zeros_like(gray)
-        crosshatch_mask = np.zeros_like(gray)
-
-        for i in range(0, max(h, w) * 2, spacing_px):
-            if angle == ANGLE_45:
-                cv2.line(hatch_mask, (-w, i), (i, -h), 255, 1)
-            elif angle == ANGLE_NEG_45:
-                cv2.line(hatch_mask, (w * 2, i), (i, h * 2), 255, 1)
-            elif angle == ANGLE_0:
-                if i < h:
-                    cv2.line(hatch_mask, (0, i), (w, i), 255, 1)
-            elif angle == ANGLE_90 and i < w:
-                cv2.line(hatch_mask, (i, 0), (i, h), 255, 1)
+        hatch_mask = hatch_pattern(h, w, spacing_px, angle)
 
         dark_regions = gray < self.darkness_threshold
         hatching = np.where(dark_regions, hatch_mask, 0).astype(np.uint8)
 
-        if self.crosshatch_threshold > 0:
+        if self.crosshatch_threshold > 0 and angle in (ANGLE_45, ANGLE_NEG_45):
             very_dark_regions = gray < self.crosshatch_threshold
-
-            for i in range(0, max(h, w) * 2, spacing_px):
-                if angle == ANGLE_45:
-                    cv2.line(crosshatch_mask, (w * 2, i), (i, h * 2), 255, 1)
-                elif angle == ANGLE_NEG_45:
-                    cv2.line(crosshatch_mask, (-w, i), (i, -h), 255, 1)
+            crosshatch_mask = hatch_pattern(h, w, spacing_px, -angle)
 
             crosshatching = np.where(very_dark_regions, crosshatch_mask, 0).astype(
                 np.uint8
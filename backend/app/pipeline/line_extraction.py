@@ -15,7 +15,9 @@ from models.classical_cv import (
     XDoGExtractor,
     auto_canny,
 )
+from models.smoothing_method import SmoothingMethod
 from numpy.typing import NDArray
+from utils.cache import stage_objects
 
 logger = logging.getLogger(__name__)
 
@@ -69,15 +71,24 @@ class LineExtractor:
 
         if method == LineExtractionMethod.CANNY:
             if low_threshold and high_threshold:
-                canny_detector = CannyEdgeDetector(low_threshold, high_threshold)
+                canny_detector = stage_objects.get(
+                    ("canny", low_threshold, high_threshold),
+                    lambda: CannyEdgeDetector(low_threshold, high_threshold),
+                )
             else:
                 canny_detector = self.canny
             return canny_detector.extract_lines(image)
 
         if method == LineExtractionMethod.BILATERAL_CANNY:
             if low_threshold and high_threshold:
-                bilateral_detector = BilateralCannyDetector(
-                    low_threshold, high_threshold
+                bilateral_detector = stage_objects.get(
+                    (
+                        "bilateral_canny",
+                        low_threshold,
+                        high_threshold,
+                        SmoothingMethod.BILATERAL,
+                    ),
+                    lambda: BilateralCannyDetector(low_threshold, high_threshold),
                 )
             else:
                 bilateral_detector = self.bilateral_canny
@@ -6,10 +6,9 @@ using the vpype library.
 """
 
 import logging
-import tempfile
-from pathlib import Path
 
 import vpype as vp
+from utils.svg import read_svg_string, write_svg_string
 
 logger = logging.getLogger(__name__)
 
@@ -45,60 +44,40 @@ class VpypeOptimizer:
         Returns:
             Optimized SVG string
         """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".svg", delete=False) as tmp:
-            tmp_path = Path(tmp.name)
-            tmp.write(svg_string)
-
-        output_path = None
-        try:
-            result = vp.read_svg(str(tmp_path), quantization=0.1)
-            # read_svg returns (LineCollection, width, height)
-            lc, _page_w, _page_h = result
-
-            logger.debug(f"Initial path count: {len(lc)}")
-
-            # Optimize
-            lc.merge(tolerance=merge_tolerance)
-            logger.debug(f"After merge: {len(lc)}")
-            lc.reloop(tolerance=dedupe_tolerance)
-            logger.debug("Reloop complete")
-
-            # Scale to fit target dimensions
-            bounds = lc.bounds()
-            if bounds:
-                current_width = bounds[2] - bounds[0]
-                current_height = bounds[3] - bounds[1]
-                logger.debug(f"Current bounds: {current_width}x{current_height}")
-
-                scale_x = canvas_width_mm / current_width if current_width > 0 else 1.0
-                scale_y = (
-                    canvas_height_mm / current_height if current_height > 0 else 1.0
-                )
-                scale_factor = min(scale_x, scale_y)
-                lc.scale(scale_factor, scale_factor)
-
-            logger.info(f"Final path count: {len(lc)}")
-
-            # Create Document for writing
-            doc = vp.Document()
-            doc.add(lc, 1)
-            doc.page_size = (canvas_width_mm, canvas_height_mm)
-
-            output_path = tmp_path.with_suffix(".optimized.svg")
-            with output_path.open("w") as f:
-                vp.write_svg(
-                    f,
-                    doc,
-                    page_size=(canvas_width_mm, canvas_height_mm),
-                    color_mode="layer",
-                )
-
-            return output_path.read_text()
-
-        finally:
-            tmp_path.unlink(missing_ok=True)
-            if output_path is not None:
-                output_path.unlink(missing_ok=True)
+        lc, _page_w, _page_h = read_svg_string(svg_string)
+
+        logger.debug(f"Initial path count: {len(lc)}")
+
+        # Optimize
+        lc.merge(tolerance=merge_tolerance)
+        logger.debug(f"After merge: {len(lc)}")
+        lc.reloop(tolerance=dedupe_tolerance)
+        logger.debug("Reloop complete")
+
+        # Scale to fit target dimensions
+        bounds = lc.bounds()
+        if bounds:
+            current_width = bounds[2] - bounds[0]
+            current_height = bounds[3] - bounds[1]
+            logger.debug(f"Current bounds: {current_width}x{current_height}")
+
+            scale_x = canvas_width_mm / current_width if current_width > 0 else 1.0
+            scale_y = canvas_height_mm / current_height if current_height > 0 else 1.0
+            scale_factor = min(scale_x, scale_y)
+            lc.scale(scale_factor, scale_factor)
+
+        logger.info(f"Final path count: {len(lc)}")
+
+        # Create Document for writing
+        doc = vp.Document()
+        doc.add(lc, 1)
+        doc.page_size = (canvas_width_mm, canvas_height_mm)
+
+        return write_svg_string(
+            doc,
+            page_size=(canvas_width_mm, canvas_height_mm),
+            color_mode="layer",
+        )
 
     def get_stats(self, svg_string: str) -> dict[str, float]:
         """
@@ -110,33 +89,23 @@ class VpypeOptimizer:
         Returns:
             Dictionary with path statistics
         """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".svg", delete=False) as tmp:
-            tmp_path = Path(tmp.name)
-            tmp.write(svg_string)
-
-        try:
-            result = vp.read_svg(str(tmp_path), quantization=0.1)
-            # read_svg returns (LineCollection, width, height)
-            lc, _, _ = result
-
-            path_count = len(lc)
-            total_length = lc.length()
-            bounds = lc.bounds()
+        lc, _, _ = read_svg_string(svg_string)
 
-            stats = {
-                "path_count": path_count,
-                "total_length_mm": total_length,
-                "bounds": bounds,
-            }
+        path_count = len(lc)
+        total_length = lc.length()
+        bounds = lc.bounds()
 
-            if bounds:
-                stats["width_mm"] = bounds[2] - bounds[0]
-                stats["height_mm"] = bounds[3] - bounds[1]
+        stats = {
+            "path_count": path_count,
+            "total_length_mm": total_length,
+            "bounds": bounds,
+        }
 
-            return stats
+        if bounds:
+            stats["width_mm"] = bounds[2] - bounds[0]
+            stats["height_mm"] = bounds[3] - bounds[1]
 
-        finally:
-            tmp_path.unlink(missing_ok=True)
+        return stats
 
     def scale_to_canvas(
         self,
@@ -157,46 +126,26 @@ class VpypeOptimizer:
         Returns:
             Scaled SVG string
         """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".svg", delete=False) as tmp:
-            tmp_path = Path(tmp.name)
-            tmp.write(svg_string)
-
-        output_path = None
-        try:
-            result = vp.read_svg(str(tmp_path), quantization=0.1)
-            # read_svg returns (LineCollection, width, height)
-            lc, _, _ = result
-
-            # Scale to fit target dimensions
-            bounds = lc.bounds()
-            if bounds:
-                current_width = bounds[2] - bounds[0]
-                current_height = bounds[3] - bounds[1]
-
-                scale_x = canvas_width_mm / current_width if current_width > 0 else 1.0
-                scale_y = (
-                    canvas_height_mm / current_height if current_height > 0 else 1.0
-                )
-                scale_factor = min(scale_x, scale_y)
-                lc.scale(scale_factor, scale_factor)
-
-            # Create Document for writing
-            doc = vp.Document()
-            doc.add(lc, 1)
-            doc.page_size = (canvas_width_mm, canvas_height_mm)
-
-            output_path = tmp_path.with_suffix(".scaled.svg")
-            with output_path.open("w") as f:
-                vp.write_svg(
-                    f,
-                    doc,
-                    page_size=(canvas_width_mm, canvas_height_mm),
-                    color_mode="layer",
-                )
-
-            return output_path.read_text()
-
-        finally:
-            tmp_path.unlink(missing_ok=True)
-            if output_path is not None and output_path.exists():
-                output_path.unlink()
+        lc, _, _ = read_svg_string(svg_string)
+
+        # Scale to fit target dimensions
+        bounds = lc.bounds()
+        if bounds:
+            current_width = bounds[2] - bounds[0]
+            current_height = bounds[3] - bounds[1]
+
+            scale_x = canvas_width_mm / current_width if current_width > 0 else 1.0
+            scale_y = canvas_height_mm / current_height if current_height > 0 else 1.0
+            scale_factor = min(scale_x, scale_y)
+            lc.scale(scale_factor, scale_factor)
+
+        # Create Document for writing
+        doc = vp.Document()
+        doc.add(lc, 1)
+        doc.page_size = (canvas_width_mm, canvas_height_mm)
+
+        return write_svg_string(
+            doc,
+            page_size=(canvas_width_mm, canvas_height_mm),
+            color_mode="layer",
+        )
@@ -0,0 +1,64 @@
+"""
+Processing parameters and results.
+
+Kept free of OpenCV, torch and the extension system so an API-only
+process can validate requests, resolve presets and queue jobs without
+loading the pipeline.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from models.smoothing_method import SmoothingMethod
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+@dataclass
+class ProcessingParams:
+    """
+    Parameters for image processing pipeline.
+
+    All canvas and line width parameters are required and specified in mm.
+    """
+
+    canvas_width_mm: float
+    canvas_height_mm: float
+    line_width_mm: float
+    isolate_subject: bool = False
+    refine_mask: bool = False
+    mask_cascade: bool = False
+    use_ml: bool = False
+    edge_threshold: tuple[int, int] = (50, 150)
+    smoothing: str = SmoothingMethod.BILATERAL
+    auto_threshold: bool = False
+    line_threshold: int = 16
+    merge_tolerance: float = 0.5
+    simplify_tolerance: float = 0.2
+    hatching_enabled: bool = False
+    hatch_density: float = 2.0
+    hatch_angle: int = 45
+    darkness_threshold: int = 100
+
+
+@dataclass
+class ProcessingResult:
+    """
+    Result of processing pipeline.
+
+    Attributes:
+        svg_content: Optimized SVG string
+        stats: Dictionary containing processing statistics
+        device_used: Name of device used for processing
+        stage_metrics: Timing and resource record for each extension call
+        plan_id: Identifier of the pipeline plan the job ran with
+    """
+
+    svg_content: str
+    stats: Mapping[str, float | int | tuple[float, ...] | None]
+    device_used: str
+    stage_metrics: list[dict[str, Any]] = field(default_factory=list)
+    plan_id: str | None = None
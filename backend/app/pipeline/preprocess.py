@@ -15,13 +15,15 @@ import pillow_heif
 from models.u2net import U2NetPredictor
 from numpy.typing import NDArray
 from PIL import Image
+from utils import compositing
+from utils.cache import get_clahe
+from utils.mask_cache import get_mask_cache
 
 logger = logging.getLogger(__name__)
 
 pillow_heif.register_heif_opener()
 
 RGB_CHANNELS = 3
-ALPHA_MAX = 255.0
 
 
 class ImagePreprocessor:
@@ -119,6 +121,8 @@ class ImagePreprocessor:
         image: NDArray[np.uint8],
         threshold: int = 128,
         background_color: tuple[int, int, int] = (255, 255, 255),
+        refine: bool = False,
+        cascade: bool = False,
     ) -> NDArray[np.uint8]:
         """
         Isolate subject from background using U²-Net.
@@ -127,6 +131,8 @@ class ImagePreprocessor:
             image: Input RGB image
             threshold: Mask threshold for segmentation
             background_color: Color for removed background
+            refine: Soften the mask along image edges with a guided filter
+            cascade: Segment with the coarse-to-fine mask cascade
 
         Returns:
             RGB image with background replaced
@@ -138,13 +144,12 @@ class ImagePreprocessor:
             msg = "U²-Net predictor not initialized"
             raise RuntimeError(msg)
 
-        rgba = self.u2net.isolate_subject(image, threshold)
-
-        rgb_with_bg = np.full_like(image, background_color, dtype=np.uint8)
-        alpha = rgba[:, :, 3:4] / ALPHA_MAX
-        rgb_with_bg = (rgba[:, :, :3] * alpha + rgb_with_bg * (1 - alpha)).astype(
-            np.uint8
+        mask = self.u2net.predict_mask(
+            image, threshold, cascade=cascade, cache=get_mask_cache()
         )
+        if refine:
+            mask = compositing.refine_mask(image, mask)
+        rgb_with_bg = compositing.composite(image, mask, background_color)
 
         logger.info("Subject isolation complete")
         return rgb_with_bg
@@ -165,12 +170,12 @@ class ImagePreprocessor:
         if len(image.shape) == RGB_CHANNELS:
             lab = cv2.cvtColor(image, cv2.COLOR_RGB2LAB)
             lightness, a_channel, b_channel = cv2.split(lab)
-            clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(8, 8))
+            clahe = get_clahe(clip_limit)
             lightness = clahe.apply(lightness)
             enhanced_lab = cv2.merge([lightness, a_channel, b_channel])
             enhanced: NDArray[np.uint8] = cv2.cvtColor(enhanced_lab, cv2.COLOR_LAB2RGB)  # type: ignore[assignment]
         else:
-            clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(8, 8))
+            clahe = get_clahe(clip_limit)
             enhanced = clahe.apply(image)  # type: ignore[assignment]
 
         logger.debug("Contrast normalization applied")
@@ -182,6 +187,7 @@ class ImagePreprocessor:
         isolate_subject: bool = False,
         max_dimension: int = 2048,
         enhance_contrast: bool = False,
+        refine_mask: bool = False,
     ) -> NDArray[np.uint8]:
         """
         Complete preprocessing pipeline.
@@ -191,6 +197,7 @@ class ImagePreprocessor:
             isolate_subject: Whether to isolate subject from background
             max_dimension: Maximum image dimension
             enhance_contrast: Whether to apply contrast enhancement
+            refine_mask: Whether to refine the subject mask with a guided filter
 
         Returns:
             Preprocessed RGB image
@@ -202,6 +209,6 @@ class ImagePreprocessor:
             image = self.normalize_contrast(image)
 
         if isolate_subject and self.u2net is not None:
-            image = self.isolate_subject(image)
+            image = self.isolate_subject(image, refine=refine_mask)
 
         return image
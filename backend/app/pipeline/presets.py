@@ -0,0 +1,465 @@
+"""
+Processing presets and the pipeline plans compiled from them.
+
+A preset names a set of processing settings (everything in
+``ProcessingParams`` except the per-job canvas and line width). The
+``PresetRegistry`` compiles each preset once into a ``PipelinePlan``: the
+provider chosen for every stage and the keyword arguments each stage is
+called with. Jobs look their plan up by settings, so a job using a preset
+reuses the plan compiled at startup, and every plan carries a stable
+``plan_id`` that caches can key on.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, fields
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+from pipeline.params import ProcessingParams
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from pathlib import Path
+
+    from extensions.base import AbstractStaticExtension
+
+logger = logging.getLogger(__name__)
+
+# Supplied per job rather than by a preset
+JOB_FIELDS = frozenset({"canvas_width_mm", "canvas_height_mm", "line_width_mm"})
+
+DEFAULT_PRESET = "auto"
+
+# Named settings; "auto" is the ProcessingParams defaults
+PRESETS: dict[str, dict[str, Any]] = {
+    "auto": {},
+    "portrait": {
+        "isolate_subject": True,
+        "use_ml": False,
+        "edge_threshold": (50, 150),
+        "line_threshold": 16,
+        "merge_tolerance": 0.5,
+        "simplify_tolerance": 0.2,
+        "hatching_enabled": True,
+        "hatch_density": 2.0,
+        "hatch_angle": 45,
+        "darkness_threshold": 100,
+    },
+    "animal": {
+        "isolate_subject": True,
+        "use_ml": False,
+        "edge_threshold": (30, 120),
+        "line_threshold": 12,
+        "merge_tolerance": 0.3,
+        "simplify_tolerance": 0.15,
+        "hatching_enabled": True,
+        "hatch_density": 1.5,
+        "hatch_angle": 45,
+        "darkness_threshold": 80,
+    },
+}
+
+# Fast preview profile: cheaper providers and coarser path settings
+PREVIEW_MIN_MERGE_TOLERANCE_MM = 1.0
+PREVIEW_MIN_SIMPLIFY_TOLERANCE_MM = 1.0
+PREVIEW_QTRES = 2.0
+PREVIEW_PATHOMIT = 16
+FULL_QTRES = 1.0
+FULL_PATHOMIT = 8
+
+# Ad-hoc (non-preset) plans kept for reuse
+MAX_CACHED_PLANS = 128
+
+PLAN_ID_LENGTH = 12
+
+
+@dataclass(frozen=True)
+class StagePlan:
+    """
+    Resolved configuration of one pipeline stage.
+
+    Attributes:
+        providers: Provider preference order; the provider resolved at
+            compile time comes first
+        options: Keyword arguments passed to the extension
+    """
+
+    providers: tuple[str, ...]
+    options: Mapping[str, Any]
+
+
+@dataclass(frozen=True)
+class HatchPlan:
+    """Hatching settings; spacing still depends on the job's line width."""
+
+    density: float
+    angle: int
+    darkness_threshold: int
+
+
+@dataclass(frozen=True)
+class PipelinePlan:
+    """
+    A compiled, immutable description of how to run the pipeline.
+
+    Attributes:
+        plan_id: Stable identifier derived from the resolved plan
+        preset: Preset the plan was compiled from, None for ad-hoc settings
+        preview: Whether this is the fast preview profile
+        settings: Processing settings the plan was compiled from
+        stages: StagePlan for each stage of ``PhotoToLineProcessor.STAGES``
+        hatching: Hatching settings, None when hatching is disabled
+    """
+
+    plan_id: str
+    preset: str | None
+    preview: bool
+    settings: Mapping[str, Any]
+    stages: Mapping[str, StagePlan]
+    hatching: HatchPlan | None
+
+
+def plan_settings(params: ProcessingParams) -> dict[str, Any]:
+    """
+    Extract the preset-controlled settings from processing parameters.
+
+    Args:
+        params: Full processing parameters
+
+    Returns:
+        Settings without the per-job canvas and line width
+    """
+    return {
+        name: list(value) if isinstance(value, tuple) else value
+        for name, value in asdict(params).items()
+        if name not in JOB_FIELDS
+    }
+
+
+def preset_params(
+    preset: str,
+    canvas_width_mm: float,
+    canvas_height_mm: float,
+    line_width_mm: float,
+    *,
+    presets: Mapping[str, Mapping[str, Any]] = PRESETS,
+    overrides: Mapping[str, Any] | None = None,
+) -> ProcessingParams:
+    """
+    Build processing parameters from a named preset.
+
+    Args:
+        preset: Preset name
+        canvas_width_mm: Required canvas width in mm
+        canvas_height_mm: Required canvas height in mm
+        line_width_mm: Required line width in mm
+        presets: Preset table to look ``preset`` up in
+        overrides: Settings that take precedence over the preset
+
+    Returns:
+        ProcessingParams for the preset
+
+    Raises:
+        ValueError: If the preset is unknown
+    """
+    if preset not in presets:
+        msg = f"Unknown preset: {preset}"
+        raise ValueError(msg)
+
+    settings = {**presets[preset], **(overrides or {})}
+    if "edge_threshold" in settings:
+        settings["edge_threshold"] = tuple(settings["edge_threshold"])
+
+    return ProcessingParams(
+        canvas_width_mm=canvas_width_mm,
+        canvas_height_mm=canvas_height_mm,
+        line_width_mm=line_width_mm,
+        **settings,
+    )
+
+
+def load_presets(path: Path | None) -> dict[str, dict[str, Any]]:
+    """
+    Merge presets from a JSON file over the built-in ones.
+
+    The file maps preset names to settings objects using the field names of
+    ``ProcessingParams`` (without canvas and line width). A preset with a
+    built-in name replaces that preset.
+
+    Args:
+        path: JSON file, or None for the built-in presets only
+
+    Returns:
+        Preset table
+
+    Raises:
+        ValueError: If the file is unreadable or uses unknown settings
+        TypeError: If the file or a preset is not a JSON object
+    """
+    presets = {name: dict(settings) for name, settings in PRESETS.items()}
+    if path is None:
+        return presets
+
+    try:
+        loaded = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError) as e:
+        msg = f"Cannot read presets file {path}: {e}"
+        raise ValueError(msg) from e
+    if not isinstance(loaded, dict):
+        msg = f"Presets file {path} must contain a JSON object"
+        raise TypeError(msg)
+
+    allowed = {f.name for f in fields(ProcessingParams)} - JOB_FIELDS
+    for name, settings in loaded.items():
+        if not isinstance(settings, dict):
+            msg = f"Preset '{name}' in {path} must be a JSON object"
+            raise TypeError(msg)
+        if unknown := set(settings) - allowed:
+            msg = f"Preset '{name}' in {path} has unknown settings: {sorted(unknown)}"
+            raise ValueError(msg)
+        presets[name] = settings
+
+    logger.info(f"Loaded {len(loaded)} preset(s) from {path}")
+    return presets
+
+
+def _resolve(
+    extension: type[AbstractStaticExtension], preferences: list[str]
+) -> tuple[str, ...]:
+    """Put the provider that is actually available first."""
+    try:
+        chosen = extension.select_provider(preferences).name
+    except RuntimeError:
+        # Nothing usable right now; keep the preferences so the error
+        # surfaces on the job rather than at startup
+        logger.warning(f"No available provider for {extension.name}: {preferences}")
+        return tuple(preferences)
+    return (chosen, *(name for name in preferences if name != chosen))
+
+
+def compile_plan(
+    settings: Mapping[str, Any],
+    preset: str | None = None,
+    preview: bool = False,
+    u2net_available: bool = False,
+) -> PipelinePlan:
+    """
+    Compile processing settings into a pipeline plan.
+
+    Args:
+        settings: Preset-controlled settings, as from ``plan_settings``
+        preset: Name of the preset the settings come from
+        preview: Compile the fast preview profile
+        u2net_available: Whether U²-Net weights are installed
+
+    Returns:
+        Immutable PipelinePlan
+    """
+    # Selecting providers loads the extension system (and OpenCV), which
+    # processes that only resolve parameters never need
+    from extensions.line_extraction.EXT_LineExtraction import EXT_LineExtraction
+    from extensions.optimize.EXT_Optimize import EXT_Optimize
+    from extensions.preprocess.EXT_Preprocess import EXT_Preprocess
+    from extensions.vectorize.EXT_Vectorize import EXT_Vectorize
+
+    use_u2net = u2net_available and not preview
+    isolate = settings["isolate_subject"] and not preview
+    merge_tolerance = settings["merge_tolerance"]
+    simplify_tolerance = settings["simplify_tolerance"]
+    if preview:
+        merge_tolerance = max(merge_tolerance, PREVIEW_MIN_MERGE_TOLERANCE_MM)
+        simplify_tolerance = max(simplify_tolerance, PREVIEW_MIN_SIMPLIFY_TOLERANCE_MM)
+
+    stages = {
+        "preprocess": StagePlan(
+            providers=_resolve(
+                EXT_Preprocess, ["u2net"] if use_u2net else ["classical_cv"]
+            ),
+            options={
+                "isolate_subject": isolate,
+                # The mask locates the subject for cropping later stages
+                "keep_alpha": isolate,
+                "refine_mask": settings["refine_mask"],
+                "mask_cascade": settings["mask_cascade"],
+                "enhance_contrast": False,
+            },
+        ),
+        "line_extraction": StagePlan(
+            providers=_resolve(
+                EXT_LineExtraction,
+                ["auto_canny" if preview else "bilateral_canny"],
+            ),
+            options={
+                "edge_threshold": tuple(settings["edge_threshold"]),
+                # auto_canny has no ML path and rejects use_ml
+                "use_ml": settings["use_ml"] and not preview,
+                "smoothing": settings["smoothing"],
+                "auto_threshold": settings["auto_threshold"],
+            },
+        ),
+        "vectorize": StagePlan(
+            providers=_resolve(EXT_Vectorize, ["imagetracer"]),
+            options={
+                "line_threshold": settings["line_threshold"],
+                "qtres": PREVIEW_QTRES if preview else FULL_QTRES,
+                "pathomit": PREVIEW_PATHOMIT if preview else FULL_PATHOMIT,
+            },
+        ),
+        "optimize": StagePlan(
+            providers=_resolve(EXT_Optimize, ["vpype"]),
+            options={
+                "merge_tolerance": merge_tolerance,
+                "simplify_tolerance": simplify_tolerance,
+            },
+        ),
+    }
+    hatching = (
+        HatchPlan(
+            density=settings["hatch_density"],
+            angle=settings["hatch_angle"],
+            darkness_threshold=settings["darkness_threshold"],
+        )
+        if settings["hatching_enabled"]
+        else None
+    )
+
+    fingerprint = json.dumps(
+        {
+            "preview": preview,
+            "stages": {
+                name: {"providers": stage.providers, "options": stage.options}
+                for name, stage in stages.items()
+            },
+            "hatching": asdict(hatching) if hatching else None,
+        },
+        sort_keys=True,
+    )
+
+    return PipelinePlan(
+        plan_id=hashlib.sha256(fingerprint.encode()).hexdigest()[:PLAN_ID_LENGTH],
+        preset=preset,
+        preview=preview,
+        settings=MappingProxyType(dict(settings)),
+        stages=MappingProxyType(
+            {
+                name: StagePlan(stage.providers, MappingProxyType(stage.options))
+                for name, stage in stages.items()
+            }
+        ),
+        hatching=hatching,
+    )
+
+
+class PresetRegistry:
+    """
+    Presets compiled into pipeline plans.
+
+    Every preset is compiled (full and preview profile) when the registry
+    is created. Settings that match no preset, such as custom API
+    parameters, are compiled on first use and kept in a bounded LRU.
+    """
+
+    def __init__(
+        self,
+        presets: Mapping[str, Mapping[str, Any]] | None = None,
+        u2net_available: bool = False,
+        compile_plans: bool = True,
+    ):
+        """
+        Compile every preset.
+
+        Args:
+            presets: Preset table (default: built-in ``PRESETS``)
+            u2net_available: Whether U²-Net weights are installed
+            compile_plans: Compile the preset plans now; processes that
+                only resolve parameters skip it, as compiling selects (and
+                so imports) providers
+        """
+        self.presets = dict(presets if presets is not None else PRESETS)
+        self.u2net_available = u2net_available
+        self._lock = threading.Lock()
+        self._preset_plans: dict[tuple[str, bool], PipelinePlan] = {}
+        self._adhoc_plans: OrderedDict[tuple[str, bool], PipelinePlan] = OrderedDict()
+
+        for name in self.presets if compile_plans else ():
+            # Canvas and line width do not affect the plan
+            settings = plan_settings(
+                preset_params(name, 1.0, 1.0, 1.0, presets=self.presets)
+            )
+            for preview in (False, True):
+                self._preset_plans[self._key(settings, preview)] = compile_plan(
+                    settings,
+                    preset=name,
+                    preview=preview,
+                    u2net_available=u2net_available,
+                )
+
+        logger.info(f"Compiled {len(self._preset_plans)} pipeline plans")
+
+    @staticmethod
+    def _key(settings: Mapping[str, Any], preview: bool) -> tuple[str, bool]:
+        return json.dumps(settings, sort_keys=True), preview
+
+    def names(self) -> list[str]:
+        """Names of all registered presets."""
+        return list(self.presets)
+
+    def params(
+        self,
+        preset: str,
+        canvas_width_mm: float,
+        canvas_height_mm: float,
+        line_width_mm: float,
+        overrides: Mapping[str, Any] | None = None,
+    ) -> ProcessingParams:
+        """
+        Build job parameters from a registered preset.
+
+        Raises:
+            ValueError: If the preset is unknown
+        """
+        return preset_params(
+            preset,
+            canvas_width_mm,
+            canvas_height_mm,
+            line_width_mm,
+            presets=self.presets,
+            overrides=overrides,
+        )
+
+    def plan_for(self, params: ProcessingParams, preview: bool = False) -> PipelinePlan:
+        """
+        Get the compiled plan for a job's parameters.
+
+        Args:
+            params: Processing parameters of the job
+            preview: Whether the job runs the fast preview profile
+
+        Returns:
+            The preset's precompiled plan when the settings match a preset,
+            otherwise a plan compiled on first use
+        """
+        settings = plan_settings(params)
+        key = self._key(settings, preview)
+        if plan := self._preset_plans.get(key):
+            return plan
+
+        with self._lock:
+            if plan := self._adhoc_plans.get(key):
+                self._adhoc_plans.move_to_end(key)
+                return plan
+
+        plan = compile_plan(
+            settings, preview=preview, u2net_available=self.u2net_available
+        )
+        with self._lock:
+            self._adhoc_plans[key] = plan
+            while len(self._adhoc_plans) > MAX_CACHED_PLANS:
+                self._adhoc_plans.popitem(last=False)
+        return plan
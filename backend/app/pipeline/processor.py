@@ -6,66 +6,112 @@ image upload through preprocessing, line extraction, vectorization,
 optimization, and export.
 """
 
+from __future__ import annotations
+
 import logging
-from collections.abc import Mapping
-from dataclasses import dataclass
-from pathlib import Path
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, ClassVar, TypeVar
 
 import cv2
+from extensions.base import RunContext
+from extensions.instrumentation import install_instrumentation
 from extensions.line_extraction.EXT_LineExtraction import EXT_LineExtraction
 from extensions.optimize.EXT_Optimize import EXT_Optimize
 from extensions.preprocess.EXT_Preprocess import EXT_Preprocess
+from extensions.progress import install_progress_hooks
 from extensions.registry import ExtensionRegistry
 from extensions.vectorize.EXT_Vectorize import EXT_Vectorize
+from models.classical_cv import canny_thresholds
+from utils.cache import stage_objects
+from utils.mask_cache import configure_mask_cache
 
+from pipeline.guardrail import EdgeBudget, enforce_edge_budget
 from pipeline.hatching import HatchGenerator
+from pipeline.params import ProcessingParams, ProcessingResult
+from pipeline.presets import PresetRegistry
+from pipeline.progress import PipelineProgress
+from pipeline.roi import RegionOfInterest, place_in_frame, subject_region
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+    from pathlib import Path
+
     import numpy as np
     from numpy.typing import NDArray
+    from utils.mask_cache import MaskCache
 
+    from pipeline.guardrail import EdgeAnalysis
+    from pipeline.presets import PipelinePlan
+    from pipeline.progress import ProgressEvent
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
 
-@dataclass
-class ProcessingParams:
-    """
-    Parameters for image processing pipeline.
+MAX_DIMENSION = 2048
+
+# Fast preview profile; its provider and path settings live in the plan
+PREVIEW_MAX_DIMENSION = 512
 
-    All canvas and line width parameters are required and specified in mm.
+RGBA_NDIM = 3
+RGBA_CHANNELS = 4
+
+
+def _require(value: _T | None, stage: str) -> _T:
+    """Return a stage output, failing clearly if that stage has not run."""
+    if value is None:
+        msg = f"Pipeline stage '{stage}' has not run"
+        raise RuntimeError(msg)
+    return value
+
+
+def create_run_context(
+    progress: Callable[[ProgressEvent], None] | None = None,
+) -> RunContext:
     """
+    Create the run context shared by the extension hooks of one job.
 
-    canvas_width_mm: float
-    canvas_height_mm: float
-    line_width_mm: float
-    isolate_subject: bool = False
-    use_ml: bool = False
-    edge_threshold: tuple[int, int] = (50, 150)
-    line_threshold: int = 16
-    merge_tolerance: float = 0.5
-    simplify_tolerance: float = 0.2
-    hatching_enabled: bool = False
-    hatch_density: float = 2.0
-    hatch_angle: int = 45
-    darkness_threshold: int = 100
+    Args:
+        progress: Optional thread-safe sink for overall progress events
+
+    Returns:
+        RunContext reporting stage progress to ``progress``
+    """
+    return RunContext(progress=PipelineProgress(progress) if progress else None)
 
 
 @dataclass
-class ProcessingResult:
+class PipelineState:
     """
-    Result of processing pipeline.
+    Intermediate data carried between pipeline stages for one job.
+
+    Each stage reads the output of the previous stage and writes its own,
+    so a job can be handed between stage worker pools without the stages
+    sharing anything but this object.
+
+    ``preview`` selects the fast preview profile: classical preprocessing
+    without subject isolation, ``auto_canny`` line extraction and coarser
+    tracing and simplification. ``plan`` is looked up from the processor's
+    preset registry before the first stage runs.
 
-    Attributes:
-        svg_content: Optimized SVG string
-        stats: Dictionary containing processing statistics
-        device_used: Name of device used for processing
+    After subject isolation, ``roi`` is the subject's bounding box: ``image``
+    and ``edges`` are cropped to it and vectorization places the traced
+    paths back in the full frame.
     """
 
-    svg_content: str
-    stats: Mapping[str, float | int | tuple[float, float, float, float] | None]
-    device_used: str
+    image_path: Path
+    params: ProcessingParams
+    preview: bool = False
+    max_dimension: int = MAX_DIMENSION
+    plan: PipelinePlan | None = None
+    image: NDArray[np.uint8] | None = None
+    edge_threshold: tuple[int, int] | None = None
+    edge_analysis: EdgeAnalysis | None = None
+    edges: NDArray[np.uint8] | None = None
+    svg: str | None = None
+    stats: Mapping[str, float | int | tuple[float, ...] | None] | None = None
+    run: RunContext = field(default_factory=RunContext)
+    roi: RegionOfInterest | None = None
 
 
 class PhotoToLineProcessor:
@@ -76,21 +122,47 @@ class PhotoToLineProcessor:
     for the complete pipeline.
     """
 
+    STAGES: ClassVar[tuple[str, ...]] = (
+        "preprocess",
+        "line_extraction",
+        "vectorize",
+        "optimize",
+    )
+
     def __init__(
         self,
         u2net_model_path: Path | None = None,
+        presets: Mapping[str, Mapping[str, Any]] | None = None,
+        edge_budget: EdgeBudget | None = None,
+        thread_concurrency: int | None = None,
+        *,
+        mask_cache: MaskCache | None = None,
     ):
         """
         Initialize processor with models and pipeline components.
 
+        Compiles every preset into a pipeline plan up front, so jobs only
+        look their plan up.
+
         Args:
             u2net_model_path: Optional path to U²-Net weights
+            presets: Preset table (default: built-in presets)
+            edge_budget: Limits on edge maps handed to vectorization
+            thread_concurrency: CPU-bound tasks sharing the CPUs with this
+                processor; torch and OpenCV thread pools are sized to an
+                equal share (default: leave the libraries' defaults)
+            mask_cache: Persisted U²-Net masks reused by jobs on the same
+                image (default: predict every mask)
         """
-        from utils.device import device_manager
+        from utils.device import allocate_threads, device_manager
 
         self.device_manager = device_manager
+        if thread_concurrency is not None:
+            device_manager.configure_threads(allocate_threads(thread_concurrency))
 
         ExtensionRegistry.discover()
+        install_instrumentation()
+        install_progress_hooks()
 
         self.u2net_available = False
         if u2net_model_path and u2net_model_path.exists():
@@ -99,19 +171,30 @@ class PhotoToLineProcessor:
         else:
             logger.warning("U²-Net model not found, subject isolation unavailable")
 
+        self.presets = PresetRegistry(presets, u2net_available=self.u2net_available)
+        self.edge_budget = edge_budget or EdgeBudget()
+        configure_mask_cache(mask_cache)
+
         logger.info("PhotoToLineProcessor initialized")
 
     def process(
         self,
         image_path: Path,
         params: ProcessingParams,
+        progress: Callable[[ProgressEvent], None] | None = None,
     ) -> ProcessingResult:
         """
         Execute complete processing pipeline.
 
+        Runs every stage in ``STAGES`` sequentially on the calling thread.
+        ``StageScheduler`` drives the same stages through per-stage worker
+        pools when several jobs are in flight.
+
         Args:
             image_path: Path to input image
             params: Processing parameters with required canvas dimensions
+            progress: Thread-safe sink receiving overall progress as stages
+                and long-running providers advance
 
         Returns:
             ProcessingResult with SVG content and statistics
@@ -122,73 +205,223 @@ class PhotoToLineProcessor:
         """
         logger.info("Starting processing: %s", image_path)
 
-        provider_prefs = ["u2net"] if self.u2net_available else ["classical_cv"]
+        state = PipelineState(
+            image_path=image_path,
+            params=params,
+            run=create_run_context(progress),
+        )
+        for stage in self.STAGES:
+            self.run_stage(stage, state)
+
+        return self.finalize(state)
+
+    def process_preview(
+        self,
+        image_path: Path,
+        params: ProcessingParams,
+        max_dimension: int = PREVIEW_MAX_DIMENSION,
+    ) -> ProcessingResult:
+        """
+        Execute a fast, low-resolution run of the pipeline.
+
+        Uses the preview profile described on ``PipelineState``; canvas
+        dimensions are honoured so the preview has the final layout.
+
+        Args:
+            image_path: Path to input image
+            params: Processing parameters of the full-quality job
+            max_dimension: Longest edge the image is downscaled to
+
+        Returns:
+            ProcessingResult with the preview SVG and statistics
+        """
+        logger.info("Starting preview: %s (max %dpx)", image_path, max_dimension)
+
+        state = PipelineState(
+            image_path=image_path,
+            params=params,
+            preview=True,
+            max_dimension=max_dimension,
+        )
+        for stage in self.STAGES:
+            self.run_stage(stage, state)
+
+        return self.finalize(state)
+
+    def run_stage(self, stage: str, state: PipelineState) -> PipelineState:
+        """
+        Execute a single pipeline stage, updating ``state`` in place.
+
+        Args:
+            stage: Stage name from ``STAGES``
+            state: Per-job pipeline state produced by the previous stage
+
+        Returns:
+            The same state object, for chaining
+
+        Raises:
+            ValueError: If stage name is unknown
+        """
+        if stage not in self.STAGES:
+            msg = f"Unknown pipeline stage: {stage}"
+            raise ValueError(msg)
+
+        if state.plan is None:
+            state.plan = self.presets.plan_for(state.params, preview=state.preview)
+
+        getattr(self, f"_run_{stage}")(state)
+        return state
 
-        preprocessed = EXT_Preprocess.preprocess(
-            image_path,
-            provider_preferences=provider_prefs,
-            isolate_subject=params.isolate_subject,
-            max_dimension=2048,
-            enhance_contrast=False,
+    def finalize(self, state: PipelineState) -> ProcessingResult:
+        """
+        Build the processing result once all stages have run.
+
+        Args:
+            state: Pipeline state after the optimize stage
+
+        Returns:
+            ProcessingResult with SVG content and statistics
+
+        Raises:
+            RuntimeError: If the pipeline has not completed
+        """
+        if state.svg is None or state.stats is None:
+            msg = "Pipeline has not completed all stages"
+            raise RuntimeError(msg)
+
+        logger.info("Processing complete: %d paths", state.stats["path_count"])
+
+        return ProcessingResult(
+            svg_content=state.svg,
+            stats=state.stats,
+            device_used=self.device_manager.device_name,
+            stage_metrics=list(state.run.stage_records),
+            plan_id=state.plan.plan_id if state.plan else None,
         )
 
+    def _run_preprocess(self, state: PipelineState) -> None:
+        """Load, resize and optionally isolate the subject of the input image."""
+        stage = _require(state.plan, "plan").stages["preprocess"]
+
+        image = EXT_Preprocess.preprocess(
+            state.image_path,
+            provider_preferences=list(stage.providers),
+            max_dimension=state.max_dimension,
+            run=state.run,
+            **stage.options,
+        )
+        if image.ndim == RGBA_NDIM and image.shape[2] == RGBA_CHANNELS:
+            # Isolation hands back the mask it composited with as alpha
+            alpha = image[..., 3]
+            image = cv2.cvtColor(image, cv2.COLOR_RGBA2RGB)  # type: ignore[assignment]
+            state.roi = subject_region(alpha)
+            if state.roi is not None:
+                logger.info(
+                    "Cropping to subject: %dx%d of %dx%d",
+                    state.roi.width,
+                    state.roi.height,
+                    state.roi.frame_width,
+                    state.roi.frame_height,
+                )
+                image = state.roi.crop(image)
+        state.image = image
+
+    def _run_line_extraction(self, state: PipelineState) -> None:
+        """Extract edges and merge in optional hatching."""
+        params = state.params
+        plan = _require(state.plan, "plan")
+        stage = plan.stages["line_extraction"]
+        preprocessed = _require(state.image, "preprocess")
+
+        # Auto thresholds are resolved here and only here, so the job's
+        # stats report the values the provider actually ran with
+        options = dict(stage.options)
+        if options.pop("auto_threshold", False):
+            options["edge_threshold"] = canny_thresholds(preprocessed)
+        if not plan.preview:
+            state.edge_threshold = tuple(options["edge_threshold"])
+
         logger.info("Extracting line art...")
         edges = EXT_LineExtraction.extract(
             preprocessed,
-            provider_preferences=["bilateral_canny"],
-            edge_threshold=params.edge_threshold,
-            use_ml=params.use_ml,
+            provider_preferences=list(stage.providers),
+            run=state.run,
+            **options,
         )
+        # Hatching adds long regular lines, so only the extracted edges count
+        edges, state.edge_analysis = enforce_edge_budget(edges, self.edge_budget)
 
-        if params.hatching_enabled:
+        if plan.hatching is not None:
             logger.info("Adding hatching...")
-            hatch_gen = HatchGenerator(
-                line_width_mm=params.line_width_mm,
-                density_factor=params.hatch_density,
-                darkness_threshold=params.darkness_threshold,
+            state.run.report_progress("hatching", 0.0, "Adding hatching")
+            hatching = plan.hatching
+            hatch_gen = stage_objects.get(
+                ("hatch", plan.plan_id, params.line_width_mm),
+                lambda: HatchGenerator(
+                    line_width_mm=params.line_width_mm,
+                    density_factor=hatching.density,
+                    darkness_threshold=hatching.darkness_threshold,
+                ),
             )
             gray_image: NDArray[np.uint8] = cv2.cvtColor(
                 preprocessed, cv2.COLOR_RGB2GRAY
             )  # type: ignore[assignment]
+            # Spacing follows pixels per mm, so a crop covers its share of
+            # the canvas
+            roi = state.roi
             edges = hatch_gen.add_hatching_to_edges(
                 edges,
                 gray_image,
-                params.canvas_width_mm,
-                params.canvas_height_mm,
+                params.canvas_width_mm * (roi.width / roi.frame_width if roi else 1),
+                params.canvas_height_mm * (roi.height / roi.frame_height if roi else 1),
             )
+            state.run.report_progress("hatching", 1.0)
 
-        edges_inverted: NDArray[np.uint8] = cv2.bitwise_not(edges)
+        state.edges = edges
+
+    def _run_vectorize(self, state: PipelineState) -> None:
+        """Trace the inverted edge map into a raw SVG."""
+        stage = _require(state.plan, "plan").stages["vectorize"]
+        edges = _require(state.edges, "line_extraction")
+        edges_inverted: NDArray[np.uint8] = cv2.bitwise_not(edges)  # type: ignore[assignment]
 
         logger.info("Vectorizing...")
-        svg_raw = EXT_Vectorize.vectorize(
+        svg = EXT_Vectorize.vectorize(
             edges_inverted,
-            provider_preferences=["imagetracer"],
-            line_threshold=params.line_threshold,
-            qtres=1.0,
-            pathomit=8,
+            provider_preferences=list(stage.providers),
+            run=state.run,
+            **stage.options,
         )
+        state.svg = place_in_frame(svg, state.roi) if state.roi else svg
+
+    def _run_optimize(self, state: PipelineState) -> None:
+        """Merge, simplify and scale paths to the canvas, then collect stats."""
+        params = state.params
+        stage = _require(state.plan, "plan").stages["optimize"]
+        svg_raw = _require(state.svg, "vectorize")
 
         logger.info("Optimizing paths...")
         svg_optimized = EXT_Optimize.optimize(
             svg_raw,
             canvas_width_mm=params.canvas_width_mm,
             canvas_height_mm=params.canvas_height_mm,
-            provider_preferences=["vpype"],
-            merge_tolerance=params.merge_tolerance,
-            simplify_tolerance=params.simplify_tolerance,
+            provider_preferences=list(stage.providers),
+            run=state.run,
+            **stage.options,
         )
 
-        stats: Mapping[str, float | int | tuple[float, float, float, float] | None] = (
-            EXT_Optimize.get_stats(svg_optimized, provider_preferences=["vpype"])
-        )
-
-        logger.info("Processing complete: %d paths", stats["path_count"])
-
-        return ProcessingResult(
-            svg_content=svg_optimized,
-            stats=stats,
-            device_used=self.device_manager.device_name,
+        state.svg = svg_optimized
+        stats: dict[str, float | int | tuple[float, ...] | None] = dict(
+            EXT_Optimize.get_stats(
+                svg_optimized, provider_preferences=list(stage.providers)
+            )
         )
+        if state.edge_threshold is not None:
+            stats["edge_threshold"] = state.edge_threshold
+        if state.edge_analysis is not None:
+            stats["edge_components"] = state.edge_analysis.components
+            stats["removed_edge_components"] = state.edge_analysis.removed_components
+        state.stats = stats
 
     def process_preset(
         self,
@@ -211,42 +444,10 @@ class PhotoToLineProcessor:
         Returns:
             ProcessingResult
         """
-        presets = {
-            "portrait": ProcessingParams(
-                canvas_width_mm=canvas_width_mm,
-                canvas_height_mm=canvas_height_mm,
-                line_width_mm=line_width_mm,
-                isolate_subject=True,
-                use_ml=False,
-                edge_threshold=(50, 150),
-                line_threshold=16,
-                merge_tolerance=0.5,
-                simplify_tolerance=0.2,
-                hatching_enabled=True,
-                hatch_density=2.0,
-                hatch_angle=45,
-                darkness_threshold=100,
-            ),
-            "animal": ProcessingParams(
-                canvas_width_mm=canvas_width_mm,
-                canvas_height_mm=canvas_height_mm,
-                line_width_mm=line_width_mm,
-                isolate_subject=True,
-                use_ml=False,
-                edge_threshold=(30, 120),
-                line_threshold=12,
-                merge_tolerance=0.3,
-                simplify_tolerance=0.15,
-                hatching_enabled=True,
-                hatch_density=1.5,
-                hatch_angle=45,
-                darkness_threshold=80,
-            ),
-        }
-
-        if preset not in presets:
-            msg = f"Unknown preset: {preset}"
-            raise ValueError(msg)
-
-        params = presets[preset]
+        params = self.presets.params(
+            preset,
+            canvas_width_mm=canvas_width_mm,
+            canvas_height_mm=canvas_height_mm,
+            line_width_mm=line_width_mm,
+        )
         return self.process(image_path, params)
@@ -0,0 +1,198 @@
+"""
+Job progress tracking.
+
+Turns the per-stage fractions reported by extension hooks and providers
+into overall job progress, and coalesces the resulting events so that a
+burst of updates from a worker thread reaches WebSocket clients as at
+most one message per interval.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import threading
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Share of a full run spent in each hook stage, in pipeline order. Derived
+# from typical stage timings: tracing and path optimization dominate.
+STAGE_WEIGHTS: dict[str, float] = {
+    "preprocess": 0.10,
+    "extract": 0.10,
+    "hatching": 0.10,
+    "vectorize": 0.40,
+    "optimize": 0.30,
+}
+STAGE_OFFSETS: dict[str, float] = dict(
+    zip(
+        STAGE_WEIGHTS,
+        accumulate(STAGE_WEIGHTS.values(), initial=0.0),
+        strict=False,
+    )
+)
+
+# 100 is reserved for the completion message sent once the result is stored
+MAX_PIPELINE_PROGRESS = 99
+PERCENT = 100
+
+DEFAULT_MIN_INTERVAL_SECONDS = 0.25
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """
+    A progress update for one job.
+
+    Attributes:
+        stage: Hook stage name (e.g. "vectorize")
+        fraction: Completed share of the stage (0.0-1.0)
+        progress: Overall job progress percentage (0-99)
+        message: Optional human-readable status
+    """
+
+    stage: str
+    fraction: float
+    progress: int
+    message: str | None = None
+
+
+class PipelineProgress:
+    """
+    Converts stage-local progress into overall job progress.
+
+    Installed as ``RunContext.progress``; called from whichever worker
+    thread runs the stage. Stages missing from ``STAGE_WEIGHTS`` (such as
+    export, which runs outside ``PhotoToLineProcessor.process``) are ignored.
+    """
+
+    def __init__(self, sink: Callable[[ProgressEvent], None]):
+        """
+        Initialize with the sink that receives overall progress events.
+
+        Args:
+            sink: Thread-safe callable receiving each ProgressEvent
+        """
+        self._sink = sink
+
+    def __call__(self, stage: str, fraction: float, message: str | None = None) -> None:
+        """
+        Report progress within a stage.
+
+        Args:
+            stage: Hook stage name
+            fraction: Completed share of the stage, clamped to 0.0-1.0
+            message: Optional human-readable status
+        """
+        if stage not in STAGE_WEIGHTS:
+            return
+
+        fraction = min(max(fraction, 0.0), 1.0)
+        overall = STAGE_OFFSETS[stage] + STAGE_WEIGHTS[stage] * fraction
+        self._sink(
+            ProgressEvent(
+                stage=stage,
+                fraction=fraction,
+                progress=min(round(overall * PERCENT), MAX_PIPELINE_PROGRESS),
+                message=message,
+            )
+        )
+
+
+class ProgressThrottle:
+    """
+    Coalesces progress events and publishes them at a bounded rate.
+
+    Events may be submitted from any thread. Only the most recent pending
+    event is kept, events that would move progress backwards are dropped,
+    and ``publish`` runs on the event loop at most once per
+    ``min_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        publish: Callable[[ProgressEvent], Awaitable[None]],
+        min_interval: float = DEFAULT_MIN_INTERVAL_SECONDS,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ):
+        """
+        Initialize throttle bound to an event loop.
+
+        Args:
+            publish: Coroutine function delivering an event to clients
+            min_interval: Minimum seconds between two published events
+            loop: Loop running ``publish``; defaults to the running loop
+        """
+        self._publish = publish
+        self._min_interval = min_interval
+        self._loop = loop or asyncio.get_running_loop()
+        self._lock = threading.Lock()
+        self._pending: ProgressEvent | None = None
+        self._latest_progress = -1
+        self._flush_scheduled = False
+        self._closed = False
+        self._last_published_at = float("-inf")
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def __call__(self, event: ProgressEvent) -> None:
+        """
+        Submit an event; safe to call from worker threads.
+
+        Args:
+            event: Progress event to publish
+        """
+        with self._lock:
+            if self._closed or event.progress < self._latest_progress:
+                return
+            self._latest_progress = event.progress
+            self._pending = event
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+
+        self._loop.call_soon_threadsafe(self._schedule_flush)
+
+    async def aclose(self) -> None:
+        """Stop accepting events and drop any that are not yet published."""
+        with self._lock:
+            self._closed = True
+            self._pending = None
+
+        for task in list(self._tasks):
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    def _schedule_flush(self) -> None:
+        if self._closed:
+            return
+        delay = max(
+            0.0, self._last_published_at + self._min_interval - self._loop.time()
+        )
+        task = self._loop.create_task(self._flush(delay))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, delay: float) -> None:
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        with self._lock:
+            event, self._pending = self._pending, None
+            self._flush_scheduled = False
+
+        if event is None:
+            return
+
+        self._last_published_at = self._loop.time()
+        try:
+            await self._publish(event)
+        except Exception as e:
+            logger.warning(f"Failed to publish progress: {e}")
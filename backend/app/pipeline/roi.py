@@ -0,0 +1,186 @@
+"""
+Region of interest around an isolated subject.
+
+Subject isolation blends the image over a plain background with the
+U²-Net mask, and line extraction, hatching and tracing find nothing where
+the mask is empty. Cropping the working image to the mask's bounding box
+(plus a margin for edge filters) lets those stages skip the blank frame;
+the traced SVG is then placed back in the full frame so later stages see
+the same coordinates as without the crop.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import cv2
+import numpy as np
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+# Margin kept around the subject so blur and edge kernels see background
+ROI_PADDING_PX = 16
+# Mask values up to this are at most ~12% subject; the faint tail of a
+# refined (soft) mask would otherwise widen the crop
+ROI_ALPHA_THRESHOLD = 32
+
+_SVG_ROOT = re.compile(r"<svg\b[^>]*>", re.IGNORECASE)
+_SVG_END = re.compile(r"</svg\s*>\s*$", re.IGNORECASE)
+_LENGTH = re.compile(r"^\s*([-+]?[\d.]+(?:e[-+]?\d+)?)\s*([a-z%]*)\s*$", re.IGNORECASE)
+
+
+def _attribute(name: str) -> re.Pattern[str]:
+    return re.compile(rf'(\s{name}\s*=\s*)(["\'])(.*?)\2', re.IGNORECASE)
+
+
+_WIDTH = _attribute("width")
+_HEIGHT = _attribute("height")
+_VIEW_BOX = _attribute("viewBox")
+
+
+@dataclass(frozen=True)
+class RegionOfInterest:
+    """
+    Crop rectangle within the full image frame, in pixels.
+
+    Attributes:
+        x: Left edge of the crop
+        y: Top edge of the crop
+        width: Crop width
+        height: Crop height
+        frame_width: Width of the uncropped image
+        frame_height: Height of the uncropped image
+    """
+
+    x: int
+    y: int
+    width: int
+    height: int
+    frame_width: int
+    frame_height: int
+
+    def crop(self, image: NDArray[np.uint8]) -> NDArray[np.uint8]:
+        """
+        Cut the region out of a full-frame image.
+
+        Args:
+            image: Image of the full frame
+
+        Returns:
+            Contiguous copy of the region
+        """
+        return np.ascontiguousarray(
+            image[self.y : self.y + self.height, self.x : self.x + self.width]
+        )
+
+
+def subject_region(
+    alpha: NDArray[np.uint8],
+    threshold: int = ROI_ALPHA_THRESHOLD,
+    padding: int = ROI_PADDING_PX,
+) -> RegionOfInterest | None:
+    """
+    Find the padded bounding box of an isolated subject.
+
+    The box is taken from the mask isolation composited with rather than
+    from the composited image: with a refined mask the subject fades into
+    the background, and near-background fringe pixels would widen it.
+
+    Args:
+        alpha: Subject mask (H, W), 0 = background, 255 = subject
+        threshold: Mask values above this count as subject
+        padding: Margin added on every side, clipped to the frame
+
+    Returns:
+        Region around the subject, or None when there is no subject or the
+        region would be the whole frame
+    """
+    _, subject = cv2.threshold(alpha, threshold, 255, cv2.THRESH_BINARY)
+    x, y, width, height = cv2.boundingRect(subject)
+    if width == 0 or height == 0:
+        return None
+
+    frame_height, frame_width = alpha.shape[:2]
+    left, top = max(x - padding, 0), max(y - padding, 0)
+    right = min(x + width + padding, frame_width)
+    bottom = min(y + height + padding, frame_height)
+    if (right - left, bottom - top) == (frame_width, frame_height):
+        return None
+
+    return RegionOfInterest(
+        x=left,
+        y=top,
+        width=right - left,
+        height=bottom - top,
+        frame_width=frame_width,
+        frame_height=frame_height,
+    )
+
+
+def _format(value: float) -> str:
+    return f"{value:.6g}"
+
+
+def place_in_frame(svg: str, roi: RegionOfInterest) -> str:
+    """
+    Move an SVG traced from a cropped image back into the full frame.
+
+    The document is resized to the frame, keeping its units and its ratio
+    of user units to pixels, and its content is wrapped in a group
+    translated by the crop offset.
+
+    Args:
+        svg: SVG document sized to the crop
+        roi: Region the document was traced from
+
+    Returns:
+        SVG document sized to the full frame
+
+    Raises:
+        ValueError: If the document has no ``<svg>`` root element
+    """
+    root = _SVG_ROOT.search(svg)
+    end = _SVG_END.search(svg)
+    if root is None or end is None:
+        msg = "Vectorizer output has no <svg> root element"
+        raise ValueError(msg)
+
+    tag = root.group(0)
+    scale_x = scale_y = 1.0
+    view_box = _VIEW_BOX.search(tag)
+    if view_box is not None:
+        min_x, min_y, box_width, box_height = (
+            float(v) for v in view_box.group(3).replace(",", " ").split()
+        )
+        scale_x, scale_y = box_width / roi.width, box_height / roi.height
+        frame_box = (
+            f"{_format(min_x)} {_format(min_y)} "
+            f"{_format(roi.frame_width * scale_x)} "
+            f"{_format(roi.frame_height * scale_y)}"
+        )
+        tag = _VIEW_BOX.sub(rf"\g<1>\g<2>{frame_box}\g<2>", tag, count=1)
+
+    for pattern, crop_size, frame_size in (
+        (_WIDTH, roi.width, roi.frame_width),
+        (_HEIGHT, roi.height, roi.frame_height),
+    ):
+        match = pattern.search(tag)
+        length = _LENGTH.match(match.group(3)) if match else None
+        if length is None:
+            continue
+        size = float(length.group(1)) * frame_size / crop_size
+        tag = pattern.sub(
+            rf"\g<1>\g<2>{_format(size)}{length.group(2)}\g<2>", tag, count=1
+        )
+
+    translate = f"translate({_format(roi.x * scale_x)} {_format(roi.y * scale_y)})"
+    return (
+        svg[: root.start()]
+        + tag
+        + f'<g transform="{translate}">'
+        + svg[root.end() : end.start()]
+        + "</g></svg>\n"
+    )
@@ -0,0 +1,287 @@
+"""
+Stage-graph scheduler for pipelined multi-job execution.
+
+Runs each pipeline stage on its own bounded worker pool and queue so that
+stages of different jobs overlap: while job A is being vectorized, job B can
+be preprocessed and job C optimized. Backpressure propagates upstream because
+a stage worker blocks on handing a job to a full downstream queue.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from pipeline.processor import PipelineState, create_run_context
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+    from pathlib import Path
+
+    from pipeline.processor import (
+        PhotoToLineProcessor,
+        ProcessingParams,
+        ProcessingResult,
+    )
+    from pipeline.progress import ProgressEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STAGE_WORKERS = 1
+
+
+@dataclass
+class _WorkItem:
+    """A job travelling through the stage graph."""
+
+    state: PipelineState
+    future: Future[ProcessingResult]
+    enqueued_at: float
+
+
+@dataclass
+class StageMetrics:
+    """
+    Point-in-time counters for one stage.
+
+    Attributes:
+        workers: Size of the stage worker pool
+        queue_capacity: Maximum number of jobs waiting for the stage
+        queue_depth: Jobs currently waiting for a worker
+        active: Jobs currently being executed by a worker
+        completed: Jobs that finished this stage successfully
+        failed: Jobs that raised inside this stage
+        wait_seconds_total: Cumulative time jobs spent queued
+        run_seconds_total: Cumulative time jobs spent executing
+    """
+
+    workers: int
+    queue_capacity: int
+    queue_depth: int = 0
+    active: int = 0
+    completed: int = 0
+    failed: int = 0
+    wait_seconds_total: float = 0.0
+    run_seconds_total: float = 0.0
+
+
+class _StageWorkerPool:
+    """Bounded queue plus fixed worker threads for a single stage."""
+
+    def __init__(
+        self,
+        name: str,
+        workers: int,
+        queue_size: int,
+        scheduler: StageScheduler,
+    ):
+        self.name = name
+        self.queue: queue.Queue[_WorkItem | None] = queue.Queue(maxsize=queue_size)
+        self._scheduler = scheduler
+        self._lock = threading.Lock()
+        self._metrics = StageMetrics(workers=workers, queue_capacity=queue_size)
+        self._threads = [
+            threading.Thread(
+                target=self._worker_loop,
+                name=f"stage-{name}-{index}",
+                daemon=True,
+            )
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def put(self, item: _WorkItem) -> None:
+        """Enqueue a job, blocking while the stage queue is full."""
+        item.enqueued_at = time.perf_counter()
+        self.queue.put(item)
+
+    def metrics(self) -> StageMetrics:
+        """Return a snapshot of this stage's counters."""
+        with self._lock:
+            snapshot = StageMetrics(**vars(self._metrics))
+        snapshot.queue_depth = self.queue.qsize()
+        return snapshot
+
+    def stop(self) -> None:
+        """Signal every worker thread to exit after draining queued jobs."""
+        for _ in self._threads:
+            self.queue.put(None)
+
+    def join(self, timeout: float | None = None) -> None:
+        """Wait for worker threads to exit."""
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _worker_loop(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+
+            # Jobs stay pending, and cancellable, until the first stage
+            # picks them up
+            if (
+                not item.future.running()
+                and not item.future.set_running_or_notify_cancel()
+            ):
+                continue
+
+            started = time.perf_counter()
+            with self._lock:
+                self._metrics.active += 1
+                self._metrics.wait_seconds_total += started - item.enqueued_at
+
+            try:
+                self._scheduler._processor.run_stage(self.name, item.state)
+            except Exception as e:
+                logger.exception(
+                    "Stage %s failed for %s", self.name, item.state.image_path
+                )
+                self._record(started, failed=True)
+                item.future.set_exception(e)
+                continue
+
+            self._record(started, failed=False)
+            self._scheduler._advance(self.name, item)
+
+    def _record(self, started: float, *, failed: bool) -> None:
+        with self._lock:
+            self._metrics.active -= 1
+            self._metrics.run_seconds_total += time.perf_counter() - started
+            if failed:
+                self._metrics.failed += 1
+            else:
+                self._metrics.completed += 1
+
+
+class StageScheduler:
+    """
+    Pipelines jobs through per-stage worker pools.
+
+    Each stage listed in ``PhotoToLineProcessor.STAGES`` gets its own
+    fixed-size thread pool and bounded queue. Jobs are handed from one stage
+    to the next as soon as they finish, so heterogeneous stages (I/O-bound
+    decode, compute-bound U²-Net, subprocess vectorization, Python
+    optimization) of different jobs run concurrently.
+    """
+
+    def __init__(
+        self,
+        processor: PhotoToLineProcessor,
+        stage_workers: Mapping[str, int],
+        queue_size: int,
+    ):
+        """
+        Start worker pools for every pipeline stage.
+
+        Args:
+            processor: Processor whose stages are executed
+            stage_workers: Worker count per stage name; unlisted stages get one
+            queue_size: Maximum jobs waiting in front of each stage
+
+        Raises:
+            ValueError: If a worker count or the queue size is below one
+        """
+        if queue_size < 1:
+            msg = f"Stage queue size must be at least 1, got {queue_size}"
+            raise ValueError(msg)
+
+        unknown = set(stage_workers) - set(processor.STAGES)
+        if unknown:
+            msg = f"Unknown pipeline stages in worker config: {sorted(unknown)}"
+            raise ValueError(msg)
+
+        self._processor = processor
+        self._stages = processor.STAGES
+        self._pools: dict[str, _StageWorkerPool] = {}
+
+        for stage in self._stages:
+            workers = stage_workers.get(stage, DEFAULT_STAGE_WORKERS)
+            if workers < 1:
+                msg = f"Stage '{stage}' needs at least one worker, got {workers}"
+                raise ValueError(msg)
+            self._pools[stage] = _StageWorkerPool(stage, workers, queue_size, self)
+
+        logger.info(
+            "Stage scheduler started: %s",
+            ", ".join(f"{s}={self._pools[s].metrics().workers}" for s in self._stages),
+        )
+
+    def submit(
+        self,
+        image_path: Path,
+        params: ProcessingParams,
+        progress: Callable[[ProgressEvent], None] | None = None,
+    ) -> Future[ProcessingResult]:
+        """
+        Queue a job at the first stage.
+
+        Blocks while the first stage's queue is full, which applies
+        backpressure to callers when the pipeline is saturated.
+
+        Args:
+            image_path: Path to input image
+            params: Processing parameters
+            progress: Thread-safe sink receiving overall progress events
+
+        Returns:
+            Future resolved with the ProcessingResult or the stage exception;
+            it can be cancelled until the first stage starts the job
+        """
+        future: Future[ProcessingResult] = Future()
+        item = _WorkItem(
+            state=PipelineState(
+                image_path=image_path,
+                params=params,
+                run=create_run_context(progress),
+            ),
+            future=future,
+            enqueued_at=time.perf_counter(),
+        )
+        self._pools[self._stages[0]].put(item)
+        return future
+
+    def metrics(self) -> dict[str, StageMetrics]:
+        """
+        Return per-stage queue depth and throughput counters.
+
+        Returns:
+            Mapping of stage name to its metrics, in pipeline order
+        """
+        return {stage: self._pools[stage].metrics() for stage in self._stages}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop all stage workers.
+
+        Jobs already queued are drained stage by stage before the workers of
+        that stage exit.
+
+        Args:
+            wait: Whether to block until worker threads have exited
+        """
+        for stage in self._stages:
+            pool = self._pools[stage]
+            pool.stop()
+            if wait:
+                pool.join()
+
+        logger.info("Stage scheduler stopped")
+
+    def _advance(self, stage: str, item: _WorkItem) -> None:
+        """Hand a job to the next stage, or resolve it after the last one."""
+        index = self._stages.index(stage)
+        if index + 1 < len(self._stages):
+            self._pools[self._stages[index + 1]].put(item)
+            return
+
+        try:
+            item.future.set_result(self._processor.finalize(item.state))
+        except Exception as e:
+            item.future.set_exception(e)
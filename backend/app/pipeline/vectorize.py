@@ -9,12 +9,12 @@ import json
 import logging
 import os
 import subprocess
-import tempfile
 from pathlib import Path
 
 import cv2
 import numpy as np
 from numpy.typing import NDArray
+from utils.potrace import trace_svg
 
 logger = logging.getLogger(__name__)
 
@@ -75,24 +75,17 @@ class ImageTracerVectorizer:
         Raises:
             RuntimeError: If vectorization fails
         """
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_input:
-            input_path = Path(tmp_input.name)
-            cv2.imwrite(str(input_path), image)
-
-        try:
-            return self._run_imagetracer(
-                input_path,
-                line_threshold,
-                qtres,
-                pathomit,
-                scale,
-            )
-        finally:
-            input_path.unlink(missing_ok=True)
+        return self._run_imagetracer(
+            image,
+            line_threshold,
+            qtres,
+            pathomit,
+            scale,
+        )
 
     def _run_imagetracer(
         self,
-        image_path: Path,
+        image: NDArray[np.uint8],
         threshold: int,
         qtres: float,
         pathomit: int,
@@ -102,7 +95,7 @@ class ImageTracerVectorizer:
         Run ImageTracerJS via Node.js subprocess.
 
         Args:
-            image_path: Path to input image
+            image: Grayscale or RGB image to trace
             threshold: Line threshold
             qtres: Quality resolution
             pathomit: Path omit threshold
@@ -114,9 +107,15 @@ class ImageTracerVectorizer:
         Raises:
             RuntimeError: If subprocess fails
         """
+        # ImageTracer works on ImageData, which is RGBA
+        rgba = cv2.cvtColor(
+            image,
+            cv2.COLOR_RGB2RGBA if image.ndim == RGB_CHANNELS else cv2.COLOR_GRAY2RGBA,
+        )
         # Use JSON encoding for safe parameter passing
         config = {
-            "imagePath": str(image_path),
+            "width": int(rgba.shape[1]),
+            "height": int(rgba.shape[0]),
             "threshold": threshold,
             "qtres": qtres,
             "pathomit": pathomit,
@@ -137,17 +136,19 @@ class ImageTracerVectorizer:
             pal: [{{r:0, g:0, b:0, a:255}}, {{r:255, g:255, b:255, a:255}}]
         }};
 
-        ImageTracer.imageToSVG(config.imagePath, (svgstr) => {{
-            console.log(svgstr);
-        }}, options);
+        // RGBA pixels arrive on stdin as one ImageData buffer
+        const chunks = [];
+        process.stdin.on('data', (chunk) => chunks.push(chunk));
+        process.stdin.on('end', () => {{
+            const imgd = {{
+                width: config.width,
+                height: config.height,
+                data: new Uint8ClampedArray(Buffer.concat(chunks)),
+            }};
+            process.stdout.write(ImageTracer.imagedataToSVG(imgd, options));
+        }});
         """
 
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".js", delete=False
-        ) as tmp_script:
-            script_path = Path(tmp_script.name)
-            tmp_script.write(tracer_script)
-
         project_root = Path(__file__).resolve().parents[PROJECT_ROOT_LEVELS_UP]
         node_modules_dir = project_root / NODE_MODULES_DIRNAME
         env = os.environ.copy()
@@ -155,25 +156,22 @@ class ImageTracerVectorizer:
 
         try:
             result = subprocess.run(
-                ["node", str(script_path)],
+                ["node", "--eval", tracer_script],
+                input=rgba.tobytes(),
                 check=False,
                 capture_output=True,
-                text=True,
                 timeout=60,
                 env=env,
             )
-
-            if result.returncode == 0:
-                return result.stdout
-
-            msg = f"ImageTracerJS failed: {result.stderr}"
-            raise RuntimeError(msg)
-
         except subprocess.TimeoutExpired as err:
             msg = "ImageTracerJS timeout"
             raise RuntimeError(msg) from err
-        finally:
-            script_path.unlink(missing_ok=True)
+
+        if result.returncode == 0:
+            return result.stdout.decode()
+
+        msg = f"ImageTracerJS failed: {result.stderr.decode(errors='replace')}"
+        raise RuntimeError(msg)
 
 
 class PotraceVectorizer:
@@ -207,6 +205,7 @@ class PotraceVectorizer:
         image: NDArray[np.uint8],
         turdsize: int = 2,
         turnpolicy: str = "minority",
+        backend: str = "svg",
     ) -> str:
         """
         Convert raster image to SVG using Potrace.
@@ -215,49 +214,19 @@ class PotraceVectorizer:
             image: Input grayscale image
             turdsize: Suppress speckles of this size
             turnpolicy: Turn policy (black, white, left, right, minority, majority)
+            backend: "svg" keeps potrace's Bézier output; "geojson" traces
+                straight to polylines
 
         Returns:
             SVG string
         """
-        with tempfile.NamedTemporaryFile(suffix=".pbm", delete=False) as tmp_input:
-            input_path = Path(tmp_input.name)
-
-            if len(image.shape) == RGB_CHANNELS:
-                gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
-            else:
-                gray = image
-
-            _, binary = cv2.threshold(gray, 128, 255, cv2.THRESH_BINARY)
-            cv2.imwrite(str(input_path), binary)
-
-        with tempfile.NamedTemporaryFile(suffix=".svg", delete=False) as tmp_output:
-            output_path = Path(tmp_output.name)
-
-        try:
-            result = subprocess.run(
-                [
-                    "potrace",
-                    "-s",
-                    "-t",
-                    str(turdsize),
-                    "-k",
-                    turnpolicy,
-                    str(input_path),
-                    "-o",
-                    str(output_path),
-                ],
-                check=False,
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-
-            if result.returncode != 0:
-                msg = f"Potrace failed: {result.stderr}"
-                raise RuntimeError(msg)
+        if len(image.shape) == RGB_CHANNELS:
+            gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        else:
+            gray = image
 
-            return output_path.read_text()
+        _, binary = cv2.threshold(gray, 128, 255, cv2.THRESH_BINARY)
 
-        finally:
-            input_path.unlink(missing_ok=True)
-            output_path.unlink(missing_ok=True)
+        return trace_svg(
+            binary == 0, ["-t", str(turdsize), "-k", turnpolicy], backend=backend
+        )
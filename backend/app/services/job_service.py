@@ -5,20 +5,55 @@ Coordinates between storage, processor, and other components.
 Handles all business rules and validations.
 """
 
+from __future__ import annotations
+
 import asyncio
+import io
 import logging
 import uuid
+import zipfile
+from dataclasses import asdict
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from api.models import ProcessingStatus
+from api.models import ProcessingMode, ProcessingStatus, ProcessParams
 from api.websocket import ws_manager
 from config import settings
 from fastapi import HTTPException, UploadFile
-from pipeline.processor import PhotoToLineProcessor, ProcessingParams, ProcessingResult
-from storage import JobStorage
+from pipeline.params import ProcessingParams
+from pipeline.presets import DEFAULT_PRESET, JOB_FIELDS, PresetRegistry
+from pipeline.progress import ProgressEvent, ProgressThrottle
+
+if TYPE_CHECKING:
+    # The processor and scheduler load OpenCV; API-only processes never
+    # create them
+    from pipeline.params import ProcessingResult
+    from pipeline.processor import PhotoToLineProcessor
+    from pipeline.scheduler import StageScheduler
+    from storage import JobStorage
 
 logger = logging.getLogger(__name__)
 
+ALLOWED_FORMATS = {
+    ".jpg",
+    ".jpeg",
+    ".png",
+    ".tiff",
+    ".tif",
+    ".webp",
+    ".heic",
+    ".heif",
+}
+ARCHIVE_FORMATS = {".zip"}
+
+BYTES_PER_MB = 1024 * 1024
+
+# Used when a process request carries no params
+DEFAULT_CANVAS_WIDTH_MM = 300.0
+DEFAULT_CANVAS_HEIGHT_MM = 200.0
+DEFAULT_LINE_WIDTH_MM = 0.3
+
 
 class JobService:
     """
@@ -28,16 +63,52 @@ class JobService:
     Contains all business logic separated from API layer.
     """
 
-    def __init__(self, storage: JobStorage, processor: PhotoToLineProcessor):
+    def __init__(
+        self,
+        storage: JobStorage,
+        processor: PhotoToLineProcessor | None = None,
+        scheduler: StageScheduler | None = None,
+        presets: PresetRegistry | None = None,
+    ):
         """
         Initialize job service.
 
         Args:
             storage: Job storage for data access
-            processor: Photo processing pipeline
+            processor: Photo processing pipeline; omitted in API-only
+                processes, which queue jobs instead of running them
+            scheduler: Stage scheduler for pipelined execution; when omitted
+                jobs run end-to-end on a single worker thread
+            presets: Preset registry for resolving requests (default: the
+                processor's)
         """
         self.storage = storage
         self.processor = processor
+        self.scheduler = scheduler
+        self._presets = presets
+
+    @property
+    def presets(self) -> PresetRegistry:
+        """Preset registry used to resolve process requests."""
+        if self._presets is not None:
+            return self._presets
+        return self._processor.presets
+
+    @property
+    def _processor(self) -> PhotoToLineProcessor:
+        """
+        Processor for the paths that run jobs in this process.
+
+        Raises:
+            RuntimeError: If this is an API-only process without a processor
+        """
+        if self.processor is None:
+            msg = (
+                "API-only job service has no processor; jobs run in worker "
+                "processes (python -m worker)"
+            )
+            raise RuntimeError(msg)
+        return self.processor
 
     async def create_job_from_upload(self, file: UploadFile) -> tuple[str, str, Path]:
         """
@@ -55,34 +126,8 @@ class JobService:
         if not file.filename:
             raise HTTPException(status_code=400, detail="No filename provided")
 
-        # Validate file format
-        suffix = Path(file.filename).suffix.lower()
-        allowed_formats = {
-            ".jpg",
-            ".jpeg",
-            ".png",
-            ".tiff",
-            ".tif",
-            ".webp",
-            ".heic",
-            ".heif",
-        }
-
-        if suffix not in allowed_formats:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unsupported file format: {suffix}. Supported: {', '.join(allowed_formats)}",
-            )
-
-        # Read and validate file size
         content = await file.read()
-        file_size_mb = len(content) / (1024 * 1024)
-
-        if file_size_mb > settings.max_upload_size_mb:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File too large: {file_size_mb:.1f}MB (max: {settings.max_upload_size_mb}MB)",
-            )
+        suffix, file_size_mb = self._validate_upload(file.filename, len(content))
 
         # Create job with unique ID
         job_id = str(uuid.uuid4())
@@ -97,7 +142,7 @@ class JobService:
 
         # Create job in storage
         try:
-            self.storage.create_job(
+            await self.storage.create_job(
                 job_id=job_id,
                 filename=file.filename,
                 input_path=file_path,
@@ -116,7 +161,145 @@ class JobService:
 
         return job_id, file.filename, file_path
 
-    def get_job(self, job_id: str) -> dict:
+    @staticmethod
+    def _validate_upload(filename: str, size: int) -> tuple[str, float]:
+        """
+        Check the format and size of an uploaded image.
+
+        Args:
+            filename: Original filename
+            size: File size in bytes
+
+        Returns:
+            Tuple of (lowercase suffix, size in MB)
+
+        Raises:
+            HTTPException: If the format is unsupported or the file too large
+        """
+        suffix = Path(filename).suffix.lower()
+        if suffix not in ALLOWED_FORMATS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported file format: {suffix}. Supported: {', '.join(ALLOWED_FORMATS)}",
+            )
+
+        file_size_mb = size / BYTES_PER_MB
+        if file_size_mb > settings.max_upload_size_mb:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large: {file_size_mb:.1f}MB (max: {settings.max_upload_size_mb}MB)",
+            )
+
+        return suffix, file_size_mb
+
+    async def read_batch_files(
+        self, files: list[UploadFile]
+    ) -> list[tuple[str, bytes]]:
+        """
+        Read a batch upload, expanding ZIP archives into their images.
+
+        Archive members are read with a size cap, so a member whose
+        header understates its size cannot exhaust memory; oversized
+        members are returned truncated and rejected by validation.
+
+        Args:
+            files: Uploaded images and/or ZIP archives
+
+        Returns:
+            List of (filename, content) pairs
+
+        Raises:
+            HTTPException: If an archive is invalid or the batch too large
+        """
+        max_bytes = settings.max_upload_size_mb * BYTES_PER_MB
+        entries: list[tuple[str, bytes]] = []
+
+        for file in files:
+            filename = file.filename or ""
+            if Path(filename).suffix.lower() not in ARCHIVE_FORMATS:
+                entries.append((filename, await file.read()))
+                continue
+
+            try:
+                with zipfile.ZipFile(io.BytesIO(await file.read())) as archive:
+                    for member in archive.infolist():
+                        if member.is_dir():
+                            continue
+                        with archive.open(member) as member_file:
+                            content = member_file.read(max_bytes + 1)
+                        entries.append((Path(member.filename).name, content))
+                        if len(entries) > settings.max_batch_size:
+                            break
+            except zipfile.BadZipFile as e:
+                raise HTTPException(
+                    status_code=400, detail=f"Invalid archive: {filename}"
+                ) from e
+
+            if len(entries) > settings.max_batch_size:
+                break
+
+        if not entries:
+            raise HTTPException(status_code=400, detail="No files provided")
+        if len(entries) > settings.max_batch_size:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Too many files in batch (max: {settings.max_batch_size})",
+            )
+
+        return entries
+
+    async def create_jobs_from_batch(
+        self, entries: list[tuple[str, bytes]]
+    ) -> tuple[list[tuple[str, str, Path]], list[tuple[str, str]]]:
+        """
+        Create one job per valid file, storing all jobs in one round trip.
+
+        Invalid files are reported instead of failing the whole batch.
+
+        Args:
+            entries: (filename, content) pairs from ``read_batch_files``
+
+        Returns:
+            Tuple of (created (job_id, filename, file_path) triples,
+            rejected (filename, reason) pairs)
+
+        Raises:
+            HTTPException: If writing files or storing the jobs fails
+        """
+        created: list[tuple[str, str, Path]] = []
+        rejected: list[tuple[str, str]] = []
+
+        try:
+            for filename, content in entries:
+                if not filename:
+                    rejected.append((filename, "No filename provided"))
+                    continue
+                try:
+                    suffix, _ = self._validate_upload(filename, len(content))
+                except HTTPException as e:
+                    rejected.append((filename, e.detail))
+                    continue
+
+                job_id = str(uuid.uuid4())
+                file_path = settings.upload_dir / f"{job_id}{suffix}"
+                file_path.write_bytes(content)
+                created.append((job_id, filename, file_path))
+
+            if created:
+                await self.storage.create_jobs(created)
+        except Exception as e:
+            for _, _, file_path in created:
+                file_path.unlink(missing_ok=True)
+            logger.exception("Batch job creation failed")
+            raise HTTPException(status_code=500, detail="Upload failed") from e
+
+        logger.info(
+            f"Created {len(created)} job(s) from batch upload, "
+            f"{len(rejected)} file(s) rejected"
+        )
+        return created, rejected
+
+    async def get_job(self, job_id: str) -> dict:
         """
         Get job by ID.
 
@@ -129,14 +312,102 @@ class JobService:
         Raises:
             HTTPException: If job not found
         """
-        job = self.storage.get_job(job_id)
+        job = await self.storage.get_job(job_id)
 
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
 
         return job
 
-    async def process_job(self, job_id: str, params: ProcessingParams) -> None:
+    def resolve_params(
+        self,
+        mode: ProcessingMode,
+        preset: str | None,
+        params: ProcessParams | None,
+    ) -> ProcessingParams:
+        """
+        Resolve a process request to pipeline parameters.
+
+        ``preset`` (or otherwise ``mode``; ``auto`` and ``custom`` both use
+        the default preset) supplies the settings, and any param the client
+        set explicitly takes precedence. The resulting settings match the
+        preset's precompiled plan unless they were overridden.
+
+        Args:
+            mode: Requested processing mode
+            preset: Requested preset name, overriding ``mode``
+            params: Client parameters, if any
+
+        Returns:
+            ProcessingParams for the job
+
+        Raises:
+            HTTPException: If the preset is unknown
+        """
+        if preset is None:
+            preset = (
+                DEFAULT_PRESET
+                if mode in {ProcessingMode.AUTO, ProcessingMode.CUSTOM}
+                else mode.value
+            )
+
+        overrides = {}
+        if params is not None:
+            overrides = {
+                name: getattr(params, name)
+                for name in params.model_fields_set - JOB_FIELDS
+            }
+
+        try:
+            return self.presets.params(
+                preset,
+                canvas_width_mm=params.canvas_width_mm
+                if params
+                else DEFAULT_CANVAS_WIDTH_MM,
+                canvas_height_mm=params.canvas_height_mm
+                if params
+                else DEFAULT_CANVAS_HEIGHT_MM,
+                line_width_mm=params.line_width_mm if params else DEFAULT_LINE_WIDTH_MM,
+                overrides=overrides,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+
+    async def enqueue_job(
+        self, job_id: str, params: ProcessingParams, preview: bool = False
+    ) -> None:
+        """
+        Hand a job to the worker processes instead of running it here.
+
+        Args:
+            job_id: Job identifier
+            params: Resolved processing parameters
+            preview: Whether the worker streams a fast preview first
+        """
+        await self.storage.enqueue_job(
+            job_id, {"params": asdict(params), "preview": preview}
+        )
+
+    async def process_queued_job(self, entry: dict[str, Any]) -> None:
+        """
+        Process a job taken from the worker queue.
+
+        Args:
+            entry: Queue entry written by ``enqueue_job``
+
+        Raises:
+            HTTPException: If job not found or invalid state
+        """
+        params = dict(entry["params"])
+        # JSON turns the threshold pair into a list
+        params["edge_threshold"] = tuple(params["edge_threshold"])
+        await self.process_job(
+            entry["job_id"], ProcessingParams(**params), preview=entry["preview"]
+        )
+
+    async def process_job(
+        self, job_id: str, params: ProcessingParams, preview: bool = False
+    ) -> None:
         """
         Process job with given parameters.
 
@@ -146,60 +417,60 @@ class JobService:
         Args:
             job_id: Job identifier
             params: Processing parameters
+            preview: Also run a fast low-resolution pass and broadcast it
+                before the full-quality result
 
         Raises:
             HTTPException: If job not found or invalid state
         """
         # Get job from storage
-        job = self.storage.get_job(job_id)
+        job = await self.storage.get_job(job_id)
 
         if not job:
             logger.error(f"Job {job_id} not found")
             raise HTTPException(status_code=404, detail="Job not found")
 
-        if job["status"] != ProcessingStatus.PENDING.value:
+        # Atomic so two concurrent requests cannot both start the job
+        if not await self.storage.transition_status(
+            job_id, ProcessingStatus.PENDING, ProcessingStatus.PROCESSING
+        ):
+            current = await self.storage.get_job(job_id)
             raise HTTPException(
                 status_code=400,
-                detail=f"Job already {job['status']}",
+                detail=f"Job already {current['status'] if current else 'deleted'}",
             )
 
-        # Update status to processing
-        self.storage.set_status(job_id, ProcessingStatus.PROCESSING)
-
         logger.info(f"Starting processing for job {job_id}")
 
-        # Broadcast initial progress
-        await ws_manager.broadcast_progress(
-            job_id, progress=10, stage="preprocessing", message="Loading image"
+        # Stages report progress from worker threads; the throttle coalesces
+        # it into at most one message per interval on this event loop
+        progress = ProgressThrottle(
+            partial(self._publish_progress, job_id),
+            min_interval=settings.progress_min_interval_ms / 1000,
         )
 
         try:
-            # Execute processing pipeline with progress updates
-            # Note: Running processor synchronously in thread pool
-            await ws_manager.broadcast_progress(
-                job_id, progress=20, stage="line_extraction", message="Extracting lines"
-            )
-
-            # Run processor in thread pool to avoid blocking
-            result: ProcessingResult = await asyncio.to_thread(
-                self.processor.process,
-                image_path=Path(job["input_path"]),
-                params=params,
-            )
-
-            await ws_manager.broadcast_progress(
-                job_id, progress=80, stage="export", message="Generating SVG"
+            input_path = Path(job["input_path"])
+            pipeline = asyncio.ensure_future(
+                self._run_pipeline(input_path, params, progress)
             )
+            try:
+                if preview:
+                    await self._stream_preview(job_id, input_path, params, pipeline)
+                result = await pipeline
+            finally:
+                # No progress message may follow the completion or error
+                await progress.aclose()
 
             # Save result
             output_path = settings.results_dir / f"{job_id}.svg"
             output_path.write_text(result.svg_content)
 
             # Update job with results
-            self.storage.set_result(
+            await self.storage.set_result(
                 job_id=job_id,
                 output_path=output_path,
-                stats=dict(result.stats),
+                stats={**result.stats, "stages": result.stage_metrics},
                 device_used=result.device_used,
             )
 
@@ -218,7 +489,7 @@ class JobService:
             logger.exception(f"Job {job_id} failed")
 
             # Update job with error
-            self.storage.set_status(job_id, ProcessingStatus.FAILED, error=str(e))
+            await self.storage.set_status(job_id, ProcessingStatus.FAILED, error=str(e))
 
             # Broadcast error
             await ws_manager.broadcast_error(job_id, error=str(e))
@@ -227,9 +498,100 @@ class JobService:
                 status_code=500, detail=f"Processing failed: {e}"
             ) from e
 
-    def get_job_status(self, job_id: str) -> dict:
+    async def _run_pipeline(
+        self,
+        image_path: Path,
+        params: ProcessingParams,
+        progress: ProgressThrottle | None = None,
+    ) -> ProcessingResult:
+        """
+        Run the processing pipeline without blocking the event loop.
+
+        Args:
+            image_path: Path to input image
+            params: Processing parameters
+            progress: Thread-safe sink for progress events from the stages
+
+        Returns:
+            ProcessingResult from the processor
+        """
+        if self.scheduler is None:
+            return await asyncio.to_thread(
+                self._processor.process,
+                image_path=image_path,
+                params=params,
+                progress=progress,
+            )
+
+        # submit() blocks while the first stage queue is full
+        future = await asyncio.to_thread(
+            self.scheduler.submit, image_path, params, progress
+        )
+        return await asyncio.wrap_future(future)
+
+    async def _publish_progress(self, job_id: str, event: ProgressEvent) -> None:
         """
-        Get job status with progress calculation.
+        Store a coalesced progress event and broadcast it to subscribers.
+
+        Args:
+            job_id: Job identifier
+            event: Latest progress event of the job
+        """
+        await self.storage.set_progress(job_id, event.progress, event.stage)
+        await ws_manager.broadcast_progress(
+            job_id, progress=event.progress, stage=event.stage, message=event.message
+        )
+
+    async def _stream_preview(
+        self,
+        job_id: str,
+        image_path: Path,
+        params: ProcessingParams,
+        pipeline: asyncio.Future[ProcessingResult],
+    ) -> None:
+        """
+        Broadcast a fast preview while the full-quality run is in flight.
+
+        The preview runs on its own worker thread, outside the stage
+        scheduler, so it is not queued behind other jobs. It is dropped when
+        it misses ``settings.preview_latency_budget_ms``, fails, or finishes
+        after the full result; none of these affect the full run.
+
+        Args:
+            job_id: Job identifier
+            image_path: Path to input image
+            params: Processing parameters of the full run
+            pipeline: Future of the full-quality run
+        """
+        budget_ms = settings.preview_latency_budget_ms
+        try:
+            result = await asyncio.wait_for(
+                asyncio.to_thread(
+                    self._processor.process_preview,
+                    image_path,
+                    params,
+                    settings.preview_max_dimension,
+                ),
+                timeout=budget_ms / 1000,
+            )
+        except TimeoutError:
+            # The worker thread cannot be interrupted; its result is discarded
+            logger.warning(f"Preview for job {job_id} exceeded {budget_ms}ms budget")
+            return
+        except Exception:
+            logger.exception(f"Preview failed for job {job_id}")
+            return
+
+        if pipeline.done():
+            return
+
+        await ws_manager.broadcast_preview(
+            job_id, svg=result.svg_content, stats=dict(result.stats)
+        )
+
+    async def get_job_status(self, job_id: str) -> dict:
+        """
+        Get job status with the latest reported progress.
 
         Args:
             job_id: Job identifier
@@ -240,31 +602,83 @@ class JobService:
         Raises:
             HTTPException: If job not found
         """
-        job = self.get_job(job_id)
+        return self._status_from_job(await self.get_job(job_id))
+
+    async def get_jobs_status(self, job_ids: list[str]) -> list[dict | None]:
+        """
+        Get the status of many jobs with a single storage round trip.
 
-        # Calculate progress
+        Args:
+            job_ids: Job identifiers
+
+        Returns:
+            Status dictionaries in the order of ``job_ids``, None for
+            unknown jobs
+        """
+        jobs = await self.storage.get_jobs(job_ids)
+        return [self._status_from_job(job) if job else None for job in jobs]
+
+    async def get_pending_jobs(
+        self, job_ids: list[str]
+    ) -> tuple[list[str], list[tuple[str, str]]]:
+        """
+        Split jobs into those ready to process and those that are not.
+
+        Args:
+            job_ids: Job identifiers
+
+        Returns:
+            Tuple of (pending job IDs, (job_id, reason) for the others)
+        """
+        pending: list[str] = []
+        rejected: list[tuple[str, str]] = []
+        for job_id, job in zip(
+            job_ids, await self.storage.get_jobs(job_ids), strict=True
+        ):
+            if not job:
+                rejected.append((job_id, "Job not found"))
+            elif job["status"] != ProcessingStatus.PENDING.value:
+                rejected.append((job_id, f"Job already {job['status']}"))
+            else:
+                pending.append(job_id)
+        return pending, rejected
+
+    @staticmethod
+    def _status_from_job(job: dict) -> dict:
+        """
+        Build the status dictionary of a stored job.
+
+        Args:
+            job: Job data from storage
+
+        Returns:
+            Status dictionary with progress, results, and metadata
+        """
+        # Running jobs report progress through set_progress
         progress = 0
         if job["status"] == ProcessingStatus.PROCESSING.value:
-            progress = 50
+            progress = job.get("progress") or 0
         elif job["status"] == ProcessingStatus.COMPLETED.value:
             progress = 100
 
         # Build result URL
         result_url = None
         if job.get("output_path"):
-            result_url = f"/api/download/{job_id}"
+            result_url = f"/api/download/{job['job_id']}"
 
         return {
             "job_id": job["job_id"],
             "status": ProcessingStatus(job["status"]),
             "progress": progress,
+            "stage": job.get("stage"),
+            "progress_updated_at": job.get("progress_updated_at"),
             "result_url": result_url,
             "stats": job.get("stats"),
             "error": job.get("error"),
             "device_used": job.get("device_used"),
         }
 
-    def get_result_path(self, job_id: str) -> Path:
+    async def get_result_path(self, job_id: str) -> Path:
         """
         Get result file path for completed job.
 
@@ -277,7 +691,7 @@ class JobService:
         Raises:
             HTTPException: If job not found or not completed
         """
-        job = self.get_job(job_id)
+        job = await self.get_job(job_id)
 
         if job["status"] != ProcessingStatus.COMPLETED.value:
             raise HTTPException(
@@ -292,7 +706,7 @@ class JobService:
 
         return output_path
 
-    def delete_job(self, job_id: str) -> bool:
+    async def delete_job(self, job_id: str) -> bool:
         """
         Delete job and associated files.
 
@@ -302,7 +716,7 @@ class JobService:
         Returns:
             True if deleted successfully
         """
-        job = self.storage.get_job(job_id)
+        job = await self.storage.get_job(job_id)
 
         if not job:
             return False
@@ -321,4 +735,4 @@ class JobService:
             logger.warning(f"Failed to delete files for job {job_id}: {e}")
 
         # Delete from storage
-        return self.storage.delete_job(job_id)
+        return await self.storage.delete_job(job_id)
@@ -2,18 +2,63 @@
 Redis-based job storage for persistent job management.
 
 Replaces in-memory dict storage with Redis for production reliability.
+Jobs are stored as Redis hashes, one field per job attribute, so updates
+write only the fields that change. All operations are async and share the
+client's connection pool.
+
+The storage also holds the queue through which API-only processes hand
+jobs to worker processes.
 """
 
+import asyncio
 import json
 import logging
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, cast
 
 import redis
+import redis.asyncio as aioredis
 from api.models import ProcessingStatus
 
 logger = logging.getLogger(__name__)
 
+JOB_TTL_SECONDS = 86400 * 7  # 7 days
+DEFAULT_MAX_CONNECTIONS = 50
+JOB_QUEUE_KEY = "jobs:queue"
+
+# KEYS[1] = job key, ARGV[1] = TTL, ARGV[2..] = field/value pairs.
+# Updates only an existing job so a late write cannot resurrect a deleted one.
+_UPDATE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+# KEYS[1] = job key, ARGV[1] = TTL, ARGV[2] = expected status,
+# ARGV[3..] = field/value pairs. Compare-and-set on the status field.
+_TRANSITION_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'status') ~= ARGV[2] then
+    return 0
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 3))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+def _encode(fields: dict[str, Any]) -> list[str]:
+    """Flatten fields into HSET arguments with JSON-encoded values."""
+    return [item for key, value in fields.items() for item in (key, json.dumps(value))]
+
+
+def _decode(fields: dict[str, str]) -> dict[str, Any]:
+    """Decode a hash read with HGETALL."""
+    return {key: json.loads(value) for key, value in fields.items()}
+
 
 class JobStorage:
     """
@@ -23,43 +68,82 @@ class JobStorage:
     file paths, results, and metadata.
     """
 
-    def __init__(self, redis_url: str | None = None, use_redis: bool = True):
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        use_redis: bool = True,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    ):
         """
         Initialize job storage.
 
+        The Redis connection is established lazily; call ``connect`` at
+        startup to verify it and fall back to in-memory storage on failure.
+
         Args:
             redis_url: Redis connection URL (e.g., "redis://localhost:6379/0")
             use_redis: Whether to use Redis or fallback to in-memory
+            max_connections: Size of the Redis connection pool
         """
         self.use_redis = use_redis and redis_url is not None
         self.redis_url = redis_url
         self._memory_storage: dict[str, dict] = {}
-
-        if self.use_redis:
-            try:
-                self.redis_client = redis.from_url(
-                    redis_url,
-                    decode_responses=True,
-                    socket_connect_timeout=5,
-                )
-                # Test connection
-                self.redis_client.ping()
-                logger.info(f"Connected to Redis: {redis_url}")
-            except Exception as e:
-                logger.warning(
-                    f"Redis connection failed: {e}. Using in-memory storage."
-                )
-                self.use_redis = False
-                self.redis_client = None
+        self._memory_queue: asyncio.Queue[str] = asyncio.Queue()
+        self.redis_client: aioredis.Redis | None = None
+
+        if self.use_redis and redis_url is not None:
+            self.redis_client = aioredis.Redis.from_url(
+                redis_url,
+                decode_responses=True,
+                socket_connect_timeout=5,
+                max_connections=max_connections,
+            )
+            self._update_script = self.redis_client.register_script(_UPDATE_SCRIPT)
+            self._transition_script = self.redis_client.register_script(
+                _TRANSITION_SCRIPT
+            )
         else:
-            self.redis_client = None
             logger.info("Using in-memory job storage")
 
+    async def connect(self) -> None:
+        """
+        Verify the Redis connection, falling back to in-memory on failure.
+        """
+        if not self.use_redis:
+            return
+
+        try:
+            await self._redis.ping()
+            logger.info(f"Connected to Redis: {self.redis_url}")
+        except (redis.RedisError, OSError) as e:
+            logger.warning(f"Redis connection failed: {e}. Using in-memory storage.")
+            await self.close()
+            self.use_redis = False
+
+    async def close(self) -> None:
+        """Release the Redis connection pool."""
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
+            self.redis_client = None
+
+    @property
+    def _redis(self) -> aioredis.Redis:
+        """
+        Redis client for the Redis-backed code paths.
+
+        Raises:
+            RuntimeError: If the client was closed
+        """
+        if self.redis_client is None:
+            msg = "Redis job storage is closed"
+            raise RuntimeError(msg)
+        return self.redis_client
+
     def _get_key(self, job_id: str) -> str:
         """Get Redis key for job ID."""
         return f"job:{job_id}"
 
-    def create_job(
+    async def create_job(
         self,
         job_id: str,
         filename: str,
@@ -75,30 +159,51 @@ class JobStorage:
             input_path: Path to uploaded file
             status: Initial status
         """
-        job_data = {
-            "job_id": job_id,
-            "filename": filename,
-            "input_path": str(input_path),
-            "output_path": None,
-            "status": status.value,
-            "error": None,
-            "stats": None,
-            "device_used": None,
+        await self.create_jobs([(job_id, filename, input_path)], status=status)
+
+    async def create_jobs(
+        self,
+        jobs: list[tuple[str, str, Path]],
+        status: ProcessingStatus = ProcessingStatus.PENDING,
+    ) -> None:
+        """
+        Create several jobs in one round trip.
+
+        Args:
+            jobs: (job_id, filename, input_path) of each job
+            status: Initial status of every job
+        """
+        records = {
+            job_id: {
+                "job_id": job_id,
+                "filename": filename,
+                "input_path": str(input_path),
+                "output_path": None,
+                "status": status.value,
+                "progress": 0,
+                "stage": None,
+                "progress_updated_at": None,
+                "error": None,
+                "stats": None,
+                "device_used": None,
+            }
+            for job_id, filename, input_path in jobs
         }
 
         if self.use_redis:
-            key = self._get_key(job_id)
-            self.redis_client.setex(
-                key,
-                86400 * 7,  # 7 days TTL
-                json.dumps(job_data),
-            )
+            async with self._redis.pipeline(transaction=True) as pipe:
+                for job_id, job_data in records.items():
+                    key = self._get_key(job_id)
+                    pipe.delete(key)
+                    pipe.hset(key, items=_encode(job_data))
+                    pipe.expire(key, JOB_TTL_SECONDS)
+                await pipe.execute()
         else:
-            self._memory_storage[job_id] = job_data
+            self._memory_storage.update(records)
 
-        logger.debug(f"Created job {job_id}")
+        logger.debug(f"Created {len(records)} job(s)")
 
-    def get_job(self, job_id: str) -> dict | None:
+    async def get_job(self, job_id: str) -> dict | None:
         """
         Get job data.
 
@@ -109,17 +214,42 @@ class JobStorage:
             Job data dict or None if not found
         """
         if self.use_redis:
-            key = self._get_key(job_id)
-            data = self.redis_client.get(key)
-            if data:
-                return json.loads(data)
-            return None
-        return self._memory_storage.get(job_id)
+            # decode_responses=True, so keys and values are str
+            data = cast(
+                "dict[str, str]", await self._redis.hgetall(self._get_key(job_id))
+            )
+            return _decode(data) if data else None
+        job = self._memory_storage.get(job_id)
+        return dict(job) if job is not None else None
 
-    def update_job(self, job_id: str, updates: dict[str, Any]) -> bool:
+    async def get_jobs(self, job_ids: list[str]) -> list[dict | None]:
+        """
+        Get several jobs in one round trip.
+
+        Args:
+            job_ids: Job identifiers
+
+        Returns:
+            Job data dicts in the order of ``job_ids``, None for unknown jobs
+        """
+        if self.use_redis:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for job_id in job_ids:
+                    pipe.hgetall(self._get_key(job_id))
+                results = await pipe.execute()
+            return [_decode(data) if data else None for data in results]
+        return [
+            dict(job) if (job := self._memory_storage.get(job_id)) else None
+            for job_id in job_ids
+        ]
+
+    async def update_job(self, job_id: str, updates: dict[str, Any]) -> bool:
         """
         Update job data.
 
+        Only the given fields are written, atomically and without
+        reading the job first.
+
         Args:
             job_id: Job identifier
             updates: Dictionary of fields to update
@@ -127,25 +257,54 @@ class JobStorage:
         Returns:
             True if job found and updated, False otherwise
         """
-        job = self.get_job(job_id)
-        if not job:
-            return False
+        if self.use_redis:
+            updated = await self._update_script(
+                keys=[self._get_key(job_id)],
+                args=[JOB_TTL_SECONDS, *_encode(updates)],
+            )
+            return bool(updated)
 
+        job = self._memory_storage.get(job_id)
+        if job is None:
+            return False
         job.update(updates)
+        return True
+
+    async def transition_status(
+        self,
+        job_id: str,
+        expected: ProcessingStatus,
+        status: ProcessingStatus,
+    ) -> bool:
+        """
+        Atomically move a job from one status to another.
+
+        Args:
+            job_id: Job identifier
+            expected: Status the job must currently have
+            status: New status
 
+        Returns:
+            True if the job had ``expected`` status and was updated
+        """
         if self.use_redis:
-            key = self._get_key(job_id)
-            self.redis_client.setex(
-                key,
-                86400 * 7,  # 7 days TTL
-                json.dumps(job),
+            updated = await self._transition_script(
+                keys=[self._get_key(job_id)],
+                args=[
+                    JOB_TTL_SECONDS,
+                    json.dumps(expected.value),
+                    *_encode({"status": status.value}),
+                ],
             )
-        else:
-            self._memory_storage[job_id] = job
+            return bool(updated)
 
+        job = self._memory_storage.get(job_id)
+        if job is None or job["status"] != expected.value:
+            return False
+        job["status"] = status.value
         return True
 
-    def set_status(
+    async def set_status(
         self, job_id: str, status: ProcessingStatus, error: str | None = None
     ) -> bool:
         """
@@ -163,9 +322,30 @@ class JobStorage:
         if error:
             updates["error"] = error
 
-        return self.update_job(job_id, updates)
+        return await self.update_job(job_id, updates)
+
+    async def set_progress(self, job_id: str, progress: int, stage: str | None) -> bool:
+        """
+        Record the latest progress of a running job.
+
+        Args:
+            job_id: Job identifier
+            progress: Overall progress percentage (0-100)
+            stage: Stage currently executing
 
-    def set_result(
+        Returns:
+            True if updated, False if job not found
+        """
+        return await self.update_job(
+            job_id,
+            {
+                "progress": progress,
+                "stage": stage,
+                "progress_updated_at": time.time(),
+            },
+        )
+
+    async def set_result(
         self,
         job_id: str,
         output_path: Path,
@@ -193,9 +373,9 @@ class JobStorage:
         if device_used:
             updates["device_used"] = device_used
 
-        return self.update_job(job_id, updates)
+        return await self.update_job(job_id, updates)
 
-    def delete_job(self, job_id: str) -> bool:
+    async def delete_job(self, job_id: str) -> bool:
         """
         Delete a job.
 
@@ -206,14 +386,13 @@ class JobStorage:
             True if deleted, False if not found
         """
         if self.use_redis:
-            key = self._get_key(job_id)
-            return bool(self.redis_client.delete(key))
+            return bool(await self._redis.delete(self._get_key(job_id)))
         if job_id in self._memory_storage:
             del self._memory_storage[job_id]
             return True
         return False
 
-    def exists(self, job_id: str) -> bool:
+    async def exists(self, job_id: str) -> bool:
         """
         Check if job exists.
 
@@ -224,11 +403,43 @@ class JobStorage:
             True if job exists
         """
         if self.use_redis:
-            key = self._get_key(job_id)
-            return bool(self.redis_client.exists(key))
+            return bool(await self._redis.exists(self._get_key(job_id)))
         return job_id in self._memory_storage
 
-    def cleanup_old_jobs(self, days: int = 7) -> int:
+    async def enqueue_job(self, job_id: str, payload: dict[str, Any]) -> None:
+        """
+        Queue a job for the next free worker process.
+
+        Args:
+            job_id: Job identifier
+            payload: JSON-serializable processing request for the worker
+        """
+        entry = json.dumps({"job_id": job_id, **payload})
+        if self.use_redis:
+            await self._redis.lpush(JOB_QUEUE_KEY, entry)
+        else:
+            self._memory_queue.put_nowait(entry)
+
+    async def dequeue_job(self, timeout: float) -> dict[str, Any] | None:
+        """
+        Take the oldest queued job, waiting up to ``timeout`` seconds.
+
+        Args:
+            timeout: Seconds to wait for a job
+
+        Returns:
+            The queued entry (``job_id`` plus its payload), or None on timeout
+        """
+        if self.use_redis:
+            item = await self._redis.brpop([JOB_QUEUE_KEY], timeout=timeout)
+            return json.loads(item[1]) if item else None
+        try:
+            entry = await asyncio.wait_for(self._memory_queue.get(), timeout)
+        except TimeoutError:
+            return None
+        return json.loads(entry)
+
+    async def cleanup_old_jobs(self, days: int = 7) -> int:
         """
         Clean up jobs older than specified days.
 
@@ -261,16 +472,22 @@ def get_job_storage() -> JobStorage:
     return job_storage
 
 
-def init_job_storage(redis_url: str | None = None) -> JobStorage:
+def init_job_storage(
+    redis_url: str | None = None,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+) -> JobStorage:
     """
     Initialize global job storage.
 
+    Call ``await storage.connect()`` afterwards to verify Redis.
+
     Args:
         redis_url: Redis connection URL or None for in-memory
+        max_connections: Size of the Redis connection pool
 
     Returns:
         JobStorage instance
     """
     global job_storage
-    job_storage = JobStorage(redis_url=redis_url)
+    job_storage = JobStorage(redis_url=redis_url, max_connections=max_connections)
     return job_storage
@@ -1,5 +1,24 @@
-"""Utility modules for the application."""
+"""
+Utility modules for the application.
 
-from utils.device import DeviceManager, DeviceType, device_manager
+The device helpers import torch, so they are loaded on first access
+rather than with the package; ``utils.metrics`` and ``utils.cache`` stay
+cheap to import for processes that never run a model.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from utils.device import DeviceManager, DeviceType, device_manager
 
 __all__ = ["DeviceManager", "DeviceType", "device_manager"]
+
+
+def __getattr__(name: str) -> Any:
+    if name in __all__:
+        return getattr(importlib.import_module("utils.device"), name)
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -0,0 +1,113 @@
+"""
+Keyed caches for reusable pipeline objects.
+
+Stage objects such as edge detectors, hatch generators, CLAHE instances
+and hatch patterns only depend on their settings, so one instance per
+distinct key is built and shared across jobs instead of being
+reconstructed on every call.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import cv2
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+_T = TypeVar("_T")
+
+MAX_CACHED_OBJECTS = 256
+# Hatch patterns are full-frame images (4 MB at 2048 x 2048)
+MAX_CACHED_PATTERNS = 16
+CLAHE_TILE_GRID = (8, 8)
+
+
+class ObjectCache:
+    """
+    Thread-safe LRU cache of objects built on first use.
+
+    Factories run outside the lock, so two threads missing the same key at
+    once may both build it; the first stored instance wins and is returned
+    to both. Cached objects are shared between threads and must not be
+    mutated by callers.
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_OBJECTS):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Number of objects kept before the least recently
+                used one is evicted
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, factory: Callable[[], _T]) -> _T:
+        """
+        Get the object stored under ``key``, building it if missing.
+
+        Args:
+            key: Hashable identity of the object, including every setting
+                the factory depends on
+            factory: Zero-argument callable building the object
+
+        Returns:
+            The cached object
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = factory()
+        with self._lock:
+            value = self._entries.setdefault(key, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached object and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def get_clahe(clip_limit: float) -> cv2.CLAHE:
+    """
+    Get a CLAHE instance for the calling thread.
+
+    ``CLAHE.apply`` keeps scratch buffers on the instance, so instances
+    are cached per thread rather than shared.
+
+    Args:
+        clip_limit: CLAHE clip limit
+
+    Returns:
+        CLAHE with an 8 x 8 tile grid
+    """
+    return stage_objects.get(
+        ("clahe", clip_limit, CLAHE_TILE_GRID, threading.get_ident()),
+        lambda: cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=CLAHE_TILE_GRID),
+    )
+
+
+# Process-wide caches shared by the pipeline stages
+stage_objects = ObjectCache()
+hatch_patterns = ObjectCache(max_entries=MAX_CACHED_PATTERNS)
@@ -9,9 +9,13 @@ CUDA (NVIDIA) → MPS (Apple Metal) → CPU fallback.
 from __future__ import annotations
 
 import logging
+import os
+from dataclasses import asdict, dataclass
 from enum import StrEnum
-from typing import TYPE_CHECKING
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
+import cv2
 import torch
 
 if TYPE_CHECKING:
@@ -28,6 +32,78 @@ class DeviceType(StrEnum):
     CPU = "cpu"
 
 
+@dataclass(frozen=True)
+class ThreadAllocation:
+    """
+    Thread pool sizes for one process.
+
+    Attributes:
+        concurrency: CPU-bound tasks expected to run at once on the CPUs
+        cpu_count: CPUs available to the process
+        torch_intra_op: Threads torch uses inside one operator
+        torch_inter_op: Threads torch uses to run operators in parallel
+        opencv: Threads OpenCV uses inside one call
+    """
+
+    concurrency: int
+    cpu_count: int
+    torch_intra_op: int
+    torch_inter_op: int
+    opencv: int
+
+
+def available_cpus() -> int:
+    """
+    Count the CPUs this process may run on.
+
+    Honours CPU affinity (e.g. ``taskset`` or a container cpuset), which
+    ``os.cpu_count()`` ignores.
+
+    Returns:
+        Number of usable CPUs (at least 1)
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def allocate_threads(
+    concurrency: int, cpu_count: int | None = None
+) -> ThreadAllocation:
+    """
+    Split the CPUs between tasks that run at the same time.
+
+    torch and OpenCV each default to one thread per CPU, so N concurrent
+    jobs would start N x CPUs threads that preempt each other. Giving every
+    task an equal share keeps the total at the CPU count; inter-op
+    parallelism is disabled because the concurrent tasks already fill the
+    remaining cores.
+
+    Args:
+        concurrency: CPU-bound tasks expected to run at once
+        cpu_count: CPUs to share (default: ``available_cpus()``)
+
+    Returns:
+        ThreadAllocation with at least one thread per pool
+
+    Raises:
+        ValueError: If concurrency is less than 1
+    """
+    if concurrency < 1:
+        msg = f"concurrency must be at least 1, got {concurrency}"
+        raise ValueError(msg)
+
+    cpus = cpu_count or available_cpus()
+    per_task = max(1, cpus // concurrency)
+    return ThreadAllocation(
+        concurrency=concurrency,
+        cpu_count=cpus,
+        torch_intra_op=per_task,
+        torch_inter_op=1,
+        opencv=per_task,
+    )
+
+
 class DeviceManager:
     """
     Manages hardware acceleration device selection and lifecycle.
@@ -42,6 +118,7 @@ class DeviceManager:
     def __init__(self) -> None:
         """Initialize device manager and auto-detect available hardware."""
         self._device = self._detect_device()
+        self._threads: ThreadAllocation | None = None
         logger.info(f"Using device: {self._device.type} ({self.device_name})")
 
     def _detect_device(self) -> torch.device:
@@ -102,5 +179,71 @@ class DeviceManager:
         """
         return tensor_or_model.to(self._device)
 
+    def configure_threads(self, allocation: ThreadAllocation) -> None:
+        """
+        Apply thread pool sizes to torch and OpenCV for this process.
+
+        torch only accepts an inter-op size before its inter-op pool has
+        started; later calls keep the current size and log a warning.
+
+        Args:
+            allocation: Pool sizes from ``allocate_threads``
+        """
+        torch.set_num_threads(allocation.torch_intra_op)
+        if torch.get_num_interop_threads() != allocation.torch_inter_op:
+            try:
+                torch.set_num_interop_threads(allocation.torch_inter_op)
+            except RuntimeError:
+                logger.warning(
+                    "torch inter-op pool already started, keeping "
+                    f"{torch.get_num_interop_threads()} thread(s)"
+                )
+        cv2.setNumThreads(allocation.opencv)
+        self._threads = allocation
+        logger.info(
+            f"Threads for {allocation.concurrency} concurrent task(s) on "
+            f"{allocation.cpu_count} CPU(s): torch {allocation.torch_intra_op} "
+            f"intra-op / {allocation.torch_inter_op} inter-op, "
+            f"OpenCV {allocation.opencv}"
+        )
+
+    def diagnostics(self) -> dict[str, Any]:
+        """
+        Describe the device and the thread pools in effect.
+
+        Returns:
+            Device details, the requested allocation (None if
+            ``configure_threads`` was never called) and the pool sizes
+            read back from torch and OpenCV
+        """
+        return {
+            "device": self.device_name,
+            "device_type": self.device_type.value,
+            "requested_threads": asdict(self._threads) if self._threads else None,
+            "threads": {
+                "cpu_count": available_cpus(),
+                "torch_intra_op": torch.get_num_threads(),
+                "torch_inter_op": torch.get_num_interop_threads(),
+                "opencv": cv2.getNumThreads(),
+            },
+        }
+
+
+@lru_cache(maxsize=1)
+def get_device_manager() -> DeviceManager:
+    """
+    Get the process-wide device manager, probing devices on first call.
+
+    Returns:
+        Shared DeviceManager instance
+    """
+    return DeviceManager()
+
 
-device_manager = DeviceManager()
+def __getattr__(name: str) -> DeviceManager:
+    # Probing CUDA/MPS is slow, so ``device_manager`` is created when a
+    # model first asks for it rather than when this module is imported
+    if name == "device_manager":
+        return get_device_manager()
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -0,0 +1,206 @@
+"""
+Persisted U²-Net masks shared by jobs on the same image.
+
+Segmentation is the most expensive step of an isolate-subject job, and
+users often run one upload through several presets. Predicted masks are
+stored as PNG files (masks are mostly flat, so they compress to a few KB)
+keyed by the image the model saw, the model weights and the inference
+mode; a later job on the same image with the same model loads the mask
+instead of running U²-Net.
+
+The directory is bounded in size. Reading a mask touches its file, so the
+modification times order entries by last use and eviction removes the
+least recently used files first. Writes go through a temp file and a
+rename, so API workers and batch processes can share one directory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import uuid
+from typing import TYPE_CHECKING
+
+import cv2
+import numpy as np
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from numpy.typing import NDArray
+
+logger = logging.getLogger(__name__)
+
+MASK_SUFFIX = ".png"
+BYTES_PER_MB = 1024 * 1024
+DEFAULT_MAX_BYTES = 256 * BYTES_PER_MB
+# zlib level 1-9; masks are mostly flat, so fast compression is enough
+PNG_COMPRESSION = 3
+DIGEST_SIZE = 16
+
+_mask_cache: MaskCache | None = None
+
+
+def image_digest(image: NDArray[np.uint8]) -> str:
+    """
+    Content hash of an image, including its shape.
+
+    Args:
+        image: Image as the model receives it (after resizing)
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    digest.update(f"{image.shape}{image.dtype}".encode())
+    digest.update(np.ascontiguousarray(image).data)
+    return digest.hexdigest()
+
+
+class MaskCache:
+    """
+    Size-bounded directory of predicted masks with LRU eviction.
+
+    Holds no in-process state besides hit counters, so it can be pickled
+    to worker processes.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Open (and create) a cache directory.
+
+        Args:
+            directory: Directory holding the mask files
+            max_bytes: Total size of the mask files kept; least recently
+                used masks are evicted beyond it
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        directory.mkdir(parents=True, exist_ok=True)
+
+    def key(self, image: NDArray[np.uint8], model_version: str, mode: str) -> str:
+        """
+        Build the cache key of a mask.
+
+        Args:
+            image: Image the mask is predicted from
+            model_version: Identity of the model weights
+            mode: Inference resolution and settings, e.g. ``"512"``
+
+        Returns:
+            Key usable as a file name
+        """
+        return f"{image_digest(image)}-{model_version}-{mode}"
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{MASK_SUFFIX}"
+
+    def get(self, key: str) -> NDArray[np.uint8] | None:
+        """
+        Load a mask and mark it as recently used.
+
+        Args:
+            key: Key from ``key``
+
+        Returns:
+            Mask, or None if it is not cached (or unreadable)
+        """
+        path = self._path(key)
+        try:
+            data = np.frombuffer(path.read_bytes(), dtype=np.uint8)
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        mask: NDArray[np.uint8] | None = cv2.imdecode(data, cv2.IMREAD_UNCHANGED)  # type: ignore[assignment]
+        if mask is None:
+            logger.warning(f"Discarding unreadable cached mask {path.name}")
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return mask
+
+    def put(self, key: str, mask: NDArray[np.uint8]) -> None:
+        """
+        Store a mask, then evict masks beyond the size limit.
+
+        Args:
+            key: Key from ``key``
+            mask: Mask (H, W), 0-255
+        """
+        ok, encoded = cv2.imencode(
+            MASK_SUFFIX, mask, [cv2.IMWRITE_PNG_COMPRESSION, PNG_COMPRESSION]
+        )
+        if not ok:
+            logger.warning(f"Could not encode mask {key}, not caching it")
+            return
+
+        path = self._path(key)
+        partial = self.directory / f".{key}.{uuid.uuid4().hex[:8]}.tmp"
+        partial.write_bytes(encoded.tobytes())
+        partial.replace(path)
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Remove least recently used masks until the directory fits.
+
+        Returns:
+            Number of masks removed
+        """
+        entries = []
+        for path in self.directory.glob(f"*{MASK_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"Evicted {removed} cached mask(s)")
+        return removed
+
+
+def open_mask_cache(directory: Path | None, max_mb: int) -> MaskCache | None:
+    """
+    Open the mask cache described by the settings.
+
+    Args:
+        directory: Cache directory, or None when caching is disabled
+        max_mb: Size limit in MB
+
+    Returns:
+        MaskCache, or None without a directory
+    """
+    if directory is None:
+        return None
+    return MaskCache(directory, max_bytes=max_mb * BYTES_PER_MB)
+
+
+def configure_mask_cache(cache: MaskCache | None) -> None:
+    """
+    Set the mask cache used by subject isolation in this process.
+
+    Args:
+        cache: Cache to use, or None to disable caching
+    """
+    global _mask_cache
+    _mask_cache = cache
+
+
+def get_mask_cache() -> MaskCache | None:
+    """Mask cache of this process, or None when caching is disabled."""
+    return _mask_cache
@@ -0,0 +1,268 @@
+"""
+In-process metrics with Prometheus text exposition.
+
+Provides label-aware histograms and gauges collected by the pipeline
+instrumentation hooks and rendered by the ``/metrics`` endpoint.
+"""
+
+from __future__ import annotations
+
+import bisect
+import itertools
+import math
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Render a label set, or an empty string when there are no labels."""
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value the way Prometheus expects."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Shared label handling for metric families."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            msg = (
+                f"Metric '{self.name}' expects labels {list(self.label_names)}, "
+                f"got {sorted(labels)}"
+            )
+            raise ValueError(msg)
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class Histogram(_Metric):
+    """
+    Cumulative histogram with fixed bucket upper bounds.
+
+    One series is kept per distinct label set. Observations are counted in
+    the first bucket whose upper bound is greater than or equal to the value.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        buckets: Sequence[float],
+        label_names: Sequence[str] = (),
+    ):
+        """
+        Create an empty histogram.
+
+        Args:
+            name: Metric family name
+            help_text: One-line description shown in the exposition
+            buckets: Strictly increasing bucket upper bounds
+            label_names: Names of labels every observation must supply
+
+        Raises:
+            ValueError: If buckets are empty or not strictly increasing
+        """
+        if not buckets or any(a >= b for a, b in itertools.pairwise(buckets)):
+            msg = f"Histogram '{name}' needs strictly increasing buckets"
+            raise ValueError(msg)
+
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(float(b) for b in buckets)
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value: Observed value
+            **labels: Label values for the series
+        """
+        key = self._label_values(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def count(self, **labels: str) -> int:
+        """Return the number of observations recorded for a label set."""
+        key = self._label_values(labels)
+        with self._lock:
+            return sum(self._counts.get(key, ()))
+
+    def render(self) -> list[str]:
+        """Render the family in Prometheus text format."""
+        lines = self._header()
+        with self._lock:
+            series = sorted(self._counts.items())
+            sums = dict(self._sums)
+
+        for key, counts in series:
+            cumulative = 0
+            for bound, bucket_count in zip(
+                (*self.buckets, math.inf), counts, strict=True
+            ):
+                cumulative += bucket_count
+                labels = _format_labels(
+                    (*self.label_names, "le"), (*key, _format_value(bound))
+                )
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(sums[key])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Last-value gauge with one series per label set."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        super().__init__(name, help_text, label_names)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """
+        Set the current value of a series.
+
+        Args:
+            value: New value
+            **labels: Label values for the series
+        """
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def render(self) -> list[str]:
+        """Render the family in Prometheus text format."""
+        lines = self._header()
+        with self._lock:
+            series = sorted(self._values.items())
+        for key, value in series:
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named collection of metric families rendered together."""
+
+    def __init__(self):
+        self._metrics: dict[str, Histogram | Gauge] = {}
+        self._lock = threading.Lock()
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        buckets: Sequence[float],
+        label_names: Sequence[str] = (),
+    ) -> Histogram:
+        """
+        Get or create a histogram family.
+
+        Args:
+            name: Metric family name
+            help_text: One-line description
+            buckets: Bucket upper bounds used when the family is created
+            label_names: Label names used when the family is created
+
+        Returns:
+            The registered histogram
+
+        Raises:
+            TypeError: If the name is already registered as another metric type
+        """
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = Histogram(name, help_text, buckets, label_names)
+                self._metrics[name] = metric
+        if not isinstance(metric, Histogram):
+            msg = f"Metric '{name}' is already registered as a {metric.kind}"
+            raise TypeError(msg)
+        return metric
+
+    def gauge(
+        self, name: str, help_text: str, label_names: Sequence[str] = ()
+    ) -> Gauge:
+        """
+        Get or create a gauge family.
+
+        Args:
+            name: Metric family name
+            help_text: One-line description
+            label_names: Label names used when the family is created
+
+        Returns:
+            The registered gauge
+
+        Raises:
+            TypeError: If the name is already registered as another metric type
+        """
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = Gauge(name, help_text, label_names)
+                self._metrics[name] = metric
+        if not isinstance(metric, Gauge):
+            msg = f"Metric '{name}' is already registered as a {metric.kind}"
+            raise TypeError(msg)
+        return metric
+
+    def render(self) -> str:
+        """
+        Render every registered family.
+
+        Returns:
+            Prometheus text exposition (version 0.0.4)
+        """
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines = [line for metric in metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry scraped by the /metrics endpoint
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,216 @@
+"""
+Potrace driven through pipes.
+
+The bitmap is encoded in memory as a raw PBM and piped to ``potrace`` on
+stdin; the traced output is read from stdout. No temp files are written.
+
+``trace_polylines`` uses potrace's GeoJSON backend, whose output is already
+flattened to straight segments: it is parsed with ``json`` into point
+arrays instead of parsing SVG Béziers. It also traces several bitmaps with
+one process by tiling them side by side on a single bitmap, so a batch
+pays for one process start instead of one per image. ``trace_svg`` keeps
+potrace's own SVG by default; the GeoJSON backend is opt-in.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from numpy.typing import NDArray
+
+POTRACE_BINARY = "potrace"
+DEFAULT_TIMEOUT_S = 30.0
+GEOJSON_BACKEND = ("--backend", "geojson")
+# Blank columns between tiled bitmaps; rings are assigned to tiles at the
+# middle of the gap, which tolerates smoothed curves overshooting an edge
+TILE_GAP_PX = 2
+# "svg" keeps potrace's own Bézier SVG; "geojson" traces to polylines
+POTRACE_BACKENDS = ("svg", "geojson")
+
+
+def encode_pbm(ink: NDArray[np.bool_]) -> bytes:
+    """
+    Encode a mask as a raw (P4) PBM bitmap.
+
+    Args:
+        ink: 2-D mask, True where potrace should trace (PBM black)
+
+    Returns:
+        PBM file contents; rows are padded to whole bytes
+    """
+    height, width = ink.shape
+    header = f"P4\n{width} {height}\n".encode()
+    return header + np.packbits(ink, axis=1).tobytes()
+
+
+def run_potrace(
+    bitmap: bytes, args: Sequence[str], timeout: float = DEFAULT_TIMEOUT_S
+) -> str:
+    """
+    Trace a bitmap piped on stdin and return potrace's stdout.
+
+    Args:
+        bitmap: PBM bitmap from ``encode_pbm``
+        args: Backend and tracing options, e.g. ``["-s", "--turdsize=2"]``
+        timeout: Seconds before the process is killed
+
+    Returns:
+        Traced document (SVG for ``-s``)
+
+    Raises:
+        RuntimeError: If potrace exits with an error
+        subprocess.TimeoutExpired: If potrace runs longer than ``timeout``
+    """
+    result = subprocess.run(
+        [POTRACE_BINARY, *args, "--output", "-", "-"],
+        input=bitmap,
+        capture_output=True,
+        timeout=timeout,
+        check=False,
+    )
+    if result.returncode != 0:
+        msg = f"Potrace failed: {result.stderr.decode(errors='replace')}"
+        raise RuntimeError(msg)
+    return result.stdout.decode()
+
+
+def parse_geojson(document: str, height: int) -> list[NDArray[np.float64]]:
+    """
+    Convert potrace GeoJSON output into polylines in image coordinates.
+
+    Args:
+        document: Output of potrace's GeoJSON backend
+        height: Height of the traced bitmap, to flip potrace's upward y axis
+
+    Returns:
+        One closed polyline per polygon ring, as (n, 2) arrays of x, y pixels
+    """
+    polylines = []
+    for feature in json.loads(document).get("features", []):
+        geometry = feature.get("geometry") or {}
+        polygons = geometry.get("coordinates", [])
+        if geometry.get("type") == "Polygon":
+            polygons = [polygons]
+        for polygon in polygons:
+            for ring in polygon:
+                points = np.asarray(ring, dtype=np.float64).reshape(-1, 2)
+                points[:, 1] = height - points[:, 1]
+                polylines.append(points)
+    return polylines
+
+
+def trace_polylines(
+    inks: Sequence[NDArray[np.bool_]],
+    args: Sequence[str] = (),
+    timeout: float = DEFAULT_TIMEOUT_S,
+) -> list[list[NDArray[np.float64]]]:
+    """
+    Trace one or more masks with a single potrace process.
+
+    Masks are placed left to right on one bitmap with ``TILE_GAP_PX`` blank
+    columns between them; every traced ring is handed back to the mask it
+    lies in and shifted into that mask's coordinates.
+
+    Args:
+        inks: 2-D masks, True where potrace should trace
+        args: Tracing options, e.g. ``["--turdsize=2"]`` (the backend is
+            always GeoJSON)
+        timeout: Seconds before the process is killed
+
+    Returns:
+        Polylines of each mask, in the order of ``inks``
+
+    Raises:
+        ValueError: If no masks are given
+        RuntimeError: If potrace exits with an error
+    """
+    if not inks:
+        msg = "At least one bitmap is needed"
+        raise ValueError(msg)
+
+    offsets = np.cumsum([0] + [ink.shape[1] + TILE_GAP_PX for ink in inks[:-1]])
+    height = max(ink.shape[0] for ink in inks)
+    sheet = np.zeros((height, int(offsets[-1]) + inks[-1].shape[1]), dtype=bool)
+    for ink, offset in zip(inks, offsets, strict=True):
+        sheet[: ink.shape[0], offset : offset + ink.shape[1]] = ink
+
+    document = run_potrace(encode_pbm(sheet), [*GEOJSON_BACKEND, *args], timeout)
+
+    boundaries = offsets - TILE_GAP_PX / 2
+    traced: list[list[NDArray[np.float64]]] = [[] for _ in inks]
+    for polyline in parse_geojson(document, height):
+        index = max(
+            int(np.searchsorted(boundaries, polyline[:, 0].min(), side="right")) - 1,
+            0,
+        )
+        polyline[:, 0] -= offsets[index]
+        traced[index].append(polyline)
+    return traced
+
+
+def polylines_to_svg(
+    polylines: Sequence[NDArray[np.float64]], width: int, height: int
+) -> str:
+    """
+    Render polylines as a minimal SVG of straight-segment paths.
+
+    Args:
+        polylines: (n, 2) point arrays in pixels
+        width: Image width in pixels
+        height: Image height in pixels
+
+    Returns:
+        SVG document sized to the image
+    """
+    paths = [
+        '<path d="M'
+        + " L".join(f"{x:.2f},{y:.2f}" for x, y in polyline)
+        + ' Z" fill="none" stroke="black"/>'
+        for polyline in polylines
+        if len(polyline)
+    ]
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+        f'height="{height}" viewBox="0 0 {width} {height}">\n'
+        + "\n".join(paths)
+        + "\n</svg>\n"
+    )
+
+
+def trace_svg(
+    ink: NDArray[np.bool_],
+    args: Sequence[str] = (),
+    backend: str = "svg",
+    timeout: float = DEFAULT_TIMEOUT_S,
+) -> str:
+    """
+    Trace a mask into an SVG document.
+
+    Args:
+        ink: 2-D mask, True where potrace should trace
+        args: Tracing options, e.g. ``["--turdsize=2"]``
+        backend: One of ``POTRACE_BACKENDS``
+        timeout: Seconds before the process is killed
+
+    Returns:
+        SVG document
+
+    Raises:
+        ValueError: If the backend is unknown
+        RuntimeError: If potrace exits with an error
+    """
+    if backend == "geojson":
+        [polylines] = trace_polylines([ink], args, timeout)
+        return polylines_to_svg(polylines, width=ink.shape[1], height=ink.shape[0])
+    if backend == "svg":
+        return run_potrace(encode_pbm(ink), ["--svg", *args], timeout)
+
+    msg = f"Unknown potrace backend: {backend} (expected one of {POTRACE_BACKENDS})"
+    raise ValueError(msg)
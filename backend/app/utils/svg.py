@@ -0,0 +1,51 @@
+"""
+In-memory SVG reading and writing with vpype.
+
+vpype reads from and writes to text streams, so SVG strings are parsed and
+produced through ``io.StringIO`` rather than round-tripped through temp
+files, which cost a file create, write, fsync pressure and unlink per call.
+"""
+
+from __future__ import annotations
+
+import io
+from typing import Any
+
+import vpype as vp
+
+# Longest segment used to approximate curves when reading (px or mm)
+QUANTIZATION = 0.1
+
+
+def read_svg_string(
+    svg: str, quantization: float = QUANTIZATION
+) -> tuple[vp.LineCollection, float, float]:
+    """
+    Parse an SVG string into line geometry.
+
+    Args:
+        svg: SVG document
+        quantization: Longest segment used to approximate curves
+
+    Returns:
+        Tuple of (LineCollection, page width, page height), as
+        ``vp.read_svg`` returns
+    """
+    return vp.read_svg(io.StringIO(svg), quantization=quantization)
+
+
+def write_svg_string(document: vp.Document, **options: Any) -> str:
+    """
+    Render a vpype document as an SVG string.
+
+    Args:
+        document: Document to write
+        **options: Keyword arguments for ``vp.write_svg`` (page_size,
+            color_mode, ...)
+
+    Returns:
+        SVG document
+    """
+    output = io.StringIO()
+    vp.write_svg(output, document, **options)
+    return output.getvalue()
@@ -0,0 +1,136 @@
+"""
+Worker process for jobs queued by API-only processes.
+
+Usage (from backend/app, with REDIS_URL set):
+    python -m worker
+
+API processes started with ``PROCESS_ROLE=api`` never import torch or
+load a model; they resolve each request and push it onto the job queue in
+Redis. Workers take jobs from the queue, run them on the stage scheduler
+and publish progress through the Redis event bus, which delivers it to
+the WebSocket clients of every API replica. Stage metrics are recorded in
+the workers, which serve them on ``WORKER_METRICS_PORT`` when it is set.
+"""
+
+import asyncio
+import contextlib
+import logging
+import signal
+
+from api.events import create_event_bus
+from api.metrics import serve_metrics
+from api.websocket import ws_manager
+from config import settings
+from dependencies import get_processor, get_scheduler
+from fastapi import HTTPException
+from services.job_service import JobService
+from storage import init_job_storage
+
+logger = logging.getLogger("worker")
+
+# How long one queue poll blocks, bounding shutdown latency
+DEQUEUE_TIMEOUT_S = 1.0
+
+
+async def run_queued_job(job_service: JobService, entry: dict) -> None:
+    """
+    Run one queued job, logging instead of raising on failure.
+
+    Args:
+        job_service: Job service running the job
+        entry: Queue entry taken from the job storage
+    """
+    try:
+        await job_service.process_queued_job(entry)
+    except HTTPException:
+        # Already recorded on the job by the service layer
+        pass
+    except Exception:
+        logger.exception(f"Queued job {entry.get('job_id')} failed")
+
+
+async def run_worker(stop: asyncio.Event) -> None:
+    """
+    Take jobs from the queue until ``stop`` is set.
+
+    At most ``settings.worker_max_jobs`` jobs run at once; jobs that are
+    running when ``stop`` is set are finished before returning.
+
+    Args:
+        stop: Event that ends the polling loop
+
+    Raises:
+        RuntimeError: If Redis is not configured or not reachable
+    """
+    settings.ensure_directories()
+
+    storage = init_job_storage(
+        redis_url=settings.redis_url,
+        max_connections=settings.redis_max_connections,
+    )
+    await storage.connect()
+    if not storage.use_redis:
+        msg = "Workers need Redis to share the job queue with the API processes"
+        raise RuntimeError(msg)
+
+    await ws_manager.start(create_event_bus(storage))
+    # Stage metrics are recorded here, not in the API processes
+    metrics_server = (
+        await serve_metrics(settings.host, settings.worker_metrics_port)
+        if settings.worker_metrics_port
+        else None
+    )
+    processor = get_processor()
+    job_service = JobService(
+        storage=storage, processor=processor, scheduler=get_scheduler()
+    )
+    logger.info(
+        f"Worker ready, running up to {settings.worker_max_jobs} jobs with "
+        f"{processor.device_manager.diagnostics()['threads']}"
+    )
+
+    slots = asyncio.Semaphore(settings.worker_max_jobs)
+    running: set[asyncio.Task[None]] = set()
+    try:
+        while not stop.is_set():
+            await slots.acquire()
+            entry = await storage.dequeue_job(timeout=DEQUEUE_TIMEOUT_S)
+            if entry is None:
+                slots.release()
+                continue
+
+            task = asyncio.create_task(run_queued_job(job_service, entry))
+            running.add(task)
+            task.add_done_callback(running.discard)
+            task.add_done_callback(lambda _: slots.release())
+        if running:
+            await asyncio.gather(*running)
+    finally:
+        if metrics_server is not None:
+            metrics_server.close()
+            await metrics_server.wait_closed()
+        await ws_manager.stop()
+        await storage.close()
+        get_scheduler().shutdown(wait=False)
+
+
+def main() -> None:
+    """Run the worker until SIGINT or SIGTERM."""
+    logging.basicConfig(
+        level=logging.INFO if settings.debug else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    async def serve() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            with contextlib.suppress(NotImplementedError):
+                loop.add_signal_handler(sig, stop.set)
+        await run_worker(stop)
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,13 @@ Tests for FastAPI endpoints.
 Validates API functionality with real HTTP requests.
 """
 
+import asyncio
 import io
+import uuid
+import zipfile
 
 import pytest
+from dependencies import get_job_service
 from fastapi.testclient import TestClient
 from main import app
 from PIL import Image
@@ -122,9 +126,104 @@ def test_process_endpoint_not_found(client):
     assert response.status_code == 404
 
 
+def test_batch_upload_and_status(client, test_image_bytes):
+    """Batch upload accepts images and ZIP archives; status is fetched in bulk."""
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("photos/inside.jpg", test_image_bytes)
+
+    upload_response = client.post(
+        "/api/batch/upload",
+        files=[
+            ("files", ("a.jpg", test_image_bytes, "image/jpeg")),
+            ("files", ("photos.zip", archive.getvalue(), "application/zip")),
+            ("files", ("notes.txt", b"not an image", "text/plain")),
+        ],
+    )
+
+    assert upload_response.status_code == 200
+    data = upload_response.json()
+    assert [job["filename"] for job in data["jobs"]] == ["a.jpg", "inside.jpg"]
+    assert [error["item"] for error in data["errors"]] == ["notes.txt"]
+
+    job_ids = [job["job_id"] for job in data["jobs"]]
+    missing = "00000000-0000-0000-0000-000000000000"
+    status_response = client.post(
+        "/api/batch/status", json={"job_ids": [*job_ids, missing]}
+    )
+
+    assert status_response.status_code == 200
+    status_data = status_response.json()
+    assert [job["job_id"] for job in status_data["jobs"]] == job_ids
+    assert all(job["status"] == "pending" for job in status_data["jobs"])
+    assert status_data["not_found"] == [missing]
+
+
+def test_batch_process_reports_unknown_jobs(client):
+    """Jobs that cannot be started are reported without failing the batch."""
+    missing = "00000000-0000-0000-0000-000000000000"
+    response = client.post("/api/batch/process", json={"job_ids": [missing]})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["jobs"] == []
+    assert data["errors"] == [{"item": missing, "error": "Job not found"}]
+
+
+def test_batch_status_rejects_invalid_job_id(client):
+    """Malformed job IDs fail the whole bulk status request."""
+    response = client.post("/api/batch/status", json={"job_ids": ["not-a-uuid"]})
+
+    assert response.status_code == 400
+
+
 def test_download_endpoint_not_found(client):
     """Test download endpoint with non-existent job."""
     # Use valid UUID format but non-existent job
     response = client.get("/api/download/00000000-0000-0000-0000-000000000000")
 
     assert response.status_code == 404
+
+
+def test_metrics_endpoint(client):
+    """Test Prometheus endpoint exposes stage histograms."""
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE pipeline_stage_wall_seconds histogram" in response.text
+
+
+class ConcurrencyProbeJobService:
+    """Job service stand-in recording how many jobs run at once."""
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+
+    def resolve_params(self, mode, preset, params):
+        return params
+
+    async def get_pending_jobs(self, job_ids):
+        return list(job_ids), []
+
+    async def process_job(self, job_id, params, preview=False):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.05)
+        self.running -= 1
+
+
+def test_batch_process_runs_jobs_concurrently(client):
+    """A batch's jobs are in flight together rather than one after another."""
+    service = ConcurrencyProbeJobService()
+    app.dependency_overrides[get_job_service] = lambda: service
+    job_ids = [str(uuid.uuid4()), str(uuid.uuid4())]
+    try:
+        response = client.post("/api/batch/process", json={"job_ids": job_ids})
+    finally:
+        app.dependency_overrides.pop(get_job_service)
+
+    assert response.status_code == 200
+    assert [job["job_id"] for job in response.json()["jobs"]] == job_ids
+    assert service.max_running == len(job_ids)
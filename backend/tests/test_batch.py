@@ -0,0 +1,153 @@
+"""
+Tests for the offline batch CLI: input discovery, output planning and resume.
+"""
+
+import json
+import os
+
+import batch.__main__
+import pytest
+from batch import (
+    discover_inputs,
+    is_up_to_date,
+    params_digest,
+    plan_tasks,
+    previous_params_digest,
+    run_batch,
+)
+from batch.__main__ import load_params
+from PIL import Image, ImageDraw
+from pipeline.presets import preset_params
+
+CANVAS_WIDTH_MM = 200.0
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    """Input tree with images, a nested image, and a non-image file."""
+    root = tmp_path / "catalog"
+    (root / "sub").mkdir(parents=True)
+    for name in ("a.jpg", "b.PNG", "sub/c.jpg", "notes.txt", ".hidden.jpg"):
+        (root / name).write_bytes(b"x")
+    return root
+
+
+def test_discover_inputs_directory_and_glob(catalog):
+    """Directories list images only; globs keep the layout below the pattern."""
+    flat, root = discover_inputs(str(catalog))
+    nested, _ = discover_inputs(str(catalog), recursive=True)
+    globbed, glob_root = discover_inputs(str(catalog / "**" / "*.jpg"))
+
+    assert [p.name for p in flat] == ["a.jpg", "b.PNG"]
+    assert root == catalog
+    assert [p.relative_to(catalog).as_posix() for p in nested] == [
+        "a.jpg",
+        "b.PNG",
+        "sub/c.jpg",
+    ]
+    assert glob_root == catalog
+    assert [p.name for p in globbed] == ["a.jpg", "c.jpg"]
+
+
+def test_plan_tasks_mirrors_input_layout(catalog, tmp_path):
+    """Outputs keep the relative path of each input with one file per format."""
+    out = tmp_path / "out"
+    [task] = plan_tasks([catalog / "sub" / "c.jpg"], catalog, out, ["svg", "gcode"])
+
+    assert task.outputs == {
+        "svg": out / "sub" / "c.svg",
+        "gcode": out / "sub" / "c.gcode",
+    }
+
+
+def test_resume_skips_up_to_date_outputs(catalog, tmp_path):
+    """Tasks whose outputs are newer than the inputs are not reprocessed."""
+    image = catalog / "a.jpg"
+    [task] = plan_tasks([image], catalog, tmp_path / "out", ["svg"])
+    assert not is_up_to_date(task)
+
+    task.outputs["svg"].parent.mkdir(parents=True)
+    task.outputs["svg"].write_text("<svg/>")
+    mtime = image.stat().st_mtime
+    os.utime(task.outputs["svg"], (mtime + 1, mtime + 1))
+
+    assert is_up_to_date(task)
+    assert not is_up_to_date(task, newer_than=mtime + 2)
+
+    params = preset_params("portrait", CANVAS_WIDTH_MM, CANVAS_WIDTH_MM, 0.3)
+    report = run_batch([task], params, workers=1)
+    assert [record.status for record in report.images] == ["skipped"]
+    assert report.to_dict()["summary"] == {"skipped": 1}
+
+
+def test_load_params_validates_fields(tmp_path):
+    """Params files use the API parameter schema and its validation."""
+    valid = tmp_path / "params.json"
+    valid.write_text(
+        json.dumps(
+            {
+                "canvas_width_mm": CANVAS_WIDTH_MM,
+                "canvas_height_mm": 150,
+                "line_width_mm": 0.3,
+                "edge_threshold": [30, 90],
+            }
+        )
+    )
+    invalid = tmp_path / "invalid.json"
+    invalid.write_text(json.dumps({"canvas_width_mm": -1}))
+
+    params = load_params(valid)
+
+    assert params.canvas_width_mm == CANVAS_WIDTH_MM
+    assert tuple(params.edge_threshold) == (30, 90)
+    with pytest.raises(ValueError, match="Invalid params file"):
+        load_params(invalid)
+
+
+def test_changed_params_disable_resume(catalog, tmp_path, monkeypatch):
+    """A report made with other parameters makes the next run reprocess all."""
+    out = tmp_path / "out"
+    report_path = out / "report.json"
+    params = preset_params("portrait", CANVAS_WIDTH_MM, CANVAS_WIDTH_MM, 0.3)
+    resized = preset_params("portrait", CANVAS_WIDTH_MM / 2, CANVAS_WIDTH_MM, 0.3)
+    assert params_digest(params) != params_digest(resized)
+    assert previous_params_digest(report_path) is None
+
+    run_batch([], params, workers=1).save(report_path)
+    assert previous_params_digest(report_path) == params_digest(params)
+
+    calls = []
+
+    def fake_run_batch(tasks, params, **kwargs):
+        calls.append(kwargs["resume"])
+        return run_batch([], params, workers=1)
+
+    monkeypatch.setattr(batch.__main__, "run_batch", fake_run_batch)
+    common = [str(catalog), "--output-dir", str(out), "--preset", "portrait"]
+    width = ["--canvas-width", str(CANVAS_WIDTH_MM), "--canvas-height"]
+
+    batch.__main__.main([*common, *width, str(CANVAS_WIDTH_MM)])
+    batch.__main__.main([*common, *width, str(CANVAS_WIDTH_MM / 2)])
+
+    assert calls == [True, False]
+
+
+@pytest.mark.requires_imagetracerjs
+def test_run_batch_converts_image_in_worker_process(tmp_path):
+    """A real image goes through the worker pool to an SVG on disk."""
+    image = tmp_path / "in" / "shapes.png"
+    image.parent.mkdir()
+    canvas = Image.new("RGB", (160, 120), "white")
+    draw = ImageDraw.Draw(canvas)
+    draw.rectangle((20, 20, 80, 90), outline="black", width=4)
+    draw.ellipse((90, 30, 140, 80), outline="black", width=4)
+    canvas.save(image)
+
+    [task] = plan_tasks([image], image.parent, tmp_path / "out", ["svg"])
+    params = preset_params("auto", CANVAS_WIDTH_MM, CANVAS_WIDTH_MM, 0.3)
+    report = run_batch([task], params, workers=1)
+
+    [record] = report.images
+    assert record.status == "completed", record.error
+    assert task.outputs["svg"].read_text().lstrip().startswith(("<?xml", "<svg"))
+    assert not list(task.outputs["svg"].parent.glob(".*.partial*"))
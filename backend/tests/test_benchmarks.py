@@ -0,0 +1,126 @@
+"""
+Tests for the benchmark harness.
+
+Runs only the in-process cases on tiny images so the suite stays fast.
+"""
+
+import numpy as np
+import pytest
+from benchmarks import (
+    CONTENT_TYPES,
+    BenchmarkReport,
+    CaseResult,
+    compare,
+    generate_image,
+    run_benchmarks,
+    select_cases,
+)
+from benchmarks.cases import BenchmarkCase
+from benchmarks.quality import edge_f_score, mask_iou
+
+
+def _result(p50: float, memory: int = 1000) -> CaseResult:
+    return CaseResult(
+        case="line_extraction.bilateral_canny",
+        content="shapes",
+        size=64,
+        iterations=3,
+        latency_ms={"p50": p50},
+        peak_memory_bytes=memory,
+    )
+
+
+@pytest.mark.parametrize("content", CONTENT_TYPES)
+def test_generate_image_is_deterministic(content):
+    """Same arguments give the same RGB image."""
+    first = generate_image(content, 64, seed=3)
+
+    assert first.shape == (48, 64, 3)
+    assert first.dtype == np.uint8
+    assert np.array_equal(first, generate_image(content, 64, seed=3))
+
+
+def test_generate_image_rejects_unknown_content():
+    """Unknown content types fail early."""
+    with pytest.raises(ValueError, match="Unknown content type"):
+        generate_image("landscape", 64)
+
+
+def test_select_cases():
+    """Patterns select cases by name and unknown patterns fail."""
+    names = [case.name for case in select_cases(["export.*"])]
+
+    assert names == ["export.vpype.svg", "export.vpype.hpgl", "export.vpype.gcode"]
+    with pytest.raises(ValueError, match="No benchmark case"):
+        select_cases(["decode.*"])
+
+
+def test_run_benchmarks_records_percentiles(tmp_path):
+    """A run records latency percentiles and skips unavailable cases."""
+    unavailable = BenchmarkCase("vectorize.missing", lambda: False, lambda data: None)
+    cases = [*select_cases(["line_extraction.*", "hatching.*"]), unavailable]
+
+    report = run_benchmarks(cases, contents=["shapes"], sizes=[64], iterations=3)
+
+    measured = {r.case: r for r in report.results if not r.skipped}
+    canny = measured["line_extraction.bilateral_canny"]
+    assert canny.iterations == 3
+    assert canny.latency_ms["p50"] <= canny.latency_ms["p99"]
+    assert canny.throughput_per_s > 0
+    assert canny.peak_memory_bytes > 0
+    assert "hatching.hatch_generator" in measured
+    assert canny.quality == {}
+    guided = measured["line_extraction.bilateral_canny.guided"]
+    assert 0 < guided.quality["f_score"] <= 1
+    skipped = [r for r in report.results if r.skipped]
+    assert [r.case for r in skipped] == ["vectorize.missing"]
+
+    path = tmp_path / "report.json"
+    report.save(path)
+    loaded = BenchmarkReport.load(path)
+    assert [r.key for r in loaded.results] == [r.key for r in report.results]
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    """Only slowdowns past the threshold are reported."""
+    baseline = BenchmarkReport(metadata={}, results=[_result(10.0)])
+
+    within = BenchmarkReport(metadata={}, results=[_result(11.0)])
+    assert compare(within, baseline, threshold=0.2) == []
+
+    slower = BenchmarkReport(metadata={}, results=[_result(13.0, memory=5000)])
+    regressions = compare(slower, baseline, threshold=0.2)
+    assert [r.metric for r in regressions] == ["latency_p50_ms", "peak_memory_bytes"]
+    assert regressions[0].ratio == pytest.approx(1.3)
+
+
+def test_edge_f_score_tolerates_small_shifts():
+    """Edges within the tolerance match; disjoint and empty maps are scored."""
+    reference = np.zeros((32, 32), dtype=np.uint8)
+    reference[:, 10] = 255
+    shifted = np.roll(reference, 1, axis=1)
+    distant = np.roll(reference, 8, axis=1)
+    empty = np.zeros_like(reference)
+
+    assert edge_f_score(shifted, reference)["f_score"] == pytest.approx(1.0)
+    assert edge_f_score(distant, reference)["f_score"] == 0.0
+    assert edge_f_score(empty, reference) == {
+        "precision": 1.0,
+        "recall": 0.0,
+        "f_score": 0.0,
+    }
+    assert edge_f_score(empty, empty)["f_score"] == 1.0
+
+
+def test_mask_iou_scores_overlap():
+    """IoU counts shared foreground; identical empty masks score 1."""
+    reference = np.zeros((10, 10), dtype=np.uint8)
+    reference[:, :4] = 255
+    mask = np.zeros_like(reference)
+    mask[:, :2] = 255
+
+    assert mask_iou(mask, reference) == {
+        "iou": pytest.approx(0.5),
+        "changed": pytest.approx(0.2),
+    }
+    assert mask_iou(np.zeros_like(mask), np.zeros_like(mask))["iou"] == 1.0
@@ -12,7 +12,9 @@ from models.classical_cv import (
     CannyEdgeDetector,
     XDoGExtractor,
     auto_canny,
+    canny_thresholds,
 )
+from models.smoothing_method import SmoothingMethod
 
 
 @pytest.fixture
@@ -112,3 +114,37 @@ def test_deterministic_output(test_image):
     edges2 = detector.extract_lines(test_image.copy())
 
     np.testing.assert_array_equal(edges1, edges2)
+
+
+@pytest.mark.parametrize(
+    "smoothing",
+    [method for method in SmoothingMethod if method != SmoothingMethod.BILATERAL],
+)
+def test_bilateral_canny_smoothing_alternatives(test_image, smoothing):
+    """Faster smoothers find the same shape outlines as the bilateral filter."""
+    reference = BilateralCannyDetector().extract_lines(test_image)
+    edges = BilateralCannyDetector(smoothing=smoothing).extract_lines(test_image)
+
+    near_reference = cv2.dilate(reference, np.ones((3, 3), np.uint8)) > 0
+    matched = np.sum((edges > 0) & near_reference)
+    assert edges.shape == reference.shape
+    assert matched > 0.9 * np.sum(edges > 0)
+
+
+def test_bilateral_canny_rejects_unknown_smoothing():
+    """Unknown smoothing methods fail when the detector is built."""
+    with pytest.raises(ValueError, match="median"):
+        BilateralCannyDetector(smoothing="median")
+
+
+def test_canny_thresholds_from_downsampled_histogram():
+    """Thresholds bracket the median, which survives downsampling."""
+    image = np.full((1200, 1600), 100, dtype=np.uint8)
+    image[:, :400] = 220
+
+    low, high = canny_thresholds(image, sigma=0.5)
+    thumbnail_low, thumbnail_high = canny_thresholds(image, max_dimension=64)
+
+    assert (low, high) == (50, 150)
+    assert (thumbnail_low, thumbnail_high) == canny_thresholds(image)
+    assert low < np.median(image) < high
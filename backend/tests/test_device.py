@@ -4,8 +4,10 @@ Tests for device detection and management.
 Validates hardware acceleration device selection logic.
 """
 
+import cv2
+import pytest
 import torch
-from utils.device import DeviceManager, DeviceType
+from utils.device import DeviceManager, DeviceType, allocate_threads
 
 
 def test_device_manager_initialization():
@@ -62,3 +64,34 @@ def test_to_device_model():
 
     param = next(moved_model.parameters())
     assert param.device.type == manager.device.type
+
+
+def test_allocate_threads_splits_cpus_between_tasks():
+    """Concurrent tasks get an equal share of the CPUs, at least one each."""
+    allocation = allocate_threads(4, cpu_count=16)
+    assert allocation.torch_intra_op == 4
+    assert allocation.opencv == 4
+    assert allocation.torch_inter_op == 1
+
+    assert allocate_threads(32, cpu_count=8).torch_intra_op == 1
+
+    with pytest.raises(ValueError, match="concurrency"):
+        allocate_threads(0)
+
+
+def test_configure_threads_is_reported_in_diagnostics():
+    """Applied pool sizes are read back from torch and OpenCV."""
+    manager = DeviceManager()
+    previous = (torch.get_num_threads(), cv2.getNumThreads())
+    allocation = allocate_threads(2, cpu_count=4)
+    try:
+        manager.configure_threads(allocation)
+        info = manager.diagnostics()
+    finally:
+        torch.set_num_threads(previous[0])
+        cv2.setNumThreads(previous[1])
+
+    assert info["device_type"] == manager.device_type.value
+    assert info["requested_threads"]["concurrency"] == 2
+    assert info["threads"]["torch_intra_op"] == allocation.torch_intra_op
+    assert info["threads"]["opencv"] == allocation.opencv
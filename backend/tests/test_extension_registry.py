@@ -0,0 +1,49 @@
+"""
+Tests for the extension manifest and lazy provider resolution.
+"""
+
+from extensions.line_extraction.EXT_LineExtraction import EXT_LineExtraction
+from extensions.line_extraction.PRV_AutoCanny import PRV_AutoCanny
+from extensions.manifest import (
+    ExtensionEntry,
+    ProviderEntry,
+    load_manifest,
+    scan_extensions,
+)
+from extensions.registry import ExtensionRegistry
+
+
+def test_manifest_matches_extension_files():
+    """The generated manifest lists exactly what a directory scan finds."""
+    assert load_manifest() == scan_extensions(), (
+        "Extension manifest is stale; run `python -m extensions` in backend/app"
+    )
+
+
+def test_providers_resolve_lazily_through_normal_imports(monkeypatch):
+    """Selection imports only the providers it tries, via sys.modules."""
+    missing = ProviderEntry("missing", "extensions.not_a_module", "PRV_Missing")
+    auto_canny = ProviderEntry(
+        "auto_canny", "extensions.line_extraction.PRV_AutoCanny", "PRV_AutoCanny"
+    )
+    monkeypatch.setattr(ExtensionRegistry, "_discovered", True)
+    monkeypatch.setattr(
+        ExtensionRegistry,
+        "_extensions",
+        {
+            "line_extraction": ExtensionEntry(
+                "line_extraction",
+                "extensions.line_extraction.EXT_LineExtraction",
+                "EXT_LineExtraction",
+                providers=(missing, auto_canny),
+            )
+        },
+    )
+    monkeypatch.setattr(ExtensionRegistry, "_loaded", {})
+
+    assert EXT_LineExtraction.select_provider(["auto_canny"]) is PRV_AutoCanny
+    assert list(ExtensionRegistry._loaded) == [(auto_canny.module, "PRV_AutoCanny")]
+
+    # A provider whose module fails to import is skipped
+    assert EXT_LineExtraction.select_provider(["missing"]) is PRV_AutoCanny
+    assert ExtensionRegistry._loaded[(missing.module, "PRV_Missing")] is None
@@ -59,6 +59,21 @@ def test_provider_availability():
     assert isinstance(available, bool)
 
 
+def test_auto_canny_provider():
+    """Test the preview line extraction provider is discovered and extracts edges."""
+    from extensions.line_extraction.EXT_LineExtraction import EXT_LineExtraction
+
+    image = np.full((64, 64, 3), 255, dtype=np.uint8)
+    image[16:48, 16:48] = 40
+
+    provider_names = [p.name for p in EXT_LineExtraction.get_providers()]
+    assert "auto_canny" in provider_names
+
+    edges = EXT_LineExtraction.extract(image, provider_preferences=["auto_canny"])
+    assert edges.shape == (64, 64)
+    assert edges.max() == 255
+
+
 def test_hook_registration():
     """Test that hooks can be registered and executed."""
     from extensions.hooks import HookTiming, hook
@@ -0,0 +1,58 @@
+"""
+Tests for the edge-density guardrail in front of vectorization.
+"""
+
+import numpy as np
+import pytest
+from pipeline.guardrail import EdgeBudget, EdgeDensityError, enforce_edge_budget
+
+FRAME_SIZE = 100
+BUDGET = EdgeBudget(
+    soft_max_components=10,
+    max_components=20,
+    max_density=0.2,
+    min_fragment_px=2,
+    max_fragment_px=8,
+)
+
+
+def _edges_with_specks(specks: int) -> np.ndarray:
+    """Two long lines plus isolated single-pixel specks."""
+    edges = np.zeros((FRAME_SIZE, FRAME_SIZE), dtype=np.uint8)
+    edges[10, 5:95] = 255
+    edges[50:90, 20] = 255
+    for i in range(specks):
+        edges[30 + 2 * (i // 40), 5 + 2 * (i % 40)] = 255
+    return edges
+
+
+def test_clean_edge_map_passes_untouched():
+    """Maps under the soft limit are only measured."""
+    edges = _edges_with_specks(3)
+
+    filtered, analysis = enforce_edge_budget(edges, BUDGET)
+
+    assert filtered is edges
+    assert analysis.components == 5
+    assert analysis.removed_components == 0
+    assert analysis.edge_pixels == int(np.count_nonzero(edges))
+
+
+def test_small_fragments_are_removed_over_soft_limit():
+    """Specks go once the fragment count passes the soft limit; lines stay."""
+    filtered, analysis = enforce_edge_budget(_edges_with_specks(60), BUDGET)
+
+    assert analysis.components == 2
+    assert analysis.removed_components == 60
+    assert analysis.min_fragment_px == BUDGET.min_fragment_px
+    assert filtered[10, 50] == 255
+    assert filtered[30, 5] == 0
+
+
+def test_dense_edge_map_fails_fast_with_advice():
+    """Maps still over budget after filtering raise an actionable error."""
+    noisy = np.zeros((FRAME_SIZE, FRAME_SIZE), dtype=np.uint8)
+    noisy[:, ::3] = 255
+
+    with pytest.raises(EdgeDensityError, match="edge_threshold"):
+        enforce_edge_budget(noisy, BUDGET)
@@ -0,0 +1,109 @@
+"""
+Tests for per-stage instrumentation hooks and metrics exposition.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+from api.metrics import serve_metrics
+from extensions.base import RunContext
+from extensions.instrumentation import describe_payload, install_instrumentation
+from extensions.line_extraction.EXT_LineExtraction import EXT_LineExtraction
+from utils.metrics import MetricsRegistry, metrics_registry
+
+
+@pytest.fixture(scope="module", autouse=True)
+def instrumented():
+    install_instrumentation()
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Buckets are cumulative and include +Inf, sum and count."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("job_seconds", "Job time", (1, 5), ("stage",))
+
+    for value in (0.5, 2, 10):
+        histogram.observe(value, stage="vectorize")
+
+    text = registry.render()
+    assert 'job_seconds_bucket{stage="vectorize",le="1"} 1' in text
+    assert 'job_seconds_bucket{stage="vectorize",le="5"} 2' in text
+    assert 'job_seconds_bucket{stage="vectorize",le="+Inf"} 3' in text
+    assert 'job_seconds_sum{stage="vectorize"} 12.5' in text
+    assert 'job_seconds_count{stage="vectorize"} 3' in text
+
+
+def test_metric_validation():
+    """Mismatched labels and buckets are rejected."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("h", "help", (1, 2), ("stage",))
+
+    with pytest.raises(ValueError, match="expects labels"):
+        histogram.observe(1, provider="x")
+    with pytest.raises(ValueError, match="strictly increasing"):
+        registry.histogram("bad", "help", (2, 1))
+    with pytest.raises(TypeError, match="already registered"):
+        registry.gauge("h", "help")
+
+
+def test_describe_payload():
+    """Payload sizes cover images, edge maps and SVG strings."""
+    edges = np.zeros((10, 20), dtype=np.uint8)
+    edges[0, :5] = 255
+
+    assert describe_payload(edges) == {"pixels": 200, "edge_pixels": 5}
+    assert describe_payload(np.zeros((4, 5, 3), dtype=np.uint8)) == {"pixels": 20}
+    assert describe_payload('<svg><path d=""/><path d=""/></svg>')["paths"] == 2
+    assert describe_payload(None) == {}
+
+
+def test_extension_call_records_stage_metrics():
+    """Hooks attach a stage record to the run and feed the histograms."""
+    labels = {"stage": "line_extraction", "provider": "bilateral_canny"}
+    wall = metrics_registry.histogram("pipeline_stage_wall_seconds", "", (1,))
+    before = wall.count(**labels)
+
+    image = np.full((64, 64, 3), 255, dtype=np.uint8)
+    image[16:48, 16:48] = 0
+    run = RunContext(job_id="job-1")
+
+    EXT_LineExtraction.extract(image, provider_preferences=["bilateral_canny"], run=run)
+
+    assert len(run.stage_records) == 1
+    record = run.stage_records[0]
+    assert record["stage"] == "line_extraction"
+    assert record["provider"] == "bilateral_canny"
+    assert record["wall_seconds"] >= 0
+    assert record["cpu_seconds"] >= 0
+    assert record["process_peak_rss_bytes"] > 0
+    assert record["input"] == {"pixels": 64 * 64}
+    assert record["output"]["edge_pixels"] > 0
+    assert wall.count(**labels) == before + 1
+    assert "process_peak_rss_bytes " in metrics_registry.render()
+    assert "pipeline_stage_peak_rss_growth_bytes" not in metrics_registry.render()
+
+
+@pytest.mark.asyncio
+async def test_worker_metrics_server_serves_scrapes():
+    """The worker metrics port answers /metrics and 404s anything else."""
+    server = await serve_metrics("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    async def get(path):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: worker\r\n\r\n".encode())
+        response = await reader.read()
+        writer.close()
+        return response.decode()
+
+    try:
+        scrape = await get("/metrics")
+        missing = await get("/other")
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    assert scrape.startswith("HTTP/1.1 200 OK")
+    assert "# TYPE pipeline_stage_wall_seconds histogram" in scrape
+    assert missing.startswith("HTTP/1.1 404")
@@ -0,0 +1,80 @@
+"""
+Tests for the persisted segmentation mask cache.
+
+Covers keying, PNG round trips, LRU eviction by size and recovery from
+unreadable entries.
+"""
+
+import os
+
+import numpy as np
+import pytest
+from utils.mask_cache import MaskCache, open_mask_cache
+
+
+@pytest.fixture
+def mask():
+    """Soft mask with a filled rectangle."""
+    mask = np.zeros((60, 80), dtype=np.uint8)
+    mask[10:50, 20:60] = 255
+    mask[10, 20:60] = 128
+    return mask
+
+
+def test_round_trip_and_key(tmp_path, mask):
+    """Stored masks load back exactly; keys change with every component."""
+    cache = MaskCache(tmp_path / "masks")
+    image = np.zeros((60, 80, 3), dtype=np.uint8)
+    key = cache.key(image, "abc", "512")
+
+    assert cache.get(key) is None
+    cache.put(key, mask)
+
+    np.testing.assert_array_equal(cache.get(key), mask)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert (
+        len(
+            {
+                key,
+                cache.key(image + 1, "abc", "512"),
+                cache.key(image, "def", "512"),
+                cache.key(image, "abc", "cascade320-t128"),
+                cache.key(image[:, :40], "abc", "512"),
+            }
+        )
+        == 5
+    )
+
+
+def test_evicts_least_recently_used(tmp_path, mask):
+    """Beyond the size limit the least recently read masks go first."""
+    cache = MaskCache(tmp_path, max_bytes=10**9)
+    for age, name in enumerate(["old", "used", "new"]):
+        cache.put(name, mask)
+        os.utime(tmp_path / f"{name}.png", (age, age))
+    cache.get("used")
+
+    cache.max_bytes = 2 * (tmp_path / "new.png").stat().st_size
+
+    assert cache.evict() == 1
+    assert cache.get("old") is None
+    assert cache.get("used") is not None
+    assert cache.get("new") is not None
+
+
+def test_unreadable_entry_is_discarded(tmp_path):
+    """A corrupt file counts as a miss and is removed."""
+    cache = MaskCache(tmp_path)
+    (tmp_path / "broken.png").write_bytes(b"not a png")
+
+    assert cache.get("broken") is None
+    assert not (tmp_path / "broken.png").exists()
+
+
+def test_open_mask_cache_disabled_without_directory(tmp_path):
+    """No directory disables the cache; a directory is created on open."""
+    assert open_mask_cache(None, 16) is None
+    cache = open_mask_cache(tmp_path / "masks", 16)
+
+    assert cache.max_bytes == 16 * 1024 * 1024
+    assert (tmp_path / "masks").is_dir()
@@ -0,0 +1,77 @@
+"""
+Tests for the keyed object caches shared by the pipeline stages.
+"""
+
+import threading
+
+import numpy as np
+import pytest
+from pipeline.hatching import HatchGenerator, hatch_pattern
+from pipeline.line_extraction import LineExtractionMethod, LineExtractor
+from utils.cache import ObjectCache, get_clahe, stage_objects
+
+FRAME_SIZE = 64
+SPACING_PX = 4
+CLIP_LIMIT = 2.0
+
+
+def test_object_cache_builds_once_and_evicts_lru():
+    """Repeated keys reuse the first object; the oldest key is evicted first."""
+    cache = ObjectCache(max_entries=2)
+    built = []
+
+    def factory(key):
+        built.append(key)
+        return object()
+
+    first = cache.get("a", lambda: factory("a"))
+    assert cache.get("a", lambda: factory("a")) is first
+    cache.get("b", lambda: factory("b"))
+    cache.get("a", lambda: factory("a"))
+    cache.get("c", lambda: factory("c"))
+    cache.get("b", lambda: factory("b"))
+
+    assert built == ["a", "b", "c", "b"]
+    assert (cache.hits, cache.misses) == (2, 4)
+    assert len(cache) == 2
+
+
+def test_line_extractor_reuses_threshold_detectors():
+    """Explicit thresholds map to one shared detector per threshold pair."""
+    stage_objects.clear()
+    extractor = LineExtractor()
+    image = np.zeros((FRAME_SIZE, FRAME_SIZE), dtype=np.uint8)
+
+    extractor.extract(image, LineExtractionMethod.BILATERAL_CANNY, 40, 120)
+    extractor.extract(image, LineExtractionMethod.BILATERAL_CANNY, 40, 120)
+    extractor.extract(image, LineExtractionMethod.BILATERAL_CANNY, 60, 120)
+
+    assert stage_objects.misses == 2
+    assert stage_objects.hits == 1
+
+
+def test_hatch_patterns_are_shared_and_read_only():
+    """Patterns are drawn once per geometry and cannot be mutated."""
+    pattern = hatch_pattern(FRAME_SIZE, FRAME_SIZE, SPACING_PX, 45)
+
+    assert hatch_pattern(FRAME_SIZE, FRAME_SIZE, SPACING_PX, 45) is pattern
+    assert pattern.any()
+    with pytest.raises(ValueError, match="read-only"):
+        pattern[0, 0] = 0
+
+    generator = HatchGenerator(line_width_mm=0.1)
+    dark = np.zeros((FRAME_SIZE, FRAME_SIZE), dtype=np.uint8)
+    hatching = generator.generate_hatches(dark, FRAME_SIZE, FRAME_SIZE)
+    assert hatching.flags.writeable
+
+
+def test_clahe_instances_are_per_thread():
+    """Each thread gets its own CLAHE; calls on one thread reuse it."""
+    main = get_clahe(CLIP_LIMIT)
+    other = []
+    thread = threading.Thread(target=lambda: other.append(get_clahe(CLIP_LIMIT)))
+    thread.start()
+    thread.join()
+
+    assert get_clahe(CLIP_LIMIT) is main
+    assert other[0] is not main
@@ -4,6 +4,8 @@ Tests for SVG optimization module.
 Tests vpype-based path optimization with real SVG data.
 """
 
+import tempfile
+
 import pytest
 
 from app.pipeline.optimize import VpypeOptimizer
@@ -56,6 +58,21 @@ class TestVpypeOptimizer:
         assert "<svg" in optimized.lower()
         assert "</svg>" in optimized.lower()
 
+    def test_optimize_stays_in_memory(self, optimizer, simple_svg, monkeypatch):
+        """Optimization and stats never round-trip through temp files."""
+
+        def no_temp_files(*args, **kwargs):
+            msg = "temp file created"
+            raise AssertionError(msg)
+
+        monkeypatch.setattr(tempfile, "NamedTemporaryFile", no_temp_files)
+
+        optimized = optimizer.optimize(
+            simple_svg, canvas_width_mm=100.0, canvas_height_mm=100.0
+        )
+
+        assert optimizer.get_stats(optimized)["path_count"] >= 1
+
     def test_optimize_with_canvas_scaling(self, optimizer, simple_svg):
         """Test SVG scales to exact canvas dimensions."""
         optimized = optimizer.optimize(
@@ -9,8 +9,10 @@ from pathlib import Path
 
 import numpy as np
 import pytest
+from extensions.preprocess.PRV_U2Net import PRV_U2Net
 from PIL import Image
 from pipeline.preprocess import ImagePreprocessor
+from utils import compositing
 
 RGB_CHANNELS = 3
 ORIGINAL_WIDTH = 800
@@ -150,3 +152,72 @@ def test_preprocess_complete_pipeline(test_image_path):
     assert result.dtype == np.uint8
     assert result.shape[0] == ORIGINAL_HEIGHT
     assert result.shape[1] == ORIGINAL_WIDTH
+
+
+class _FixedMaskPredictor:
+    """Stands in for U2NetPredictor with a fixed rectangular mask."""
+
+    def predict_mask(self, image, threshold=128, cascade=False, cache=None):
+        mask = np.zeros(image.shape[:2], dtype=np.uint8)
+        mask[20:80, 30:70] = 255
+        return mask
+
+
+@pytest.fixture
+def subject_image():
+    """Dark square on a mid-gray frame."""
+    image = np.full((100, 100, 3), 128, dtype=np.uint8)
+    image[20:80, 30:70] = (40, 20, 10)
+    return image
+
+
+def test_composite_matches_float_blend():
+    """Fixed-point blending stays within one level of the float reference."""
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (64, 48, 3), dtype=np.uint8)
+    alpha = rng.integers(0, 256, (64, 48), dtype=np.uint8)
+    background = np.array((255, 240, 10))
+
+    weight = alpha[:, :, None] / 255.0
+    expected = image * weight + background * (1 - weight)
+
+    result = compositing.composite(image, alpha, (255, 240, 10))
+
+    assert result.dtype == np.uint8
+    assert np.abs(result - expected).max() <= 1
+
+
+def test_isolate_subject_hard_mask_is_exact(subject_image):
+    """A hard mask keeps subject pixels and paints exactly the background."""
+    preprocessor = ImagePreprocessor(_FixedMaskPredictor())
+
+    result = preprocessor.isolate_subject(subject_image, background_color=(1, 2, 3))
+
+    np.testing.assert_array_equal(result[20:80, 30:70], subject_image[20:80, 30:70])
+    assert (result[:20] == (1, 2, 3)).all()
+
+
+def test_isolate_subject_refined_mask(subject_image):
+    """Refinement softens the boundary but keeps interior and far background."""
+    mask = _FixedMaskPredictor().predict_mask(subject_image)
+
+    refined = compositing.refine_mask(subject_image, mask, max_dimension=50)
+
+    assert refined.shape == mask.shape
+    assert refined[50, 50] == 255
+    assert refined[2, 2] == 0
+    assert ((refined > 0) & (refined < 255)).any()
+
+
+def test_u2net_provider_keeps_mask_as_alpha(subject_image, monkeypatch):
+    """With keep_alpha the provider returns the composite plus its mask."""
+    monkeypatch.setattr(PRV_U2Net, "_u2net_predictor", _FixedMaskPredictor())
+
+    rgba = PRV_U2Net.isolate_subject(subject_image, keep_alpha=True)
+    rgb = PRV_U2Net.isolate_subject(subject_image)
+
+    assert rgba.shape == (100, 100, 4)
+    np.testing.assert_array_equal(rgba[..., :3], rgb)
+    np.testing.assert_array_equal(
+        rgba[..., 3], _FixedMaskPredictor().predict_mask(subject_image)
+    )
@@ -0,0 +1,149 @@
+"""
+Tests for the preset registry and compiled pipeline plans.
+"""
+
+import json
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from api.models import ProcessingMode, ProcessParams
+from fastapi import HTTPException
+from models.classical_cv import canny_thresholds
+from pipeline.presets import PresetRegistry, load_presets
+from pipeline.processor import PhotoToLineProcessor, PipelineState
+from services.job_service import JobService
+
+CANVAS_WIDTH_MM = 200.0
+CANVAS_HEIGHT_MM = 150.0
+LINE_WIDTH_MM = 0.5
+ANIMAL_LOW_THRESHOLD = 30
+CUSTOM_LOW_THRESHOLD = 10
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return PresetRegistry()
+
+
+def test_presets_are_compiled_once_with_stable_ids(registry):
+    """Preset jobs reuse the startup plan regardless of canvas and line width."""
+    portrait = registry.params("portrait", CANVAS_WIDTH_MM, CANVAS_HEIGHT_MM, 0.3)
+    resized = registry.params("portrait", 400.0, 300.0, LINE_WIDTH_MM)
+
+    plan = registry.plan_for(portrait)
+
+    assert plan.preset == "portrait"
+    assert registry.plan_for(resized) is plan
+    assert plan.hatching is not None
+    assert plan.stages["line_extraction"].options["edge_threshold"] == (50, 150)
+    assert PresetRegistry().plan_for(portrait).plan_id == plan.plan_id
+
+    preview = registry.plan_for(portrait, preview=True)
+    animal = registry.plan_for(registry.params("animal", 1.0, 1.0, 1.0))
+    assert len({plan.plan_id, preview.plan_id, animal.plan_id}) == 3
+    assert preview.stages["line_extraction"].providers[0] == "auto_canny"
+
+
+def test_overridden_settings_compile_an_adhoc_plan(registry):
+    """Settings matching no preset get their own cached plan."""
+    params = registry.params("animal", 1.0, 1.0, 1.0, overrides={"line_threshold": 40})
+
+    plan = registry.plan_for(params)
+
+    assert plan.preset is None
+    assert registry.plan_for(params) is plan
+    assert plan.stages["vectorize"].options["line_threshold"] == 40
+
+
+def test_load_presets_merges_file(tmp_path):
+    """Presets from a file are added to the built-ins and validated."""
+    path = tmp_path / "presets.json"
+    path.write_text(json.dumps({"sketchy": {"hatching_enabled": False}}))
+    bad = tmp_path / "bad.json"
+    bad.write_text(json.dumps({"broken": {"canvas_width_mm": 10}}))
+
+    presets = load_presets(path)
+
+    assert {"auto", "portrait", "animal", "sketchy"} <= set(presets)
+    assert (
+        PresetRegistry(presets)
+        .plan_for(PresetRegistry(presets).params("sketchy", 1.0, 1.0, 1.0))
+        .preset
+        == "sketchy"
+    )
+    with pytest.raises(ValueError, match="unknown settings"):
+        load_presets(bad)
+
+
+def test_job_service_resolves_mode_and_explicit_params(registry):
+    """Mode picks the preset; only params the client set override it."""
+    processor = Mock()
+    processor.presets = registry
+    service = JobService(storage=Mock(), processor=processor)
+    params = ProcessParams(
+        canvas_width_mm=CANVAS_WIDTH_MM,
+        canvas_height_mm=CANVAS_HEIGHT_MM,
+        line_width_mm=LINE_WIDTH_MM,
+    )
+    custom = ProcessParams(
+        canvas_width_mm=CANVAS_WIDTH_MM,
+        canvas_height_mm=CANVAS_HEIGHT_MM,
+        line_width_mm=LINE_WIDTH_MM,
+        edge_threshold=(CUSTOM_LOW_THRESHOLD, 100),
+    )
+
+    animal = service.resolve_params(ProcessingMode.ANIMAL, None, params)
+    overridden = service.resolve_params(ProcessingMode.ANIMAL, None, custom)
+    auto = service.resolve_params(ProcessingMode.AUTO, None, None)
+
+    assert animal.edge_threshold == (ANIMAL_LOW_THRESHOLD, 120)
+    assert animal.canvas_width_mm == CANVAS_WIDTH_MM
+    assert overridden.edge_threshold == (CUSTOM_LOW_THRESHOLD, 100)
+    assert overridden.hatching_enabled
+    assert registry.plan_for(auto).preset == "auto"
+    with pytest.raises(HTTPException) as exc_info:
+        service.resolve_params(ProcessingMode.AUTO, "missing", params)
+    assert exc_info.value.status_code == 400
+
+
+def test_auto_threshold_is_resolved_once_and_recorded():
+    """Auto thresholds are computed from the image and kept for the job stats."""
+    processor = PhotoToLineProcessor()
+    params = processor.presets.params(
+        "auto", CANVAS_WIDTH_MM, CANVAS_HEIGHT_MM, LINE_WIDTH_MM
+    )
+    params.auto_threshold = True
+    image = np.full((120, 160, 3), 200, dtype=np.uint8)
+    image[30:90, 40:120] = 40
+    state = PipelineState(image_path=Path("unused.png"), params=params, image=image)
+
+    processor.run_stage("line_extraction", state)
+
+    assert state.plan.stages["line_extraction"].options["auto_threshold"] is True
+    assert state.edge_threshold == canny_thresholds(image)
+    assert state.edges.any()
+
+
+def test_preview_ignores_use_ml():
+    """The preview extractor has no ML path, so use_ml is dropped for previews."""
+    processor = PhotoToLineProcessor()
+    params = processor.presets.params(
+        "auto", CANVAS_WIDTH_MM, CANVAS_HEIGHT_MM, LINE_WIDTH_MM
+    )
+    params.use_ml = True
+    image = np.full((120, 160, 3), 200, dtype=np.uint8)
+    image[30:90, 40:120] = 40
+    state = PipelineState(
+        image_path=Path("unused.png"), params=params, image=image, preview=True
+    )
+
+    processor.run_stage("line_extraction", state)
+
+    preview = state.plan.stages["line_extraction"]
+    full = processor.presets.plan_for(params).stages["line_extraction"]
+    assert preview.providers[0] == "auto_canny"
+    assert preview.options["use_ml"] is False
+    assert full.options["use_ml"] is True
+    assert state.edges.any()
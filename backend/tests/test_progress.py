@@ -0,0 +1,122 @@
+"""
+Tests for pipeline progress reporting and throttling.
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+from extensions.base import RunContext
+from extensions.instrumentation import install_instrumentation
+from extensions.line_extraction.EXT_LineExtraction import EXT_LineExtraction
+from extensions.progress import install_progress_hooks
+from pipeline.progress import PipelineProgress, ProgressEvent, ProgressThrottle
+
+MIN_INTERVAL = 0.05
+FINAL_PROGRESS = 99
+MAX_PUBLISHED_PER_BURST = 4
+
+
+@pytest.fixture(scope="module", autouse=True)
+def progress_hooks():
+    install_progress_hooks()
+
+
+def test_extension_hooks_report_stage_boundaries():
+    """Before and after hooks report the start and end of each stage."""
+    reports = []
+    run = RunContext(progress=lambda *report: reports.append(report))
+
+    EXT_LineExtraction.extract(
+        np.zeros((32, 32, 3), dtype=np.uint8),
+        provider_preferences=["bilateral_canny"],
+        run=run,
+    )
+
+    assert reports == [("extract", 0.0, None), ("extract", 1.0, None)]
+
+
+def test_progress_hooks_bracket_stage_timing():
+    """Progress is reported outside the metrics hooks that time the stage."""
+    install_instrumentation()
+
+    modules = {"extensions.progress", "extensions.instrumentation"}
+
+    def hook_order(timing):
+        hooks = sorted(
+            EXT_LineExtraction._hooks[("extract", timing)], key=lambda x: x[0]
+        )
+        return [func.__module__ for _, func in hooks if func.__module__ in modules]
+
+    assert hook_order("before") == [
+        "extensions.progress",
+        "extensions.instrumentation",
+    ]
+    assert hook_order("after") == [
+        "extensions.instrumentation",
+        "extensions.progress",
+    ]
+
+
+def test_pipeline_progress_weights_stages():
+    """Stage fractions map onto increasing overall percentages."""
+    events: list[ProgressEvent] = []
+    progress = PipelineProgress(events.append)
+
+    progress("preprocess", 0.0)
+    progress("vectorize", 0.5, "Tracing")
+    progress("optimize", 1.0)
+    progress("export", 0.5)
+
+    assert [event.progress for event in events] == [0, 50, 99]
+    assert events[1] == ProgressEvent("vectorize", 0.5, 50, "Tracing")
+
+
+@pytest.mark.asyncio
+async def test_throttle_coalesces_bursts_from_threads():
+    """A burst of events is published as the first and the latest one."""
+    published: list[ProgressEvent] = []
+    done = asyncio.Event()
+
+    async def publish(event: ProgressEvent) -> None:
+        published.append(event)
+        if event.progress == FINAL_PROGRESS:
+            done.set()
+
+    throttle = ProgressThrottle(publish, min_interval=MIN_INTERVAL)
+
+    def burst() -> None:
+        for progress in range(100):
+            throttle(ProgressEvent("vectorize", progress / 100, progress))
+
+    thread = threading.Thread(target=burst)
+    thread.start()
+    thread.join()
+
+    await asyncio.wait_for(done.wait(), timeout=1)
+    await throttle.aclose()
+
+    assert len(published) <= MAX_PUBLISHED_PER_BURST
+    assert published[-1].progress == FINAL_PROGRESS
+    assert [e.progress for e in published] == sorted(e.progress for e in published)
+
+
+@pytest.mark.asyncio
+async def test_throttle_drops_regressions_and_closes():
+    """Backwards progress is ignored and nothing is published after close."""
+    published: list[ProgressEvent] = []
+
+    async def publish(event: ProgressEvent) -> None:
+        published.append(event)
+
+    throttle = ProgressThrottle(publish, min_interval=MIN_INTERVAL)
+    throttle(ProgressEvent("optimize", 0.5, 85))
+    await asyncio.sleep(0.01)
+    throttle(ProgressEvent("vectorize", 0.5, 50))
+    throttle(ProgressEvent("optimize", 0.8, 94))
+    await throttle.aclose()
+    throttle(ProgressEvent("optimize", 1.0, 99))
+    await asyncio.sleep(MIN_INTERVAL * 2)
+
+    assert [event.progress for event in published] == [85]
@@ -0,0 +1,107 @@
+"""
+Tests for subject region-of-interest cropping.
+
+Tests the padded subject bounding box, cropping in the preprocess stage
+and placing SVGs traced from a crop back into the full frame.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pipeline import processor as processor_module
+from pipeline.processor import PhotoToLineProcessor, PipelineState, ProcessingParams
+from pipeline.roi import RegionOfInterest, place_in_frame, subject_region
+from utils.potrace import polylines_to_svg
+from utils.svg import read_svg_string
+
+
+@pytest.fixture
+def subject_mask():
+    """Hard U²-Net mask of a subject in a 300x200 frame."""
+    mask = np.zeros((200, 300), dtype=np.uint8)
+    mask[50:100, 120:180] = 255
+    return mask
+
+
+def test_subject_region_pads_bounding_box(subject_mask):
+    """Region is the mask's bounding box plus padding."""
+    roi = subject_region(subject_mask, padding=10)
+
+    assert roi == RegionOfInterest(
+        x=110, y=40, width=80, height=70, frame_width=300, frame_height=200
+    )
+    assert roi.crop(np.dstack([subject_mask] * 3)).shape == (70, 80, 3)
+
+
+def test_subject_region_ignores_faint_mask_fringe(subject_mask):
+    """A refined mask's low-alpha tail does not widen the region."""
+    soft = subject_mask.copy()
+    soft[:, 20:300] = np.maximum(soft[:, 20:300], 10)
+
+    assert subject_region(soft, padding=10) == subject_region(subject_mask, padding=10)
+
+
+def test_subject_region_none_without_gain(subject_mask):
+    """No region for an empty mask or one the padding stretches to the frame."""
+    assert subject_region(np.zeros_like(subject_mask)) is None
+    assert subject_region(subject_mask, padding=200) is None
+
+
+def test_preprocess_crops_to_isolation_mask(subject_mask, monkeypatch):
+    """The preprocess stage crops to the returned alpha and drops it."""
+    rgba = np.dstack([np.full((200, 300, 3), 255, np.uint8), subject_mask])
+    # A near-white fringe outside the mask must not affect the crop
+    rgba[150:160, 10:290, :3] = 250
+
+    def fake_preprocess(*args, **options):
+        assert options["keep_alpha"] is True
+        return rgba
+
+    monkeypatch.setattr(
+        processor_module.EXT_Preprocess, "preprocess", staticmethod(fake_preprocess)
+    )
+    processor = PhotoToLineProcessor()
+    params = ProcessingParams(
+        canvas_width_mm=300, canvas_height_mm=200, line_width_mm=0.3
+    )
+    params.isolate_subject = True
+    state = PipelineState(image_path=Path("unused.png"), params=params)
+
+    processor.run_stage("preprocess", state)
+
+    assert state.roi == subject_region(subject_mask)
+    assert state.image.shape == (state.roi.height, state.roi.width, 3)
+
+
+def test_place_in_frame_restores_coordinates():
+    """Traced points land at their full-frame position on a full-frame page."""
+    roi = RegionOfInterest(
+        x=110, y=40, width=80, height=70, frame_width=300, frame_height=200
+    )
+    square = np.array([[10.0, 10.0], [30.0, 10.0], [30.0, 30.0], [10.0, 30.0]])
+    svg = polylines_to_svg([square], width=roi.width, height=roi.height)
+
+    lc, page_width, page_height = read_svg_string(place_in_frame(svg, roi))
+
+    assert (page_width, page_height) == (300, 200)
+    np.testing.assert_allclose(lc.bounds(), (120, 50, 140, 70), atol=1e-6)
+
+
+def test_place_in_frame_keeps_units_and_scale():
+    """Potrace-style pt sizes and viewBox scale are carried to the frame."""
+    roi = RegionOfInterest(
+        x=20, y=10, width=50, height=40, frame_width=100, frame_height=80
+    )
+    svg = (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="50pt" height="40pt" '
+        'viewBox="0 0 500 400">\n'
+        '<path d="M100,100 L200,100" stroke="black"/>\n</svg>\n'
+    )
+
+    framed = place_in_frame(svg, roi)
+
+    assert 'width="100pt"' in framed
+    assert 'height="80pt"' in framed
+    assert 'viewBox="0 0 1000 800"' in framed
+    assert '<g transform="translate(200 100)">' in framed
@@ -0,0 +1,173 @@
+"""
+Tests for the stage-graph scheduler.
+
+Uses a lightweight processor exposing the same stage interface as
+PhotoToLineProcessor so stage timing can be controlled deterministically.
+"""
+
+import threading
+from pathlib import Path
+
+import pytest
+from pipeline.processor import PipelineState, ProcessingParams
+from pipeline.scheduler import StageScheduler
+
+STAGE_TIMEOUT = 5.0
+
+
+class GatedProcessor:
+    """Processor whose vectorize stage blocks until released."""
+
+    STAGES = ("preprocess", "line_extraction", "vectorize", "optimize")
+
+    def __init__(self):
+        self.vectorize_started = threading.Event()
+        self.release_vectorize = threading.Event()
+        self.preprocessed: list[str] = []
+        self.lock = threading.Lock()
+
+    def run_stage(self, stage: str, state: PipelineState) -> PipelineState:
+        if stage == "preprocess":
+            with self.lock:
+                self.preprocessed.append(state.image_path.name)
+            if state.image_path.name == "fail.png":
+                msg = "decode failed"
+                raise ValueError(msg)
+        if stage == "vectorize" and state.image_path.name == "slow.png":
+            self.vectorize_started.set()
+            assert self.release_vectorize.wait(STAGE_TIMEOUT)
+        state.svg = f"<svg>{state.image_path.name}</svg>"
+        return state
+
+    def finalize(self, state: PipelineState) -> str:
+        return state.svg
+
+
+@pytest.fixture
+def params():
+    return ProcessingParams(
+        canvas_width_mm=100, canvas_height_mm=100, line_width_mm=0.3
+    )
+
+
+def test_jobs_overlap_across_stages(params):
+    """Job B is preprocessed while job A is still vectorizing."""
+    processor = GatedProcessor()
+    scheduler = StageScheduler(processor, stage_workers={}, queue_size=4)
+
+    try:
+        slow = scheduler.submit(Path("slow.png"), params)
+        assert processor.vectorize_started.wait(STAGE_TIMEOUT)
+
+        fast = scheduler.submit(Path("fast.png"), params)
+
+        # B can only reach vectorize after A leaves it (one worker per stage),
+        # but it must already have been preprocessed.
+        for _ in range(100):
+            if "fast.png" in processor.preprocessed:
+                break
+            threading.Event().wait(0.01)
+        assert "fast.png" in processor.preprocessed
+        assert not slow.done()
+
+        processor.release_vectorize.set()
+        assert slow.result(STAGE_TIMEOUT) == "<svg>slow.png</svg>"
+        assert fast.result(STAGE_TIMEOUT) == "<svg>fast.png</svg>"
+    finally:
+        processor.release_vectorize.set()
+        scheduler.shutdown()
+
+
+def test_queue_depth_metrics(params):
+    """Jobs waiting behind a busy stage show up in its queue depth."""
+    processor = GatedProcessor()
+    scheduler = StageScheduler(processor, stage_workers={}, queue_size=4)
+
+    try:
+        futures = [scheduler.submit(Path("slow.png"), params)]
+        assert processor.vectorize_started.wait(STAGE_TIMEOUT)
+        futures += [scheduler.submit(Path(f"job{i}.png"), params) for i in range(2)]
+
+        for _ in range(100):
+            if scheduler.metrics()["vectorize"].queue_depth == 2:
+                break
+            threading.Event().wait(0.01)
+
+        metrics = scheduler.metrics()
+        assert list(metrics) == list(GatedProcessor.STAGES)
+        assert metrics["vectorize"].active == 1
+        assert metrics["vectorize"].queue_depth == 2
+        assert metrics["preprocess"].completed == 3
+
+        processor.release_vectorize.set()
+        for future in futures:
+            future.result(STAGE_TIMEOUT)
+
+        metrics = scheduler.metrics()
+        assert metrics["optimize"].completed == 3
+        assert all(m.queue_depth == 0 and m.active == 0 for m in metrics.values())
+    finally:
+        processor.release_vectorize.set()
+        scheduler.shutdown()
+
+
+def test_stage_failure_propagates(params):
+    """An exception in a stage fails only that job's future."""
+    processor = GatedProcessor()
+    scheduler = StageScheduler(processor, stage_workers={"preprocess": 2}, queue_size=2)
+
+    try:
+        failed = scheduler.submit(Path("fail.png"), params)
+        ok = scheduler.submit(Path("ok.png"), params)
+
+        with pytest.raises(ValueError, match="decode failed"):
+            failed.result(STAGE_TIMEOUT)
+        assert ok.result(STAGE_TIMEOUT) == "<svg>ok.png</svg>"
+        assert scheduler.metrics()["preprocess"].failed == 1
+        assert scheduler.metrics()["preprocess"].workers == 2
+    finally:
+        scheduler.shutdown()
+
+
+def test_invalid_configuration_rejected():
+    """Unknown stages and empty pools are configuration errors."""
+    processor = GatedProcessor()
+
+    with pytest.raises(ValueError, match="Unknown pipeline stages"):
+        StageScheduler(processor, stage_workers={"decode": 1}, queue_size=1)
+    with pytest.raises(ValueError, match="at least one worker"):
+        StageScheduler(processor, stage_workers={"vectorize": 0}, queue_size=1)
+    with pytest.raises(ValueError, match="queue size"):
+        StageScheduler(processor, stage_workers={}, queue_size=0)
+
+
+def test_queued_job_can_be_cancelled(params):
+    """A job still waiting for the first stage is cancelled and never run."""
+    started = threading.Event()
+    release = threading.Event()
+
+    class BlockingProcessor(GatedProcessor):
+        def run_stage(self, stage: str, state: PipelineState) -> PipelineState:
+            if stage == "preprocess" and state.image_path.name == "busy.png":
+                started.set()
+                assert release.wait(STAGE_TIMEOUT)
+            return super().run_stage(stage, state)
+
+    processor = BlockingProcessor()
+    scheduler = StageScheduler(processor, stage_workers={}, queue_size=2)
+    try:
+        busy = scheduler.submit(Path("busy.png"), params)
+        assert started.wait(STAGE_TIMEOUT)
+        queued = scheduler.submit(Path("queued.png"), params)
+
+        assert queued.cancel()
+        assert not busy.cancel()
+
+        release.set()
+        assert busy.result(STAGE_TIMEOUT) == "<svg>busy.png</svg>"
+    finally:
+        release.set()
+        scheduler.shutdown()
+
+    assert queued.cancelled()
+    assert "queued.png" not in processor.preprocessed
@@ -0,0 +1,56 @@
+"""
+Tests for the startup import budget of the API process.
+"""
+
+from benchmarks.imports import (
+    API_FORBIDDEN_MODULES,
+    ImportReport,
+    check_budget,
+    measure_imports,
+    parse_importtime,
+)
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2000 |       2500 |     numpy
+import time:       500 |       3000 |   cv2
+import time:       400 |       3520 | main
+"""
+MAIN_TOTAL_MS = 3.52
+
+
+def test_parse_importtime_reads_times_and_nesting():
+    """Every module line is parsed; the header is skipped."""
+    imports = parse_importtime(IMPORTTIME_OUTPUT)
+
+    assert [entry.name for entry in imports] == ["_io", "numpy", "cv2", "main"]
+    assert [entry.depth for entry in imports] == [1, 2, 1, 0]
+    assert imports[-1].cumulative_ms == MAIN_TOTAL_MS
+    assert imports[1].self_ms == 2.0
+
+
+def test_check_budget_reports_time_and_forbidden_modules():
+    """Reports list each forbidden package and an exceeded budget."""
+    report = ImportReport(
+        module="main",
+        total_ms=MAIN_TOTAL_MS,
+        imports=tuple(parse_importtime(IMPORTTIME_OUTPUT)),
+    )
+
+    assert check_budget(report, budget_ms=10, forbidden=("torch",)) == []
+    assert check_budget(report, budget_ms=1, forbidden=("cv2",)) == [
+        "cv2 is imported at startup",
+        "import main took 4 ms (budget 1 ms)",
+    ]
+
+
+def test_api_process_does_not_import_heavy_packages():
+    """Importing the API app loads neither OpenCV nor the ML stack.
+
+    Only the module set is checked; the time budget depends on the machine
+    and is enforced by ``python -m benchmarks.imports``.
+    """
+    report = measure_imports("main", repeat=1)
+
+    assert sorted(report.loaded & set(API_FORBIDDEN_MODULES)) == []
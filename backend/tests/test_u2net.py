@@ -0,0 +1,72 @@
+"""
+Tests for the U²-Net predictor's mask cascade.
+
+Model inference is replaced with fixed outputs so the tiling logic is
+tested without weights.
+"""
+
+import numpy as np
+import pytest
+from models.u2net import CASCADE_GRID, CASCADE_TILE_SIZE, U2NetPredictor
+from utils.mask_cache import MaskCache
+
+HEIGHT = 300
+WIDTH = 400
+TILE = WIDTH // CASCADE_GRID
+
+
+@pytest.fixture
+def predictor(monkeypatch):
+    """Predictor whose coarse pass is uncertain in one tile only."""
+    coarse = np.zeros((HEIGHT, WIDTH), dtype=np.uint8)
+    coarse[:, 2 * TILE :] = 255
+    coarse[10:20, TILE + 10 : TILE + 30] = 128
+    batches = []
+
+    def infer(batch):
+        batches.append(tuple(batch.shape))
+        return np.full(
+            (len(batch), CASCADE_TILE_SIZE, CASCADE_TILE_SIZE), 200, np.uint8
+        )
+
+    predictor = U2NetPredictor.__new__(U2NetPredictor)
+    monkeypatch.setattr(predictor, "predict", lambda image, size: coarse.copy())
+    monkeypatch.setattr(predictor, "_infer", infer)
+    predictor.batches = batches
+    return predictor
+
+
+def test_cascade_refines_only_uncertain_pixels(predictor):
+    """Only the uncertain tile is re-predicted, and only where uncertain."""
+    image = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+
+    mask = predictor.predict_cascade(image, threshold=128)
+
+    assert predictor.batches == [(1, 3, CASCADE_TILE_SIZE, CASCADE_TILE_SIZE)]
+    assert (mask[10:20, TILE + 10 : TILE + 30] == 200).all()
+    assert (mask[:, : TILE + 10] == 0).all()
+    assert (mask[:, 2 * TILE :] == 255).all()
+
+
+def test_predict_mask_binarizes_cascade(predictor):
+    """The cascade mask is thresholded like a single-pass one."""
+    image = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+
+    mask = predictor.predict_mask(image, threshold=128, cascade=True)
+
+    assert set(np.unique(mask)) == {0, 255}
+    assert (mask[10:20, TILE + 10 : TILE + 30] == 255).all()
+
+
+def test_predict_mask_reuses_cached_mask(predictor, tmp_path):
+    """A second prediction of the same image loads the stored mask."""
+    image = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    cache = MaskCache(tmp_path)
+    predictor.version = "test"
+
+    first = predictor.predict_mask(image, cascade=True, cache=cache)
+    second = predictor.predict_mask(image, cascade=True, cache=cache)
+
+    np.testing.assert_array_equal(first, second)
+    assert len(predictor.batches) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -4,9 +4,15 @@ Tests for vectorization module.
 Tests ImageTracerJS and Potrace vectorizers with real image data.
 """
 
+import json
+import shutil
+
 import cv2
 import numpy as np
 import pytest
+import utils.potrace
+from utils.potrace import encode_pbm, polylines_to_svg, trace_polylines, trace_svg
+from utils.svg import read_svg_string
 
 from app.pipeline.vectorize import ImageTracerVectorizer, PotraceVectorizer
 
@@ -170,3 +176,88 @@ class TestPotraceVectorizer:
             if "Potrace" in str(e):
                 pytest.skip("Potrace not installed")
             raise
+
+
+def test_encode_pbm_matches_opencv():
+    """In-memory PBM bitmaps are byte-identical to OpenCV's, padding included."""
+    image = np.full((5, 13), 255, dtype=np.uint8)
+    image[1:4, 2:11] = 0
+
+    ok, expected = cv2.imencode(".pbm", image)
+
+    assert ok
+    assert encode_pbm(image == 0) == expected.tobytes()
+
+
+def test_trace_polylines_splits_tiled_bitmaps(monkeypatch):
+    """One potrace run traces a batch; rings return to their own bitmap."""
+    size, square = 10, (3, 2, 8, 6)  # x0, y0, x1, y1 of the inked square
+    inks = [np.zeros((size, size), dtype=bool) for _ in range(2)]
+    for ink in inks:
+        ink[square[1] : square[3], square[0] : square[2]] = True
+    calls = []
+
+    def fake_potrace(bitmap, args, timeout):
+        # GeoJSON rings around each square, in potrace's y-up coordinates
+        calls.append((bitmap, args))
+        x0, y0, x1, y1 = square
+        rings = [
+            [[off + x0, size - y0], [off + x1, size - y0], [off + x1, size - y1]]
+            for off in (0, size + utils.potrace.TILE_GAP_PX)
+        ]
+        features = [
+            {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [r]}}
+            for r in rings
+        ]
+        return json.dumps({"type": "FeatureCollection", "features": features})
+
+    monkeypatch.setattr(utils.potrace, "run_potrace", fake_potrace)
+
+    traced = trace_polylines(inks, ["--turdsize=2"])
+
+    assert len(calls) == 1
+    assert calls[0][1] == ["--backend", "geojson", "--turdsize=2"]
+    assert [len(polylines) for polylines in traced] == [1, 1]
+    for (polyline,) in traced:
+        np.testing.assert_array_equal(polyline.min(axis=0), square[:2])
+        np.testing.assert_array_equal(polyline.max(axis=0), square[2:])
+
+
+def test_polylines_to_svg_is_readable_by_vpype():
+    """Traced polylines become straight-segment SVG paths."""
+    polyline = np.array([[1.0, 1.0], [9.0, 1.0], [9.0, 4.0]])
+
+    lines, width, height = read_svg_string(polylines_to_svg([polyline], 10, 5))
+
+    assert (width, height) == (10, 5)
+    assert len(lines) == 1
+
+
+@pytest.mark.requires_potrace
+@pytest.mark.skipif(
+    shutil.which(utils.potrace.POTRACE_BINARY) is None, reason="Potrace not installed"
+)
+def test_geojson_backend_matches_svg_backend():
+    """Both potrace backends trace the same outlines of one bitmap."""
+    image = np.zeros((80, 120), dtype=np.uint8)
+    cv2.rectangle(image, (10, 10), (60, 50), 255, thickness=-1)
+    cv2.circle(image, (90, 40), 20, 255, thickness=4)
+    ink = image > 0
+
+    traced = {}
+    for backend in utils.potrace.POTRACE_BACKENDS:
+        lines, width, height = read_svg_string(trace_svg(ink, backend=backend))
+        # Potrace's SVG is in pt, the GeoJSON rendering in px: compare
+        # geometry relative to the page
+        traced[backend] = (
+            len(lines),
+            np.asarray(lines.bounds()) / (width, height, width, height),
+            lines.length() / width,
+        )
+
+    svg_count, svg_bounds, svg_length = traced["svg"]
+    geojson_count, geojson_bounds, geojson_length = traced["geojson"]
+    # Rectangle outline plus the ring's outer and inner outlines
+    assert svg_count == geojson_count == 3
+    np.testing.assert_allclose(geojson_bounds, svg_bounds, atol=0.01)
+    assert geojson_length == pytest.approx(svg_length, rel=0.03)
@@ -0,0 +1,217 @@
+"""
+Tests for WebSocket broadcasting and cross-replica event fan-out.
+"""
+
+import asyncio
+import json
+
+import pytest
+from api.events import RedisEventBus
+from api.websocket import OUTBOUND_QUEUE_SIZE, ConnectionManager, websocket_endpoint
+from fastapi import WebSocketDisconnect
+
+DELIVERY_TIMEOUT = 2.0
+PROGRESS_EXAMPLE = 40
+
+
+class FakeWebSocket:
+    """Records messages sent to a client, optionally stalling on each send."""
+
+    def __init__(self, stalled: bool = False):
+        self.sent: list[dict] = []
+        self.received = asyncio.Event()
+        self.unblocked = asyncio.Event()
+        self.closed_with: int | None = None
+        if not stalled:
+            self.unblocked.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await self.unblocked.wait()
+        self.sent.append(json.loads(text))
+        self.received.set()
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+class FakePubSub:
+    """Subscription side of FakeRedis."""
+
+    def __init__(self):
+        self.channels: set[str] = set()
+        self.messages: asyncio.Queue[dict] = asyncio.Queue()
+
+    async def subscribe(self, channel: str):
+        self.channels.add(channel)
+
+    async def get_message(
+        self, ignore_subscribe_messages: bool = False, timeout: float = 0.0
+    ):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except TimeoutError:
+            return None
+
+    async def aclose(self):
+        self.channels.clear()
+
+
+class FakeRedis:
+    """In-process stand-in for a Redis server shared by several replicas."""
+
+    def __init__(self):
+        self.subscriptions: list[FakePubSub] = []
+
+    def pubsub(self, ignore_subscribe_messages: bool = False):
+        subscription = FakePubSub()
+        self.subscriptions.append(subscription)
+        return subscription
+
+    async def publish(self, channel: str, message: str) -> int:
+        receivers = [s for s in self.subscriptions if channel in s.channels]
+        for subscription in receivers:
+            subscription.messages.put_nowait(
+                {"type": "message", "channel": channel, "data": message}
+            )
+        return len(receivers)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_broadcast_reaches_local_clients():
+    """Without Redis, events are delivered to sockets in the same process."""
+    manager = ConnectionManager()
+    client = FakeWebSocket()
+    await manager.connect(client, "job-1")
+
+    await manager.broadcast_progress(
+        "job-1", progress=PROGRESS_EXAMPLE, stage="vectorize"
+    )
+    await manager.broadcast_progress("job-2", progress=PROGRESS_EXAMPLE)
+    await asyncio.wait_for(client.received.wait(), DELIVERY_TIMEOUT)
+
+    assert client.sent == [
+        {
+            "type": "progress",
+            "job_id": "job-1",
+            "progress": PROGRESS_EXAMPLE,
+            "stage": "vectorize",
+        }
+    ]
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_redis_bus_fans_out_across_replicas():
+    """A client on one replica hears events published by another."""
+    redis_server = FakeRedis()
+    replica_a = ConnectionManager()
+    replica_b = ConnectionManager()
+    await replica_a.start(RedisEventBus(redis_server))
+    await replica_b.start(RedisEventBus(redis_server))
+
+    client = FakeWebSocket()
+    await replica_b.connect(client, "job-1")
+
+    try:
+        await replica_a.broadcast_complete("job-1", result_url="/api/download/job-1")
+        await asyncio.wait_for(client.received.wait(), DELIVERY_TIMEOUT)
+    finally:
+        await replica_a.stop()
+        await replica_b.stop()
+
+    assert client.sent[0]["type"] == "complete"
+    assert client.sent[0]["result_url"] == "/api/download/job-1"
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_delay_others():
+    """A stalled socket only holds up its own messages."""
+    manager = ConnectionManager()
+    slow, fast = FakeWebSocket(stalled=True), FakeWebSocket()
+    await manager.connect(slow, "job-1")
+    await manager.connect(fast, "job-1")
+
+    await asyncio.wait_for(
+        manager.broadcast_progress("job-1", progress=PROGRESS_EXAMPLE),
+        DELIVERY_TIMEOUT,
+    )
+    await asyncio.wait_for(fast.received.wait(), DELIVERY_TIMEOUT)
+
+    assert fast.sent[0]["progress"] == PROGRESS_EXAMPLE
+    assert slow.sent == []
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_progress_frames_drop_oldest_when_queue_full():
+    """Backlogged progress is dropped oldest-first; the latest survives."""
+    manager = ConnectionManager()
+    client = FakeWebSocket(stalled=True)
+    await manager.connect(client, "job-1")
+
+    frames = OUTBOUND_QUEUE_SIZE * 2
+    for progress in range(frames):
+        await manager.broadcast_progress("job-1", progress=progress)
+    await manager.broadcast_complete("job-1", result_url="/api/download/job-1")
+
+    client.unblocked.set()
+    for _ in range(100):
+        if client.sent and client.sent[-1]["type"] == "complete":
+            break
+        await asyncio.sleep(0.01)
+
+    assert "job-1" in manager.active_connections
+    assert len(client.sent) <= OUTBOUND_QUEUE_SIZE + 1
+    assert client.sent[-2]["progress"] == frames - 1
+    assert client.sent[-1]["type"] == "complete"
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_evicted(monkeypatch):
+    """A client that cannot take a message in time is disconnected."""
+    monkeypatch.setattr("api.websocket.SEND_TIMEOUT_SECONDS", 0.05)
+    manager = ConnectionManager()
+    client = FakeWebSocket(stalled=True)
+    await manager.connect(client, "job-1")
+
+    await manager.broadcast_error("job-1", error="boom")
+    for _ in range(100):
+        if client.closed_with is not None:
+            break
+        await asyncio.sleep(0.01)
+
+    assert client.closed_with is not None
+    assert "job-1" not in manager.active_connections
+    await manager.stop()
+
+
+class PingingWebSocket(FakeWebSocket):
+    """Sends the given client messages, then disconnects."""
+
+    def __init__(self, messages: list[str], stalled: bool = False):
+        super().__init__(stalled=stalled)
+        self.incoming = list(messages)
+
+    async def receive_text(self) -> str:
+        if not self.incoming:
+            raise WebSocketDisconnect
+        return self.incoming.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_pong_goes_through_writer_queue(monkeypatch):
+    """Replies to pings are queued, so a stalled socket never blocks reads."""
+    manager = ConnectionManager()
+    monkeypatch.setattr("api.websocket.ws_manager", manager)
+    client = PingingWebSocket(["ping", "ping"], stalled=True)
+
+    await asyncio.wait_for(websocket_endpoint(client, "job-1"), DELIVERY_TIMEOUT)
+
+    assert client.incoming == []
+    assert client.sent == []
+    assert "job-1" not in manager.active_connections
+    await manager.stop()
@@ -1,13 +1,17 @@
 """Unit tests for JobService service layer."""
 
+import asyncio
+import threading
 import uuid
 from unittest.mock import AsyncMock, Mock
 
 import pytest
-from api.models import ProcessingStatus
+from api.models import ProcessingMode, ProcessingStatus
 from config import settings
 from fastapi import HTTPException, UploadFile
+from pipeline.presets import PresetRegistry
 from pipeline.processor import PhotoToLineProcessor, ProcessingParams, ProcessingResult
+from pipeline.progress import ProgressEvent, ProgressThrottle
 from services.job_service import JobService
 from storage import JobStorage
 
@@ -16,6 +20,7 @@ STATUS_PAYLOAD_TOO_LARGE = 413
 STATUS_NOT_FOUND = 404
 STATUS_INTERNAL_SERVER_ERROR = 500
 JOB_PROGRESS_COMPLETE = 100
+JOB_PROGRESS_VECTORIZING = 50
 PATH_COUNT_EXAMPLE = 42
 
 
@@ -23,12 +28,14 @@ PATH_COUNT_EXAMPLE = 42
 def mock_storage():
     """Mock JobStorage."""
     storage = Mock(spec=JobStorage)
-    storage.create_job = Mock()
-    storage.get_job = Mock()
-    storage.update_job = Mock()
-    storage.set_status = Mock(return_value=True)
-    storage.set_result = Mock(return_value=True)
-    storage.job_exists = Mock(return_value=False)
+    storage.create_job = AsyncMock()
+    storage.get_job = AsyncMock()
+    storage.update_job = AsyncMock()
+    storage.transition_status = AsyncMock(return_value=True)
+    storage.set_status = AsyncMock(return_value=True)
+    storage.set_progress = AsyncMock(return_value=True)
+    storage.set_result = AsyncMock(return_value=True)
+    storage.exists = AsyncMock(return_value=False)
     return storage
 
 
@@ -109,7 +116,8 @@ async def test_create_job_from_upload_file_too_large(job_service):
     assert "File too large" in exc_info.value.detail
 
 
-def test_get_job_success(job_service, mock_storage):
+@pytest.mark.asyncio
+async def test_get_job_success(job_service, mock_storage):
     """Test retrieving job by ID."""
     job_id = str(uuid.uuid4())
     expected_job = {
@@ -119,23 +127,25 @@ def test_get_job_success(job_service, mock_storage):
     }
     mock_storage.get_job.return_value = expected_job
 
-    result = job_service.get_job(job_id)
+    result = await job_service.get_job(job_id)
 
     assert result == expected_job
     mock_storage.get_job.assert_called_once_with(job_id)
 
 
-def test_get_job_not_found(job_service, mock_storage):
+@pytest.mark.asyncio
+async def test_get_job_not_found(job_service, mock_storage):
     """Test retrieving non-existent job."""
     mock_storage.get_job.return_value = None
 
     with pytest.raises(HTTPException) as exc_info:
-        job_service.get_job("nonexistent-id")
+        await job_service.get_job("nonexistent-id")
 
     assert exc_info.value.status_code == STATUS_NOT_FOUND
 
 
-def test_get_job_status(job_service, mock_storage):
+@pytest.mark.asyncio
+async def test_get_job_status(job_service, mock_storage):
     """Test getting job status with stats."""
     job_id = str(uuid.uuid4())
     mock_job = {
@@ -150,14 +160,15 @@ def test_get_job_status(job_service, mock_storage):
     }
     mock_storage.get_job.return_value = mock_job
 
-    status = job_service.get_job_status(job_id)
+    status = await job_service.get_job_status(job_id)
 
     assert status["status"] == ProcessingStatus.COMPLETED.value
     assert status["progress"] == JOB_PROGRESS_COMPLETE
     assert status["stats"]["path_count"] == PATH_COUNT_EXAMPLE
 
 
-def test_get_result_path_success(job_service, mock_storage, tmp_path):
+@pytest.mark.asyncio
+async def test_get_result_path_success(job_service, mock_storage, tmp_path):
     """Test getting result file path."""
     settings.results_dir = tmp_path
 
@@ -171,13 +182,14 @@ def test_get_result_path_success(job_service, mock_storage, tmp_path):
         "output_path": str(result_file),
     }
 
-    path = job_service.get_result_path(job_id)
+    path = await job_service.get_result_path(job_id)
 
     assert path == result_file
     assert path.exists()
 
 
-def test_get_result_path_not_complete(job_service, mock_storage):
+@pytest.mark.asyncio
+async def test_get_result_path_not_complete(job_service, mock_storage):
     """Test getting result path for incomplete job."""
     job_id = str(uuid.uuid4())
     mock_storage.get_job.return_value = {
@@ -186,7 +198,7 @@ def test_get_result_path_not_complete(job_service, mock_storage):
     }
 
     with pytest.raises(HTTPException) as exc_info:
-        job_service.get_result_path(job_id)
+        await job_service.get_result_path(job_id)
 
     assert exc_info.value.status_code == STATUS_BAD_REQUEST
     assert "not complete" in exc_info.value.detail.lower()
@@ -225,12 +237,17 @@ async def test_process_job_success(job_service, mock_storage, mock_processor, tm
         "height_mm": 150.0,
     }
     mock_result.device_used = "cpu"
+    mock_result.stage_metrics = [
+        {"stage": "preprocess", "provider": "classical_cv", "wall_seconds": 0.1}
+    ]
     mock_processor.process.return_value = mock_result
 
     await job_service.process_job(job_id, params)
 
-    # Verify status was set to PROCESSING then result was set
-    assert mock_storage.set_status.called
+    # Verify status moved to PROCESSING then result was set
+    mock_storage.transition_status.assert_awaited_once_with(
+        job_id, ProcessingStatus.PENDING, ProcessingStatus.PROCESSING
+    )
     assert mock_storage.set_result.called
 
     # Verify set_result was called with correct parameters
@@ -240,10 +257,108 @@ async def test_process_job_success(job_service, mock_storage, mock_processor, tm
         "total_length_mm": 500.0,
         "width_mm": 200.0,
         "height_mm": 150.0,
+        "stages": mock_result.stage_metrics,
     }
     assert set_result_call.kwargs["device_used"] == "cpu"
 
 
+@pytest.fixture
+def pending_job(mock_storage, tmp_path):
+    """Register a pending job whose input file exists."""
+    settings.upload_dir = tmp_path
+    settings.results_dir = tmp_path
+
+    job_id = str(uuid.uuid4())
+    input_file = tmp_path / f"{job_id}.jpg"
+    input_file.write_bytes(b"fake image")
+    mock_storage.get_job.return_value = {
+        "job_id": job_id,
+        "filename": "test.jpg",
+        "input_path": str(input_file),
+        "status": ProcessingStatus.PENDING.value,
+    }
+    return job_id
+
+
+def _result(svg: str) -> Mock:
+    result = Mock(spec=ProcessingResult)
+    result.svg_content = svg
+    result.stats = {"path_count": 1, "total_length_mm": 10.0}
+    result.device_used = "cpu"
+    result.stage_metrics = []
+    return result
+
+
+@pytest.mark.asyncio
+async def test_process_job_streams_preview_first(
+    job_service, mock_processor, pending_job, monkeypatch
+):
+    """Preview result is broadcast before the full result."""
+    events = []
+    ws = Mock()
+    ws.broadcast_progress = AsyncMock()
+    ws.broadcast_preview = AsyncMock(
+        side_effect=lambda *a, **k: events.append("preview")
+    )
+    ws.broadcast_complete = AsyncMock(
+        side_effect=lambda *a, **k: events.append("complete")
+    )
+    monkeypatch.setattr("services.job_service.ws_manager", ws)
+
+    full_started = threading.Event()
+
+    def slow_process(**kwargs):
+        full_started.set()
+        # Keep the full run going until the preview has been broadcast
+        for _ in range(100):
+            if events:
+                break
+            threading.Event().wait(0.01)
+        return _result("<svg>full</svg>")
+
+    mock_processor.process = Mock(side_effect=slow_process)
+    mock_processor.process_preview = Mock(return_value=_result("<svg>preview</svg>"))
+    params = ProcessingParams(
+        canvas_width_mm=200, canvas_height_mm=150, line_width_mm=0.3
+    )
+
+    await job_service.process_job(pending_job, params, preview=True)
+
+    assert full_started.is_set()
+    assert events == ["preview", "complete"]
+    assert ws.broadcast_preview.call_args.kwargs["svg"] == "<svg>preview</svg>"
+    mock_processor.process_preview.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_process_job_drops_slow_preview(
+    job_service, mock_processor, mock_storage, pending_job, monkeypatch
+):
+    """A preview that misses the latency budget is not broadcast."""
+    ws = Mock()
+    ws.broadcast_progress = AsyncMock()
+    ws.broadcast_preview = AsyncMock()
+    ws.broadcast_complete = AsyncMock()
+    monkeypatch.setattr("services.job_service.ws_manager", ws)
+    monkeypatch.setattr(settings, "preview_latency_budget_ms", 50)
+
+    def slow_preview(*args):
+        threading.Event().wait(0.5)
+        return _result("<svg>preview</svg>")
+
+    mock_processor.process = Mock(return_value=_result("<svg>full</svg>"))
+    mock_processor.process_preview = Mock(side_effect=slow_preview)
+    params = ProcessingParams(
+        canvas_width_mm=200, canvas_height_mm=150, line_width_mm=0.3
+    )
+
+    await job_service.process_job(pending_job, params, preview=True)
+
+    ws.broadcast_preview.assert_not_called()
+    ws.broadcast_complete.assert_called_once()
+    assert mock_storage.set_result.called
+
+
 @pytest.mark.asyncio
 async def test_process_job_not_found(job_service, mock_storage):
     """Test processing non-existent job."""
@@ -297,3 +412,110 @@ async def test_process_job_handles_error(
     status_call = mock_storage.set_status.call_args
     assert status_call.args[1] == ProcessingStatus.FAILED
     assert "Processing failed" in status_call.kwargs.get("error", "")
+
+
+@pytest.mark.asyncio
+async def test_get_job_status_reports_stored_progress(job_service, mock_storage):
+    """Running jobs report the progress stored by the pipeline."""
+    mock_storage.get_job.return_value = {
+        "job_id": "job-1",
+        "status": ProcessingStatus.PROCESSING.value,
+        "progress": JOB_PROGRESS_VECTORIZING,
+        "stage": "vectorize",
+        "progress_updated_at": 1700000000.0,
+    }
+
+    status = await job_service.get_job_status("job-1")
+
+    assert status["progress"] == JOB_PROGRESS_VECTORIZING
+    assert status["stage"] == "vectorize"
+
+
+@pytest.mark.asyncio
+async def test_process_job_publishes_pipeline_progress(
+    job_service, mock_processor, mock_storage, pending_job, monkeypatch
+):
+    """Progress reported by the pipeline is stored and broadcast, not faked."""
+    ws = Mock()
+    ws.broadcast_progress = AsyncMock()
+    ws.broadcast_complete = AsyncMock()
+    monkeypatch.setattr("services.job_service.ws_manager", ws)
+
+    def process(image_path, params, progress):
+        progress(ProgressEvent("vectorize", 0.5, JOB_PROGRESS_VECTORIZING, "Tracing"))
+        return _result("<svg>full</svg>")
+
+    mock_processor.process = Mock(side_effect=process)
+    params = ProcessingParams(
+        canvas_width_mm=200, canvas_height_mm=150, line_width_mm=0.3
+    )
+
+    # Let the published event reach the loop before the job finishes
+    monkeypatch.setattr(settings, "progress_min_interval_ms", 10)
+    original_close = ProgressThrottle.aclose
+
+    async def close_after_flush(self):
+        await asyncio.sleep(0.05)
+        await original_close(self)
+
+    monkeypatch.setattr(ProgressThrottle, "aclose", close_after_flush)
+
+    await job_service.process_job(pending_job, params)
+
+    ws.broadcast_progress.assert_called_once_with(
+        pending_job,
+        progress=JOB_PROGRESS_VECTORIZING,
+        stage="vectorize",
+        message="Tracing",
+    )
+    mock_storage.set_progress.assert_called_once_with(
+        pending_job, JOB_PROGRESS_VECTORIZING, "vectorize"
+    )
+    ws.broadcast_complete.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_process_job_rejects_job_already_started(
+    job_service, mock_storage, mock_processor, pending_job
+):
+    """Losing the PENDING -> PROCESSING race reports the job as started."""
+    mock_storage.transition_status.return_value = False
+    mock_storage.get_job.side_effect = [
+        {"job_id": pending_job, "status": ProcessingStatus.PENDING.value},
+        {"job_id": pending_job, "status": ProcessingStatus.PROCESSING.value},
+    ]
+    params = ProcessingParams(
+        canvas_width_mm=200, canvas_height_mm=150, line_width_mm=0.3
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        await job_service.process_job(pending_job, params)
+
+    assert exc_info.value.status_code == STATUS_BAD_REQUEST
+    assert "processing" in exc_info.value.detail
+    mock_processor.process.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_queued_job_round_trips_params():
+    """An API-only service queues jobs that a worker's service runs unchanged."""
+    storage = JobStorage(redis_url=None)
+    api_service = JobService(storage=storage, presets=PresetRegistry())
+    params = api_service.resolve_params(ProcessingMode.PORTRAIT, None, None)
+    await api_service.enqueue_job("job-1", params, preview=True)
+
+    worker_service = JobService(storage=storage, processor=Mock())
+    worker_service.process_job = AsyncMock()
+    await worker_service.process_queued_job(await storage.dequeue_job(timeout=0.1))
+
+    worker_service.process_job.assert_awaited_once_with("job-1", params, preview=True)
+
+
+@pytest.mark.asyncio
+async def test_api_only_service_cannot_run_jobs(mock_storage, tmp_path):
+    """Without a processor, running a job fails with a clear error."""
+    service = JobService(storage=mock_storage, presets=PresetRegistry())
+    params = service.resolve_params(ProcessingMode.PORTRAIT, None, None)
+
+    with pytest.raises(RuntimeError, match="API-only"):
+        await service._run_pipeline(tmp_path / "in.jpg", params, Mock())
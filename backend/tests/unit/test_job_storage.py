@@ -0,0 +1,67 @@
+"""Unit tests for the in-memory JobStorage backend."""
+
+from pathlib import Path
+
+import pytest
+from api.models import ProcessingStatus
+from storage import JobStorage
+
+PROGRESS_EXAMPLE = 40
+
+
+async def _storage_with_job() -> JobStorage:
+    """In-memory JobStorage with one pending job."""
+    storage = JobStorage(redis_url=None)
+    await storage.create_job("job-1", "photo.jpg", Path("/tmp/photo.jpg"))
+    return storage
+
+
+@pytest.mark.asyncio
+async def test_update_job_writes_only_given_fields():
+    """Updates merge into the stored job; missing jobs are not created."""
+    storage = await _storage_with_job()
+    assert await storage.set_progress("job-1", PROGRESS_EXAMPLE, "vectorize")
+    assert not await storage.update_job("missing", {"progress": PROGRESS_EXAMPLE})
+
+    job = await storage.get_job("job-1")
+    assert job["progress"] == PROGRESS_EXAMPLE
+    assert job["stage"] == "vectorize"
+    assert job["filename"] == "photo.jpg"
+    assert not await storage.exists("missing")
+
+
+@pytest.mark.asyncio
+async def test_transition_status_is_compare_and_set():
+    """Only the first PENDING -> PROCESSING transition succeeds."""
+    storage = await _storage_with_job()
+    pending, processing = ProcessingStatus.PENDING, ProcessingStatus.PROCESSING
+
+    assert await storage.transition_status("job-1", pending, processing)
+    assert not await storage.transition_status("job-1", pending, processing)
+    assert not await storage.transition_status("missing", pending, processing)
+    assert (await storage.get_job("job-1"))["status"] == processing.value
+
+
+@pytest.mark.asyncio
+async def test_get_job_returns_copy():
+    """Mutating a returned job does not change stored state."""
+    storage = await _storage_with_job()
+    job = await storage.get_job("job-1")
+    job["status"] = ProcessingStatus.FAILED.value
+
+    assert (await storage.get_job("job-1"))["status"] == ProcessingStatus.PENDING.value
+
+
+@pytest.mark.asyncio
+async def test_job_queue_is_fifo_and_times_out():
+    """Queued jobs come out oldest first; an empty queue returns None."""
+    storage = JobStorage(redis_url=None)
+    await storage.enqueue_job("job-1", {"preview": False})
+    await storage.enqueue_job("job-2", {"preview": True})
+
+    assert await storage.dequeue_job(timeout=0.1) == {
+        "job_id": "job-1",
+        "preview": False,
+    }
+    assert (await storage.dequeue_job(timeout=0.1))["job_id"] == "job-2"
+    assert await storage.dequeue_job(timeout=0.01) is None